@@ -0,0 +1,243 @@
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import claim_extraction
+import metrics
+import storage
+import verify_service
+from rate_limit import TokenBucket
+
+# =====================================================
+# 🚦 ADMISSION CONTROL (বটে rate limit + অগ্রাধিকার সারি)
+# =====================================================
+# আগে বটে প্রতিটা মেসেজ — স্প্যাম/ফ্লাড সহ — সরাসরি Gemini-তে যেত; একটা চ্যাটই কোটা
+# শেষ করে সবাইকে ধীর করে দিতে পারত। এখন প্রতিটা মেসেজ:
+# - প্রতি চ্যাটের token bucket (ফ্লাড আটকায়) আর একটা global bucket (মডেল কল/সেকেন্ড) পার হয়
+# - সীমা পেরোলে আগে ক্যাশ / অনুরূপ যাচাই থেকে উত্তর (মডেল কল ছাড়াই)
+# - তাও না পেলে সীমিত অগ্রাধিকার সারিতে — যে চ্যাটের কম মেসেজ অপেক্ষায় সে আগে;
+#   সারি ভরা থাকলে বা চ্যাট নিজেই ফ্লাড করলে ভদ্রভাবে ফিরিয়ে দেওয়া হয়
+# সীমাগুলো admission_limits টেবিলে — অ্যাডমিন প্যানেল থেকে বদলালে বট কয়েক সেকেন্ডে নেয়।
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+WORKERS = int(os.getenv("ADMISSION_WORKERS", 2))  # সারি থেকে যাচাই চালানোর থ্রেড
+RELOAD_SECONDS = 5   # admission_limits কতক্ষণ পরপর আবার পড়া হয়
+MAX_CHATS = 10000    # এর বেশি চ্যাটের bucket মনে রাখা হয় না (পুরোনোগুলো বাদ)
+
+DEFAULT_LIMITS = {
+    "chat_rate": 0.2,     # মেসেজ/সেকেন্ড, একই চ্যাটে (মিনিটে ১২টা)
+    "chat_burst": 5,      # একসাথে কতগুলো মেসেজ ছাড়
+    "global_rate": 2.0,   # সব চ্যাট মিলিয়ে যাচাই/সেকেন্ড
+    "global_burst": 10,
+    "queue_size": 100,    # অপেক্ষমাণ সারির সর্বোচ্চ দৈর্ঘ্য
+}
+
+SLOW_DOWN_TEXT = "🐢 খুব দ্রুত অনেক মেসেজ এসেছে — একটু পরে আবার পাঠাও।"
+BUSY_TEXT = "⚠️ সার্ভার এখন খুব ব্যস্ত — কয়েক মিনিট পরে আবার চেষ্টা করো।"
+FALLBACK_PREFIX = "⏳ এখন অনেক অনুরোধ — আগের অনুরূপ যাচাই থেকে উত্তর:\n\n"
+
+
+def load_limits(db_path=DB_PATH):
+    # শেয়ার্ড storage-এ — PostgreSQL হলে সব নোডের বট একই সীমা দেখে
+    limits = dict(DEFAULT_LIMITS)
+    with storage.get_storage(db_path).reader() as conn:
+        for name, value in conn.execute("SELECT name, value FROM admission_limits").fetchall():
+            if name in limits:
+                limits[name] = value
+    return limits
+
+
+def save_limits(limits, db_path=DB_PATH):
+    storage.get_storage(db_path).write(lambda conn: conn.executemany("""
+        INSERT INTO admission_limits (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value=excluded.value
+    """, [(k, float(v)) for k, v in limits.items() if k in DEFAULT_LIMITS]))
+
+
+class Admission:
+    def __init__(self, name, db_path=DB_PATH, workers=WORKERS):
+        self.name = name
+        self.db_path = db_path
+        self.workers = workers
+        self.limits = dict(DEFAULT_LIMITS)
+        self.global_bucket = TokenBucket(self.limits["global_rate"], capacity=self.limits["global_burst"])
+        self.chat_buckets = OrderedDict()  # chat_id → TokenBucket (LRU)
+        self.queue = []  # heap: (chat-এর অপেক্ষমাণ সংখ্যা, seq, কাজ)
+        self.queued_per_chat = Counter()
+        self.counts = Counter()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._running = 0  # সারি থেকে নেওয়া, এখনো উত্তর যায়নি
+        self._loaded_at = 0.0
+        metrics.QUEUE_DEPTH.track(self.depth, f"{name}_admission")
+
+    # ---------- সীমা ----------
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._loaded_at < RELOAD_SECONDS:
+            return
+        self._loaded_at = now
+        try:
+            limits = load_limits(self.db_path)
+        except Exception as e:
+            logging.error(f"Admission limit পড়া ব্যর্থ: {e}")
+            return
+        with self._cond:
+            self.limits = limits
+            self.global_bucket.rate = limits["global_rate"]
+            self.global_bucket.capacity = limits["global_burst"]
+            for bucket in self.chat_buckets.values():
+                bucket.rate = limits["chat_rate"]
+                bucket.capacity = limits["chat_burst"]
+
+    def _chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.limits["chat_rate"], capacity=self.limits["chat_burst"])
+            if len(self.chat_buckets) > MAX_CHATS:
+                self.chat_buckets.popitem(last=False)
+        else:
+            self.chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    @staticmethod
+    def _take(bucket):
+        if bucket.wait_time() > 0:
+            return False
+        bucket.take()
+        return True
+
+    def _admit(self, chat_id):
+        self._refresh()
+        with self._cond:
+            chat_ok = self._take(self._chat_bucket(chat_id))
+            return chat_ok, chat_ok and self._take(self.global_bucket)
+
+    def _fallback(self, text):
+        # ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → অনুরূপ AI রিপোর্ট; মডেল কল নয়
+        try:
+            past = claim_extraction.past_verdict(text, self.db_path)
+        except Exception as e:
+            logging.error(f"Fallback খোঁজা ব্যর্থ: {e}")
+            return None
+        return FALLBACK_PREFIX + verify_service.chat_reply(past) if past else None
+
+    def _count(self, decision):
+        with self._cond:
+            self.counts[decision] += 1
+        metrics.ADMISSIONS.inc(self.name, decision)
+        return decision
+
+    # ---------- listener: নিজের সারি আছে, তাই এখানে অপেক্ষা ----------
+    def answer(self, chat_id, text, run):
+        chat_ok, global_ok = self._admit(chat_id)
+        if global_ok:
+            self._count("run")
+            return run(text)
+        fallback = self._fallback(text)
+        if fallback:
+            self._count("fallback")
+            return fallback
+        if not chat_ok:
+            self._count("rejected_chat")
+            return SLOW_DOWN_TEXT
+        with self._cond:
+            while True:
+                wait = self.global_bucket.wait_time()
+                if wait <= 0:
+                    self.global_bucket.take()
+                    break
+                self._cond.wait(wait)
+        self._count("waited")
+        return run(text)
+
+    # ---------- telegram_bot: handler থ্রেড আটকে না রেখে সারিতে ----------
+    def submit(self, chat_id, text, run, respond):
+        # run(text) → উত্তরের টেক্সট (মডেল কল), respond(answer) → চ্যাটে পাঠানো; সিদ্ধান্ত ফেরত
+        chat_ok, global_ok = self._admit(chat_id)
+        if global_ok:
+            self._count("run")
+            respond(run(text))
+            return "run"
+        fallback = self._fallback(text)
+        if fallback:
+            respond(fallback)
+            return self._count("fallback")
+        if not chat_ok:
+            respond(SLOW_DOWN_TEXT)
+            return self._count("rejected_chat")
+        with self._cond:
+            full = len(self.queue) >= self.limits["queue_size"]
+            if not full:
+                heapq.heappush(self.queue, (self.queued_per_chat[chat_id], next(self._seq), (chat_id, text, run, respond)))
+                self.queued_per_chat[chat_id] += 1
+                position = len(self.queue)
+                self._start_workers()
+                self._cond.notify_all()
+        if full:
+            respond(BUSY_TEXT)
+            return self._count("rejected_full")
+        respond(f"⏳ এখন অনেক অনুরোধ — তোমার মেসেজ সারিতে আছে (অবস্থান {position})। যাচাই হলে উত্তর পাঠাবো।")
+        return self._count("queued")
+
+    def _start_workers(self):
+        # _cond ধরে রাখা অবস্থায় ডাকা হয়
+        if not self._threads:
+            for i in range(self.workers):
+                t = threading.Thread(target=self._drain, name=f"{self.name}-admission-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while True:
+                    wait = self.global_bucket.wait_time() if self.queue else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                self.global_bucket.take()
+                _, _, (chat_id, text, run, respond) = heapq.heappop(self.queue)
+                self.queued_per_chat[chat_id] -= 1
+                if not self.queued_per_chat[chat_id]:
+                    del self.queued_per_chat[chat_id]
+                self._running += 1
+            try:
+                answer = run(text)
+            except Exception as e:
+                logging.error(f"সারির যাচাই ব্যর্থ: {e}")
+                answer = f"⚠️ ত্রুটি ঘটেছে: {e}"
+            try:
+                respond(answer)
+            except Exception as e:
+                logging.error(f"সারির উত্তর পাঠানো ব্যর্থ ({chat_id}): {e}")
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+            self._count("dequeued")
+
+    def drain(self, timeout=30):
+        # shutdown-এর আগে: সারিতে থাকা আর চলমান যাচাই শেষ হওয়া পর্যন্ত অপেক্ষা
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.queue or self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.error(f"Admission drain সময় পেরিয়েছে — {len(self.queue)}টি সারিতে বাকি")
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def depth(self):
+        with self._cond:
+            return len(self.queue)
+
+    def stats(self):
+        with self._cond:
+            return {"limits": dict(self.limits), "queued": len(self.queue), "chats": len(self.chat_buckets),
+                    **dict(self.counts)}
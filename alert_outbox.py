@@ -0,0 +1,284 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import metrics
+from rate_limit import TokenBucket
+
+# =====================================================
+# 📢 ALERT OUTBOX (durable queue + rate-limited dispatcher)
+# =====================================================
+# আগে send_alert Streamlit রিকোয়েস্টের ভেতরেই requests.post করত — Telegram ধীর হলে
+# অ্যাডমিন UI আটকে যেত, ব্যর্থ হলে অ্যালার্ট হারিয়ে যেত। এখন:
+# - enqueue() শুধু alerts_outbox-এ row লেখে (প্রতি চ্যানেলে একটা), সাথে সাথে ফেরত
+# - ব্যাকগ্রাউন্ড dispatcher একটা pooled Session দিয়ে পাঠায়
+# - Telegram-এর সীমা মানে: সব মিলিয়ে ~৩০/সেকেন্ড, প্রতি চ্যাটে ১/সেকেন্ড, গ্রুপে ২০/মিনিট
+# - ব্যর্থ হলে exponential backoff, 429 হলে retry_after যতক্ষণ বলে ততক্ষণ অপেক্ষা
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+CHAT_IDS = [c.strip() for c in os.getenv("ALERT_CHAT_IDS", "").split(",") if c.strip()]
+
+GLOBAL_RATE = 30.0         # মেসেজ/সেকেন্ড, সব চ্যাট মিলিয়ে
+PRIVATE_CHAT_RATE = 1.0    # মেসেজ/সেকেন্ড, একই চ্যাটে
+GROUP_CHAT_RATE = 20 / 60  # গ্রুপ/চ্যানেলে (negative chat_id)
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 2.0         # সেকেন্ড, প্রতিবার দ্বিগুণ
+BACKOFF_MAX = 300.0
+LEASE_SECONDS = 60         # পাঠানোর সময় row লক; প্রসেস মরে গেলে পরে আবার চেষ্টা
+IDLE_SLEEP = 0.5
+
+_conn = None
+_lock = threading.Lock()
+
+
+def configure(bot_token=None, chat_ids=None):
+    global BOT_TOKEN, CHAT_IDS
+    if bot_token:
+        BOT_TOKEN = bot_token
+    if chat_ids:
+        CHAT_IDS = [str(c).strip() for c in chat_ids if str(c).strip()]
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10)
+        _conn.execute("PRAGMA journal_mode=WAL;")
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alerts_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                parse_mode TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_alerts_outbox_due
+                ON alerts_outbox(next_attempt_at) WHERE status = 'pending';
+            CREATE INDEX IF NOT EXISTS idx_alerts_outbox_chat
+                ON alerts_outbox(chat_id, id) WHERE status = 'pending';
+            CREATE INDEX IF NOT EXISTS idx_alerts_outbox_sent
+                ON alerts_outbox(sent_at) WHERE status = 'sent';
+        """)
+        _conn.commit()
+    return _conn
+
+
+def enqueue(text, chat_ids=None, parse_mode="HTML"):
+    # প্রতিটা চ্যানেলের জন্য আলাদা row — একটা চ্যানেল ব্যর্থ হলে বাকিগুলো আটকায় না
+    chat_ids = [str(c) for c in (chat_ids or CHAT_IDS)]
+    if not chat_ids:
+        logging.error("Alert enqueue ব্যর্থ: কোনো chat_id নেই")
+        return 0
+    now = time.time()
+    try:
+        with _lock, metrics.DB_QUERY.time("insert", "alerts_outbox"):
+            conn = _get_conn()
+            conn.executemany("""
+                INSERT INTO alerts_outbox (chat_id, text, parse_mode, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(c, text, parse_mode, now, now) for c in chat_ids])
+            conn.commit()
+        _wake.set()
+        return len(chat_ids)
+    except Exception as e:
+        logging.error(f"Alert enqueue ব্যর্থ: {e}")
+        return 0
+
+
+def pending_count():
+    with _lock:
+        return _get_conn().execute("SELECT COUNT(*) FROM alerts_outbox WHERE status = 'pending'").fetchone()[0]
+
+
+def stats(window=100):
+    with _lock:
+        conn = _get_conn()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM alerts_outbox GROUP BY status").fetchall())
+        oldest = conn.execute("SELECT MIN(created_at) FROM alerts_outbox WHERE status = 'pending'").fetchone()[0]
+        latencies = [r[0] for r in conn.execute("""
+            SELECT sent_at - created_at FROM alerts_outbox
+            WHERE status = 'sent' ORDER BY sent_at DESC LIMIT ?
+        """, (window,))]
+    latencies.sort()
+    return {
+        "pending": counts.get("pending", 0),
+        "sent": counts.get("sent", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_pending_age": time.time() - oldest if oldest else 0.0,
+        "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+        "latency_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+    }
+
+
+# =====================================================
+# 🚚 DISPATCHER (ব্যাকগ্রাউন্ড থ্রেড)
+# =====================================================
+_wake = threading.Event()
+
+
+class Dispatcher:
+    def __init__(self, session=None, global_rate=GLOBAL_RATE):
+        if session is None:
+            import requests  # app.py-র cold start-এ নয় — প্রথম dispatcher চালু হলে
+            session = requests.Session()
+        self.session = session
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.chat_buckets = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        # gauge শুধু যে প্রসেসে dispatcher চলে সেখানে — import করলেই data.db খুলে COUNT(*) নয়
+        metrics.QUEUE_DEPTH.track(pending_count, "alert_outbox")
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name="alert-dispatcher", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        _wake.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _bucket(self, chat_id):
+        if chat_id not in self.chat_buckets:
+            rate = GROUP_CHAT_RATE if chat_id.startswith("-") else PRIVATE_CHAT_RATE
+            self.chat_buckets[chat_id] = TokenBucket(rate)
+        return self.chat_buckets[chat_id]
+
+    def _due(self, limit=100):
+        # প্রতি চ্যাটের সবচেয়ে পুরোনো pending অ্যালার্টটাই — retry চললেও চ্যাটে ক্রম ঠিক থাকে
+        with _lock, metrics.DB_QUERY.time("fetch", "alerts_outbox"):
+            return _get_conn().execute("""
+                SELECT id, chat_id, text, parse_mode, attempts FROM alerts_outbox a
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM alerts_outbox o
+                      WHERE o.status = 'pending' AND o.chat_id = a.chat_id AND o.id < a.id
+                  )
+                ORDER BY next_attempt_at, id LIMIT ?
+            """, (time.time(), limit)).fetchall()
+
+    def _claim(self, alert_id):
+        # অন্য কোনো dispatcher (আরেকটা প্রসেস) আগে নিয়ে নিলে rowcount 0
+        now = time.time()
+        with _lock, metrics.DB_QUERY.time("update", "alerts_outbox"):
+            conn = _get_conn()
+            cur = conn.execute("""
+                UPDATE alerts_outbox SET next_attempt_at = ?
+                WHERE id = ? AND status = 'pending' AND next_attempt_at <= ?
+            """, (now + LEASE_SECONDS, alert_id, now))
+            conn.commit()
+        return cur.rowcount == 1
+
+    def _finish(self, alert_id, status, attempts, next_attempt_at=None, error=None):
+        with _lock, metrics.DB_QUERY.time("update", "alerts_outbox"):
+            conn = _get_conn()
+            conn.execute("""
+                UPDATE alerts_outbox
+                SET status = ?, attempts = ?, next_attempt_at = COALESCE(?, next_attempt_at),
+                    sent_at = CASE WHEN ? = 'sent' THEN ? ELSE sent_at END, last_error = ?
+                WHERE id = ?
+            """, (status, attempts, next_attempt_at, status, time.time(), error, alert_id))
+            conn.commit()
+
+    def _send(self, chat_id, text, parse_mode):
+        url = f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/sendMessage"
+        payload = {"chat_id": chat_id, "text": text}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        return self.session.post(url, data=payload, timeout=10)
+
+    def _deliver(self, row):
+        alert_id, chat_id, text, parse_mode, attempts = row
+        attempts += 1
+        started = time.perf_counter()
+        try:
+            res = self._send(chat_id, text, parse_mode)
+            metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "alert_outbox",
+                                          "ok" if res.status_code == 200 else "ratelimited" if res.status_code == 429 else "error")
+            if res.status_code == 200:
+                self._finish(alert_id, "sent", attempts)
+                return
+            body = res.json() if "json" in res.headers.get("Content-Type", "") else {}
+            retry_after = (body.get("parameters") or {}).get("retry_after")
+            error = f"{res.status_code}: {body.get('description', res.text[:200])}"
+        except Exception as e:
+            metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "alert_outbox", "error")
+            res, retry_after, error = None, None, str(e)
+
+        if retry_after:
+            # 429 — Telegram যতক্ষণ বলে ততক্ষণ এই চ্যাটে আর কিছু না
+            self._bucket(chat_id).block(float(retry_after))
+            delay = float(retry_after)
+            attempts -= 1  # rate limit-কে ব্যর্থতা ধরা হয় না
+        else:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+        permanent = res is not None and res.status_code in (400, 401, 403)  # ভুল chat_id/টোকেন
+        if permanent or attempts >= MAX_ATTEMPTS:
+            logging.error(f"Telegram alert ব্যর্থ (#{alert_id}, {chat_id}): {error}")
+            self._finish(alert_id, "failed", attempts, error=error)
+        else:
+            logging.warning(f"Telegram alert আবার চেষ্টা হবে {delay:.0f}s পরে (#{alert_id}): {error}")
+            self._finish(alert_id, "pending", attempts, time.time() + delay, error)
+
+    def run_once(self):
+        # যা due আর যার rate limit খালি, সেগুলো পাঠায়; পরের চেষ্টার আগে কতক্ষণ ঘুমানো যায় ফেরত দেয়
+        sleep_for = IDLE_SLEEP
+        for row in self._due():
+            chat_bucket = self._bucket(row[1])
+            wait = max(self.global_bucket.wait_time(), chat_bucket.wait_time())
+            if wait > 0:
+                sleep_for = min(sleep_for, wait)
+                continue
+            if not self._claim(row[0]):
+                continue
+            self.global_bucket.take()
+            chat_bucket.take()
+            self._deliver(row)
+            sleep_for = 0.0
+        return sleep_for
+
+    def run(self):
+        logging.info("📢 Alert dispatcher চালু হয়েছে।")
+        while not self.stop_event.is_set():
+            try:
+                sleep_for = self.run_once()
+            except Exception as e:
+                logging.error(f"Alert dispatcher ত্রুটি: {e}")
+                sleep_for = 2.0
+            if sleep_for > 0:
+                _wake.wait(timeout=sleep_for)
+                _wake.clear()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def start_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = Dispatcher()
+        return _dispatcher.start()
+
+
+if __name__ == "__main__":
+    # আলাদা প্রসেসে চালাতে: BOT_TOKEN=... python alert_outbox.py
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    dispatcher = Dispatcher()
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        pass
@@ -1,16 +1,25 @@
+import startup_timing # 👈 cold start-এর ধাপগুলোর সময় (সবার আগে import)
 import streamlit as st
-import pandas as pd
-import requests
-import google.generativeai as genai
-import json
-import re
 import logging
 import os
+import time
 from datetime import datetime
-import matplotlib.pyplot as plt # 👈 চার্ট লাইব্রেরি
-from fpdf import FPDF # 👈 PDF লাইব্রেরি
-import sqlite3 # 👈 তোমার ফাইনাল SQLite ইম্পোর্ট
-import shutil # 👈 তোমার ব্যাকআপ ইম্পোর্ট
+import report_render # 👈 চার্ট + PDF রেন্ডারিং (আলাদা প্রসেসে, মেমোরিতে)
+import storage # 👈 SQLite (লোকাল data.db) বা শেয়ার্ড PostgreSQL — YACHAI_DATABASE_URL দিয়ে
+import db_backup # 👈 অনলাইন ব্যাকআপ (SQLite backup API + gzip + retention)
+import verdict_cache # 👈 একই দাবির জন্য বারবার Gemini কল এড়াতে
+import claim_index # 👈 অনুরূপ (near-duplicate) দাবি খোঁজার জন্য
+import review_queue # 👈 priority রিভিউ কিউ + রিভিউয়ার লিজ + ক্লাস্টার ট্যাগ
+import gemini_analysis # 👈 Gemini প্রম্পট + JSON পার্সিং (বট আর CLI-ও এটা ব্যবহার করে)
+import report_rollup # 👈 দিন/ভার্ডিক্ট/স্কোর-বাকেট rollup (Analytics পেজ)
+import report_archive # 👈 পুরোনো যাচাইকৃত রিপোর্টের Parquet আর্কাইভ (DuckDB দিয়ে পড়া)
+import model_router # 👈 মডেল latency/circuit breaker পরিসংখ্যান
+import verify_service # 👈 single-flight যাচাই সার্ভিস (পোর্টাল + বট একই পথে)
+import metrics # 👈 ধাপভিত্তিক latency histogram (Performance পেজ)
+import alert_outbox # 👈 টেলিগ্রাম অ্যালার্ট কিউ + ব্যাকগ্রাউন্ড পাঠানো
+import lottie_assets # 👈 লোকাল Lottie JSON (নেটওয়ার্ক ছাড়াই)
+# pandas আর requests ভারী — শুধু যে ফাংশনে লাগে সেখানেই import (অ্যাডমিন/টেলিগ্রাম পথ)
+startup_timing.mark("imports")
 
 # --- 1. পেজ কনফিগারেশন এবং লগিং সেটআপ ---
 st.set_page_config(page_title="YachaiFactBot - তথ্য যাচাই প্ল্যাটফর্ম", page_icon="🧠", layout="wide")
@@ -82,72 +91,128 @@ GEMINI_API_KEY = st.secrets.get("GEMINI_API_KEY", "YOUR_GEMINI_KEY")
 BOT_TOKEN = st.secrets.get("bot_token", "YOUR_BOT_TOKEN") # <-- ⚠️⚠️⚠️ এখানে তোমার নতুন (রিভোক করা) টোকেনটি secrets.toml ফাইলে রাখো
 CHAT_ID = st.secrets.get("chat_id", "YOUR_CHAT_ID")
 ADMIN_PASS = st.secrets.get("ADMIN_PASS", "demo123")
+gemini_analysis.configure(GEMINI_API_KEY)
 
 
 # =====================================================
 # 🧱 DATABASE LAYER (তোমার ফাইনাল ফিক্সড SQLite সিস্টেম v5.8)
 # =====================================================
 DB_PATH = "data.db"  # File stored permanently
+PAGE_SIZE = 50  # অ্যাডমিন টেবিলে প্রতি পৃষ্ঠায় কয়টা রিপোর্ট
+REPORT_COLUMNS = "id, timestamp, text, score, verdict, justification, final_verdict, updated_at, source"
 
-# Always keep one live connection for Streamlit session
+def get_storage():
+    # প্রতি প্রসেসে একটাই storage (SQLite: writer থ্রেড + read পুল, PostgreSQL: connection pool)
+    return storage.get_storage(DB_PATH)  # YACHAI_DATABASE_URL থাকলে PostgreSQL, না হলে data.db
+
+# Initialize table once (প্রতি প্রসেসে একবার — প্রতি rerun-এ নয়)
 @st.cache_resource
-def get_db_connection():
+def init_db():
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode=WAL;")  # better concurrency
-        logging.info("✅ SQLite Connected (Persistent Mode)")
-        st.sidebar.success("🧠 Persistent Memory Active (SQLite)")
-        return conn
+        store = get_storage()  # reports + index + সার্চ + rollup — storage চালুর সময়ই তৈরি হয়
     except Exception as e:
         st.error(f"❌ Database connection failed: {e}")
         logging.error(f"DB Connect Error: {e}")
         st.stop()
+    logging.info(f"✅ {store.label} Connected")
+    st.sidebar.success(f"🧠 Persistent Memory Active ({store.label})")
+    logging.info("🧠 Table 'reports' initialized successfully.")
+    with store.reader() as conn:
+        claim_index.ensure_built(conn) # পুরোনো রিপোর্টগুলো near-duplicate index-এ তোলা
+
+def read_connection():
+    # পড়ার কানেকশন — SQLite-এ read-only পুল, PostgreSQL-এ connection pool থেকে
+    return get_storage().reader()
+
+def read_frame(sql, params=()):
+    import pandas as pd
+    # pd.read_sql_query-এর বদলে — দুই ব্যাকএন্ডেই "?" placeholder
+    columns, rows = get_storage().fetch(sql, params)
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+# --- অ্যাডমিন ড্যাশবোর্ডের জন্য ছোট ছোট indexed query (পুরো টেবিল লোড নয়) ---
+def get_reports_watermark():
+    # সর্বশেষ id আর সর্বশেষ আপডেটের সময় — দুটোই index থেকে, তাই প্রতি rerun-এ সস্তা
+    with read_connection() as conn, metrics.DB_QUERY.time("fetch", "reports"):
+        row = conn.execute(
+            "SELECT COALESCE((SELECT MAX(id) FROM reports), 0), (SELECT MAX(updated_at) FROM reports)"
+        ).fetchone()
+        return (int(row[0]), str(row[1] or ""))
+
+@st.cache_data(ttl=None, max_entries=500) # watermark বদলালে নিজে থেকেই নতুন ডেটা
+def fetch_reports_page(cursor, watermark, page_size=PAGE_SIZE):
+    # keyset pagination: cursor = আগের পৃষ্ঠার শেষ রিপোর্টের (timestamp, id)
+    with metrics.DB_QUERY.time("fetch", "reports"):
+        if cursor is None:
+            return read_frame(
+                f"SELECT {REPORT_COLUMNS} FROM reports ORDER BY timestamp DESC, id DESC LIMIT ?", (page_size,)
+            )
+        return read_frame(
+            f"SELECT {REPORT_COLUMNS} FROM reports WHERE (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (cursor[0], cursor[1], page_size),
+        )
 
-# Initialize table once
-def init_db():
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS reports (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            text TEXT,
-            score INTEGER,
-            verdict TEXT,
-            justification TEXT,
-            final_verdict TEXT
+@st.cache_data(ttl=None, max_entries=50)
+def count_reports(watermark):
+    with read_connection() as conn, metrics.DB_QUERY.time("fetch", "reports"):
+        totals = report_rollup.totals(conn) # COUNT(*) নয় — rollup থেকে, রিপোর্ট যত বাড়ুক খরচ একই
+        return totals["reports"], totals["pending"]
+
+def fetch_report_changes(last_seen_id, since):
+    # incremental refresh: শুধু নতুন রিপোর্ট আর যেগুলোর ভার্ডিক্ট বদলেছে
+    with metrics.DB_QUERY.time("fetch", "reports"):
+        if not since:  # আগে কোনো আপডেটই ছিল না
+            return read_frame(f"SELECT {REPORT_COLUMNS} FROM reports WHERE id > ? ORDER BY id DESC", (last_seen_id,))
+        return read_frame(
+            f"SELECT * FROM (SELECT {REPORT_COLUMNS} FROM reports WHERE id > ? "
+            f"UNION SELECT {REPORT_COLUMNS} FROM reports WHERE updated_at >= ?) AS changes ORDER BY id DESC",
+            (last_seen_id, since),
         )
-    """)
-    conn.commit()
-    # conn.close() - @st.cache_resource কানেকশন খোলা রাখে
-    logging.info("🧠 Table 'reports' initialized successfully.")
 
-# Insert data safely (don’t close conn!)
-def insert_report(text, score, verdict, justification):
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute("""
-        INSERT INTO reports (text, score, verdict, justification, final_verdict)
-        VALUES (?, ?, ?, ?, ?)
-    """, (text, score, verdict, justification, None))
-    conn.commit()
-    c.close() # কার্সর বন্ধ করা
-    logging.info(f"📝 Report inserted successfully: {verdict}")
-
-@st.cache_data(ttl=None, persist=True) # তোমার পার্মানেন্ট মেমোরি ক্যাশ
-def fetch_all_reports():
-    conn = get_db_connection()
-    df = pd.read_sql_query("SELECT * FROM reports ORDER BY timestamp DESC", conn)
-    # conn.close() - @st.cache_resource কানেকশন খোলা রাখে
-    return df
-
-def update_verdict(report_id, verdict):
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute("UPDATE reports SET final_verdict=? WHERE id=?", (verdict, report_id))
-    conn.commit()
-    c.close() # কার্সর বন্ধ করা
-    logging.info(f"🔄 Verdict updated for ID {report_id}: {verdict}")
+@st.cache_data(ttl=None, max_entries=50)
+def fetch_pending_reports(watermark, limit=500):
+    with metrics.DB_QUERY.time("fetch", "reports"):
+        return read_frame(
+            f"SELECT {REPORT_COLUMNS} FROM reports WHERE final_verdict IS NULL ORDER BY id DESC LIMIT ?", (limit,)
+        )
+
+@st.cache_data(ttl=None, max_entries=200)
+def search_reports(query, verdict, date_from, date_to, watermark, limit=20):
+    results = get_storage().search(query, verdict, date_from, date_to, limit=limit) # SQLite FTS5 / PostgreSQL ILIKE
+    if len(results) < limit:
+        # লাইভে কম পেলে আর্কাইভ থেকেও (পুরোনো রিপোর্ট, id ছোট — তাই পরে)
+        try:
+            results += report_archive.search(get_storage(), query, verdict, date_from, date_to, limit=limit - len(results))
+        except Exception as e:
+            logging.error(f"আর্কাইভ সার্চ ব্যর্থ: {e}")
+    return results
+
+@st.cache_data(ttl=None, max_entries=50)
+def sync_review_clusters(watermark):
+    # নতুন পেন্ডিং রিপোর্টগুলো ক্লাস্টারে — watermark বদলালে একবার
+    return review_queue.sync_clusters(get_storage())
+
+def review_items(reviewer):
+    # নিজের চলমান লিজ; শেষ হয়ে গেলে কিউর উপর থেকে নতুন batch
+    store = get_storage()
+    with metrics.DB_QUERY.time("fetch", "review_queue"):
+        items = review_queue.leased(store, reviewer)
+    if not items:
+        with metrics.DB_QUERY.time("update", "review_queue"):
+            items = review_queue.claim(store, reviewer)
+    return items
+
+def update_verdict(report_ids, verdict, reviewer):
+    # এক বা একাধিক (ক্লাস্টার) রিপোর্ট এক ট্রানজ্যাকশনে; অন্য রিভিউয়ারের লিজে থাকাগুলো বাদ
+    with metrics.DB_QUERY.time("update", "reports"):
+        rows = review_queue.tag(get_storage(), report_ids, verdict, reviewer) # SQLite-এ অন্য লেখার সাথে group commit
+    for report_id, text, score, ai_verdict, justification in rows:
+        # অ্যাডমিনের সিদ্ধান্ত ক্যাশে বসানো, যাতে পরের একই দাবিতে সেটাই দেখায়
+        verdict_cache.record_final_verdict(
+            text, verdict, {"score": score, "verdict": ai_verdict, "justification": justification}
+        )
+    logging.info(f"🔄 Verdict updated by {reviewer} for IDs {[r[0] for r in rows]}: {verdict}")
+    return [r[0] for r in rows]
 
 # Initialize database
 try:
@@ -156,73 +221,29 @@ except Exception as e:
     st.error(f"❌ Database initialization error: {e}")
     logging.error(e)
     st.stop()
+startup_timing.mark("db_init")
 
 
 # =====================================================
-# 🔍 HELPER FUNCTIONS (জেসন)
+# 📢 TELEGRAM ALERT (আসল বট)
 # =====================================================
-def safe_parse_json(text):
-    try:
-        t = re.sub(r"^```json", "", text, flags=re.I).strip()
-        t = re.sub(r"```$", "", t).strip()
-        m = re.search(r"(\{.*\})", t, flags=re.S)
-        if m:
-            t = m.group(1)
-        return json.loads(t)
-    except Exception as e:
-        logging.error(f"JSON Parse Error: {e}")
-        return None
+# chat_id-তে কমা দিয়ে একাধিক চ্যানেল দেওয়া যায় — প্রতিটাতে আলাদাভাবে যায়
+alert_outbox.configure(BOT_TOKEN, str(CHAT_ID).split(","))
 
-# =====================================================
-# 🧠 AI ANALYSIS (আসল Gemini)
-# =====================================================
-def get_gemini_analysis(text_to_analyze):
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        models_to_try = ['gemini-2.5-flash', 'gemini-1.5-flash-latest']
-
-        prompt = f"""
-        তুমি 'যাচাই' নামের একজন AI ফ্যাক্ট-চেকার।
-        নিচের টেক্সট বিশ্লেষণ করো: "{text_to_analyze}"
-        শুধু JSON আকারে উত্তর দাও:
-        {{
-          "score": [০-১০০],
-          "verdict": ["সত্য", "সম্ভবত সত্য", "বিভ্রান্তিকর", "সম্ভবত মিথ্যা", "মিথ্যা"],
-          "justification": "[বাংলায় সংক্ষিপ্ত ব্যাখ্যা]"
-        }}
-        """
-
-        for model_name in models_to_try:
-            try:
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt)
-                analysis = safe_parse_json(response.text)
-                if analysis:
-                    analysis["score"] = int(float(analysis.get("score", 0)))
-                    return analysis
-            except Exception as e:
-                logging.warning(f"{model_name} ব্যর্থ: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"Gemini error: {e}")
-        return None
+@st.cache_resource
+def get_alert_dispatcher():
+    # প্রতি সার্ভার প্রসেসে একটাই ব্যাকগ্রাউন্ড থ্রেড
+    return alert_outbox.start_dispatcher()
+
+get_alert_dispatcher()  # আগের রানে জমে থাকা অ্যালার্টও পাঠানো শুরু
 
-# =====================================================
-# 📢 TELEGRAM ALERT (আসল বট)
-# =====================================================
 def send_alert(message):
-    try:
-        # === 🐞 বাগ ফিক্স (v6.2): https:// যোগ করা হয়েছে ===
-        url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {"chat_id": CHAT_ID, "text": message, "parse_mode": "HTML"} # HTML পার্স মোড
-        res = requests.post(url, data=payload, timeout=10)
-        return res.status_code == 200
-    except Exception as e:
-        logging.error(f"Telegram alert ব্যর্থ: {e}")
-        return False
+    # সরাসরি পাঠানো নয় — alerts_outbox-এ রাখা হয়, dispatcher rate limit মেনে পাঠায়
+    return alert_outbox.enqueue(message, parse_mode="HTML") > 0
 
 @st.cache_data(ttl=300) # ৫ মিনিটের জন্য কানেকশন স্ট্যাটাস ক্যাশ করা
 def check_telegram_connection():
+    import requests
     if not BOT_TOKEN or BOT_TOKEN == "YOUR_BOT_TOKEN":
         st.sidebar.error("❌ Telegram Token নেই।")
         return False
@@ -245,29 +266,67 @@ def check_telegram_connection():
 # 💾 তোমার নতুন ব্যাকআপ ফাংশন (v5.6)
 # =====================================================
 def backup_database():
-    try:
-        shutil.copyfile("data.db", f"backup_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
-        st.sidebar.info("💾 Backup created successfully!")
-    except Exception as e:
-        st.sidebar.error(f"Backup failed: {e}")
+    # ব্যাকগ্রাউন্ড থ্রেডে চলে — UI আটকায় না, অগ্রগতি backup_status-এ
+    if get_storage().name != "sqlite":
+        st.sidebar.info("💾 PostgreSQL-এর ব্যাকআপ সার্ভারেই (pg_dump / managed snapshot) — এখানে শুধু SQLite।")
+        return None
+    job = db_backup.start_backup(DB_PATH)
+    st.sidebar.info("💾 Backup শুরু হয়েছে…")
+    return job
+
+@st.fragment(run_every=1)
+def backup_progress():
+    # শুধু ব্যাকআপ চলার সময় দেখানো হয়, প্রতি সেকেন্ডে নিজে থেকে রিফ্রেশ
+    job = db_backup.current_job()
+    if not job.running:
+        st.rerun()  # শেষ — পুরো পেজ একবার রিফ্রেশ করে ফলাফল দেখানো
+    label = {"copy": f"কপি হচ্ছে ({job.done_pages}/{job.total_pages} পেজ)", "compress": "কমপ্রেস হচ্ছে", "verify": "রিস্টোর যাচাই হচ্ছে"}.get(job.phase, job.phase)
+    st.progress(job.fraction, text=f"💾 {label}")
+
+def backup_status():
+    import pandas as pd
+    job = db_backup.current_job()
+    if job is None:
+        pass
+    elif job.running:
+        backup_progress()
+    elif job.error:
+        st.error(f"Backup failed: {job.error}")
+    elif job.result:
+        r = job.result
+        mark = "✅" if r["verified"] else "❌ যাচাই ব্যর্থ —"
+        st.success(f"{mark} {r['file']} — {r['raw_bytes'] / 1e6:.1f} MB → {r['bytes'] / 1e6:.1f} MB, {r['total_seconds']:.1f}s")
+        if job.removed:
+            st.caption(f"🗑️ retention: {len(job.removed)}টি পুরোনো ব্যাকআপ মুছে ফেলা হয়েছে")
+    backups = db_backup.list_backups()
+    if backups:
+        with st.expander(f"💾 ব্যাকআপ ({len(backups)})", expanded=False):
+            st.dataframe(pd.DataFrame([{
+                "file": b["file"],
+                "MB": round(b.get("bytes", 0) / 1e6, 2),
+                "seconds": b.get("total_seconds"),
+                "verified": b.get("verified"),
+            } for b in backups]), use_container_width=True, hide_index=True)
 
 
 # =====================================================
-# 🎨 ANIMATIONS (লটি লোডার)
+# 🖨️ REPORT RENDERER (চার্ট + PDF)
 # =====================================================
-@st.cache_data
-def load_lottie_url(url):
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None # লোড ফেইল হলে অ্যাপ যেন ক্র্যাশ না করে
+@st.cache_resource
+def get_renderer():
+    # সব সেশনের জন্য একটাই process pool আর ক্যাশ
+    return report_render.ReportRenderer()
+
 
-lottie_loading = load_lottie_url("https://assets9.lottiefiles.com/packages/lf20_qp1q7mct.json")
-lottie_success = load_lottie_url("https://assets2.lottiefiles.com/packages/lf20_mq9m0vpg.json")
-lottie_alert = load_lottie_url("https://assets1.lottiefiles.com/packages/lf20_jtbfg2nb.json")
+# =====================================================
+# 🎨 ANIMATIONS (লটি লোডার)
+# =====================================================
+# আগে এখানে তিনটা নেটওয়ার্ক কল ছিল (প্রতিটায় ১০ সেকেন্ড পর্যন্ত) — এখন লোকাল ফাইল
+if os.getenv("LOTTIE_REFRESH") == "1":
+    lottie_assets.refresh_in_background()
+lottie_loading = lottie_assets.load_lottie("loading")
+lottie_success = lottie_assets.load_lottie("success")
+lottie_alert = lottie_assets.load_lottie("alert")
 
 # =====================================================
 # 🧭 NAVIGATION (সাইডবার)
@@ -280,10 +339,10 @@ except:
 
 st.sidebar.markdown("### 🤖 YachaiFactBot")
 st.sidebar.markdown("_Uncover the truth, one fact at a time._")
-# st.sidebar.success("🧠 Persistent Memory Active (SQLite)") # এই লাইনটি get_db_connection() ফাংশনে মুভ করা হয়েছে
+# st.sidebar.success("🧠 Persistent Memory Active (SQLite)") # এই লাইনটি get_storage() ফাংশনে মুভ করা হয়েছে
 st.sidebar.markdown("---")
 
-page = st.sidebar.radio("নেভিগেশন", ["🔍 নাগরিক পোর্টাল", "🧑‍💼 অ্যাডমিন প্যানেল"])
+page = st.sidebar.radio("নেভিগেশন", ["🔍 নাগরিক পোর্টাল", "🧑‍💼 অ্যাডমিন প্যানেল", "📈 Analytics", "📊 Performance"])
 st.sidebar.markdown("---")
 
 
@@ -309,100 +368,105 @@ if page == "🔍 নাগরিক পোর্টাল":
         if not input_text:
             st.warning("⚠️ অনুগ্রহ করে কিছু লিখুন।")
         else:
-            with st.spinner("🤖 AI যাচাই চলছে..."):
-                # --- আসল AI কল (র‍্যান্ডম নয়) ---
-                result = get_gemini_analysis(input_text)
+            # --- Gemini-র উত্তর stream হওয়ার সাথে সাথে আংশিক ফলাফল (পুরোটার অপেক্ষা নয়) ---
+            live = st.empty()
+            shown_at = [0.0]
+
+            def show_partial(partial):
+                if time.monotonic() - shown_at[0] < 0.15:  # প্রতি টুকরোয় নয় — ব্রাউজারে অত ঘন আপডেট লাগে না
+                    return
+                shown_at[0] = time.monotonic()
+                head = f"**{partial['verdict']}**" if partial.get("verdict") else "বিশ্লেষণ আসছে"
+                if partial.get("score") is not None:
+                    head += f" ({partial['score']}% সন্দেহজনক)"
+                live.info(f"⏳ {head}\n\n💬 {partial.get('justification', '')}▌")
 
-            if result:
+            with st.spinner("🤖 AI যাচাই চলছে..."):
+                # --- আসল AI কল (র‍্যান্ডম নয়) ---
+                # ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → Gemini, আর একই দাবি একসাথে অনেকে পাঠালে
+                # একটাই মডেল কল — সব verify_service-এ; রিপোর্টও সেখানেই সেভ হয় (stream শেষ হলে)
+                try:
+                    result = verify_service.verify(input_text, source="portal", on_partial=show_partial)
+                except Exception as e:
+                    logging.error(f"যাচাই ব্যর্থ: {e}")
+                    result = None
+            live.empty()
+
+            if result and "score" in result:
                 # --- আসল ফলাফল ---
-                score = result.get("score", 0) # Suspicion Score
-                truth_score = 100 - score
-                verdict = result.get("verdict", "N/A")
+                score = int(result.get("score", 0)) # Suspicion Score
+                final_verdict = result.get("final_verdict")
                 justification = result.get("justification", "N/A")
 
-                # --- আসল ডেটাবেসে সেভ ---
-                insert_report(input_text, score, verdict, justification)
+                report_id = result["report_id"]
 
-                # --- ফলাফল প্রদর্শন ---
-                if score > 75:
-                    st.error(f"❌ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
-                elif score > 50:
-                    st.warning(f"⚠️ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
-                else:
-                    st.success(f"✅ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
-
-                # --- তোমার নতুন matplotlib চার্ট ---
-                st.write("### 📊 AI Confidence Meter")
-                data = pd.DataFrame({'Category':['Truth Probability','Misinformation Probability'],'Score':[truth_score,score]})
-                fig, ax = plt.subplots(figsize=(5,3))
-                ax.bar(data['Category'], data['Score'], color=['#00bfff','#ff4d4d'])
-                ax.set_ylim(0,100)
-                ax.set_ylabel('Confidence %')
-                ax.set_title('AI Confidence Meter', color='#1d3557') # <-- হেডার কালার
-                ax.tick_params(colors='#111') # <-- টেক্সট কালার
-                fig.patch.set_alpha(0) # চার্টের الخلفية স্বচ্ছ করা
-                ax.set_facecolor('none') # অক্ষের الخلفية স্বচ্ছ করা
-                st.pyplot(fig)
-                chart_path = "chart.png"
-                # === 2. তোমার নতুন Sharp চার্ট ===
-                fig.savefig(chart_path, transparent=True, bbox_inches='tight', dpi=200)
-
-
-                # --- তোমার নতুন AI ব্যাখ্যা (আসল জাস্টিফিকেশন) ---
-                st.info(f"**💬 AI ব্যাখ্যা:** {justification}")
-                st.success("✅ রিপোর্টটি আমাদের ডেটাবেসে সংরক্ষিত হয়েছে।")
-
-                # --- তোমার নতুন PDF রিপোর্ট (আসল ডেটা সহ) ---
-                if st.button("📄 Save Visual Report (PDF)"):
-                    pdf = FPDF()
-                    pdf.add_page()
-                    
-                    # বাংলা ফন্ট যোগ করা (গুরুত্বপূর্ণ)
-                    try:
-                        pdf.add_font('Bangla', '', 'SolaimanLipi.ttf', uni=True)
-                        pdf.set_font('Bangla', '', 12)
-                    except RuntimeError:
-                        st.error("❌ PDF বানাতে সমস্যা: `SolaimanLipi.ttf` ফন্ট ফাইলটি পাওয়া যায়নি।")
-                        st.stop()
-
-                    pdf.set_font('Bangla', 'B', 16)
-                    pdf.cell(0, 10, txt="YachaiFactBot - AI Verification Report", ln=True, align='C')
-                    
-                    pdf.set_font('Bangla', '', 12)
-                    pdf.multi_cell(0, 10, txt=f"\nUser Query:\n{input_text}")
-                    pdf.cell(0, 10, txt=f"\nSuspicion Score: {score}%", ln=True)
-                    pdf.cell(0, 10, txt=f"Truth Probability: {truth_score}%", ln=True)
-                    pdf.multi_cell(0, 10, txt=f"\nAI Explanation:\n{justification}")
-                    
-                    # === 3. PDF-এ Gemini মডেলের নাম ===
-                    pdf.cell(0, 10, txt="Model: Gemini-2.5 Flash (Pro API)", ln=True)
-                    pdf.ln(5) # একটু গ্যাপ
-                    
-                    try:
-                        pdf.image("yachai_logo.png", x=160, y=10, w=30)
-                    except:
-                        pass # লোগো না থাকলে সমস্যা নেই
-                    
-                    pdf.image(chart_path, x=40, y=pdf.get_y() + 5, w=130)
-                    pdf.set_y(pdf.get_y() + 80) # চার্টের নিচে কার্সর আনা
-
-                    # === 1. PDF-এ টিমের নাম ===
-                    pdf.set_font('Bangla', 'B', 12)
-                    pdf.cell(0, 10, txt="Developed by Team Believer 💡", ln=True, align='C')
-
-                    pdf_file_path = "Yachai_Report_Visual.pdf"
-                    pdf.output(pdf_file_path)
-
-                    with open(pdf_file_path, "rb") as file:
-                        st.download_button("⬇️ Download Visual Report (PDF)", file, pdf_file_path, "application/pdf")
+                # rerun-এর পরেও (যেমন PDF বাটনে ক্লিক) ফলাফল দেখানোর জন্য session-এ রাখা
+                st.session_state["portal_report"] = {
+                    "id": report_id, "text": input_text, "score": score, "verdict": result.get("verdict", "N/A"),
+                    "justification": justification, "final_verdict": final_verdict, "similarity": result.get("similarity"),
+                    "claims": result.get("claims"),
+                }
             else:
-                st.error("❌ AI সেবাটি এই মুহূর্তে পাওয়া যাচ্ছে না। অনুগ্রহ করে কিছুক্ষণ পর আবার চেষ্টা করুন।")
+                st.session_state.pop("portal_report", None)
+                st.error("❌ AI সেবাটি এই মুহূর্তে পাওয়া যাচ্ছে না। অনুগ্রহ করে কিছুক্ষণ পর আবার চেষ্টা করুন।")
+
+    report = st.session_state.get("portal_report")
+    if report:
+        score = report["score"]
+        final_verdict = report["final_verdict"]
+        verdict = final_verdict or report["verdict"] # অ্যাডমিনের সিদ্ধান্ত আগে
+        justification = report["justification"]
+
+        if final_verdict and report["similarity"] is not None:
+            st.info(f"🧑‍💼 এর সাথে অনুরূপ একটি দাবি ({report['similarity'] * 100:.0f}% মিল) আগেই আমাদের ফ্যাক্ট-চেকাররা যাচাই করেছেন।")
+        elif final_verdict:
+            st.info("🧑‍💼 এই দাবিটি আগেই আমাদের ফ্যাক্ট-চেকাররা যাচাই করেছেন।")
+
+        # --- ফলাফল প্রদর্শন ---
+        if score > 75:
+            st.error(f"❌ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
+        elif score > 50:
+            st.warning(f"⚠️ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
+        else:
+            st.success(f"✅ **ভার্ডিক্ট:** {verdict} ({score}% সন্দেহজনক)")
+
+        # --- matplotlib চার্ট (worker প্রসেসে আঁকা PNG, স্কোর ধরে ক্যাশ) ---
+        st.write("### 📊 AI Confidence Meter")
+        renderer = get_renderer()
+        chart_png = renderer.chart(report).result()
+        st.image(chart_png, width=500)
+
+        # --- তোমার নতুন AI ব্যাখ্যা (আসল জাস্টিফিকেশন) ---
+        st.info(f"**💬 AI ব্যাখ্যা:** {justification}")
+
+        # --- লম্বা পোস্ট: প্রতিটা দাবির আলাদা ফলাফল (claim_extraction) ---
+        if report.get("claims"):
+            import pandas as pd
+            origin_labels = {"model": "🤖 নতুন যাচাই", "cache": "♻️ আগের ফলাফল", "reviewed": "🧑‍💼 ফ্যাক্ট-চেকার",
+                             "report": "📚 অনুরূপ রিপোর্ট", "skipped": "⏭️ বাজেট শেষ", "failed": "❌ ব্যর্থ"}
+            with st.expander(f"🧩 দাবি অনুযায়ী বিশ্লেষণ ({len(report['claims'])}টি দাবি)", expanded=True):
+                st.dataframe(pd.DataFrame([{
+                    "দাবি": c["claim"],
+                    "ভার্ডিক্ট": c.get("final_verdict") or c.get("verdict") or "—",
+                    "স্কোর": c.get("score"),
+                    "উৎস": origin_labels.get(c.get("origin"), c.get("origin")),
+                } for c in report["claims"]]), use_container_width=True, hide_index=True)
+        st.success("✅ রিপোর্টটি আমাদের ডেটাবেসে সংরক্ষিত হয়েছে।")
+
+        # --- PDF রিপোর্ট (মেমোরিতে, report id ধরে ক্যাশ — শেয়ার্ড ফাইল নেই) ---
+        if st.button("📄 Save Visual Report (PDF)"):
+            try:
+                with st.spinner("📄 PDF তৈরি হচ্ছে..."):
+                    pdf_bytes = renderer.pdf(report, chart_png).result()
+                st.download_button("⬇️ Download Visual Report (PDF)", pdf_bytes, f"Yachai_Report_{report['id']}.pdf", "application/pdf")
+            except report_render.FontMissingError:
+                st.error(f"❌ PDF বানাতে সমস্যা: `{report_render.FONT_PATH}` ফন্ট ফাইলটি পাওয়া যায়নি।")
 
 # =====================================================
 # 🧑‍💼 Admin Panel (আমাদের পুরোনো প্যানেল)
 # =====================================================
 elif page == "🧑‍💼 অ্যাডমিন প্যানেল":
-    password = st.sidebar.text_input("🔑 অ্যাডমিন পাসওয়ার্ড", type="password")
+    password = st.sidebar.text_input("🔑 অ্যাডমিন পাসওয়ার্ড", type="password", key="admin_password")
 
     if password == ADMIN_PASS:
         st.sidebar.success("লগ-ইন সফল!")
@@ -417,15 +481,21 @@ elif page == "🧑‍💼 অ্যাডমিন প্যানেল":
             min_value=0, max_value=100, value=75, step=5
         )
         auto_send = st.sidebar.checkbox("Auto-send 'মিথ্যা' alerts", value=False)
+        # রিভিউ কিউর লিজ এই নামে — একাধিক ফ্যাক্ট-চেকার একসাথে কাজ করলে আলাদা নাম দিন
+        st.session_state.setdefault("reviewer", f"admin-{os.urandom(2).hex()}")
+        reviewer = st.sidebar.text_input("👤 রিভিউয়ারের নাম", key="reviewer").strip() or "admin"
         
         st.sidebar.markdown("---")
         with st.sidebar.expander("🧩 Secrets Debug Panel", expanded=False):
             st.write("**GEMINI_API_KEY:**", "✅ লোড হয়েছে" if GEMINI_API_KEY and "AIza" in GEMINI_API_KEY else "❌ নেই")
             st.write("**BOT_TOKEN:**", "✅ লোড হয়েছে" if BOT_TOKEN and ":" in BOT_TOKEN else "❌ নেই")
-            chat_id_check = CHAT_ID and (CHAT_ID.isdigit() or (CHAT_ID.startswith("-") and CHAT_ID[1:].isdigit()))
+            chat_id_check = CHAT_ID and all(c.strip().lstrip("-").isdigit() for c in CHAT_ID.split(","))
             st.write("**CHAT_ID:**", f"✅ {CHAT_ID}" if chat_id_check else "❌ নেই")
-            # ডিবাগ প্যানেলে ডেটাবেস স্ট্যাটাস (SQLite)
-            st.write("**DATABASE:**", "✅ SQLite (Local)")
+            # ডিবাগ প্যানেলে ডেটাবেস স্ট্যাটাস (SQLite / PostgreSQL)
+            st.write("**DATABASE:**", f"✅ {get_storage().label}")
+            archive_stats = report_archive.stats(get_storage())
+            st.write("**ARCHIVE:**", f"🗄️ {archive_stats['reports']} রিপোর্ট, {archive_stats['files']} ফাইল ({archive_stats['bytes'] / 1e6:.1f} MB)" if archive_stats["files"] else "—")
+            st.write("**COLD START:**", ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in startup_timing.summary().items()) or "—")
             
             if st.sidebar.button("📲 Test Telegram Alert (Debug)"):
                 send_alert("🧪 Debug: YachaiBot test alert — সিক্রেট যাচাই সফল!")
@@ -434,93 +504,363 @@ elif page == "🧑‍💼 অ্যাডমিন প্যানেল":
         # --- নতুন ব্যাকআপ এবং রিলোড বাটন (v5.6) ---
         col1, col2 = st.sidebar.columns(2)
         if col1.button("🔄 ডেটা রিলোড করুন"):
-            st.cache_data.clear()
-            st.rerun()
+            st.rerun() # শুধু নতুন/পরিবর্তিত রিপোর্ট আনা হয়, পুরো ক্যাশ ক্লিয়ার নয়
         if col2.button("💾 ডেটাবেস ব্যাকআপ"):
             backup_database() # তোমার নতুন ফাংশন কল
+        with st.sidebar:
+            backup_status()
         
         # --- অ্যাডমিন ড্যাশবোর্ড ---
         st.title("🧑‍💼 Admin Dashboard")
         
         try:
-            df = fetch_all_reports()
+            watermark = get_reports_watermark()
+            total_reports, pending_count = count_reports(watermark)
         except Exception as e:
             st.error(f"ডেটা লোড করতে ব্যর্থ: {e}")
             st.stop()
         
-        st.info(f"মোট রিপোর্ট: {len(df)}")
-        st.dataframe(df, use_container_width=True)
+        st.info(f"মোট রিপোর্ট: {total_reports} | পেন্ডিং: {pending_count}")
+
+        # --- incremental refresh: আগের বার দেখার পর থেকে কী বদলেছে ---
+        seen = st.session_state.get("seen_watermark")
+        if seen is not None and tuple(seen) != watermark:
+            changes = fetch_report_changes(seen[0], seen[1])
+            new_count = int((changes["id"] > seen[0]).sum())
+            st.success(f"🆕 {new_count}টি নতুন রিপোর্ট, 🔄 {len(changes) - new_count}টি আপডেট")
+            with st.expander("সর্বশেষ পরিবর্তন", expanded=False):
+                st.dataframe(changes, use_container_width=True)
+        st.session_state["seen_watermark"] = watermark
+
+        # --- ভার্ডিক্ট ক্যাশ পরিসংখ্যান ---
+        cache_stats = verdict_cache.stats()
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Cache hits", cache_stats["hits"])
+        m2.metric("Cache misses", cache_stats["misses"])
+        m3.metric("Hit rate", f"{cache_stats['hit_rate']:.1f}%")
+        m4.metric("Cached claims", cache_stats["entries"], f"{cache_stats['pinned']} admin-verified", delta_color="off")
+
+        # --- 📢 অ্যালার্ট কিউ ---
+        alert_stats = alert_outbox.stats()
+        a1, a2, a3, a4 = st.columns(4)
+        a1.metric("Alert queue", alert_stats["pending"], f"{alert_stats['oldest_pending_age']:.0f}s পুরোনো" if alert_stats["pending"] else None, delta_color="off")
+        a2.metric("Alerts sent", alert_stats["sent"])
+        a3.metric("Alerts failed", alert_stats["failed"])
+        a4.metric("Delivery p50 / p95", "—" if alert_stats["latency_p50"] is None else f"{alert_stats['latency_p50']:.1f}s / {alert_stats['latency_p95']:.1f}s")
+
+        # --- 🚦 মডেল রাউটার (latency, error rate, circuit) ---
+        with st.expander("🚦 AI মডেল স্বাস্থ্য", expanded=False):
+            import pandas as pd
+            router_stats = model_router.get_router().stats()
+            st.dataframe(pd.DataFrame(router_stats["models"]), use_container_width=True)
+            st.caption(f"Hedging: {'চালু' if router_stats['hedge'] else 'বন্ধ'} — {router_stats['hedges_started']} hedge, {router_stats['hedge_wins']} বার fallback আগে এসেছে")
+            flight = verify_service.get_verifier().stats()
+            st.caption(f"Single-flight (এই প্রসেস): {flight['requests']} অনুরোধ, {flight['coalesced']}টি একই চলমান যাচাইয়ে যুক্ত, {flight['model']} মডেল কল")
+
+        # --- keyset pagination (নতুন থেকে পুরোনো) ---
+        cursors = st.session_state.setdefault("page_cursors", [None])
+        page_df = fetch_reports_page(cursors[-1], watermark)
+        st.dataframe(page_df, use_container_width=True)
+        p1, p2, p3 = st.columns([1, 2, 1])
+        if p1.button("⬅️ নতুনতর", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+        p2.caption(f"পৃষ্ঠা {len(cursors)} / {max(1, -(-total_reports // PAGE_SIZE))}")
+        if p3.button("পুরোনোতর ➡️", disabled=len(page_df) < PAGE_SIZE):
+            last = page_df.iloc[-1]
+            cursors.append((str(last["timestamp"]), int(last["id"])))
+            st.rerun()
 
-        if len(df) > 0:
+        # --- 📄 bulk PDF এক্সপোর্ট ---
+        with st.expander("📄 PDF এক্সপোর্ট", expanded=False):
+            export_scope = st.radio("কোন রিপোর্টগুলো?", ["এই পৃষ্ঠা", "সব পেন্ডিং (সর্বোচ্চ ৫০০)"], horizontal=True, key="export_scope")
+            if st.button("PDF তৈরি করুন", key="bulk_pdf"):
+                export_df = page_df if export_scope == "এই পৃষ্ঠা" else fetch_pending_reports(watermark)
+                try:
+                    with st.spinner(f"📄 {len(export_df)}টি রিপোর্টের PDF তৈরি হচ্ছে..."):
+                        pdf_bytes = get_renderer().bulk_pdf(export_df.to_dict("records")).result()
+                    st.download_button("⬇️ Download PDF", pdf_bytes, f"Yachai_Reports_{datetime.now():%Y%m%d_%H%M}.pdf", "application/pdf")
+                except report_render.FontMissingError:
+                    st.error(f"❌ PDF বানাতে সমস্যা: `{report_render.FONT_PATH}` ফন্ট ফাইলটি পাওয়া যায়নি।")
+
+        # --- 🔎 রিপোর্ট সার্চ (FTS5) ---
+        with st.expander("🔎 রিপোর্ট খুঁজুন", expanded=False):
+            s1, s2, s3 = st.columns([3, 1, 2])
+            search_query = s1.text_input("শব্দ বা বাক্যাংশ", key="search_query")
+            search_verdict = s2.selectbox("ভার্ডিক্ট", ["সব", "সত্য", "সম্ভবত সত্য", "বিভ্রান্তিকর", "সম্ভবত মিথ্যা", "মিথ্যা"], key="search_verdict")
+            search_dates = s3.date_input("তারিখ (থেকে – পর্যন্ত)", value=(), key="search_dates")
+            if search_query.strip():
+                date_from, date_to = (search_dates[0], search_dates[-1]) if len(search_dates) else (None, None)
+                results = search_reports(
+                    search_query.strip(), None if search_verdict == "সব" else search_verdict,
+                    date_from, date_to, watermark,
+                )
+                st.caption(f"{len(results)}টি ফলাফল")
+                for r in results:
+                    mark = ("🗄️" if r.get("archived") else "") + ("🧑‍💼" if r["final_verdict"] else "🤖")
+                    st.markdown(
+                        f"**#{r['id']}** {mark} {r['final_verdict'] or r['verdict']} ({r['score']}%) — {r['timestamp']}\n\n"
+                        f"{r['text_snippet']}\n\n_{r['justification_snippet']}_"
+                    )
+
+        if total_reports > 0:
             st.subheader("✅ রিপোর্ট যাচাই করুন")
-            pending = df[df["final_verdict"].isna()]
-            if len(pending) == 0:
+            if pending_count == 0:
                 st.success("🎉 সব রিপোর্ট যাচাই সম্পন্ন!")
             else:
-                # পেন্ডিং রিপোর্টগুলো থেকে সিলেক্ট করা
-                selected_text = st.selectbox("একটি পেন্ডিং রিপোর্ট নির্বাচন করুন:", pending["text"])
-                selected_row = pending[pending["text"] == selected_text].iloc[0]
-                
-                report_id = int(selected_row["id"]) # ID ঠিকমতো নেওয়া
-                ai_score = int(selected_row["score"])
-
-                st.markdown(f"**AI ভার্ডিক্ট:** {selected_row['verdict']} ({ai_score}%)")
-                st.markdown(f"**ব্যাখ্যা:** {selected_row['justification']}")
-
-                status = st.radio("ফাইনাল ট্যাগ দিন:", ["সত্য", "বিভ্রান্তিকর", "মিথ্যা"], key=f"status_{report_id}")
-                
-                if st.button("ফাইনাল ট্যাগ করুন ✅", type="primary"):
-                    update_verdict(report_id, status)
-                    st.cache_data.clear() # ডেটা আপডেট হয়েছে, ক্যাশ ক্লিয়ার
+                # --- priority কিউ: নিজের লিজ নেওয়া রিপোর্টগুলো (শুধু পেন্ডিং partial index থেকে) ---
+                sync_review_clusters(watermark)
+                items = review_items(reviewer)
+                queue_stats = review_queue.stats(get_storage())
+                st.caption(
+                    f"🗂️ আপনার লিজে {len(items)}টি (মেয়াদ {review_queue.LEASE_SECONDS // 60} মিনিট) | "
+                    f"মোট লিজে {queue_stats['leased']}টি, {queue_stats['reviewers']} জন রিভিউয়ার | "
+                    f"⌨️ 1/2/3 = ভার্ডিক্ট, Ctrl+Enter = ট্যাগ, Ctrl+Shift+Enter = পুরো ক্লাস্টার"
+                )
+
+                # --- অনুরূপ পেন্ডিং দাবির ক্লাস্টার ---
+                pending_clusters = review_queue.top_clusters(get_storage())
+                if pending_clusters:
+                    with st.expander(f"🧩 অনুরূপ পেন্ডিং দাবির ক্লাস্টার ({len(pending_clusters)})", expanded=False):
+                        for group in pending_clusters:
+                            st.markdown(f"**{group['pending']}টি রিপোর্ট** (ক্লাস্টার #{group['cluster_id']}) — _{group['text'][:120]}_")
+
+                if not items:
+                    st.info("এই মুহূর্তে সব পেন্ডিং রিপোর্ট অন্য রিভিউয়ারদের লিজে আছে।")
+                else:
+                    # লিজ নেওয়া রিপোর্টগুলো থেকে সিলেক্ট করা — id দিয়ে, টেক্সট মিলিয়ে নয়
+                    by_id = {item["id"]: item for item in items}
+                    report_id = st.selectbox(
+                        "একটি পেন্ডিং রিপোর্ট নির্বাচন করুন:", list(by_id),
+                        format_func=lambda i: f"#{i} · {by_id[i]['score']}% · ×{by_id[i]['duplicates']} · {by_id[i]['text'][:80]}",
+                    )
+                    selected_row = by_id[report_id]
+                    ai_score = int(selected_row["score"])
+
+                    st.markdown(f"**AI ভার্ডিক্ট:** {selected_row['verdict']} ({ai_score}%)")
+                    st.markdown(f"**ব্যাখ্যা:** {selected_row['justification']}")
+
+                    members = review_queue.cluster_members(get_storage(), report_id) if selected_row["duplicates"] > 1 else []
+                    taggable = [m["id"] for m in members if m["leased_by"] in (None, reviewer)]
+                    if len(members) > 1:
+                        with st.expander(f"🧩 একই ক্লাস্টারে {len(members)}টি পেন্ডিং রিপোর্ট", expanded=False):
+                            for m in members:
+                                lock = f" 🔒 {m['leased_by']}" if m["leased_by"] not in (None, reviewer) else ""
+                                st.markdown(f"**#{m['id']}** ({m['score']}%){lock} — {m['text'][:120]}")
+
+                    verdict_options = ["সত্য", "বিভ্রান্তিকর", "মিথ্যা"]
+                    status_key = f"status_{report_id}"
+                    hot = st.columns(len(verdict_options))
+                    for n, (col, option) in enumerate(zip(hot, verdict_options), start=1):
+                        col.button(f"{n} · {option}", key=f"hot_{n}", shortcut=str(n),
+                                   on_click=st.session_state.update, kwargs={status_key: option})
+                    status = st.radio("ফাইনাল ট্যাগ দিন:", verdict_options, key=status_key)
+
+                    t1, t2 = st.columns(2)
+                    tag_one = t1.button("ফাইনাল ট্যাগ করুন ✅", type="primary", shortcut="Ctrl+Enter")
+                    tag_cluster = len(taggable) > 1 and t2.button(f"🧩 পুরো ক্লাস্টারে ট্যাগ ({len(taggable)})", shortcut="Ctrl+Shift+Enter")
+
+                    if tag_one or tag_cluster:
+                        tagged = update_verdict(taggable if tag_cluster else [report_id], status, reviewer) # updated_at বদলায়, তাই পরের rerun-এ ড্যাশবোর্ড নিজে থেকেই রিফ্রেশ
+                        if len(tagged) > 1:
+                            st.toast(f"🧩 {len(tagged)}টি রিপোর্টে '{status}' ট্যাগ হয়েছে।")
                     
-                    if status == "মিথ্যা":
-                        # অটো-সেন্ড লজিক
-                        if auto_send and ai_score >= alert_threshold:
-                            alert_msg = (
-                                f"🚨 <b>ভুয়া তথ্য শনাক্ত!</b> 🚨\n\n"
-                                f"<b>তথ্য:</b> <i>{selected_row['text']}</i>\n"
-                                f"<b>AI স্কোর:</b> {ai_score}%\n"
-                                f"<b>চূড়ান্ত সিদ্ধান্ত:</b> ❌ {status}\n\n"
-                                f"<i>#Build4Democracy #YachaiBot</i>"
-                            )
-                            if send_alert(alert_msg):
-                                st.success("📲 অটোমেটিক টেলিগ্রাম অ্যালার্ট পাঠানো হয়েছে।")
-                            else:
-                                st.error("⚠️ অ্যালার্ট পাঠাতে ব্যর্থ হয়েছে।")
-                            st.rerun()
-                        
-                        else:
-                            # ম্যানুয়াল-সেন্ড লজিক
-                            st.info("রিপোর্টটি ‘মিথ্যা’ ট্যাগ করা হয়েছে।")
-                            st.write(f"AI স্কোর: **{ai_score}%** | থ্রেশহোল্ড: **{alert_threshold}%** | অটো-সেন্ড: **{auto_send}**")
-                            
-                            if st.button("📨 ম্যানুয়ালি অ্যালার্ট পাঠাও", key=f"manual_alert_{report_id}"):
+                        if not tagged:
+                            st.warning("⚠️ রিপোর্টটি ইতিমধ্যে অন্য রিভিউয়ার ট্যাগ করেছেন।")
+                        elif status == "মিথ্যা":
+                            # অটো-সেন্ড লজিক
+                            if auto_send and ai_score >= alert_threshold:
                                 alert_msg = (
-                                    f"🚨 <b>ম্যানুয়াল অ্যালার্ট:</b> যাচাইকৃত ভুয়া তথ্য!\n\n"
+                                    f"🚨 <b>ভুয়া তথ্য শনাক্ত!</b> 🚨\n\n"
                                     f"<b>তথ্য:</b> <i>{selected_row['text']}</i>\n"
                                     f"<b>AI স্কোর:</b> {ai_score}%\n"
-                                    f"<b>সিদ্ধান্ত:</b> ❌ {status}\n\n"
+                                    f"<b>চূড়ান্ত সিদ্ধান্ত:</b> ❌ {status}\n\n"
                                     f"<i>#Build4Democracy #YachaiBot</i>"
                                 )
                                 if send_alert(alert_msg):
-                                    st.success("✅ ম্যানুয়াল অ্যালার্ট পাঠানো হয়েছে।")
-                                    st.rerun()
+                                    st.success("📲 অটোমেটিক টেলিগ্রাম অ্যালার্ট পাঠানোর কিউতে যোগ হয়েছে।")
                                 else:
-                                    st.error("❌ ম্যানুয়াল অ্যালার্ট পাঠানো ব্যর্থ হয়েছে।")
+                                    st.error("⚠️ অ্যালার্ট পাঠাতে ব্যর্থ হয়েছে।")
+                                st.rerun()
                         
-                        # --- তোমার বাগ ফিক্স (v5.9) ---
-                        # এখানের 'else' ব্লকটি ডিলিট করা হয়েছে যাতে ম্যানুয়াল বাটনটি দেখা যায়
+                            else:
+                                # ম্যানুয়াল-সেন্ড লজিক
+                                st.info("রিপোর্টটি ‘মিথ্যা’ ট্যাগ করা হয়েছে।")
+                                st.write(f"AI স্কোর: **{ai_score}%** | থ্রেশহোল্ড: **{alert_threshold}%** | অটো-সেন্ড: **{auto_send}**")
+                            
+                                if st.button("📨 ম্যানুয়ালি অ্যালার্ট পাঠাও", key=f"manual_alert_{report_id}"):
+                                    alert_msg = (
+                                        f"🚨 <b>ম্যানুয়াল অ্যালার্ট:</b> যাচাইকৃত ভুয়া তথ্য!\n\n"
+                                        f"<b>তথ্য:</b> <i>{selected_row['text']}</i>\n"
+                                        f"<b>AI স্কোর:</b> {ai_score}%\n"
+                                        f"<b>সিদ্ধান্ত:</b> ❌ {status}\n\n"
+                                        f"<i>#Build4Democracy #YachaiBot</i>"
+                                    )
+                                    if send_alert(alert_msg):
+                                        st.success("✅ ম্যানুয়াল অ্যালার্ট পাঠানোর কিউতে যোগ হয়েছে।")
+                                        st.rerun()
+                                    else:
+                                        st.error("❌ ম্যানুয়াল অ্যালার্ট পাঠানো ব্যর্থ হয়েছে।")
+                        
+                            # --- তোমার বাগ ফিক্স (v5.9) ---
+                            # এখানের 'else' ব্লকটি ডিলিট করা হয়েছে যাতে ম্যানুয়াল বাটনটি দেখা যায়
 
-                    else:
-                        # যদি স্ট্যাটাস "মিথ্যা" না হয় (যেমন: সত্য বা বিভ্রান্তিকর)
-                        st.success("✅ আপডেট হয়েছে!")
-                        st.rerun()
+                        else:
+                            # যদি স্ট্যাটাস "মিথ্যা" না হয় (যেমন: সত্য বা বিভ্রান্তিকর)
+                            st.success("✅ আপডেট হয়েছে!")
+                            st.rerun()
     
     elif password:
         st.error("🔒 ভুল পাসওয়ার্ড।")
     else:
         st.info("🔒 অ্যাডমিন প্যানেল দেখতে সাইডবারে পাসওয়ার্ড দিন।")
 
+# =====================================================
+# 📈 Analytics (report_rollup + archive_rollup — reports টেবিল স্ক্যান নয়)
+# =====================================================
+elif page == "📈 Analytics":
+    password = st.sidebar.text_input("🔑 অ্যাডমিন পাসওয়ার্ড", type="password", key="admin_password")
+
+    if password == ADMIN_PASS:
+        import pandas as pd
+        st.title("📈 Analytics")
+        window = st.selectbox("সময়সীমা", ["৭ দিন", "৩০ দিন", "৯০ দিন", "সব"], index=1, key="analytics_window")
+        days = {"৭ দিন": 7, "৩০ দিন": 30, "৯০ দিন": 90}.get(window)
+
+        with read_connection() as conn, metrics.DB_QUERY.time("fetch", "report_rollup"):
+            totals = report_rollup.totals(conn)
+            daily = report_rollup.daily(conn, days)
+            verdicts = report_rollup.verdicts(conn, days)
+            histogram = report_rollup.score_histogram(conn, days)
+            backlog = report_rollup.backlog_ages(conn)
+            sources = report_rollup.sources(conn, days)
+
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("মোট রিপোর্ট", totals["reports"] + totals["archived"], f"🗄️ {totals['archived']} আর্কাইভে" if totals["archived"] else None, delta_color="off")
+        k2.metric("পেন্ডিং", totals["pending"])
+        k3.metric("সবচেয়ে পুরোনো পেন্ডিং", totals["oldest_pending_day"] or "—")
+        k4.metric(f"এই সময়ে ({window})", sum(d["reports"] for d in daily))
+
+        st.subheader("🗓️ দৈনিক রিপোর্ট")
+        if daily:
+            daily_df = pd.DataFrame(daily).set_index("day")
+            st.line_chart(daily_df[["reports", "pending"]])
+            st.dataframe(daily_df, use_container_width=True)
+        else:
+            st.caption("এই সময়ে কোনো রিপোর্ট নেই।")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.subheader("📊 স্কোর বণ্টন")
+            st.bar_chart(pd.DataFrame(histogram).set_index("bucket"))
+        with c2:
+            st.subheader("⏳ রিভিউ ব্যাকলগের বয়স")
+            st.bar_chart(pd.DataFrame(backlog).set_index("age"))
+
+        st.subheader("⚖️ ভার্ডিক্ট বণ্টন (AI বনাম অ্যাডমিন)")
+        if verdicts:
+            verdict_df = pd.DataFrame(verdicts).fillna({"verdict": "N/A", "final_verdict": "⏳ পেন্ডিং"})
+            st.dataframe(
+                verdict_df.pivot_table(index="verdict", columns="final_verdict", values="reports", aggfunc="sum", fill_value=0),
+                use_container_width=True,
+            )
+        st.subheader("📥 উৎস")
+        st.dataframe(pd.DataFrame(sources), use_container_width=True, hide_index=True)
+
+        # backfill/অমিল হলে (যেমন trigger-এর আগের পুরোনো ব্যাকআপ রিস্টোর) — CLI: python report_rollup.py --rebuild
+        if st.button("🔁 Rollup আবার গুনুন"):
+            with st.spinner("reports থেকে rollup তৈরি হচ্ছে..."):
+                counted = get_storage().rebuild_rollup()
+            count_reports.clear()
+            st.success(f"✅ {counted}টি রিপোর্ট গোনা হয়েছে।")
+
+    elif password:
+        st.error("🔒 ভুল পাসওয়ার্ড।")
+    else:
+        st.info("🔒 Analytics পেজ দেখতে সাইডবারে পাসওয়ার্ড দিন।")
+
+# =====================================================
+# 📊 Performance (ধাপভিত্তিক latency + queue depth)
+# =====================================================
+elif page == "📊 Performance":
+    password = st.sidebar.text_input("🔑 অ্যাডমিন পাসওয়ার্ড", type="password", key="admin_password")
+
+    if password == ADMIN_PASS:
+        import pandas as pd
+        st.title("📊 Performance")
+        st.caption("এই অ্যাপ প্রসেসের মেট্রিক (চালু হওয়ার পর থেকে)। p50/p95 histogram bucket-এর উপরের সীমা — আনুমানিক।")
+
+        queues = metrics.QUEUE_DEPTH.values()
+        if queues:
+            q_cols = st.columns(len(queues))
+            for col, (labels, value) in zip(q_cols, queues):
+                col.metric(f"Queue: {labels[0]}", f"{value:g}")
+
+        # --- মডেলের JSON উত্তর: সরাসরি ঠিক / লোকাল মেরামতে বাঁচল / অচল (পরের মডেলে retry) ---
+        outputs = gemini_analysis.parse_stats()
+        o1, o2, o3, o4 = st.columns(4)
+        o1.metric("Model JSON ঠিক", outputs["ok"])
+        o2.metric("মেরামত (retry এড়ানো)", outputs["retries_avoided"])
+        o3.metric("অচল (retry)", outputs["invalid"])
+        o4.metric("Parse failure rate", f"{outputs['failure_rate'] * 100:.1f}%")
+
+        for hist in metrics.histograms():
+            rows = hist.summary()
+            st.subheader(hist.help)
+            if rows:
+                st.dataframe(pd.DataFrame(rows), use_container_width=True)
+            else:
+                st.caption("এখনো কোনো ডেটা নেই।")
+
+        # --- বটের rate limit (admission_limits টেবিল; বট কয়েক সেকেন্ডের মধ্যে নতুন মান নেয়) ---
+        import admission
+        st.subheader("🚦 বট rate limit")
+        limits = admission.load_limits(DB_PATH)
+        with st.form("admission_limits"):
+            l_cols = st.columns(5)
+            new_limits = {
+                "chat_rate": l_cols[0].number_input("প্রতি চ্যাট (msg/s)", min_value=0.01, value=float(limits["chat_rate"]), step=0.05),
+                "chat_burst": l_cols[1].number_input("চ্যাট burst", min_value=1, value=int(limits["chat_burst"])),
+                "global_rate": l_cols[2].number_input("মোট যাচাই/s", min_value=0.1, value=float(limits["global_rate"]), step=0.5),
+                "global_burst": l_cols[3].number_input("মোট burst", min_value=1, value=int(limits["global_burst"])),
+                "queue_size": l_cols[4].number_input("সারির দৈর্ঘ্য", min_value=0, value=int(limits["queue_size"])),
+            }
+            if st.form_submit_button("💾 সীমা সেভ করুন"):
+                admission.save_limits(new_limits, DB_PATH)
+                logging.info(f"Admission limit বদলানো হয়েছে: {new_limits}")
+                st.success("✅ সেভ হয়েছে — বটগুলো কয়েক সেকেন্ডের মধ্যে নতুন সীমা নেবে।")
+
+        # বট প্রসেসগুলোর /metrics (যেমন http://localhost:9101/metrics,http://localhost:9102/metrics)
+        targets = [t.strip() for t in os.getenv("METRICS_TARGETS", "").split(",") if t.strip()]
+        if targets:
+            import requests
+            st.subheader("🤖 বট প্রসেস")
+            for target in targets:
+                with st.expander(target, expanded=False):
+                    try:
+                        text = requests.get(target, timeout=2).text
+                    except Exception as e:
+                        st.error(f"মেট্রিক পড়া ব্যর্থ: {e}")
+                        continue
+                    # admission সিদ্ধান্ত (run/fallback/queued/rejected_*) আলাদা টেবিলে
+                    decisions = {}
+                    for line in text.splitlines():
+                        if line.startswith("yachai_admission_total{"):
+                            labels, _, value = line.rpartition(" ")
+                            decision = labels.split('decision="', 1)[1].split('"', 1)[0]
+                            decisions[decision] = decisions.get(decision, 0) + float(value)
+                    if decisions:
+                        st.dataframe(pd.DataFrame([decisions]), use_container_width=True, hide_index=True)
+                    st.code(text, language="text")
+
+        with st.expander("Prometheus text (এই প্রসেস)", expanded=False):
+            st.code(metrics.render(), language="text")
+
+    elif password:
+        st.error("🔒 ভুল পাসওয়ার্ড।")
+    else:
+        st.info("🔒 Performance পেজ দেখতে সাইডবারে পাসওয়ার্ড দিন।")
+
 # ---------- তোমার নতুন FOOTER ----------
 st.markdown("""
 <hr style='border-color:#00bfff22; margin-top: 40px;'>
@@ -528,3 +868,5 @@ st.markdown("""
 Developed by <b>Team Believer</b> | Hackathon: <i>Build for Democracy 2025 🇧🇩</i>
 </p>
 """, unsafe_allow_html=True)
+
+startup_timing.finish() # প্রথম পেজ পাঠানো শেষ
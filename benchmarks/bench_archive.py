@@ -0,0 +1,127 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: hot/cold আর্কাইভ — সরানোর গতি, আর আগে/পরে পড়া, সার্চ, ব্যাকআপ
+# =====================================================
+# python benchmarks/bench_archive.py --reports 100000 --days 365 --older-than 90
+# temp data.db-তে এক বছরে ছড়ানো রিপোর্ট (৮০% যাচাইকৃত) → আর্কাইভের আগে আর পরে মাপা হয়:
+# data.db সাইজ, ব্যাকআপ (db_backup), পুরো টেবিল পড়া, লাইভ সার্চ, আর্কাইভ সার্চ (DuckDB),
+# near-duplicate fallback lookup, আর Analytics rollup query (দুই স্তর মিলিয়ে)।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONSONANTS = "কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ"
+VOWEL_SIGNS = ["", "া", "ি", "ী", "ু", "ূ", "ে", "ো"]
+TOPICS = ["ভোটার", "নির্বাচন", "ইভিএম", "স্কুল", "টাকা", "বন্যা", "টিকা", "রেমিট্যান্স"]
+
+
+def timed(fn, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def seed(db_path, count, days, rng):
+    import verify_service
+    conn = verify_service._open_db(db_path)  # reports + FTS + rollup trigger
+    word = lambda: "".join(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS) for _ in range(3))
+    rows = []
+    for i in range(count):
+        score = rng.randrange(101)
+        final = rng.choice(["সত্য", "বিভ্রান্তিকর", "মিথ্যা"]) if rng.random() < 0.8 else None
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - days * 86400 * (1 - i / count)))
+        text = f"{rng.choice(TOPICS)} " + " ".join(word() for _ in range(rng.randint(10, 25)))
+        justification = "সূত্র অনুযায়ী " + " ".join(word() for _ in range(20))
+        rows.append((text, score, "মিথ্যা" if score > 50 else "সত্য", justification, final, "seed", timestamp))
+        if len(rows) >= 5000 or i == count - 1:
+            conn.executemany("""
+                INSERT INTO reports (text, score, verdict, justification, final_verdict, source, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+            rows = []
+    conn.close()
+
+
+def measure(store, db_path, backup_dir, rng, label):
+    import db_backup
+    import report_rollup
+    result = {"label": label, "db_mb": os.path.getsize(db_path) / 1e6}
+    result["backup_ms"], _ = timed(lambda: db_backup.run_backup(db_path, backup_dir))
+    raw = sqlite3.connect(db_path)
+    result["full_read_ms"], rows = timed(lambda: raw.execute("SELECT * FROM reports ORDER BY timestamp DESC").fetchall(), 3)
+    result["live_rows"] = len(rows)
+    raw.close()
+    queries = [f"{rng.choice(['ভোটার', 'ইভিএম', 'টিকা'])}" for _ in range(20)]
+    result["search_ms"], _ = timed(lambda: [store.search(q, limit=20) for q in queries], 3)
+    result["search_ms"] /= len(queries)
+
+    def analytics():
+        with store.reader() as conn:
+            report_rollup.totals(conn)
+            report_rollup.daily(conn, None)
+            report_rollup.verdicts(conn)
+            return report_rollup.score_histogram(conn)
+    result["analytics_ms"], _ = timed(analytics, 5)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365, help="রিপোর্টগুলো কত দিনে ছড়ানো")
+    parser.add_argument("--older-than", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="yachai_bench_")
+    db_path = os.path.join(workdir, "data.db")
+    os.environ["YACHAI_DB_PATH"] = db_path
+    os.environ["YACHAI_ARCHIVE_DIR"] = os.path.join(workdir, "archive")
+    import report_archive  # env সেট করার পরে import
+    import storage
+
+    rng = random.Random(7)
+    started = time.perf_counter()
+    seed(db_path, args.reports, args.days, rng)
+    print(f"🌱 {args.reports} রিপোর্ট seed: {time.perf_counter() - started:.1f}s ({workdir})")
+
+    store = storage.get_storage(db_path)
+    before = measure(store, db_path, os.path.join(workdir, "backups_before"), rng, "আগে")
+
+    started = time.perf_counter()
+    moved, files, size = report_archive.archive(store, args.older_than, args.batch_size)
+    archive_s = time.perf_counter() - started
+    store.close()
+    report_archive.vacuum(db_path)
+    storage._storages.clear()  # VACUUM-এর পরে নতুন writer/পুল
+    store = storage.get_storage(db_path)
+    after = measure(store, db_path, os.path.join(workdir, "backups_after"), rng, "পরে")
+
+    # আর্কাইভের দিক (DuckDB) — প্রথম কল import/ক্যাশ গরম করে, তারপর মাপা
+    report_archive.search(store, "ভোটার")
+    archive_search_ms, _ = timed(lambda: report_archive.search(store, rng.choice(["ভোটার", "ইভিএম", "টিকা"])), 10)
+    with store.reader() as conn:
+        archived_ids = [r[0] for r in conn.execute("SELECT first_id FROM archive_files ORDER BY first_id").fetchall()]
+    lookup_ms, found = timed(lambda: report_archive.lookup(store, archived_ids[:3]), 10)
+
+    print(f"\n🗄️ আর্কাইভ: {moved} রিপোর্ট → {files} ফাইল ({size / 1e6:.1f} MB), {archive_s:.1f}s ({moved / archive_s:.0f} সারি/s)")
+    print(f"{'':<6} {'data.db MB':>10} {'live rows':>10} {'backup ms':>10} {'full read ms':>13} {'search ms':>10} {'analytics ms':>13}")
+    for r in (before, after):
+        print(f"{r['label']:<6} {r['db_mb']:>10.1f} {r['live_rows']:>10} {r['backup_ms']:>10.0f} {r['full_read_ms']:>13.0f} "
+              f"{r['search_ms']:>10.1f} {r['analytics_ms']:>13.1f}")
+    print(f"আর্কাইভ সার্চ (DuckDB, সব ফাইল): {archive_search_ms:.1f} ms | id lookup ({len(found)}টি): {lookup_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: single-claim বনাম batch Gemini analysis
+# =====================================================
+# GEMINI_API_KEY=... python benchmarks/bench_batch_analysis.py --claims 20 --batch-sizes 5,10,20
+# আসল Gemini API কল করে — প্রতি দাবিতে latency আর token খরচ তুলনা করে।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gemini_analysis
+
+SAMPLE_CLAIMS = [
+    "ভোটার লিস্টে ১ কোটি নাম মুছে গেছে",
+    "নির্বাচন কমিশন জানিয়েছে আগামী মাসে জাতীয় নির্বাচন হবে না",
+    "ঢাকায় আজ থেকে সব স্কুল এক মাসের জন্য বন্ধ",
+    "নতুন টাকার নোটে প্রধানমন্ত্রীর ছবি থাকবে না",
+    "ইভিএম মেশিনে ভোট দিলে আঙুলের ছাপ সরকারের কাছে চলে যায়",
+]
+
+
+def load_claims(db_path, n):
+    claims = []
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        claims = [r[0] for r in conn.execute("SELECT text FROM reports ORDER BY id DESC LIMIT ?", (n,))]
+        conn.close()
+    while len(claims) < n:
+        claims.append(SAMPLE_CLAIMS[len(claims) % len(SAMPLE_CLAIMS)] + f" ({len(claims)})")
+    return claims
+
+
+def reset_usage():
+    for u in gemini_analysis.usage.values():
+        u.update(calls=0, claims=0, seconds=0.0, prompt_tokens=0, output_tokens=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=os.getenv("YACHAI_DB_PATH", "data.db"))
+    parser.add_argument("--claims", type=int, default=20)
+    parser.add_argument("--batch-sizes", default="5,10,20")
+    args = parser.parse_args()
+
+    gemini_analysis.configure(os.getenv("GEMINI_API_KEY"))
+    claims = load_claims(args.db, args.claims)
+    items = list(enumerate(claims))
+
+    print(f"{'mode':>10} {'wall s/claim':>13} {'model s/claim':>14} {'tokens/claim':>13} {'fallbacks':>10}")
+    reset_usage()
+    started = time.perf_counter()
+    for text in claims:
+        gemini_analysis.get_gemini_analysis(text)
+    u = gemini_analysis.usage_per_claim()["single"]
+    print(f"{'single':>10} {(time.perf_counter() - started) / len(claims):>13.2f} {u['seconds_per_claim']:>14.2f} {u['tokens_per_claim']:>13.0f} {'-':>10}")
+
+    for size in [int(s) for s in args.batch_sizes.split(",")]:
+        reset_usage()
+        started = time.perf_counter()
+        gemini_analysis.get_gemini_batch_analysis(items, batch_size=size)
+        wall = (time.perf_counter() - started) / len(claims)
+        usage = gemini_analysis.usage_per_claim()
+        u = usage["batch"]
+        print(f"{'batch=' + str(size):>10} {wall:>13.2f} {u['seconds_per_claim']:>14.2f} {u['tokens_per_claim']:>13.0f} {usage['single']['claims']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: near-duplicate claim index lookup latency
+# =====================================================
+# python benchmarks/bench_claim_index.py --sizes 10000,100000,1000000
+# index একটাই ফাইলে ধাপে ধাপে বাড়ে (10k → 100k → 1M), প্রতিটা ধাপে lookup মাপা হয়।
+# সাথে একটা ভাইরাল ঢেউ (--wave টা প্রায়-একই কপি, সবচেয়ে পুরোনোটা যাচাইকৃত): similar() আর
+# find_reviewed()-এর পুরো খরচ (lock, reviewed sync, লাইভ টেবিল যাচাই সহ)।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_SYLLABLES = ["ভো", "টা", "র", "লি", "স্টে", "কো", "টি", "না", "ম", "মু", "ছে", "গে", "নি", "র্বা", "চ",
+              "ন", "ক", "মি", "শ", "ঢা", "কা", "য়", "সে", "তু", "দা", "বি", "প্র", "ধা", "মন্ত্রী", "দল"]
+_NOISE = ["🚨", "😱", "‼️", "#ভুয়া_খবর", "#নির্বাচন", "শেয়ার করুন!!", "https://t.co/x1"]
+
+
+def make_corpus(rng, vocab_size=3000):
+    vocab = ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(vocab_size)]
+    return lambda: " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 16)))
+
+
+def perturb(rng, text):
+    words = text.split()
+    if len(words) > 8 and rng.random() < 0.5:
+        words.pop(rng.randrange(len(words)))
+    return f"{rng.choice(_NOISE)} {' '.join(words)} {rng.choice(_NOISE)}"
+
+
+def make_wave(store, claim_index, rng, viral, size, first_id=10 ** 9):
+    # corpus-এর id-র অনেক উপরে: প্রথমটা যাচাইকৃত, বাকিগুলো পেন্ডিং কপি
+    rows = [(first_id + i, viral if i == 0 else perturb(rng, viral), "মিথ্যা" if i == 0 else None)
+            for i in range(size + 1)]
+    store.write(lambda conn: conn.executemany(
+        "INSERT INTO reports (id, text, score, verdict, justification, final_verdict) VALUES (?, ?, 50, 'মিথ্যা', '', ?)",
+        rows))
+    claim_index.add_many([(rid, text) for rid, text, _ in rows])
+    return first_id
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--wave", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="yachai_bench_")
+    os.environ["YACHAI_DB_PATH"] = os.path.join(workdir, "data.db")
+    import claim_index  # env সেট করার পরে import, যাতে index temp ফোল্ডারে বানায়
+    import storage
+
+    rng = random.Random(7)
+    new_claim = make_corpus(rng)
+    texts = {}
+    viral = new_claim()
+    wave = make_wave(storage.get_storage(os.environ["YACHAI_DB_PATH"]), claim_index, rng, viral, args.wave)
+    print(f"index: {claim_index.INDEX_PATH}")
+    print(f"{'reports':>9} {'build s':>8} {'sig p50':>8} {'lookup p50':>10} {'p95':>7} {'p99':>7} {'recall':>7}"
+          f" {'similar p50':>11} {'p95':>7} {'reviewed p50':>12} {'p95':>7}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        start = time.perf_counter()
+        while len(texts) < size:
+            n = min(args.batch, size - len(texts))
+            batch = [(len(texts) + i + 1, new_claim()) for i in range(n)]
+            claim_index.add_many(batch)
+            texts.update(batch)
+        build_s = time.perf_counter() - start
+
+        sig_ms, lookup_ms, found = [], [], 0
+        conn = claim_index._get_conn()
+        for _ in range(args.queries):
+            rid = rng.randint(1, size)
+            query = perturb(rng, texts[rid])
+            t0 = time.perf_counter()
+            sig = claim_index.signature(query)
+            t1 = time.perf_counter()
+            cands = claim_index._candidates(conn, sig)
+            t2 = time.perf_counter()
+            sig_ms.append((t1 - t0) * 1000)
+            lookup_ms.append((t2 - t1) * 1000)
+            found += rid in cands
+
+        similar_ms, reviewed_ms = [], []
+        for _ in range(min(args.queries, 200)):
+            query = perturb(rng, viral)
+            t0 = time.perf_counter()
+            claim_index.similar(query)
+            t1 = time.perf_counter()
+            match = claim_index.find_reviewed(query, os.environ["YACHAI_DB_PATH"])
+            t2 = time.perf_counter()
+            similar_ms.append((t1 - t0) * 1000)
+            reviewed_ms.append((t2 - t1) * 1000)
+            assert match is None or match["id"] == wave, match
+
+        print(f"{size:>9} {build_s:>8.1f} {statistics.median(sig_ms):>7.3f}m {statistics.median(lookup_ms):>9.3f}m "
+              f"{pct(lookup_ms, 95):>6.3f}m {pct(lookup_ms, 99):>6.3f}m {found / args.queries:>7.1%} "
+              f"{statistics.median(similar_ms):>10.3f}m {pct(similar_ms, 95):>6.3f}m "
+              f"{statistics.median(reviewed_ms):>11.3f}m {pct(reviewed_ms, 95):>6.3f}m")
+
+
+if __name__ == "__main__":
+    main()
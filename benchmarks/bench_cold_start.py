@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: app.py cold start (time-to-first-paint)
+# =====================================================
+# python benchmarks/bench_cold_start.py --runs 5
+# python benchmarks/bench_cold_start.py --app /tmp/old_app.py   (আগের ভার্সনের সাথে তুলনা)
+# প্রতিটা রান নতুন Python প্রসেস + নতুন temp data.db — Streamlit AppTest দিয়ে প্রথম রান
+# শেষ হওয়া পর্যন্ত সময় (প্রসেস শুরু থেকে) আর startup_timing-এর ধাপগুলো।
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import os, sys, time
+started = float(sys.argv[3])
+sys.path.insert(0, sys.argv[2])
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.secrets["ADMIN_PASS"] = "bench"
+at.run()
+print("FIRST_PAINT", time.time() - started, len(at.exception))
+"""
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run_once(app):
+    workdir = tempfile.mkdtemp(prefix="yachai_cold_")
+    log = os.path.join(workdir, "startup.jsonl")
+    env = dict(os.environ, YACHAI_STARTUP_LOG=log, YACHAI_DB_PATH=os.path.join(workdir, "data.db"))
+    started = time.time()
+    out = subprocess.run([sys.executable, "-c", CHILD, app, ROOT, str(started)], cwd=workdir, env=env,
+                         capture_output=True, text=True, timeout=300)
+    line = next((l for l in out.stdout.splitlines() if l.startswith("FIRST_PAINT")), None)
+    if line is None:
+        raise RuntimeError(out.stderr[-2000:])
+    _, first_paint, errors = line.split()
+    phases = {}
+    if os.path.exists(log):
+        with open(log, encoding="utf-8") as f:
+            phases = json.loads(f.readline())
+    return float(first_paint), int(errors), phases
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    args = parser.parse_args()
+
+    results = []
+    for i in range(args.runs):
+        first_paint, errors, phases = run_once(args.app)
+        results.append((first_paint, phases))
+        detail = ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in phases.items() if k != "pid")
+        print(f"run {i + 1}: first paint {first_paint * 1000:.0f}ms ({detail or 'no startup log'}){' ⚠️ ' + str(errors) + ' exceptions' if errors else ''}")
+
+    paints = [r[0] * 1000 for r in results]
+    print(f"\n{'':>14} {'p50 ms':>8} {'max ms':>8}")
+    print(f"{'first paint':>14} {pct(paints, 50):>8.0f} {max(paints):>8.0f}")
+    for phase in ("imports", "db_init", "first_render"):
+        values = [r[1][phase] * 1000 for r in results if phase in r[1]]
+        if values:
+            print(f"{phase:>14} {pct(values, 50):>8.0f} {max(values):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
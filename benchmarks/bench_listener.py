@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: listener.py throughput (fake Telegram + fake verifier)
+# =====================================================
+# python benchmarks/bench_listener.py --messages 500 --chats 50 --latency 0.2 --workers 1,8,32
+# প্রতিটা রানে নতুন temp data.db; শেষে per-chat ক্রম ঠিক আছে কি না যাচাই হয়।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_once(messages, chats, latency, jitter, workers, queue_size):
+    workdir = tempfile.mkdtemp(prefix="yachai_bench_")
+    os.environ["YACHAI_DB_PATH"] = os.path.join(workdir, "data.db")
+    import listener
+    from fake_servers import FakeTelegram
+
+    fake = FakeTelegram().start()
+    listener.TELEGRAM_API_URL = fake.url
+    listener.BOT_TOKEN = fake.token
+    rng = random.Random(1)
+
+    def fake_verify(msg):
+        time.sleep(latency + rng.random() * jitter)  # ধীর Gemini-র মতো
+        return f"ok: {msg}"
+
+    for i in range(messages):
+        fake.add_message(i % chats, f"{i % chats}:{i}")
+
+    async def main():
+        stop = asyncio.Event()
+        bot = listener.Listener(verify=fake_verify, workers=workers, queue_size=queue_size,
+                                db_path=os.environ["YACHAI_DB_PATH"])
+        bot.fetch = lambda offset: listener.get_updates(offset, timeout=1)
+        task = asyncio.create_task(bot.run(stop))
+        while bot.processed < messages:
+            await asyncio.sleep(0.05)
+        stop.set()
+        return await task
+
+    stats = asyncio.run(main())
+    fake.stop()
+
+    # per-chat ক্রম যাচাই
+    last = {}
+    ordered = True
+    for chat_id, text, _ in fake.sent:
+        seq = int(text.rsplit(":", 1)[1])
+        ordered &= seq > last.get(chat_id, -1)
+        last[chat_id] = seq
+    return stats, ordered
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--workers", default="1,8,32")
+    parser.add_argument("--queue-size", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'msgs':>6} {'secs':>7} {'msg/s':>8} {'ordered':>8}")
+    for workers in [int(w) for w in args.workers.split(",")]:
+        stats, ordered = run_once(args.messages, args.chats, args.latency, args.jitter, workers, args.queue_size)
+        print(f"{workers:>7} {stats['processed']:>6} {stats['elapsed']:>7.2f} {stats['msgs_per_sec']:>8.2f} {str(ordered):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: metrics overhead (observe / time() / render)
+# =====================================================
+# python benchmarks/bench_metrics.py --ops 200000 --threads 1,8
+# production-এ সবসময় চালু রাখার আগে দেখা: প্রতি observe কত মাইক্রোসেকেন্ড, আর
+# অনেক থ্রেড একসাথে লিখলে lock contention কতটা বাড়ে।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+
+
+def bench(fn, ops, threads):
+    per_thread = ops // threads
+
+    def loop():
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=200000)
+    parser.add_argument("--threads", default="1,8")
+    args = parser.parse_args()
+
+    hist = metrics.histogram("bench_seconds", "benchmark", ("op",))
+
+    def timed_block():
+        with hist.time("fetch"):
+            pass
+
+    cases = [
+        ("baseline (perf_counter)", time.perf_counter),
+        ("observe", lambda: hist.observe(0.003, "insert")),
+        ("with time()", timed_block),
+    ]
+
+    print(f"{'case':<26} {'threads':>7} {'µs/op':>8}")
+    for threads in [int(t) for t in args.threads.split(",")]:
+        for name, fn in cases:
+            print(f"{name:<26} {threads:>7} {bench(fn, args.ops, threads):>8.2f}")
+
+    started = time.perf_counter()
+    text = metrics.render()
+    print(f"render(): {(time.perf_counter() - started) * 1000:.2f} ms, {len(text.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
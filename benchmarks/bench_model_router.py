@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================
+# ⏱️ BENCHMARK: model router — sequential fallback বনাম hedging
+# =====================================================
+# python benchmarks/bench_model_router.py --requests 400 --tail-rate 0.04 --primary-failures 0.05
+# primary সাধারণত দ্রুত কিন্তু মাঝে মাঝে খুব ধীর/ব্যর্থ — FakeModel দিয়ে, আসল API ছাড়া।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_router
+from fake_servers import FakeModel
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run(args, hedge):
+    models = {
+        "primary": FakeModel("primary", latency=args.primary_latency, jitter=args.primary_jitter,
+                             failure_rate=args.primary_failures, tail_rate=args.tail_rate,
+                             tail_latency=args.tail_latency, seed=1),
+        "fallback": FakeModel("fallback", latency=args.fallback_latency, jitter=0.05, seed=2),
+    }
+    router = model_router.ModelRouter(["primary", "fallback"], factory=models.__getitem__,
+                                      hedge=hedge, cooldown=args.cooldown)
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            router.generate("যাচাই করো")
+            ok = True
+        except Exception:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    latencies = [lat * 1000 for lat, _ in results]
+    errors = sum(1 for _, ok in results if not ok)
+    stats = router.stats()
+    return latencies, errors, stats, models
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--primary-latency", type=float, default=0.1)
+    parser.add_argument("--primary-jitter", type=float, default=0.05)
+    parser.add_argument("--primary-failures", type=float, default=0.05)
+    parser.add_argument("--tail-rate", type=float, default=0.04)
+    parser.add_argument("--tail-latency", type=float, default=2.0)
+    parser.add_argument("--fallback-latency", type=float, default=0.3)
+    parser.add_argument("--cooldown", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'hedges':>7} {'h-wins':>7} {'trips':>6} {'calls p/f':>10}")
+    for hedge in (False, True):
+        lat, errors, stats, models = run(args, hedge)
+        trips = sum(m["trips"] for m in stats["models"])
+        calls = f"{models['primary'].calls}/{models['fallback'].calls}"
+        print(f"{'hedged' if hedge else 'sequential':>10} {pct(lat, 50):>8.0f} {pct(lat, 95):>8.0f} {pct(lat, 99):>8.0f} "
+              f"{errors:>7} {stats['hedges_started']:>7} {stats['hedge_wins']:>7} {trips:>6} {calls:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================
+# ⏱️ BENCHMARK: মডেলের JSON উত্তর — আগের regex parser বনাম যাচাই + লোকাল মেরামত
+# =====================================================
+# python benchmarks/bench_parse.py --requests 400 --near-valid 0.15 --invalid 0.02
+# primary FakeModel মাঝে মাঝে প্রায়-ঠিক (``` + আগে-পরে লেখা, trailing comma, "৮৫%" স্কোর,
+# ইংরেজি verdict ...) বা সত্যিই অচল উত্তর দেয়। legacy: আগের safe_parse_json (greedy \{.*\})
+# accept-এ — ব্যর্থ হলে fallback মডেলে। validated: gemini_analysis.get_gemini_analysis।
+# মাপা হয়: প্রতি অনুরোধে মডেল কল, latency, আর legacy যেসব ভুল মান (score > 100, অজানা verdict) মেনে নিত।
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gemini_analysis
+import model_router
+from fake_servers import FakeModel
+
+GOOD = {"score": 80, "verdict": "মিথ্যা", "justification": "পরীক্ষামূলক উত্তর — সূত্রে {এমন} কিছু নেই"}
+NEAR_VALID = [
+    lambda: "```json\n" + json.dumps(GOOD, ensure_ascii=False) + "\n```\nআশা করি এটা কাজে লাগবে {🙂}",
+    lambda: "বিশ্লেষণ: " + json.dumps(GOOD, ensure_ascii=False) + " — শেষ}",
+    lambda: json.dumps(GOOD, ensure_ascii=False)[:-1] + ",}",
+    lambda: json.dumps({**GOOD, "score": "৮৫%"}, ensure_ascii=False),
+    lambda: json.dumps({**GOOD, "verdict": "False"}, ensure_ascii=False),
+    lambda: json.dumps({**GOOD, "verdict": ["সম্ভবত মিথ্যা"]}, ensure_ascii=False),
+    lambda: json.dumps(GOOD, ensure_ascii=False) + '\n{"note": "extra"}',
+]
+INVALID = [
+    lambda: "দুঃখিত, {ভাঙা JSON",
+    lambda: json.dumps({**GOOD, "score": 180}, ensure_ascii=False),
+    lambda: json.dumps({**GOOD, "verdict": "জানি না"}, ensure_ascii=False),
+]
+
+
+def legacy_parse(text):
+    # আগের gemini_analysis.safe_parse_json
+    try:
+        t = re.sub(r"^```json", "", text, flags=re.I).strip()
+        t = re.sub(r"```$", "", t).strip()
+        m = re.search(r"(\{.*\})", t, flags=re.S)
+        if m:
+            t = m.group(1)
+        return json.loads(t)
+    except Exception:
+        return None
+
+
+def legacy_analysis(text):
+    # আগের get_gemini_analysis: accept = পার্স হলো কি না, তারপর int(float(score))
+    _, response = model_router.get_router().generate(text, accept=lambda r: legacy_parse(r.text) is not None)
+    analysis = legacy_parse(response.text)
+    analysis["score"] = int(float(analysis.get("score", 0)))
+    return analysis
+
+
+def make_reply(args, rng):
+    def reply(prompt):
+        roll = rng.random()
+        if roll < args.invalid:
+            return rng.choice(INVALID)()
+        if roll < args.invalid + args.near_valid:
+            return rng.choice(NEAR_VALID)()
+        return json.dumps(GOOD, ensure_ascii=False)
+    return reply
+
+
+def run(mode, args):
+    rng = random.Random(7)
+    models = {
+        "primary": FakeModel("primary", latency=args.primary_latency, jitter=0.02, seed=1, reply=make_reply(args, rng)),
+        "fallback": FakeModel("fallback", latency=args.fallback_latency, jitter=0.05, seed=2),
+    }
+    model_router._router = model_router.ModelRouter(["primary", "fallback"], factory=models.__getitem__, cooldown=0.01)
+    analyze = legacy_analysis if mode == "legacy" else gemini_analysis.get_gemini_analysis
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            result = analyze(f"দাবি {i}")
+        except Exception:
+            result = None
+        return time.perf_counter() - started, result
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    latencies = sorted(lat * 1000 for lat, _ in results)
+    failed = sum(1 for _, r in results if r is None)
+    wrong = sum(1 for _, r in results if r is not None and (r.get("verdict") not in gemini_analysis.VERDICTS or not 0 <= r["score"] <= 100))
+    calls = models["primary"].calls + models["fallback"].calls
+    return {
+        "mode": mode, "requests": args.requests, "model_calls": calls, "fallback_calls": models["fallback"].calls,
+        "calls_per_request": round(calls / args.requests, 3), "failed": failed, "accepted_wrong": wrong,
+        "p50_ms": round(latencies[len(latencies) // 2], 1), "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 1),
+    }
+
+
+def parse_cost(n=20000):
+    # শুধু পার্সিং-এর খরচ (µs/উত্তর), মডেল ছাড়া
+    texts = [json.dumps(GOOD, ensure_ascii=False)] * 8 + [f() for f in NEAR_VALID]
+    out = {}
+    for name, fn in (("legacy", legacy_parse), ("validated", gemini_analysis.parse_analysis)):
+        started = time.perf_counter()
+        for i in range(n):
+            fn(texts[i % len(texts)])
+        out[name] = round((time.perf_counter() - started) / n * 1e6, 1)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--near-valid", type=float, default=0.15, help="প্রায়-ঠিক উত্তরের হার")
+    parser.add_argument("--invalid", type=float, default=0.02, help="সত্যিই অচল উত্তরের হার")
+    parser.add_argument("--primary-latency", type=float, default=0.1)
+    parser.add_argument("--fallback-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)  # প্রতিটা অচল উত্তরের লগ বেঞ্চমার্কে দরকার নেই
+    print(f"{'mode':<10} {'calls/req':>9} {'fallback':>8} {'failed':>6} {'wrong':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    results = []
+    for mode in ("legacy", "validated"):
+        r = run(mode, args)
+        results.append(r)
+        print(f"{r['mode']:<10} {r['calls_per_request']:>9} {r['fallback_calls']:>8} {r['failed']:>6} "
+              f"{r['accepted_wrong']:>6} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+    print("validated রানের parse ফলাফল:", gemini_analysis.parse_stats())
+    print("parse µs/উত্তর:", parse_cost())
+    print(json.dumps(results, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
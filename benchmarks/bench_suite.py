@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# =====================================================
+# ⏱️ BENCHMARK SUITE: hot path-গুলো, লোকাল fake Gemini + Telegram-এর বিপরীতে
+# =====================================================
+# python benchmarks/bench_suite.py --db-sizes 1000,10000,50000 --concurrency 1,8,32 --ops 200
+# python benchmarks/bench_suite.py --compare benchmarks/results/old.json benchmarks/results/new.json
+#
+# প্রতিটা ডেটাবেস সাইজ আলাদা প্রসেসে, নতুন temp data.db-তে (মডিউলগুলো DB path import-এর
+# সময় পড়ে)। FakeGemini আর FakeTelegram HTTP সার্ভার — আসল google-generativeai আর
+# telebot ক্লায়েন্টই সেখানে কল করে, তাই serialization/HTTP খরচও মাপা হয়।
+# প্রতি (path, db_size, concurrency): throughput, p50/p95/p99, error, মডেল কল — JSON-এ সেভ,
+# --compare দিয়ে দুটো রান মিলিয়ে regression ধরা যায় (থাকলে exit code 1)।
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ["gemini_analysis", "insert_report", "fetch_all_reports", "fetch_reports_page", "analytics", "review_queue", "verify", "listener", "telegram_bot"]
+SAMPLE_CLAIMS = [
+    "ভোটার লিস্টে ১ কোটি নাম মুছে গেছে",
+    "নির্বাচন কমিশন জানিয়েছে আগামী মাসে জাতীয় নির্বাচন হবে না",
+    "ঢাকায় আজ থেকে সব স্কুল এক মাসের জন্য বন্ধ",
+    "নতুন টাকার নোটে প্রধানমন্ত্রীর ছবি থাকবে না",
+    "ইভিএম মেশিনে ভোট দিলে আঙুলের ছাপ সরকারের কাছে চলে যায়",
+]
+CONSONANTS = "কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ"
+VOWEL_SIGNS = ["", "া", "ি", "ী", "ু", "ূ", "ে", "ো"]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else None
+
+
+def summarize(path, db_size, concurrency, latencies, errors, seconds, model_calls):
+    ops = len(latencies)
+    return {
+        "path": path, "db_size": db_size, "concurrency": concurrency, "ops": ops, "errors": errors,
+        "seconds": round(seconds, 3), "throughput": round(ops / seconds, 2) if seconds else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "model_calls": model_calls,
+    }
+
+
+# =====================================================
+# 🧪 WORKER (এক ডেটাবেস সাইজ, সব path আর concurrency)
+# =====================================================
+class Worker:
+    def __init__(self, args):
+        self.args = args
+        self.db_path = os.environ["YACHAI_DB_PATH"]
+        self.rng = random.Random(7)
+        self.seq = 0
+
+        from fake_servers import FakeGemini, FakeTelegram
+        self.gemini = FakeGemini(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                                 malformed_rate=args.malformed_rate, seed=1).start()
+        self.telegram = FakeTelegram(token="123456:TEST", send_latency=args.send_latency, failure_rate=args.failure_rate, seed=2).start()
+        # মডিউলগুলো import-এর আগেই env — সবাই fake সার্ভারে যায়
+        os.environ.update({
+            "GEMINI_API_ENDPOINT": self.gemini.url, "GEMINI_API_KEY": "local",
+            "TELEGRAM_API_URL": self.telegram.url, "BOT_TOKEN": self.telegram.token,
+            "TELEGRAM_BOT_TOKEN": self.telegram.token,
+        })
+
+    def unique_claim(self):
+        # প্রতিবার নতুন দাবি — ক্যাশ বা অনুরূপ-ম্যাচ (MinHash) নয়, পুরো পথটাই মাপা হয়।
+        # নমুনা দাবির শুরুটা রাখা হয়, বাকিটা এলোমেলো বাংলা শব্দ যাতে shingle মিল কম থাকে।
+        self.seq += 1
+        words = " ".join(
+            "".join(self.rng.choice(CONSONANTS) + self.rng.choice(VOWEL_SIGNS) for _ in range(3))
+            for _ in range(12)
+        )
+        return f"{self.rng.choice(SAMPLE_CLAIMS).split()[0]} {words} {self.seq}"
+
+    def seed(self, size):
+        import claim_index
+        import report_search
+        import verify_service
+        conn = verify_service._open_db(self.db_path)
+        report_search.ensure_fts(conn)
+        rows = []
+        for i in range(size):
+            score = self.rng.randrange(101)
+            final = self.rng.choice(["সত্য", "বিভ্রান্তিকর", "মিথ্যা"]) if self.rng.random() < 0.2 else None
+            # গত ৯০ দিনে ছড়ানো, id ক্রমে (Analytics পেজের দৈনিক rollup-এ বাস্তবসম্মত দিন-সংখ্যা)
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - 90 * 86400 * (1 - i / size)))
+            rows.append((self.unique_claim(), score, "মিথ্যা" if score > 50 else "সত্য", "পরীক্ষামূলক ব্যাখ্যা", final, "seed", timestamp))
+            if len(rows) >= 5000 or i == size - 1:
+                conn.executemany("""
+                    INSERT INTO reports (text, score, verdict, justification, final_verdict, source, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+                rows = []
+        claim_index.ensure_built(conn)
+        conn.close()
+
+    def run_ops(self, path, fn, ops, concurrency):
+        latencies, errors = [], 0
+
+        def one(i):
+            started = time.perf_counter()
+            try:
+                ok = fn(i)
+            except Exception:
+                ok = False
+            return time.perf_counter() - started, ok is not False
+
+        calls_before = self.gemini.calls
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for seconds, ok in pool.map(one, range(ops)):
+                latencies.append(seconds)
+                errors += not ok
+        return summarize(path, self.args.db_size, concurrency, latencies, errors,
+                         time.perf_counter() - started, self.gemini.calls - calls_before)
+
+    # --- প্রতিটা path ---
+    def bench_gemini_analysis(self, ops, concurrency):
+        import gemini_analysis
+        claims = [self.unique_claim() for _ in range(ops)]
+        return self.run_ops("gemini_analysis", lambda i: gemini_analysis.get_gemini_analysis(claims[i]) is not None, ops, concurrency)
+
+    def bench_insert_report(self, ops, concurrency):
+        import verify_service
+        verifier = verify_service.get_verifier()
+        claims = [self.unique_claim() for _ in range(ops)]
+        result = {"score": 70, "verdict": "মিথ্যা", "justification": "পরীক্ষামূলক ব্যাখ্যা"}
+        return self.run_ops("insert_report", lambda i: verifier._persist(claims[i], result, "bench"), ops, concurrency)
+
+    def bench_fetch_all_reports(self, ops, concurrency):
+        # pagination-এর আগের অ্যাডমিন ড্যাশবোর্ডের পুরো-টেবিল query (তুলনার ভিত্তি), একটাই শেয়ার্ড কানেকশন
+        import pandas as pd
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        ops = max(3, ops // 20)  # পুরো টেবিল — বড় ডেটাবেসে প্রতিটা কয়েক সেকেন্ড
+        try:
+            return self.run_ops("fetch_all_reports", lambda i: pd.read_sql_query(
+                "SELECT * FROM reports ORDER BY timestamp DESC", conn), ops, concurrency)
+        finally:
+            conn.close()
+
+    def bench_fetch_reports_page(self, ops, concurrency):
+        # অ্যাডমিন টেবিলের keyset pagination (app.py-র fetch_reports_page-এর query)
+        import pandas as pd
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        columns = "id, timestamp, text, score, verdict, justification, final_verdict, updated_at, source"
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 1) FROM reports").fetchone()[0]
+        cursors = [conn.execute("SELECT timestamp, id FROM reports WHERE id <= ? ORDER BY id DESC LIMIT 1",
+                                (self.rng.randint(1, max_id),)).fetchone() for _ in range(ops)]
+
+        def page(i):
+            if cursors[i] is None or i % 2 == 0:
+                return pd.read_sql_query(f"SELECT {columns} FROM reports ORDER BY timestamp DESC, id DESC LIMIT 50", conn)
+            return pd.read_sql_query(
+                f"SELECT {columns} FROM reports WHERE (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT 50",
+                conn, params=cursors[i])
+        try:
+            return self.run_ops("fetch_reports_page", page, ops, concurrency)
+        finally:
+            conn.close()
+
+    def bench_analytics(self, ops, concurrency):
+        # app.py-র Analytics পেজের সব query (শুধু report_rollup) — db_size বাড়লেও একই থাকা উচিত
+        import report_rollup
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        def page(i):
+            days = [7, 30, 90, None][i % 4]
+            report_rollup.totals(conn)
+            report_rollup.daily(conn, days)
+            report_rollup.verdicts(conn, days)
+            report_rollup.score_histogram(conn, days)
+            report_rollup.backlog_ages(conn)
+            return report_rollup.sources(conn, days)
+        try:
+            return self.run_ops("analytics", page, ops, concurrency)
+        finally:
+            conn.close()
+
+    def bench_review_queue(self, ops, concurrency):
+        # অ্যাডমিনের এক রিভিউ: নিজের লিজ (না থাকলে কিউ থেকে নতুন batch) → প্রথমটা ট্যাগ।
+        # concurrency = একসাথে কয়জন রিভিউয়ার; অন্যের লিজে থাকা রিপোর্ট ট্যাগ হলে error গোনা হয়
+        import review_queue
+        import storage
+        store = storage.get_storage(self.db_path)
+        review_queue.sync_clusters(store)
+
+        def review(i):
+            reviewer = f"bench-{concurrency}-{threading.get_ident()}"  # প্রতি থ্রেডে একজন রিভিউয়ার
+            items = review_queue.leased(store, reviewer) or review_queue.claim(store, reviewer)
+            return bool(items) and bool(review_queue.tag(store, [items[0]["id"]], "মিথ্যা", reviewer))
+        return self.run_ops("review_queue", review, ops, concurrency)
+
+    def bench_verify(self, ops, concurrency):
+        import verify_service
+        verifier = verify_service.get_verifier()
+        claims = [self.unique_claim() for _ in range(ops)]
+        return self.run_ops("verify", lambda i: verifier.verify(claims[i], "bench"), ops, concurrency)
+
+    def bench_listener(self, ops, concurrency):
+        # পুরো লুপ: getUpdates → inbox → verify → sendMessage; প্রতি মেসেজ আলাদা চ্যাট,
+        # latency = add_message থেকে fake-এ উত্তর পৌঁছানো পর্যন্ত
+        import listener
+        fake = self.telegram
+        fake.sent.clear()
+        added = {}
+        base_chat = 10_000_000 * (concurrency + 1)
+        for i in range(ops):
+            chat_id = base_chat + i
+            fake.add_message(chat_id, self.unique_claim())
+            added[chat_id] = time.time()
+        calls_before = self.gemini.calls
+
+        async def main():
+            stop = asyncio.Event()
+            bot = listener.Listener(workers=concurrency, db_path=self.db_path)
+            bot.fetch = lambda offset: listener.get_updates(offset, timeout=1)
+            task = asyncio.create_task(bot.run(stop))
+            while sum(1 for c, _, _ in fake.sent if c >= base_chat) < ops:
+                await asyncio.sleep(0.02)
+            stop.set()
+            return await task
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        seconds = time.perf_counter() - started
+        latencies = [sent_at - added[chat_id] for chat_id, _, sent_at in fake.sent if chat_id in added]
+        errors = sum(1 for chat_id, text, _ in fake.sent if chat_id in added and "ত্রুটি" in text)
+        return summarize("listener", self.args.db_size, concurrency, latencies, errors, seconds,
+                         self.gemini.calls - calls_before)
+
+    def bench_telegram_bot(self, ops, concurrency):
+        # telebot handler-গুলো সরাসরি (polling ছাড়া): check_fact → verify → reply_to
+        import telebot
+        telebot.apihelper.API_URL = self.telegram.url + "/bot{0}/{1}"
+        import admission
+        import telegram_bot
+        telegram_bot.bot.threaded = False  # handler আমাদের থ্রেডেই, latency মাপার জন্য
+        # rate limit নয়, পুরো পথটাই মাপা — সীমা অনেক উঁচুতে
+        admission.save_limits({"chat_rate": 1000, "chat_burst": 1000, "global_rate": 1000, "global_burst": 1000}, self.db_path)
+        updates = [telebot.types.Update.de_json({
+            "update_id": i + 1,
+            "message": {"message_id": i + 1, "date": int(time.time()), "text": self.unique_claim(),
+                        "chat": {"id": 20_000_000 + i, "type": "private"},
+                        "from": {"id": 20_000_000 + i, "is_bot": False, "first_name": "bench"}},
+        }) for i in range(ops)]
+        return self.run_ops("telegram_bot", lambda i: telegram_bot.bot.process_new_updates([updates[i]]), ops, concurrency)
+
+    def run(self):
+        warnings.filterwarnings("ignore")
+        seed_started = time.perf_counter()
+        self.seed(self.args.db_size)
+        print(f"🌱 {self.args.db_size} রিপোর্ট seed: {time.perf_counter() - seed_started:.1f}s", file=sys.stderr)
+        import gemini_analysis
+        gemini_analysis.get_gemini_analysis(self.unique_claim())  # warmup — genai import/কানেকশন মাপে না
+        results = []
+        for path in self.args.paths.split(","):
+            for concurrency in [int(c) for c in self.args.concurrency.split(",")]:
+                result = getattr(self, f"bench_{path}")(self.args.ops, concurrency)
+                print(format_row(result), file=sys.stderr)
+                results.append(result)
+        self.gemini.stop()
+        self.telegram.stop()
+        return results
+
+
+# =====================================================
+# 📋 রিপোর্ট আর তুলনা
+# =====================================================
+HEADER = f"{'path':<20} {'db_size':>8} {'conc':>5} {'ops':>5} {'err':>4} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'model':>6}"
+
+
+def format_row(r):
+    def ms(v):
+        return "—" if v is None else f"{v:.1f}"
+    return (f"{r['path']:<20} {r['db_size']:>8} {r['concurrency']:>5} {r['ops']:>5} {r['errors']:>4} "
+            f"{r['throughput'] or 0:>9.1f} {ms(r['p50_ms']):>9} {ms(r['p95_ms']):>9} {ms(r['p99_ms']):>9} {r['model_calls']:>6}")
+
+
+def compare(old_path, new_path, threshold):
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["path"], r["db_size"], r["concurrency"]): r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+    regressions = 0
+    print(f"{'path':<20} {'db_size':>8} {'conc':>5} {'p95 old':>9} {'p95 new':>9} {'Δp95':>7} {'ops/s old':>10} {'ops/s new':>10} {'Δops/s':>7}")
+    for r in new:
+        o = old.get((r["path"], r["db_size"], r["concurrency"]))
+        if not o or not o["p95_ms"] or not o["throughput"]:
+            continue
+        d_p95 = (r["p95_ms"] - o["p95_ms"]) / o["p95_ms"] * 100
+        d_tp = (r["throughput"] - o["throughput"]) / o["throughput"] * 100
+        flag = d_p95 > threshold or d_tp < -threshold
+        regressions += flag
+        print(f"{r['path']:<20} {r['db_size']:>8} {r['concurrency']:>5} {o['p95_ms']:>9.1f} {r['p95_ms']:>9.1f} {d_p95:>+6.0f}% "
+              f"{o['throughput']:>10.1f} {r['throughput']:>10.1f} {d_tp:>+6.0f}%{'  ⚠️' if flag else ''}")
+    print(f"{regressions}টি regression (>{threshold:.0f}%)" if regressions else "✅ কোনো regression নেই")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hot path বেঞ্চমার্ক (fake Gemini + Telegram)")
+    parser.add_argument("--db-sizes", default="1000,10000,50000")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--ops", type=int, default=200, help="প্রতি (path, concurrency)-তে কয়টা অপারেশন")
+    parser.add_argument("--paths", default=",".join(PATHS))
+    parser.add_argument("--latency", type=float, default=0.05, help="fake Gemini-র latency (সেকেন্ড)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.02, help="Gemini 503 আর Telegram 500-এর হার")
+    parser.add_argument("--malformed-rate", type=float, default=0.02, help="ভাঙা JSON উত্তরের হার")
+    parser.add_argument("--send-latency", type=float, default=0.005, help="fake Telegram sendMessage latency")
+    parser.add_argument("--out", help="ফলাফলের JSON (ডিফল্ট: benchmarks/results/bench_<সময়>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="দুটো ফলাফল তুলনা")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression ধরার সীমা, %%")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db-size", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    if args.worker:
+        print(json.dumps(Worker(args).run(), ensure_ascii=False))
+        return
+
+    results = []
+    print(HEADER)
+    for size in [int(s) for s in args.db_sizes.split(",")]:
+        workdir = tempfile.mkdtemp(prefix="yachai_suite_")
+        env = dict(os.environ, YACHAI_DB_PATH=os.path.join(workdir, "data.db"))
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", "--db-size", str(size)]
+        for flag in ("concurrency", "ops", "paths", "latency", "jitter", "failure_rate", "malformed_rate", "send_latency"):
+            cmd += [f"--{flag.replace('_', '-')}", str(getattr(args, flag))]
+        proc = subprocess.run(cmd, env=env, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr[-3000:], file=sys.stderr)
+            sys.exit(f"❌ db_size={size} রান ব্যর্থ")
+        for r in json.loads(proc.stdout.strip().splitlines()[-1]):
+            print(format_row(r))
+            results.append(r)
+
+    git_rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    out = args.out or os.path.join(ROOT, "benchmarks", "results", datetime.now().strftime("bench_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    meta = {
+        "created_at": datetime.now().isoformat(timespec="seconds"), "git": git_rev,
+        "python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "cpus": os.cpu_count(),
+        "settings": {k: getattr(args, k) for k in ("db_sizes", "concurrency", "ops", "latency", "jitter",
+                                                   "failure_rate", "malformed_rate", "send_latency")},
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"💾 {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# =====================================================
+# ⏱️ BENCHMARK: webhook mode (রেকর্ড করা আপডেট POST, হাজার/মিনিট লোড)
+# =====================================================
+# python benchmarks/bench_webhook.py --target listener --rate 3000 --seconds 20
+# python benchmarks/bench_webhook.py --target telegram_bot --updates recorded_updates.jsonl
+#
+# লোকাল webhook instance-এ (FakeTelegram + FakeModel, নতুন temp data.db) নির্দিষ্ট হারে
+# আপডেট POST করা হয় — Telegram যেভাবে করে। মাপা হয়: 200 ack কত দ্রুত, POST থেকে প্রথম
+# উত্তর-মেসেজ (stream-এর প্রথম টুকরো) আর শেষ উত্তর (শেষ edit) পর্যন্ত latency, 503 কতটা। শেষে shutdown ডেকে দেখা হয়
+# গ্রহণ করা সব আপডেটের উত্তর গেছে কি না (graceful drain), আর ভুল secret-এ 401 আসে কি না।
+# --updates: প্রতি লাইনে একটা Telegram Update JSON (update_id আর chat id নতুন করে দেওয়া হয়)।
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_suite import CONSONANTS, SAMPLE_CLAIMS, VOWEL_SIGNS, percentile
+
+SECRET = "bench_secret_token"
+BASE_CHAT = 30_000_000
+
+
+def load_texts(path, count, rng):
+    if path:
+        with open(path, encoding="utf-8") as f:
+            texts = [(json.loads(line).get("message") or {}).get("text") for line in f if line.strip()]
+        texts = [t for t in texts if t]
+        return [texts[i % len(texts)] for i in range(count)]
+    # রেকর্ড না থাকলে: প্রতিটা আলাদা দাবি (ক্যাশ হিট নয়, পুরো পথটাই)
+    return [
+        SAMPLE_CLAIMS[i % len(SAMPLE_CLAIMS)].split()[0] + " " + " ".join(
+            "".join(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS) for _ in range(3)) for _ in range(12)
+        ) + f" {i}"
+        for i in range(count)
+    ]
+
+
+async def run(args):
+    import aiohttp
+    import model_router
+    import webhook
+    from fake_servers import FakeModel, FakeTelegram
+
+    fake_tg = FakeTelegram(token="123456:TEST", send_latency=args.send_latency).start()
+    model = FakeModel(latency=args.latency, jitter=args.jitter, seed=1, stream_chunks=args.chunks)
+    model_router._router = model_router.ModelRouter(["fake"], factory=lambda name: model, hedge=False)
+    db_path = os.environ["YACHAI_DB_PATH"]
+
+    if args.target == "listener":
+        import listener
+        listener.TELEGRAM_API_URL = fake_tg.url
+        listener.BOT_TOKEN = fake_tg.token
+        server = webhook.WebhookServer(None, name="listener", secret=SECRET, host="127.0.0.1", port=0,
+                                       workers=args.workers, queue_size=args.queue_size)
+        bot = listener.Listener(workers=args.workers, db_path=db_path, edit=listener.edit_message)
+        stop = asyncio.Event()
+        service = asyncio.create_task(bot.run(stop, webhook_server=server))
+        while server.runner is None:
+            await asyncio.sleep(0.01)
+    else:
+        import admission
+        import telebot
+        telebot.apihelper.API_URL = fake_tg.url + "/bot{0}/{1}"
+        os.environ.update({"GEMINI_API_KEY": "local", "TELEGRAM_BOT_TOKEN": fake_tg.token})
+        import telegram_bot
+        telegram_bot.bot.threaded = False
+        admission.save_limits({"chat_rate": 1000, "chat_burst": 1000, "global_rate": 1000, "global_burst": 1000}, db_path)
+        server = webhook.WebhookServer(telegram_bot.handle_update, name="telegram_bot", secret=SECRET,
+                                       host="127.0.0.1", port=0, workers=args.workers, queue_size=args.queue_size)
+        stop = asyncio.Event()
+        service = asyncio.create_task(webhook.serve(server, stop))
+        while server.runner is None:
+            await asyncio.sleep(0.01)
+
+    url = f"http://127.0.0.1:{server.port}{server.path}"
+    total = int(args.rate / 60 * args.seconds)
+    texts = load_texts(args.updates, total, random.Random(7))
+    posted_at, acks, statuses = {}, [], {}
+    gate = asyncio.Semaphore(args.connections)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.connections)) as session:
+        async with session.post(url, json={"update_id": 0}, headers={webhook.SECRET_HEADER: "wrong"}) as resp:
+            secret_ok = resp.status == 401
+
+        async def post(i):
+            chat_id = BASE_CHAT + i
+            update = {"update_id": i + 1, "message": {
+                "message_id": i + 1, "date": int(time.time()), "text": texts[i],
+                "chat": {"id": chat_id, "type": "private"}, "from": {"id": chat_id, "is_bot": False, "first_name": "bench"}}}
+            async with gate:
+                started = time.time()
+                async with session.post(url, json=update, headers={webhook.SECRET_HEADER: SECRET}) as resp:
+                    await resp.read()
+                    statuses[resp.status] = statuses.get(resp.status, 0) + 1
+                    if resp.status == 200:
+                        posted_at[chat_id] = started
+                        acks.append(time.time() - started)
+
+        # open-loop: হার ধরে পাঠানো, আগের উত্তরের অপেক্ষা না করে (Telegram-এর মতো)
+        started = time.perf_counter()
+        tasks = []
+        for i in range(total):
+            delay = started + i * 60 / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(post(i)))
+        await asyncio.gather(*tasks)
+        send_seconds = time.perf_counter() - started
+
+    # সব POST শেষ হওয়ার সাথে সাথে shutdown — drain-এ গ্রহণ করা সবকিছুর উত্তর যাওয়া উচিত
+    drain_started = time.perf_counter()
+    stop.set()
+    await service
+    drain_seconds = time.perf_counter() - drain_started
+    fake_tg.stop()
+
+    sent, final = {}, {}
+    for chat_id, _, sent_at in fake_tg.sent:
+        if chat_id in posted_at and chat_id not in sent:
+            sent[chat_id] = sent_at
+        final[chat_id] = max(final.get(chat_id, 0), sent_at)
+    for chat_id, _, _, edited_at in fake_tg.edits:
+        final[chat_id] = max(final.get(chat_id, 0), edited_at)  # stream: শেষ উত্তর edit হয়ে আসে
+    first = [sent[c] - posted_at[c] for c in sent]
+    e2e = [final[c] - posted_at[c] for c in sent]
+    return {
+        "target": args.target, "rate_per_min": args.rate, "posted": total, "statuses": statuses,
+        "achieved_per_min": round(total / send_seconds * 60, 1),
+        "ack_p50_ms": round(percentile(acks, 50) * 1000, 2) if acks else None,
+        "ack_p99_ms": round(percentile(acks, 99) * 1000, 2) if acks else None,
+        "first_reply_p50_ms": round(percentile(first, 50) * 1000, 2) if first else None,
+        "e2e_p50_ms": round(percentile(e2e, 50) * 1000, 2) if e2e else None,
+        "e2e_p95_ms": round(percentile(e2e, 95) * 1000, 2) if e2e else None,
+        "answered": len(sent), "accepted": len(posted_at), "edits": len(fake_tg.edits),
+        "drain_seconds": round(drain_seconds, 2),
+        "model_calls": model.calls, "secret_rejected": secret_ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", choices=["listener", "telegram_bot"], default="listener")
+    parser.add_argument("--rate", type=float, default=3000, help="আপডেট/মিনিট")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--updates", help="রেকর্ড করা আপডেট (JSONL)")
+    parser.add_argument("--connections", type=int, default=40, help="Telegram-এর max_connections-এর মতো")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake মডেলের latency (সেকেন্ড)")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--send-latency", type=float, default=0.0)
+    parser.add_argument("--chunks", type=int, default=8, help="stream-এ কয় টুকরো")
+    args = parser.parse_args()
+
+    os.environ["YACHAI_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="yachai_bench_"), "data.db")
+    result = asyncio.run(run(args))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    ok = result["secret_rejected"] and result["answered"] == result["accepted"]
+    print("✅ সব গ্রহণ করা আপডেটের উত্তর গেছে" if ok else "❌ কিছু আপডেটের উত্তর যায়নি / secret যাচাই ব্যর্থ")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================
+# ⏱️ BENCHMARK: report insert — প্রতি সারিতে commit বনাম group-commit writer
+# =====================================================
+# python benchmarks/bench_writer.py --concurrency 1,10,100 --ops 2000 --readers 2
+#
+# direct: আগের পথ — একটা শেয়ার্ড check_same_thread=False কানেকশন + lock, প্রতি সারিতে commit
+#         (journal_mode=WAL, synchronous ডিফল্ট FULL)।
+# group:  report_writer — এক writer থ্রেড, batch-এ commit (synchronous=NORMAL)।
+# প্রতি ১০টার একটা লেখা update_verdict (অ্যাডমিনের ট্যাগ), বাকিগুলো insert। --readers থাকলে
+# একই সময়ে অ্যাডমিন ড্যাশবোর্ডের query চলে (direct-এ একই কানেকশনে, group-এ read পুলে)।
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_suite import percentile
+
+RESULT = {"score": 70, "verdict": "মিথ্যা", "justification": "পরীক্ষামূলক ব্যাখ্যা"}
+PAGE_SQL = "SELECT id, timestamp, text, score, verdict, final_verdict FROM reports ORDER BY timestamp DESC, id DESC LIMIT 50"
+
+
+class Direct:
+    # আগের app.py/verify_service-এর মতো
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.lock = threading.Lock()
+
+    def insert(self, text):
+        with self.lock:
+            cur = self.conn.execute("""
+                INSERT INTO reports (text, score, verdict, justification, final_verdict, source)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (text, RESULT["score"], RESULT["verdict"], RESULT["justification"], None, "bench"))
+            self.conn.commit()
+            return cur.lastrowid
+
+    def update(self, report_id):
+        with self.lock:
+            self.conn.execute("UPDATE reports SET final_verdict=?, updated_at=CURRENT_TIMESTAMP WHERE id=?", ("মিথ্যা", report_id))
+            self.conn.commit()
+
+    def read(self):
+        with self.lock:
+            return self.conn.execute(PAGE_SQL).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+class Group:
+    def __init__(self, db_path):
+        import report_writer
+        self.writer = report_writer.ReportWriter(db_path)
+        self.pool = report_writer.ReadPool(db_path)
+
+    def insert(self, text):
+        return self.writer.insert_report(text, RESULT, "bench")
+
+    def update(self, report_id):
+        self.writer.update_verdict(report_id, "মিথ্যা")
+
+    def read(self):
+        with self.pool.connection() as conn:
+            return conn.execute(PAGE_SQL).fetchall()
+
+    def close(self):
+        self.writer.close()
+
+
+def run(mode, db_path, ops, concurrency, readers):
+    target = (Direct if mode == "direct" else Group)(db_path)
+    latencies, errors, reads = [], [0], []
+    stop = threading.Event()
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            if i % 10 == 9:
+                target.update(max(1, i - 5))
+            else:
+                target.insert(f"বেঞ্চমার্ক দাবি {mode} {concurrency} {i}")
+        except Exception:
+            errors[0] += 1
+        return time.perf_counter() - started
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            target.read()
+            reads.append(time.perf_counter() - started)
+
+    reader_threads = [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+    for t in reader_threads:
+        t.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(ops)))
+    seconds = time.perf_counter() - started
+    stop.set()
+    for t in reader_threads:
+        t.join()
+    stats = target.writer.stats() if mode == "group" else {}
+    target.close()
+    return {
+        "mode": mode, "concurrency": concurrency, "ops": ops, "errors": errors[0],
+        "throughput": round(ops / seconds, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "avg_batch": stats.get("avg_batch"),
+        "read_p99_ms": round(percentile(reads, 99) * 1000, 2) if reads else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", default="1,10,100")
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--modes", default="direct,group")
+    parser.add_argument("--readers", type=int, default=2, help="একসাথে চলা ড্যাশবোর্ড reader থ্রেড")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="yachai_bench_")
+    os.environ["YACHAI_DB_PATH"] = os.path.join(tmp, "data.db")
+    import verify_service
+    verify_service._open_db(os.environ["YACHAI_DB_PATH"]).close()  # reports টেবিল + rollup trigger, app-এর মতো
+
+    print(f"{'mode':<7} {'conc':>5} {'ops':>6} {'err':>4} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>6} {'read p99':>9}")
+    results = []
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        for mode in args.modes.split(","):
+            r = run(mode, os.environ["YACHAI_DB_PATH"], args.ops, concurrency, args.readers)
+            results.append(r)
+            print(f"{r['mode']:<7} {r['concurrency']:>5} {r['ops']:>6} {r['errors']:>4} {r['throughput']:>9.1f} "
+                  f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['avg_batch'] or '—':>6} {r['read_p99_ms'] or '—':>9}")
+    print(json.dumps(results, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import claim_index
+import storage
+import verdict_cache
+from claim_text import claim_key, normalize_claim
+
+# =====================================================
+# ✂️ CLAIM EXTRACTION (লম্বা পোস্ট → আলাদা আলাদা দাবি)
+# =====================================================
+# ব্যবহারকারীরা পুরো ফেসবুক পোস্ট/খবর পেস্ট করেন — পুরোটা এক প্রম্পটে পাঠালে ধীর,
+# টোকেন বেশি, আর সত্য-মিথ্যা মেশানো পোস্টে একটাই স্কোর আসে। এখন:
+# - বাক্য ধরে ভাগ করে ছোট দাবিগুলো (atomic claim) আলাদা করা, প্রশ্ন/লিংক/খুব ছোট অংশ বাদ
+# - প্রতিটা দাবি আগে ক্যাশ, অ্যাডমিন-যাচাই আর আগের অনুরূপ রিপোর্টের সাথে মেলানো
+# - শুধু নতুন দাবিগুলো সমান্তরালে মডেলে, TOKEN_BUDGET পেরোলে কম গুরুত্বপূর্ণগুলো বাদ
+# - ফল: প্রতি দাবির breakdown + পুরো পোস্টের স্কোর (সবচেয়ে সন্দেহজনক দাবিটাই)
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+MIN_POST_CHARS = int(os.getenv("CLAIM_SPLIT_MIN_CHARS", 280))  # এর ছোট টেক্সট একটাই দাবি
+MIN_CLAIM_CHARS = 15
+MAX_CLAIMS = int(os.getenv("CLAIM_MAX_CLAIMS", 12))
+TOKEN_BUDGET = int(os.getenv("CLAIM_TOKEN_BUDGET", 3000))  # প্রতি পোস্টে মডেলের আনুমানিক টোকেন
+PROMPT_OVERHEAD_TOKENS = 180  # get_gemini_analysis-এর প্রম্পট টেমপ্লেট + JSON উত্তর
+CHARS_PER_TOKEN = 3           # বাংলা টেক্সটে মোটামুটি
+WORKERS = int(os.getenv("CLAIM_WORKERS", 4))
+
+_SPLIT_RE = re.compile(r"(?<=[।!?.])\s+|\n+")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_DIGIT_RE = re.compile(r"[0-9০-৯]")
+
+
+def split_claims(text):
+    claims, seen = [], set()
+    for part in _SPLIT_RE.split(text or ""):
+        part = _URL_RE.sub(" ", part).strip(" \t-•*#")
+        part = " ".join(part.split())
+        if part.endswith("?") or len(normalize_claim(part)) < MIN_CLAIM_CHARS:
+            continue  # প্রশ্ন বা খুব ছোট অংশ যাচাইযোগ্য দাবি নয়
+        key = claim_key(part)
+        if key in seen:
+            continue
+        seen.add(key)
+        claims.append(part)
+    return claims
+
+
+def is_long(text):
+    return len(text or "") >= MIN_POST_CHARS and len(split_claims(text)) > 1
+
+
+def estimate_tokens(claim):
+    return PROMPT_OVERHEAD_TOKENS + len(claim) // CHARS_PER_TOKEN + 1
+
+
+def _priority(claim):
+    # বাজেট কম পড়লে আগে সংখ্যা/পরিমাণওয়ালা আর বড় দাবি — এগুলোই সাধারণত যাচাইযোগ্য তথ্য
+    return (bool(_DIGIT_RE.search(claim)), len(claim))
+
+
+def past_verdict(claim, db_path):
+    # আগে যাচাই হয়ে থাকলে: হুবহু ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → অনুরূপ AI রিপোর্ট
+    cached = verdict_cache.lookup(claim)
+    if cached and "score" in cached:
+        return {**cached, "origin": "cache"}
+    match = claim_index.find_reviewed(claim, db_path)
+    if match:
+        return {**{k: match[k] for k in ("score", "verdict", "justification", "final_verdict", "similarity")},
+                "origin": "reviewed"}
+    similar = claim_index.similar(claim, limit=1)
+    if not similar:
+        return None
+    report_id, similarity = similar[0]
+    try:
+        with storage.get_storage(db_path).reader() as conn:
+            row = conn.execute("SELECT score, verdict, justification FROM reports WHERE id=?", (report_id,)).fetchone()
+    except Exception as e:
+        logging.error(f"আগের রিপোর্ট পড়া ব্যর্থ: {e}")
+        return None
+    if not row or row[0] is None:
+        return None
+    return {"score": row[0], "verdict": row[1], "justification": row[2], "similarity": similarity, "origin": "report"}
+
+
+def analyze_post(text, analyze, db_path=DB_PATH, budget=TOKEN_BUDGET):
+    # analyze(claim) → {"score", "verdict", "justification", ...} বা None (মডেল কল)
+    claims = split_claims(text)
+    keep = set(sorted(claims, key=_priority, reverse=True)[:MAX_CLAIMS])
+    breakdown = [{"claim": c} for c in claims if c in keep]  # পোস্টের ক্রমেই
+
+    new = []
+    for item in breakdown:
+        past = past_verdict(item["claim"], db_path)
+        if past:
+            item.update(past)
+        else:
+            new.append(item)
+
+    spent, run = 0, []
+    for item in sorted(new, key=lambda i: _priority(i["claim"]), reverse=True):
+        cost = estimate_tokens(item["claim"])
+        if spent + cost > budget:
+            item["origin"] = "skipped"  # বাজেট শেষ — এই দাবিটা যাচাই হয়নি
+            continue
+        spent += cost
+        run.append(item)
+
+    if run:
+        with ThreadPoolExecutor(max_workers=min(WORKERS, len(run))) as pool:
+            for item, analysis in zip(run, pool.map(lambda i: analyze(i["claim"]), run)):
+                if analysis and "score" in analysis:
+                    item.update({k: analysis.get(k) for k in ("score", "verdict", "justification", "final_verdict")})
+                    item["origin"] = "model"
+                else:
+                    item["origin"] = "failed"
+
+    scored = [i for i in breakdown if i.get("score") is not None]
+    if not scored:
+        return None
+    worst = max(scored, key=lambda i: int(i["score"]))
+    suspicious = sum(1 for i in scored if int(i["score"]) > 50)
+    lines = [f"{len(breakdown)}টি দাবির মধ্যে {suspicious}টি সন্দেহজনক "
+             f"({sum(1 for i in breakdown if i.get('origin') == 'model')}টি নতুন যাচাই, "
+             f"{sum(1 for i in breakdown if i.get('origin') in ('cache', 'reviewed', 'report'))}টি আগের রিপোর্ট থেকে)।"]
+    for i in breakdown:
+        label = i.get("final_verdict") or i.get("verdict") or "যাচাই হয়নি"
+        score = f" ({int(i['score'])}%)" if i.get("score") is not None else ""
+        lines.append(f"• {i['claim'][:120]} → {label}{score}")
+    return {
+        "score": int(worst["score"]),
+        "verdict": worst.get("final_verdict") or worst.get("verdict", "N/A"),
+        "justification": "\n".join(lines),
+        "claims": breakdown,
+        "tokens_estimated": spent,
+    }
@@ -0,0 +1,307 @@
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import struct
+import threading
+import zlib
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+
+import report_archive
+import report_writer
+import storage
+from claim_text import shingles
+
+# =====================================================
+# 🧩 NEAR-DUPLICATE CLAIM INDEX (MinHash + LSH)
+# =====================================================
+# একটু ঘুরিয়ে লেখা বা ইমোজি/হ্যাশট্যাগ যোগ করা গুজবও যেন আগের রিপোর্টের সাথে মেলে।
+# reports.text-এর MinHash signature আর LSH band bucket আলাদা SQLite ফাইলে
+# (data.db-এর পাশে data.lsh.db) রাখা হয় — insert_report-এর সাথে সাথে আপডেট হয়।
+# lookup মানে প্রতি band-এ একটা indexed point query, প্রতিটায় সর্বোচ্চ BAND_LIMIT সারি —
+# তাই ভাইরাল ঢেউয়ে হাজারো কপি এক bucket-এ জমলেও খরচ বাঁধা (১০ লাখ রিপোর্টে p50 ~১ ms,
+# ৫,০০০ কপির ঢেউয়ে similar()/find_reviewed() কয়েক ms — benchmarks/bench_claim_index.py)।
+# যাচাইকৃত রিপোর্টগুলোর band আলাদা টেবিলে (reviewed_buckets) থাকে, যাতে ঢেউয়ের নতুন পেন্ডিং
+# কপির ভিড়ে পুরোনো যাচাইকৃতটা cap-এর বাইরে না পড়ে।
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+INDEX_PATH = os.path.splitext(DB_PATH)[0] + ".lsh.db"
+
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS  # threshold ≈ (1/BANDS)^(1/ROWS) ≈ 0.59
+SIMILARITY_THRESHOLD = 0.6
+MAX_CANDIDATES = 200
+BAND_LIMIT = MAX_CANDIDATES  # প্রতি band bucket থেকে সর্বোচ্চ কয়টা (নতুনগুলো আগে)
+SYNC_OVERLAP = timedelta(seconds=60)  # দেরিতে commit হওয়া ট্যাগ যেন watermark-এর ফাঁকে না পড়ে
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(397)  # ফিক্সড seed — persisted signature-এর সাথে মিল রাখতে
+_PERMS = [(_rng.randrange(1, 1 << 32), _rng.randrange(0, 1 << 32)) for _ in range(NUM_PERM)]
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(INDEX_PATH, check_same_thread=False, timeout=10)
+        report_writer.apply_pragmas(_conn)  # WAL + synchronous=NORMAL — প্রতি insert-এ fsync নয়
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                report_id INTEGER PRIMARY KEY,
+                sig BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                report_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, report_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS reviewed_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                report_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, report_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        _conn.commit()
+    return _conn
+
+
+def _shingle_hash(s):
+    return zlib.crc32(s.encode("utf-8"))
+
+
+def signature(text):
+    hashes = [_shingle_hash(s) for s in shingles(text)]
+    if not hashes:
+        return None
+    return [min([(a * h + b) % _MERSENNE for h in hashes]) & 0xFFFFFFFF for a, b in _PERMS]
+
+
+def _band_keys(sig):
+    keys = []
+    for band in range(BANDS):
+        chunk = struct.pack(f"<{ROWS}I", *sig[band * ROWS:(band + 1) * ROWS])
+        keys.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True)))
+    return keys
+
+
+def _similarity(a, b):
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def _rows_for(items):
+    sig_rows, bucket_rows = [], []
+    for report_id, text in items:
+        sig = signature(text)
+        if sig is None:
+            continue
+        sig_rows.append((report_id, array("I", sig).tobytes()))
+        bucket_rows.extend((band, key, report_id) for band, key in _band_keys(sig))
+    return sig_rows, bucket_rows
+
+
+def add_many(items):
+    sig_rows, bucket_rows = _rows_for(items)
+    with _lock:
+        conn = _get_conn()
+        conn.executemany("INSERT OR REPLACE INTO signatures (report_id, sig) VALUES (?, ?)", sig_rows)
+        conn.executemany("INSERT OR IGNORE INTO buckets (band, bucket, report_id) VALUES (?, ?, ?)", bucket_rows)
+        conn.commit()
+    return len(sig_rows)
+
+
+def add(report_id, text):
+    try:
+        add_many([(report_id, text)])
+    except Exception as e:
+        logging.error(f"Claim index update ব্যর্থ (ID {report_id}): {e}")
+
+
+def count():
+    with _lock:
+        return _get_conn().execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+
+def ensure_built(db_conn, batch_size=5000):
+    # প্রথমবার (বা index ফাইল মুছে গেলে) reports টেবিল থেকে backfill
+    last_id = db_conn.execute("SELECT COALESCE(MAX(id), 0) FROM reports").fetchone()[0]
+    with _lock:
+        indexed = _get_conn().execute("SELECT COALESCE(MAX(report_id), 0) FROM signatures").fetchone()[0]
+    if indexed >= last_id:
+        return 0
+    added = 0
+    while True:
+        rows = db_conn.execute(
+            "SELECT id, text FROM reports WHERE id > ? ORDER BY id LIMIT ?", (indexed, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        added += add_many(rows)
+        indexed = rows[-1][0]
+    with _lock:
+        # backfill হওয়া যাচাইকৃত রিপোর্টগুলো পরের find_reviewed-এ পুরো sync-এ উঠবে
+        conn = _get_conn()
+        conn.execute("DELETE FROM meta WHERE key IN ('reviewed_at', 'archived_at')")
+        conn.commit()
+    logging.info(f"🧩 Claim index backfilled: {added} reports")
+    return added
+
+
+def _candidate_ids(conn, sig, limit=MAX_CANDIDATES, table="buckets"):
+    # প্রতি band-এ নতুনগুলো আগে, সর্বোচ্চ BAND_LIMIT — পুরো ঢেউ কখনো GROUP BY/sort হয় না।
+    # তারপর যত বেশি band-এ মিল তত কাছের দাবি, সমানে নতুনটা আগে
+    hits = Counter()
+    for band, bucket in _band_keys(sig):
+        hits.update(r[0] for r in conn.execute(
+            f"SELECT report_id FROM {table} WHERE band=? AND bucket=? ORDER BY report_id DESC LIMIT ?",
+            (band, bucket, BAND_LIMIT)))
+    return sorted(hits, key=lambda rid: (-hits[rid], -rid))[:limit]
+
+
+def _signatures(conn, ids):
+    sigs = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        sigs.update(
+            (rid, array("I", blob))
+            for rid, blob in conn.execute(f"SELECT report_id, sig FROM signatures WHERE report_id IN ({marks})", chunk)
+        )
+    return sigs
+
+
+def _candidates(conn, sig):
+    return _signatures(conn, _candidate_ids(conn, sig))
+
+
+def similar(text, threshold=SIMILARITY_THRESHOLD, limit=10):
+    sig = signature(text)
+    if sig is None:
+        return []
+    with _lock:
+        cands = _candidates(_get_conn(), sig)
+    scored = [(rid, _similarity(sig, other)) for rid, other in cands.items()]
+    scored = [x for x in scored if x[1] >= threshold]
+    scored.sort(key=lambda x: (-x[1], -x[0]))
+    return scored[:limit]
+
+
+def _sync_reviewed(store):
+    # শেষ sync-এর পরে যাচাইকৃত হওয়া (partial index-এ range query) আর আর্কাইভে সরানো রিপোর্টগুলোর band
+    # reviewed_buckets-এ তোলা — দুই sync-এর মাঝে ট্যাগ হয়ে আর্কাইভে চলে গেলেও বাদ পড়ে না
+    with _lock:
+        marks = dict(_get_conn().execute("SELECT key, value FROM meta WHERE key IN ('reviewed_at', 'archived_at')"))
+    since = {key: (datetime.fromisoformat(value) - SYNC_OVERLAP).strftime("%Y-%m-%d %H:%M:%S") for key, value in marks.items()}
+    with store.reader() as conn:
+        if "reviewed_at" not in since:
+            rows = conn.execute("""
+                SELECT id, COALESCE(updated_at, timestamp) FROM reports WHERE final_verdict IS NOT NULL
+            """).fetchall()
+        else:
+            rows = conn.execute("""
+                SELECT id, COALESCE(updated_at, timestamp) FROM reports
+                WHERE final_verdict IS NOT NULL AND COALESCE(updated_at, timestamp) >= ?
+            """, (since["reviewed_at"],)).fetchall()
+    archived, archived_at = report_archive.archived_ids(store, since.get("archived_at"))
+    ids = [rid for rid, _ in rows] + archived
+    latest = {"reviewed_at": max((str(at) for _, at in rows if at is not None), default=None), "archived_at": archived_at}
+    new_marks = {key: max(v for v in (latest[key], marks.get(key), "1970-01-01 00:00:00") if v is not None) for key in latest}
+    if not ids and new_marks == marks:
+        return
+    with _lock:
+        conn = _get_conn()
+        sigs = _signatures(conn, ids)
+        conn.executemany(
+            "INSERT OR IGNORE INTO reviewed_buckets (band, bucket, report_id) VALUES (?, ?, ?)",
+            [(band, key, rid) for rid, sig in sigs.items() for band, key in _band_keys(sig)])
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", new_marks.items())
+        conn.commit()
+
+
+def _reviewed_ids(store, ids):
+    # ids-এর মধ্যে যেগুলো লাইভ টেবিলে যাচাইকৃত, আর যেগুলো লাইভ টেবিলে নেই (আর্কাইভে থাকতে পারে)
+    reviewed, live = [], set()
+    with store.reader() as conn:  # SQLite read পুল বা PostgreSQL pool
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for rid, final_verdict in conn.execute(
+                f"SELECT id, final_verdict FROM reports WHERE id IN ({marks})", chunk
+            ).fetchall():
+                live.add(rid)
+                if final_verdict is not None:
+                    reviewed.append(rid)
+    return reviewed, [i for i in ids if i not in live]
+
+
+def find_reviewed(text, db_path=DB_PATH, threshold=SIMILARITY_THRESHOLD):
+    # অনুরূপ দাবির মধ্যে অ্যাডমিন-যাচাইকৃত (final_verdict আছে) সবচেয়ে কাছেরটা।
+    # শুধু reviewed_buckets খোঁজা হয়, তাই শত শত পেন্ডিং কপির ভিড়েও যাচাইকৃত রিপোর্টটা বাদ পড়ে না
+    sig = signature(text)
+    if sig is None:
+        return None
+    keys = ["id", "text", "score", "verdict", "justification", "final_verdict"]
+    try:
+        store = storage.get_storage(db_path)
+        _sync_reviewed(store)
+        with _lock:
+            conn = _get_conn()
+            sigs = _signatures(conn, _candidate_ids(conn, sig, table="reviewed_buckets"))
+        sim = {rid: x for rid, x in ((rid, _similarity(sig, other)) for rid, other in sigs.items()) if x >= threshold}
+        if not sim:
+            return None
+        # reviewed_buckets পুরোনো হতে পারে (verdict তুলে নেওয়া, আর্কাইভে সরানো) — লাইভ টেবিলে যাচাই
+        reviewed, missing = _reviewed_ids(store, list(sim))
+        if reviewed:
+            best_id = max(reviewed, key=lambda rid: (sim[rid], rid))
+            with store.reader() as conn:
+                row = conn.execute(f"SELECT {', '.join(keys)} FROM reports WHERE id = ?", (best_id,)).fetchone()
+        else:
+            # পুরোনো যাচাইকৃত রিপোর্ট আর্কাইভে সরানো হয়ে থাকলে
+            rows = report_archive.lookup(store, {rid: sim[rid] for rid in missing}) if missing else []
+            row = max(rows, key=lambda r: (sim[r[0]], r[0])) if rows else None
+    except Exception as e:
+        logging.error(f"Near-duplicate lookup ব্যর্থ: {e}")
+        return None
+    if not row:
+        return None
+    return {**dict(zip(keys, row)), "similarity": sim[row[0]]}
+
+
+def clusters(report_ids, threshold=SIMILARITY_THRESHOLD):
+    # পেন্ডিং রিপোর্টগুলোকে অনুরূপতা অনুযায়ী গ্রুপ করা (union-find)
+    wanted = set(int(r) for r in report_ids)
+    parent = {r: r for r in wanted}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    with _lock:
+        conn = _get_conn()
+        for rid in wanted:
+            row = conn.execute("SELECT sig FROM signatures WHERE report_id=?", (rid,)).fetchone()
+            if not row:
+                continue
+            sig = array("I", row[0])
+            for other, other_sig in _candidates(conn, sig).items():
+                if other != rid and other in wanted and _similarity(sig, other_sig) >= threshold:
+                    parent[find(other)] = find(rid)
+
+    groups = {}
+    for rid in wanted:
+        groups.setdefault(find(rid), []).append(rid)
+    return sorted((sorted(g) for g in groups.values()), key=lambda g: (-len(g), g[0]))
@@ -0,0 +1,53 @@
+import hashlib
+import re
+import unicodedata
+
+# =====================================================
+# 🔤 CLAIM NORMALIZATION (বাংলা + ASCII)
+# =====================================================
+# একই দাবি ভিন্নভাবে টাইপ হলেও (যতিচিহ্ন, স্পেস, বাংলা/ইংরেজি অঙ্ক) যেন একই key পায়
+
+_BN_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+
+
+def normalize_claim(text):
+    t = unicodedata.normalize("NFC", text or "")
+    t = t.translate(_BN_DIGITS)
+    out = []
+    for ch in t:
+        cat = unicodedata.category(ch)
+        if cat.startswith("P"):
+            out.append(" ")  # । , ! ? “ ” ইত্যাদি → স্পেস
+        elif cat == "Cf":
+            continue  # ZWJ / ZWNJ key-তে দরকার নেই
+        else:
+            out.append(ch)
+    t = unicodedata.normalize("NFC", "".join(out).casefold())
+    return " ".join(t.split())
+
+
+def claim_key(text):
+    return hashlib.sha1(normalize_claim(text).encode("utf-8")).hexdigest()
+
+
+# =====================================================
+# 🧩 SHINGLES (near-duplicate খোঁজার জন্য)
+# =====================================================
+# ইমোজি, #হ্যাশট্যাগ, @মেনশন আর লিংক বাদ দিয়ে অক্ষর-ভিত্তিক shingle।
+# বাংলায় কার-চিহ্ন/হসন্ত আলাদা codepoint, তাই ৪-codepoint ≈ ২টা যুক্ত অক্ষর।
+
+SHINGLE_SIZE = 4
+_NOISE_RE = re.compile(r"(https?://\S+|www\.\S+|[#@]\S+)")
+
+
+def shingle_text(text):
+    t = normalize_claim(_NOISE_RE.sub(" ", text or ""))
+    t = "".join(ch for ch in t if not unicodedata.category(ch).startswith("S"))
+    return " ".join(t.split())
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    t = shingle_text(text)
+    if len(t) <= k:
+        return {t} if t else set()
+    return {t[i:i + k] for i in range(len(t) - k + 1)}
@@ -0,0 +1,248 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# =====================================================
+# 💾 ONLINE BACKUP (SQLite backup API + gzip + retention)
+# =====================================================
+# আগে shutil.copyfile("data.db") করা হত — WAL মোডে -wal ফাইলের লেখা বাদ পড়ত, তাই
+# ব্যাকআপ অসম্পূর্ণ হতে পারত, আর পুরো কপির সময় UI আটকে থাকত। এখন:
+# - sqlite3 backup API দিয়ে PAGES_PER_STEP পেজ করে কপি, মাঝে একটু বিরতি, একটাই
+#   read snapshot থেকে — লেখকেরা আটকায় না, আর কপিটা consistent
+# - gzip করে backups/ ফোল্ডারে, পাশে .json-এ সাইজ/সময়/checksum
+# - .gz খুলে আবার integrity_check (restore verification)
+# - retention: শেষ HOURLY ঘণ্টা, DAILY দিন, WEEKLY সপ্তাহ — প্রতিটাতে সবচেয়ে নতুনটা
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+BACKUP_DIR = os.getenv("YACHAI_BACKUP_DIR", "backups")
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.005  # সেকেন্ড — প্রতি ধাপের পরে লেখকদের সুযোগ
+KEEP_HOURLY = int(os.getenv("BACKUP_KEEP_HOURLY", 24))
+KEEP_DAILY = int(os.getenv("BACKUP_KEEP_DAILY", 7))
+KEEP_WEEKLY = int(os.getenv("BACKUP_KEEP_WEEKLY", 4))
+NAME_FORMAT = "backup_data_%Y%m%d_%H%M%S.db.gz"
+
+
+def _table_counts(conn):
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%'"
+    )]
+    return {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in tables}
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def verify_backup(path, expected_counts=None):
+    # .gz আলাদা ফাইলে restore করে integrity_check — আসল ডেটাবেস ছোঁয়া হয় না
+    fd, restored = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        with gzip.open(path, "rb") as src, open(restored, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        conn = sqlite3.connect(restored)
+        try:
+            integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            counts = _table_counts(conn)
+        finally:
+            conn.close()
+    finally:
+        os.remove(restored)
+    ok = integrity == "ok" and (expected_counts is None or counts == expected_counts)
+    return {"ok": ok, "integrity": integrity, "counts": counts}
+
+
+def run_backup(db_path=DB_PATH, backup_dir=BACKUP_DIR, progress=None, now=None):
+    # progress(phase, done_pages, total_pages) — UI-তে অগ্রগতি দেখানোর জন্য
+    os.makedirs(backup_dir, exist_ok=True)
+    now = now or datetime.now()
+    name = now.strftime(NAME_FORMAT)
+    path = os.path.join(backup_dir, name)
+    snapshot = os.path.join(backup_dir, f".{name}.snapshot")
+    started = time.perf_counter()
+
+    def report(phase, done=0, total=0):
+        if progress:
+            progress(phase, done, total)
+
+    def on_step(status, remaining, total):
+        report("copy", total - remaining, total)
+
+    src = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+    dst = sqlite3.connect(snapshot)
+    try:
+        # read transaction খোলা রাখা হয় — নইলে অন্য কানেকশন লিখলেই backup আবার শুরু থেকে
+        # চলে (ব্যস্ত সময়ে কখনো শেষ হয় না)। WAL মোডে এতে লেখকেরা আটকায় না।
+        src.execute("BEGIN")
+        src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        src.backup(dst, pages=PAGES_PER_STEP, progress=on_step, sleep=STEP_SLEEP)
+        src.execute("COMMIT")
+        counts = _table_counts(dst)
+    finally:
+        dst.close()
+        src.close()
+    copy_seconds = time.perf_counter() - started
+
+    report("compress")
+    raw_size = os.path.getsize(snapshot)
+    with open(snapshot, "rb") as f_in, gzip.open(path + ".part", "wb", compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out, 1 << 20)
+    os.replace(path + ".part", path)
+    os.remove(snapshot)
+
+    report("verify")
+    verification = verify_backup(path, counts)
+    meta = {
+        "file": name,
+        "created_at": now.isoformat(timespec="seconds"),
+        "raw_bytes": raw_size,
+        "bytes": os.path.getsize(path),
+        "sha256": _sha256(path),
+        "copy_seconds": round(copy_seconds, 3),
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "verified": verification["ok"],
+        "integrity": verification["integrity"],
+        "counts": counts,
+    }
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    if not verification["ok"]:
+        logging.error(f"Backup verification ব্যর্থ ({name}): {verification['integrity']}")
+    else:
+        logging.info(f"💾 Backup তৈরি: {name} ({meta['bytes'] / 1024:.0f} KB, {meta['total_seconds']:.1f}s)")
+    return meta
+
+
+def list_backups(backup_dir=BACKUP_DIR):
+    # নতুন থেকে পুরোনো
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = []
+    for name in os.listdir(backup_dir):
+        try:
+            created = datetime.strptime(name, NAME_FORMAT)
+        except ValueError:
+            continue
+        meta_path = os.path.join(backup_dir, name + ".json")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        meta.update({"file": name, "path": os.path.join(backup_dir, name), "created": created})
+        backups.append(meta)
+    return sorted(backups, key=lambda b: b["created"], reverse=True)
+
+
+def apply_retention(backup_dir=BACKUP_DIR, hourly=KEEP_HOURLY, daily=KEEP_DAILY, weekly=KEEP_WEEKLY):
+    keep = set()
+    for fmt, limit in (("%Y%m%d%H", hourly), ("%Y%m%d", daily), ("%G%V", weekly)):
+        seen = []
+        for b in list_backups(backup_dir):
+            bucket = b["created"].strftime(fmt)
+            if bucket in seen:
+                continue
+            if len(seen) >= limit:
+                break
+            seen.append(bucket)
+            keep.add(b["file"])  # প্রতি ঘণ্টা/দিন/সপ্তাহের সবচেয়ে নতুনটা
+    removed = []
+    for b in list_backups(backup_dir):
+        if b["file"] in keep:
+            continue
+        for p in (b["path"], b["path"] + ".json"):
+            if os.path.exists(p):
+                os.remove(p)
+        removed.append(b["file"])
+    return removed
+
+
+# =====================================================
+# 🧵 BACKGROUND JOB (Streamlit UI আটকায় না)
+# =====================================================
+class BackupJob:
+    def __init__(self, db_path=DB_PATH, backup_dir=BACKUP_DIR):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.phase = "copy"
+        self.done_pages = 0
+        self.total_pages = 0
+        self.result = None
+        self.error = None
+        self.removed = []
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._run, name="db-backup", daemon=True)
+
+    def _progress(self, phase, done, total):
+        self.phase = phase
+        if phase == "copy":
+            self.done_pages, self.total_pages = done, total
+
+    def _run(self):
+        try:
+            self.result = run_backup(self.db_path, self.backup_dir, progress=self._progress)
+            self.removed = apply_retention(self.backup_dir)
+            self.phase = "done"
+        except Exception as e:
+            logging.error(f"Backup ব্যর্থ: {e}")
+            self.error = str(e)
+
+    @property
+    def running(self):
+        return self.thread.is_alive()
+
+    @property
+    def fraction(self):
+        if self.result:
+            return 1.0
+        return self.done_pages / self.total_pages if self.total_pages else 0.0
+
+
+_job = None
+_job_lock = threading.Lock()
+
+
+def start_backup(db_path=DB_PATH, backup_dir=BACKUP_DIR):
+    # একসাথে একটাই ব্যাকআপ; চলমান থাকলে সেটাই ফেরত
+    global _job
+    with _job_lock:
+        if _job is None or not _job.running:
+            _job = BackupJob(db_path, backup_dir)
+            _job.thread.start()
+        return _job
+
+
+def current_job():
+    return _job
+
+
+if __name__ == "__main__":
+    # cron থেকে: python db_backup.py  (প্রতি ঘণ্টায়)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="SQLite online backup + retention")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--dir", default=BACKUP_DIR)
+    parser.add_argument("--verify", help="শুধু এই .gz ব্যাকআপটা যাচাই করো")
+    args = parser.parse_args()
+    if args.verify:
+        result = verify_backup(args.verify)
+        print(("✅" if result["ok"] else "❌"), result["integrity"], result["counts"])
+    else:
+        meta = run_backup(args.db, args.dir)
+        removed = apply_retention(args.dir)
+        print(f"💾 {meta['file']}: {meta['raw_bytes']} → {meta['bytes']} bytes, {meta['total_seconds']}s, verified={meta['verified']}")
+        if removed:
+            print(f"🗑️ retention: {len(removed)}টি পুরোনো ব্যাকআপ মুছে ফেলা হয়েছে")
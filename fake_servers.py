@@ -0,0 +1,318 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# =====================================================
+# 🧪 LOCAL FAKES (টেস্ট আর বেঞ্চমার্কের জন্য)
+# =====================================================
+# আসল Telegram Bot API-র বদলে লোকাল সার্ভার — listener.py-র TELEGRAM_API_URL
+# এখানে পয়েন্ট করালেই getUpdates / sendMessage এখানে আসে।
+# FakeModel — model_router-এর factory হিসেবে, latency আর failure ইচ্ছেমতো।
+# FakeGemini — একই FakeModel HTTP-র পেছনে, Gemini REST API-র মতো
+# (GEMINI_API_ENDPOINT=<url> দিলে আসল google-generativeai ক্লায়েন্টই এখানে কল করে)।
+
+
+class FakeTelegram:
+    def __init__(self, token="TEST", host="127.0.0.1", port=0, send_latency=0.0, failure_rate=0.0, seed=None):
+        self.token = token
+        self.send_latency = send_latency
+        self.failure_rate = failure_rate  # এই হারে sendMessage 500 দেয়
+        self._rng = random.Random(seed)
+        self.updates = []
+        self.sent = []  # (chat_id, text, সময়)
+        self.edits = []  # (chat_id, message_id, text, সময়) — streaming উত্তর
+        self._next_id = 1
+        self.throttled = 0  # পরের কয়টা sendMessage-এ 429 দেওয়া হবে
+        self.retry_after = 1
+        self.webhook = None  # setWebhook-এর params; সেট থাকলে getUpdates 409
+        self._cond = threading.Condition()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_message(self, chat_id, text):
+        with self._cond:
+            update = {
+                "update_id": self._next_id,
+                "message": {"message_id": self._next_id, "chat": {"id": chat_id}, "text": text, "date": int(time.time())},
+            }
+            self._next_id += 1
+            self.updates.append(update)
+            self._cond.notify_all()
+        return update
+
+    def wait_sent(self, count, timeout=30):
+        deadline = time.time() + timeout
+        with self._cond:
+            while len(self.sent) < count and time.time() < deadline:
+                self._cond.wait(timeout=0.1)
+        return len(self.sent) >= count
+
+    def throttle(self, count, retry_after=1):
+        # Telegram-এর 429 Too Many Requests অনুকরণ
+        with self._cond:
+            self.throttled = count
+            self.retry_after = retry_after
+
+    def _get_updates(self, params):
+        offset = int(params.get("offset") or 0)
+        timeout = min(float(params.get("timeout") or 0), 5)
+        limit = int(params.get("limit") or 100)
+        deadline = time.time() + timeout
+        with self._cond:
+            # Telegram-এর মতো: offset-এর আগের আপডেট confirmed ধরে বাদ
+            self.updates = [u for u in self.updates if u["update_id"] >= offset]
+            while not self.updates and time.time() < deadline:
+                self._cond.wait(timeout=deadline - time.time())
+            return self.updates[:limit]
+
+    def _edit_message(self, params):
+        with self._cond:
+            self.edits.append((int(params["chat_id"]), int(params["message_id"]), params.get("text", ""), time.time()))
+            self._cond.notify_all()
+            return {"message_id": int(params["message_id"]), "date": int(time.time()), "text": params.get("text", ""),
+                    "chat": {"id": int(params["chat_id"]), "type": "private"}}
+
+    def _send_message(self, params):
+        if self.send_latency:
+            time.sleep(self.send_latency)
+        with self._cond:
+            self.sent.append((int(params["chat_id"]), params.get("text", ""), time.time()))
+            self._cond.notify_all()
+            return {"message_id": len(self.sent), "date": int(time.time()), "text": params.get("text", ""),
+                    "chat": {"id": int(params["chat_id"]), "type": "private"}}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _params(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body = self.rfile.read(length).decode("utf-8")
+                    if "json" in (self.headers.get("Content-Type") or ""):
+                        params.update(json.loads(body))
+                    else:
+                        params.update({k: v[0] for k, v in parse_qs(body).items()})
+                return parsed.path, params
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _dispatch(self):
+                path, params = self._params()
+                m = re.match(r"^/bot([^/]+)/(\w+)$", path)
+                if not m or m.group(1) != fake.token:
+                    return self._reply(401, {"ok": False, "error_code": 401, "description": "Unauthorized"})
+                method = m.group(2)
+                if method == "setWebhook":
+                    fake.webhook = params
+                    return self._reply(200, {"ok": True, "result": True, "description": "Webhook was set"})
+                if method == "deleteWebhook":
+                    fake.webhook = None
+                    return self._reply(200, {"ok": True, "result": True, "description": "Webhook was deleted"})
+                if method == "getUpdates" and fake.webhook:
+                    return self._reply(409, {"ok": False, "error_code": 409,
+                                             "description": "Conflict: can't use getUpdates method while webhook is active"})
+                if method == "getUpdates":
+                    return self._reply(200, {"ok": True, "result": fake._get_updates(params)})
+                if method == "sendMessage" and fake.throttled:
+                    with fake._cond:
+                        fake.throttled -= 1
+                    return self._reply(429, {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after " + str(fake.retry_after),
+                                             "parameters": {"retry_after": fake.retry_after}})
+                if method == "sendMessage" and fake.failure_rate:
+                    with fake._cond:
+                        fail = fake._rng.random() < fake.failure_rate
+                    if fail:
+                        return self._reply(500, {"ok": False, "error_code": 500, "description": "Internal Server Error (injected)"})
+                if method == "sendMessage":
+                    return self._reply(200, {"ok": True, "result": fake._send_message(params)})
+                if method == "editMessageText":
+                    return self._reply(200, {"ok": True, "result": fake._edit_message(params)})
+                if method == "sendChatAction":
+                    return self._reply(200, {"ok": True, "result": True})
+                if method == "getMe":
+                    return self._reply(200, {"ok": True, "result": {"id": 1, "is_bot": True, "username": "yachai_fake_bot"}})
+                return self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+        return Handler
+
+
+class FakeResponse:
+    def __init__(self, text, prompt_tokens=0, output_tokens=0):
+        self.text = text
+        self.usage_metadata = type("UsageMetadata", (), {
+            "prompt_token_count": prompt_tokens,
+            "candidates_token_count": output_tokens,
+            "total_token_count": prompt_tokens + output_tokens,
+        })()
+
+
+class FakeStream:
+    # generate_content(stream=True)-এর মতো: টুকরো টুকরো, iterate শেষে .text-এ পুরোটা
+    def __init__(self, text, first_delay, chunk_delay, chunks, prompt_tokens=0):
+        size = max(1, -(-len(text) // chunks))
+        self._pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        self._first_delay = first_delay
+        self._chunk_delay = chunk_delay
+        self.text = ""
+        self.usage_metadata = FakeResponse(text, prompt_tokens, len(text) // 4).usage_metadata
+
+    def __iter__(self):
+        for i, piece in enumerate(self._pieces):
+            time.sleep(self._first_delay if i == 0 else self._chunk_delay)
+            self.text += piece
+            yield FakeResponse(piece)
+
+
+class FakeModel:
+    def __init__(self, name="fake-model", latency=0.1, jitter=0.0, failure_rate=0.0,
+                 malformed_rate=0.0, tail_rate=0.0, tail_latency=2.0, seed=None, reply=None,
+                 stream_chunks=8, first_token=0.3):
+        self.name = name
+        self.stream_chunks = stream_chunks  # stream=True হলে কয় টুকরোয়
+        self.first_token = first_token      # মোট latency-র কত অংশ প্রথম টুকরোর আগে
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate        # মাঝে মাঝে খুব ধীর উত্তর (tail latency)
+        self.tail_latency = tail_latency
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.reply = reply or (lambda prompt: '{"score": 80, "verdict": "মিথ্যা", "justification": "পরীক্ষামূলক উত্তর"}')
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            if self._rng.random() < self.tail_rate:
+                delay += self.tail_latency
+            fail = self._rng.random() < self.failure_rate
+            malformed = self._rng.random() < self.malformed_rate
+        text = "দুঃখিত, {ভাঙা JSON" if malformed else self.reply(prompt)
+        if stream and not fail:
+            first = delay * self.first_token
+            return FakeStream(text, first, (delay - first) / max(1, self.stream_chunks - 1),
+                              self.stream_chunks, prompt_tokens=len(prompt) // 4)
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{self.name}: 503 Service Unavailable (injected)")
+        return FakeResponse(text, prompt_tokens=len(prompt) // 4, output_tokens=len(text) // 4)
+
+
+class FakeGemini:
+    # POST /v1beta/models/<model>:generateContent — প্রতিটা মডেল নামের জন্য আলাদা FakeModel
+    def __init__(self, host="127.0.0.1", port=0, **model_kwargs):
+        self.model_kwargs = model_kwargs
+        self.models = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def model(self, name):
+        with self._lock:
+            if name not in self.models:
+                self.models[name] = FakeModel(name=name, **self.model_kwargs)
+            return self.models[name]
+
+    @property
+    def calls(self):
+        return sum(m.calls for m in self.models.values())
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _candidate(self, text):
+                return {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+
+            def do_POST(self):
+                m = re.match(r"^/v1(?:beta)?/models/([^/:?]+):(generateContent|streamGenerateContent)", self.path)
+                if not m:
+                    return self._reply(404, {"error": {"code": 404, "message": "Not Found", "status": "NOT_FOUND"}})
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+                prompt = "".join(
+                    part.get("text", "")
+                    for content in request.get("contents", [])
+                    for part in content.get("parts", [])
+                )
+                stream = m.group(2) == "streamGenerateContent"
+                try:
+                    response = fake.model(m.group(1)).generate_content(prompt, stream=stream)
+                except RuntimeError as e:
+                    return self._reply(503, {"error": {"code": 503, "message": str(e), "status": "UNAVAILABLE"}})
+                meta = response.usage_metadata
+                if stream:
+                    # REST stream: একটা JSON array, প্রতিটা element আলাদা করে লেখা (connection বন্ধে শেষ)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.end_headers()
+                    self.wfile.write(b"[")
+                    for i, chunk in enumerate(response):
+                        item = {"candidates": [self._candidate(chunk.text)]}
+                        self.wfile.write((",\r\n" if i else "").encode() + json.dumps(item, ensure_ascii=False).encode("utf-8"))
+                        self.wfile.flush()
+                    self.wfile.write(b"]")
+                    return
+                return self._reply(200, {
+                    "candidates": [{"content": {"parts": [{"text": response.text}], "role": "model"},
+                                    "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {"promptTokenCount": meta.prompt_token_count,
+                                      "candidatesTokenCount": meta.candidates_token_count,
+                                      "totalTokenCount": meta.total_token_count},
+                })
+
+        return Handler
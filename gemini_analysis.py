@@ -0,0 +1,377 @@
+import json
+import logging
+import math
+import os
+import re
+import time
+
+import metrics
+import model_router
+
+# =====================================================
+# 🧠 AI ANALYSIS (আসল Gemini) — পোর্টাল, বট আর CLI সবাই এটা ব্যবহার করে
+# =====================================================
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", 10))  # এক প্রম্পটে কয়টা দাবি
+
+# single বনাম batch — latency আর token খরচ তুলনার জন্য
+usage = {
+    mode: {"calls": 0, "claims": 0, "seconds": 0.0, "prompt_tokens": 0, "output_tokens": 0}
+    for mode in ("single", "batch")
+}
+
+
+def configure(api_key):
+    global GEMINI_API_KEY
+    GEMINI_API_KEY = api_key
+    model_router.configure(api_key)
+
+
+def _record_usage(mode, claims, seconds, response):
+    u = usage[mode]
+    u["calls"] += 1
+    u["claims"] += claims
+    u["seconds"] += seconds
+    meta = getattr(response, "usage_metadata", None)
+    if meta is not None:
+        u["prompt_tokens"] += getattr(meta, "prompt_token_count", 0) or 0
+        u["output_tokens"] += getattr(meta, "candidates_token_count", 0) or 0
+
+
+def usage_per_claim():
+    out = {}
+    for mode, u in usage.items():
+        n = u["claims"] or 1
+        out[mode] = {
+            "claims": u["claims"],
+            "calls": u["calls"],
+            "seconds_per_claim": u["seconds"] / n,
+            "tokens_per_claim": (u["prompt_tokens"] + u["output_tokens"]) / n,
+        }
+    return out
+
+
+# =====================================================
+# 🧾 STRUCTURED OUTPUT + VALIDATOR (জেসন)
+# =====================================================
+# আগে regex দিয়ে ``` আর greedy \{.*\} কেটে json.loads করা হতো — আগে-পরে একটু লেখা বা
+# justification-এ একটা "}" থাকলেই None, আর accept ব্যর্থ মানে পুরো কল আবার fallback মডেলে
+# (দ্বিগুণ latency আর খরচ)। এখন:
+# - মডেলকে response_schema দিয়ে শুধু JSON চাওয়া হয় (GEMINI_STRUCTURED=0 দিলে আগের মতো শুধু প্রম্পট)
+# - প্রথমে সরাসরি json.loads + কড়া যাচাই: score 0–100 পূর্ণসংখ্যা, verdict VERDICTS-এর একটা,
+#   justification খালি নয়
+# - না মিললে সস্তা লোকাল মেরামত: আগে-পরের লেখা/``` বাদ দিয়ে প্রথম পূর্ণ JSON (raw_decode),
+#   trailing comma, "৮৫" / "85%" স্কোর, ইংরেজি বা ["..."] আকারের verdict
+# - মেরামতের পরেও অচল হলে তবেই পরের মডেল
+# ফলাফল metrics.MODEL_OUTPUT-এ: ok / repaired (একটা retry বাঁচল) / invalid (retry হলো)
+
+STRUCTURED = os.getenv("GEMINI_STRUCTURED", "1") == "1"
+VERDICTS = ("সত্য", "সম্ভবত সত্য", "বিভ্রান্তিকর", "সম্ভবত মিথ্যা", "মিথ্যা")
+MAX_CANDIDATES = 20  # মেরামতে সর্বোচ্চ কয়টা "{" / "[" থেকে চেষ্টা
+
+_VERDICT_ALIASES = {
+    "true": "সত্য", "mostly true": "সম্ভবত সত্য", "likely true": "সম্ভবত সত্য", "probably true": "সম্ভবত সত্য",
+    "misleading": "বিভ্রান্তিকর", "mixed": "বিভ্রান্তিকর", "half true": "বিভ্রান্তিকর",
+    "likely false": "সম্ভবত মিথ্যা", "probably false": "সম্ভবত মিথ্যা", "mostly false": "সম্ভবত মিথ্যা",
+    "false": "মিথ্যা", "fake": "মিথ্যা",
+}
+_TO_ASCII = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_DECODER = json.JSONDecoder()
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "verdict": {"type": "string", "enum": list(VERDICTS)},
+        "justification": {"type": "string"},
+    },
+    "required": ["score", "verdict", "justification"],
+}
+BATCH_SCHEMA = {
+    "type": "array",
+    "items": {
+        **ANALYSIS_SCHEMA,
+        "properties": {"id": {"type": "string"}, **ANALYSIS_SCHEMA["properties"]},
+        "required": ["id"] + ANALYSIS_SCHEMA["required"],
+    },
+}
+
+
+def _structured(schema):
+    # generate_content-এর kwargs — Gemini নিজেই schema মেনে JSON দেয়
+    if not STRUCTURED:
+        return {}
+    return {"generation_config": {"response_mime_type": "application/json", "response_schema": schema}}
+
+
+def validate_analysis(data):
+    # কড়া যাচাই — ঠিক থাকলে পরিষ্কার dict, না হলে ValueError
+    if not isinstance(data, dict):
+        raise ValueError("JSON অবজেক্ট নয়")
+    score = data.get("score")
+    # json.loads Infinity/NaN মেনে নেয় — int()-এর আগেই বাদ (নইলে OverflowError)
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or (isinstance(score, float) and not math.isfinite(score)) or score != int(score):
+        raise ValueError(f"score পূর্ণসংখ্যা নয়: {score!r}")
+    if not 0 <= score <= 100:
+        raise ValueError(f"score ০–১০০-এর বাইরে: {score}")
+    if data.get("verdict") not in VERDICTS:
+        raise ValueError(f"অজানা verdict: {data.get('verdict')!r}")
+    justification = data.get("justification")
+    if not isinstance(justification, str) or not justification.strip():
+        raise ValueError("justification নেই")
+    return {"score": int(score), "verdict": data["verdict"], "justification": justification.strip()}
+
+
+def _repair_fields(data):
+    # প্রায়-ঠিক মানগুলো ঠিক করা; যাচাই তারপরও validate_analysis-এর
+    if not isinstance(data, dict):
+        return data
+    data = dict(data)
+    score = data.get("score")
+    if isinstance(score, str):
+        m = re.search(r"\d+(?:\.\d+)?", score.translate(_TO_ASCII))
+        score = float(m.group(0)) if m else score
+    if isinstance(score, float) and math.isfinite(score) and not score.is_integer():
+        score = round(score)
+    data["score"] = score
+    verdict = data.get("verdict")
+    if isinstance(verdict, list) and len(verdict) == 1:  # প্রম্পটের টেমপ্লেট দেখে ["মিথ্যা"]
+        verdict = verdict[0]
+    if isinstance(verdict, str):
+        verdict = " ".join(verdict.replace("\u200c", "").replace("\u200d", "").strip(" \"'.।").split())
+        verdict = _VERDICT_ALIASES.get(verdict.lower(), verdict)
+    data["verdict"] = verdict
+    if isinstance(data.get("justification"), list):
+        data["justification"] = " ".join(str(j) for j in data["justification"])
+    return data
+
+
+def _json_values(text, opener):
+    # প্রতিটা opener ("{" বা "[") থেকে raw_decode — যেখান থেকে পুরো JSON পাওয়া যায় (greedy regex নয়)
+    i = text.find(opener)
+    for _ in range(MAX_CANDIDATES):
+        if i == -1:
+            return
+        try:
+            value, end = _DECODER.raw_decode(text, i)
+        except ValueError:
+            i = text.find(opener, i + 1)
+            continue
+        yield value
+        i = text.find(opener, end)
+
+
+def _repaired_texts(text):
+    text = (text or "").strip().lstrip("\ufeff")
+    yield text
+    fixed = _TRAILING_COMMA_RE.sub(r"\1", text)
+    if fixed != text:
+        yield fixed
+
+
+def _observe(kind, outcome, started):
+    metrics.JSON_PARSE.observe(time.perf_counter() - started, kind, outcome)
+    metrics.MODEL_OUTPUT.inc(kind, outcome)
+
+
+def parse_analysis(text):
+    # (analysis বা None, "ok" / "repaired" / "invalid")
+    started = time.perf_counter()
+    try:
+        analysis = validate_analysis(json.loads(text))
+        _observe("object", "ok", started)
+        return analysis, "ok"
+    except (TypeError, ValueError):
+        pass
+    for candidate in _repaired_texts(text):
+        for value in _json_values(candidate, "{"):
+            try:
+                analysis = validate_analysis(_repair_fields(value))
+            except ValueError:
+                continue
+            _observe("object", "repaired", started)
+            return analysis, "repaired"
+    _observe("object", "invalid", started)
+    logging.error(f"Model JSON অচল (মেরামতেও হয়নি): {(text or '')[:200]!r}")
+    return None, "invalid"
+
+
+def _batch_items(value):
+    # [(id, analysis)] — অচল item বাদ (সেগুলো পরে আলাদা করে যাচাই হয়), কোনোটা মেরামত হলো কি না
+    items, repaired = [], False
+    for item in value:
+        if not isinstance(item, dict) or item.get("id") is None:
+            continue
+        try:
+            items.append((str(item["id"]), validate_analysis(item)))
+            continue
+        except ValueError:
+            pass
+        try:
+            items.append((str(item["id"]), validate_analysis(_repair_fields(item))))
+            repaired = True
+        except ValueError:
+            continue
+    return items, repaired
+
+
+def parse_analysis_array(text):
+    # batch উত্তর: ([(id, analysis)] বা None, outcome)
+    started = time.perf_counter()
+    try:
+        value = json.loads(text)
+        if isinstance(value, list):
+            items, repaired = _batch_items(value)
+            if items and not repaired and len(items) == len(value):
+                _observe("array", "ok", started)
+                return items, "ok"
+    except (TypeError, ValueError):
+        pass
+    for candidate in _repaired_texts(text):
+        for value in _json_values(candidate, "["):
+            if not isinstance(value, list):
+                continue
+            items, _ = _batch_items(value)
+            if items:
+                _observe("array", "repaired", started)
+                return items, "repaired"
+    _observe("array", "invalid", started)
+    logging.error(f"Batch JSON অচল (মেরামতেও হয়নি): {(text or '')[:200]!r}")
+    return None, "invalid"
+
+
+def parse_stats():
+    # এই প্রসেসে: কতগুলো উত্তর সরাসরি ঠিক, কতগুলো মেরামতে বাঁচল (retry এড়ানো), কতগুলো অচল (retry)
+    counts = {"ok": 0, "repaired": 0, "invalid": 0}
+    for (kind, outcome), n in list(metrics.MODEL_OUTPUT.values.items()):
+        counts[outcome] = counts.get(outcome, 0) + n
+    total = sum(counts.values())
+    return {**counts, "total": total, "retries_avoided": counts["repaired"],
+            "failure_rate": counts["invalid"] / total if total else 0.0}
+
+
+_PARTIAL_NUMBER_RE = r'"{}"\s*:\s*"?(\d+(?:\.\d+)?)"?\s*[,}}\n]'
+_PARTIAL_STRING_RE = r'"{}"\s*:\s*"((?:[^"\\]|\\.)*)("?)'
+
+
+def parse_partial_json(text):
+    # stream চলাকালীন অসম্পূর্ণ JSON থেকে যতটুকু পাওয়া যায় — শুধু দেখানোর জন্য,
+    # চূড়ান্ত ফলাফল সবসময় পুরো উত্তরের parse_analysis থেকে
+    partial = {}
+    m = re.search(_PARTIAL_NUMBER_RE.format("score"), text)
+    if m and math.isfinite(float(m.group(1))):
+        partial["score"] = int(float(m.group(1)))
+    for key in ("verdict", "justification"):
+        m = re.search(_PARTIAL_STRING_RE.format(key), text, flags=re.S)
+        if not m or (key == "verdict" and not m.group(2)):
+            continue  # verdict অর্ধেক দেখানো হয় না
+        raw = re.sub(r"\\u[0-9a-fA-F]{0,3}$", "", m.group(1))  # \uXXXX-এর মাঝখানে কাটা
+        try:
+            partial[key] = json.loads(f'"{raw}"')
+        except ValueError:
+            partial[key] = raw
+    # চূড়ান্ত যাচাইয়ে যা টিকবে না সেটা আগেই দেখানো হয় না
+    if partial.get("verdict") not in VERDICTS:
+        partial.pop("verdict", None)
+    if not 0 <= partial.get("score", 0) <= 100:
+        partial.pop("score")
+    return partial
+
+
+def get_gemini_analysis(text_to_analyze, on_partial=None):
+    # on_partial(dict) দিলে উত্তর stream হয় — প্রতি টুকরোয় parse_partial_json-এর ফল
+    try:
+        prompt = f"""
+        তুমি 'যাচাই' নামের একজন AI ফ্যাক্ট-চেকার।
+        নিচের টেক্সট বিশ্লেষণ করো: "{text_to_analyze}"
+        শুধু JSON আকারে উত্তর দাও:
+        {{
+          "score": [০-১০০, পূর্ণসংখ্যা],
+          "verdict": "[এগুলোর একটি: {' / '.join(VERDICTS)}]",
+          "justification": "[বাংলায় সংক্ষিপ্ত ব্যাখ্যা]"
+        }}
+        """
+
+        # মডেল বাছাই, fallback আর hedging model_router-এর কাজ; পরের মডেলে যাওয়া শুধু মেরামতেও অচল উত্তরে
+        parsed = {}
+
+        def accept(text):
+            parsed["analysis"] = parse_analysis(text)[0]
+            return parsed["analysis"] is not None
+
+        started = time.perf_counter()
+        if on_partial is None:
+            _, response = model_router.get_router().generate(
+                prompt, accept=lambda r: accept(r.text), **_structured(ANALYSIS_SCHEMA)
+            )
+        else:
+            _, _, response = model_router.get_router().generate_stream(
+                prompt, lambda so_far: on_partial(parse_partial_json(so_far)),
+                accept=accept, **_structured(ANALYSIS_SCHEMA),
+            )
+        _record_usage("single", 1, time.perf_counter() - started, response)
+        return parsed["analysis"]
+    except Exception as e:
+        logging.error(f"Gemini error: {e}")
+        return None
+
+
+# =====================================================
+# 📦 BATCH ANALYSIS (এক প্রম্পটে অনেক দাবি)
+# =====================================================
+# bulk re-scoring বা বটের জমে থাকা মেসেজ একসাথে পাঠাতে। উত্তরে যেসব id
+# নেই বা ভুল ফরম্যাটে এসেছে, শুধু সেগুলো আলাদাভাবে get_gemini_analysis দিয়ে চলে।
+
+def _batch_prompt(items):
+    claims = "\n".join(json.dumps({"id": str(cid), "text": text}, ensure_ascii=False) for cid, text in items)
+    return f"""
+        তুমি 'যাচাই' নামের একজন AI ফ্যাক্ট-চেকার।
+        নিচের প্রতিটি দাবি (প্রতি লাইনে একটি JSON) আলাদাভাবে বিশ্লেষণ করো:
+{claims}
+        শুধু একটি JSON array আকারে উত্তর দাও, প্রতিটি দাবির জন্য একটি অবজেক্ট, একই id সহ:
+        [
+          {{
+            "id": "[দাবির id]",
+            "score": [০-১০০, পূর্ণসংখ্যা],
+            "verdict": "[এগুলোর একটি: {' / '.join(VERDICTS)}]",
+            "justification": "[বাংলায় সংক্ষিপ্ত ব্যাখ্যা]"
+          }}
+        ]
+        """
+
+
+def _analyze_chunk(items):
+    prompt = _batch_prompt(items)
+    parsed = {}
+
+    def accept(response):
+        parsed["items"] = parse_analysis_array(response.text)[0]
+        return parsed["items"] is not None
+
+    try:
+        started = time.perf_counter()
+        _, response = model_router.get_router().generate(prompt, accept=accept, **_structured(BATCH_SCHEMA))
+        _record_usage("batch", len(items), time.perf_counter() - started, response)
+    except Exception as e:
+        logging.warning(f"Batch ব্যর্থ: {e}")
+        return {}
+    wanted = {str(cid): cid for cid, _ in items}
+    return {wanted[item_id]: analysis for item_id, analysis in parsed["items"] if item_id in wanted}
+
+
+def get_gemini_batch_analysis(items, batch_size=None):
+    # items: [(id, text), ...] → {id: analysis বা None}
+    batch_size = batch_size or BATCH_SIZE
+    items = list(items)
+    results = {}
+    for start in range(0, len(items), batch_size):
+        chunk = items[start:start + batch_size]
+        got = _analyze_chunk(chunk) if len(chunk) > 1 else {}
+        missing = [(cid, text) for cid, text in chunk if cid not in got]
+        if missing and len(chunk) > 1:
+            logging.warning(f"Batch উত্তরে {len(missing)}/{len(chunk)} টি দাবি নেই — আলাদাভাবে যাচাই হচ্ছে")
+        for cid, text in missing:
+            got[cid] = get_gemini_analysis(text)
+        results.update(got)
+    return results
@@ -0,0 +1,216 @@
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import claim_index
+import gemini_analysis
+import storage
+import verdict_cache
+
+# =====================================================
+# 📥 BULK CLAIM IMPORT (JSONL → যাচাই → reports)
+# =====================================================
+# python import_claims.py partner_dump.jsonl --workers 8 --batch-size 10
+# - ফাইল লাইন ধরে পড়া হয় (মেমোরি স্থির), একসাথে সর্বোচ্চ workers*2 টা batch চলমান
+# - প্রতিটা দাবি: আগে ভার্ডিক্ট ক্যাশ, তারপর অনুরূপ অ্যাডমিন-যাচাই, না পেলে batch Gemini
+# - ফলাফল executemany দিয়ে, আর checkpoint (কোন byte পর্যন্ত শেষ) একই ট্রানজ্যাকশনে (SQLite বা PostgreSQL) —
+#   ক্র্যাশের পরে আবার চালালে ঠিক সেখান থেকে শুরু, কোনো দাবি দুবার ঢোকে না
+# - যেগুলো যাচাই হয়নি সেগুলো <file>.failed.jsonl-এ, পরে আবার চালানোর জন্য
+
+TEXT_FIELDS = ("text", "claim", "body")  # --field না দিলে এগুলোর প্রথমটা যেটা আছে
+PROGRESS_EVERY = 2.0  # সেকেন্ড
+
+
+def _claim_text(line, field):
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(item, dict):
+        return None
+    fields = (field,) if field else TEXT_FIELDS
+    for f in fields:
+        value = item.get(f)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def read_batches(path, start_offset, start_line, batch_size, field):
+    # (শুরুর byte, শেষের byte, শেষ লাইন নম্বর, [(line_no, text)], skipped) — একটা একটা করে
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        offset, line_no = start_offset, start_line
+        batch, skipped, batch_start = [], 0, offset
+        for raw in f:
+            offset += len(raw)
+            line_no += 1
+            if raw.strip():
+                text = _claim_text(raw.decode("utf-8", errors="replace"), field)
+                if text is None:
+                    skipped += 1
+                    logging.warning(f"লাইন {line_no}: দাবির টেক্সট পাওয়া যায়নি — বাদ")
+                else:
+                    batch.append((line_no, text))
+            if len(batch) >= batch_size:
+                yield batch_start, offset, line_no, batch, skipped
+                batch, skipped, batch_start = [], 0, offset
+        if batch or skipped or offset > batch_start:
+            yield batch_start, offset, line_no, batch, skipped
+
+
+def verify_batch(items, db_path, batch_size):
+    # পোর্টালের মতোই: ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → Gemini
+    results, unknown = {}, []
+    for line_no, text in items:
+        cached = verdict_cache.lookup(text)
+        if cached and "score" in cached:
+            results[line_no] = cached
+            continue
+        match = claim_index.find_reviewed(text, db_path)
+        if match:
+            results[line_no] = {k: match[k] for k in ("score", "verdict", "justification", "final_verdict")}
+            continue
+        unknown.append((line_no, text))
+    if unknown:
+        texts = dict(unknown)
+        for line_no, analysis in gemini_analysis.get_gemini_batch_analysis(unknown, batch_size=batch_size).items():
+            results[line_no] = analysis
+            if analysis:
+                verdict_cache.store(texts[line_no], analysis)
+    return results
+
+
+class Importer:
+    def __init__(self, path, db_path, workers, batch_size, field=None, restart=False):
+        self.path = path
+        self.source = os.path.realpath(path)
+        self.db_path = db_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.field = field
+        self.store = storage.get_storage(db_path)  # reports/import_progress টেবিল না থাকলে তৈরি করে নেয়
+        self.failed_path = path + ".failed.jsonl"
+        self.total_bytes = os.path.getsize(path)
+        if restart:
+            self.store.write(lambda conn: conn.execute("DELETE FROM import_progress WHERE source=?", (self.source,)))
+        with self.store.reader() as conn:
+            row = conn.execute(
+                "SELECT byte_offset, line_no, imported, failed, skipped FROM import_progress WHERE source=?", (self.source,)
+            ).fetchone()
+        self.offset, self.line_no, self.imported, self.failed, self.skipped = row or (0, 0, 0, 0, 0)
+        self.start_offset = self.offset
+        self.start_imported = self.imported
+        if row:
+            logging.info(f"↩️ আগের রান থেকে চালু: লাইন {self.line_no}, {self.imported} ইম্পোর্ট হয়েছে")
+
+    def _commit(self, batch, results):
+        # একটা batch-এর সব রিপোর্ট + checkpoint একই ট্রানজ্যাকশনে
+        _, end, last_line, items, skipped = batch
+        rows, failed = [], []
+        for line_no, text in items:
+            a = results.get(line_no)
+            if a:
+                rows.append((text, int(a["score"]), a.get("verdict", "N/A"), a.get("justification", ""), a.get("final_verdict")))
+            else:
+                failed.append(text)
+        if failed:
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                for text in failed:
+                    f.write(json.dumps({"text": text}, ensure_ascii=False) + "\n")
+        self.imported += len(rows)
+        self.failed += len(failed)
+        self.skipped += skipped
+        self.offset, self.line_no = end, last_line
+        progress = (self.source, self.offset, self.line_no, self.imported, self.failed, self.skipped)
+        self.store.write(lambda conn: self._save(conn, rows, progress))
+
+    def _save(self, conn, rows, progress):
+        if rows:
+            conn.executemany("""
+                INSERT INTO reports (text, score, verdict, justification, final_verdict, source)
+                VALUES (?, ?, ?, ?, ?, 'import')
+            """, rows)
+        conn.execute("""
+            INSERT INTO import_progress (source, byte_offset, line_no, imported, failed, skipped, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(source) DO UPDATE SET
+                byte_offset=excluded.byte_offset, line_no=excluded.line_no, imported=excluded.imported,
+                failed=excluded.failed, skipped=excluded.skipped, updated_at=excluded.updated_at
+        """, progress)
+
+    def _progress(self, started):
+        elapsed = time.perf_counter() - started
+        done_bytes = self.offset - self.start_offset
+        rate = (self.imported - self.start_imported) / elapsed if elapsed else 0.0
+        eta = (self.total_bytes - self.offset) / (done_bytes / elapsed) if done_bytes and elapsed else None
+        pct = 100 * self.offset / self.total_bytes if self.total_bytes else 100.0
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "—"
+        print(f"📥 {pct:5.1f}% | লাইন {self.line_no} | {self.imported} ইম্পোর্ট, {self.failed} ব্যর্থ, "
+              f"{self.skipped} বাদ | {rate:.2f} claims/s | ETA {eta_text}", flush=True)
+
+    def run(self):
+        started = time.perf_counter()
+        last_report = started
+        batches = read_batches(self.path, self.offset, self.line_no, self.batch_size, self.field)
+        running = {}  # future → batch
+        finished = {}  # শুরুর byte → (batch, results); ক্রম ঠিক রেখে commit করার জন্য
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                # bounded: একসাথে workers*2 টার বেশি batch মেমোরিতে নয়
+                while not exhausted and len(running) + len(finished) < self.workers * 2:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    running[pool.submit(verify_batch, batch[3], self.db_path, self.batch_size)] = batch
+                if not running and not finished:
+                    break
+                done, _ = wait(running, timeout=PROGRESS_EVERY, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = running.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logging.error(f"Batch যাচাই ব্যর্থ (লাইন {batch[3][0][0] if batch[3] else batch[2]}): {e}")
+                        results = {}
+                    finished[batch[0]] = (batch, results)
+                # checkpoint শুধু ধারাবাহিক অংশ পর্যন্ত এগোয়
+                while self.offset in finished:
+                    self._commit(*finished.pop(self.offset))
+                if time.perf_counter() - last_report >= PROGRESS_EVERY:
+                    self._progress(started)
+                    last_report = time.perf_counter()
+        with self.store.reader() as conn:
+            claim_index.ensure_built(conn)  # নতুন রিপোর্টগুলো near-duplicate index-এ
+        self._progress(started)
+        return self.imported - self.start_imported
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="JSONL দাবি ফাইল যাচাই করে reports-এ ইম্পোর্ট")
+    parser.add_argument("path", help="JSONL ফাইল (প্রতি লাইনে একটা JSON অবজেক্ট)")
+    parser.add_argument("--db", default=os.getenv("YACHAI_DB_PATH", "data.db"))
+    parser.add_argument("--workers", type=int, default=8, help="একসাথে কয়টা batch যাচাই")
+    parser.add_argument("--batch-size", type=int, default=gemini_analysis.BATCH_SIZE)
+    parser.add_argument("--field", help=f"দাবির টেক্সট কোন ফিল্ডে (ডিফল্ট: {', '.join(TEXT_FIELDS)})")
+    parser.add_argument("--restart", action="store_true", help="checkpoint মুছে শুরু থেকে")
+    args = parser.parse_args()
+
+    gemini_analysis.configure(os.getenv("GEMINI_API_KEY"))
+    started = time.perf_counter()
+    importer = Importer(args.path, args.db, args.workers, args.batch_size, args.field, args.restart)
+    imported = importer.run()
+    elapsed = time.perf_counter() - started
+    print(f"✅ {imported} দাবি ইম্পোর্ট হয়েছে, {elapsed:.1f}s ({imported / elapsed if elapsed else 0:.2f} claims/s)")
+    if importer.failed:
+        print(f"⚠️ {importer.failed}টি দাবি যাচাই হয়নি — {importer.failed_path} আবার ইম্পোর্ট করুন")
+
+
+if __name__ == "__main__":
+    main()
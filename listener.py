@@ -1,43 +1,351 @@
 import os
-import requests
-import google.generativeai as genai
+import asyncio
+import json
+import logging
+import signal
+import sqlite3
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import metrics
+import admission
+import report_search
+import model_router
+import verify_service
+import webhook
+import telegram_stream
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+
+# ⚙️ কনকারেন্সি সেটিংস
+WORKERS = int(os.getenv("LISTENER_WORKERS", 8))          # একসাথে কতগুলো যাচাই চলবে
+QUEUE_SIZE = int(os.getenv("LISTENER_QUEUE_SIZE", 200))  # এর বেশি জমলে polling থামবে (backpressure)
+POLL_TIMEOUT = int(os.getenv("LISTENER_POLL_TIMEOUT", 60))
+REPORT_EVERY = 30  # সেকেন্ড — throughput লগ
+METRICS_PORT = int(os.getenv("LISTENER_METRICS_PORT", 9101))  # Prometheus /metrics; 0 = বন্ধ
+LISTENER_MODE = os.getenv("LISTENER_MODE", "polling")  # polling | webhook
+WEBHOOK_URL = os.getenv("LISTENER_WEBHOOK_URL")  # Telegram যেখানে POST করবে
+SEEN_WINDOW = 10000  # শেষ এতগুলো update_id মনে রাখা হয় — webhook retry দ্বিতীয়বার উত্তর পায় না
+
+_session = requests.Session()  # কানেকশন রি-ইউজ
+
+
+def get_updates(offset=None, timeout=POLL_TIMEOUT):
+    url = f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/getUpdates"
+    params = {"timeout": timeout, "offset": offset}
+    return _session.get(url, params=params, timeout=timeout + 10).json()
+
+
+def set_webhook(url, secret):
+    payload = {"url": url, "secret_token": secret, "allowed_updates": json.dumps(["message"]),
+               "max_connections": webhook.WEBHOOK_WORKERS * 5}
+    return _session.post(f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/setWebhook", data=payload, timeout=30).json()
+
 
-print("🤖 YachaiBot listener running...")
+def delete_webhook():
+    # webhook সেট থাকলে getUpdates 409 দেয় — polling-এ ফেরার আগে
+    return _session.post(f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/deleteWebhook", timeout=30).json()
 
-def get_updates(offset=None):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/getUpdates"
-    params = {"timeout": 60, "offset": offset}
-    return requests.get(url, params=params).json()
 
 def send_message(chat_id, text):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+    url = f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/sendMessage"
     payload = {"chat_id": chat_id, "text": text}
-    requests.post(url, data=payload)
-
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-1.5-flash")
-
-offset = None
-while True:
-    updates = get_updates(offset)
-    if updates.get("result"):
-        for update in updates["result"]:
-            offset = update["update_id"] + 1
-            msg = update["message"].get("text", "")
-            chat_id = update["message"]["chat"]["id"]
-
-            if msg:
-                print(f"💬 {msg}")
-                prompt = f"তুমি একজন ফ্যাক্ট-চেকিং AI। নিচের বার্তাটি বিশ্লেষণ করো: {msg}"
-                try:
-                    response = model.generate_content(prompt)
-                    answer = response.text or "দুঃখিত, আমি এখন বিশ্লেষণ করতে পারছি না।"
-                except Exception as e:
-                    answer = f"ত্রুটি: {e}"
-
-                send_message(chat_id, "🧠 যাচাই ফলাফল:\n" + answer)
-    time.sleep(2)
+    started = time.perf_counter()
+    result = "error"
+    try:
+        resp = _session.post(url, data=payload, timeout=30)
+        result = "ok" if resp.status_code == 200 else "error"
+        return resp.json()["result"]["message_id"] if result == "ok" else None  # stream-এ edit করার জন্য
+    finally:
+        metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "listener", result)
+
+
+def edit_message(chat_id, message_id, text):
+    url = f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/editMessageText"
+    payload = {"chat_id": chat_id, "message_id": message_id, "text": text}
+    started = time.perf_counter()
+    result = "error"
+    try:
+        resp = _session.post(url, data=payload, timeout=30)
+        result = "ok" if resp.status_code == 200 else "error"
+        if resp.status_code != 200:
+            raise RuntimeError(f"editMessageText HTTP {resp.status_code}")
+    finally:
+        metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "listener_edit", result)
+
+
+def answer_for(msg, on_partial=None):
+    if msg.startswith("/search"):
+        # 🔎 আগের যাচাই করা রিপোর্ট খোঁজা
+        query = msg.partition(" ")[2].strip()
+        if not query:
+            return "🔎 ব্যবহার: /search <শব্দ বা বাক্যাংশ>"
+        return report_search.format_results_text(query, report_search.search_db(query, DB_PATH))
+    try:
+        # ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → Gemini, single-flight আর reports-এ সেভ — সব verify_service-এ
+        return verify_service.chat_reply(verify_service.verify(msg, source="listener", on_partial=on_partial))
+    except Exception as e:
+        return f"ত্রুটি: {e}"
+
+
+# =====================================================
+# 📥 DURABLE INBOX (রিস্টার্টে আবার যাচাই না করার জন্য)
+# =====================================================
+# getUpdates-এ নতুন offset দিলেই Telegram আগের আপডেট ভুলে যায়, তাই offset বাড়ানোর
+# আগেই মেসেজগুলো listener_inbox-এ রাখা হয়, আর উত্তর পাঠানোর পরে মুছে ফেলা হয়।
+# রিস্টার্টে শুধু inbox-এ বাকি থাকা (উত্তর না পাওয়া) মেসেজগুলো আবার চলে।
+
+class Inbox:
+    def __init__(self, path=DB_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS bot_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS listener_inbox (
+                update_id INTEGER PRIMARY KEY,
+                chat_id INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+        """)
+        if "done" not in [r[1] for r in self.conn.execute("PRAGMA table_info(listener_inbox)")]:
+            self.conn.execute("ALTER TABLE listener_inbox ADD COLUMN done INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def offset(self):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM bot_state WHERE key='listener_offset'").fetchone()
+        return int(row[0]) if row else None
+
+    def pending(self):
+        with self._lock, metrics.DB_QUERY.time("fetch", "listener_inbox"):
+            return self.conn.execute("SELECT update_id, chat_id, text FROM listener_inbox WHERE done=0 ORDER BY update_id").fetchall()
+
+    def accept(self, rows, offset=None):
+        # মেসেজ আর নতুন offset (polling-এ) একই ট্রানজ্যাকশনে। ফেরত: যে সারিগুলো সত্যিই নতুন —
+        # Telegram একই update_id আবার পাঠালে (webhook retry) সেটা দ্বিতীয়বার যাচাই হয় না
+        added = []
+        with self._lock, metrics.DB_QUERY.time("insert", "listener_inbox"):
+            for row in rows:
+                if self.conn.execute("INSERT OR IGNORE INTO listener_inbox (update_id, chat_id, text) VALUES (?, ?, ?)", row).rowcount:
+                    added.append(row)
+            if offset is not None:
+                self.conn.execute("""
+                    INSERT INTO bot_state (key, value) VALUES ('listener_offset', ?)
+                    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                """, (str(offset),))
+            self.conn.commit()
+        return added
+
+    def done(self, update_id):
+        with self._lock, metrics.DB_QUERY.time("delete", "listener_inbox"):
+            # সারি থাকে (লেখা মুছে) যাতে একই update_id আবার এলে INSERT OR IGNORE ধরে ফেলে
+            self.conn.execute("UPDATE listener_inbox SET done=1, text='' WHERE update_id=?", (update_id,))
+            self.conn.execute("DELETE FROM listener_inbox WHERE done=1 AND update_id < ?", (update_id - SEEN_WINDOW,))
+            self.conn.commit()
+
+
+# =====================================================
+# ⚡ ASYNC PIPELINE (poller → queue → worker pool)
+# =====================================================
+# - একসাথে সর্বোচ্চ WORKERS টা যাচাই; একটা ধীর Gemini উত্তর অন্য চ্যাট আটকায় না
+# - একই চ্যাটের মেসেজ সবসময় আগে-পরে ক্রমেই উত্তর পায় (per-chat backlog)
+# - QUEUE_SIZE টা মেসেজ জমে গেলে poller থেমে থাকে (backpressure)
+# - admission: ফ্লাড করা চ্যাট আর global সীমা পেরোলে ক্যাশ থেকে উত্তর, নইলে worker অপেক্ষা করে
+
+class Listener:
+    def __init__(self, verify=answer_for, send=send_message, fetch=get_updates,
+                 workers=WORKERS, queue_size=QUEUE_SIZE, db_path=DB_PATH, admission=None, edit=None):
+        self.verify = verify
+        self.edit = edit  # edit_message দিলে উত্তর stream হয় (verify-কে on_partial দেওয়া হয়)
+        self.admission = admission  # admission.Admission — None হলে সীমা ছাড়া (বেঞ্চমার্ক)
+        self.send = send
+        self.fetch = fetch
+        self.workers = workers
+        self.queue_size = queue_size
+        self.inbox = Inbox(db_path)
+        self.processed = 0
+        self.started_at = None
+
+    async def run(self, stop=None, webhook_server=None):
+        # webhook_server দিলে getUpdates-এর বদলে Telegram-এর POST থেকে আপডেট আসে
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.workers + 2))
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.queue_size)
+        self.active = {}  # chat_id → deque (চলমান চ্যাটের বাকি মেসেজ)
+        metrics.QUEUE_DEPTH.track(self.queue.qsize, "listener_queue")
+        metrics.QUEUE_DEPTH.track(lambda: sum(len(b) for b in list(self.active.values())), "listener_chat_backlog")
+        self.offset = self.inbox.offset()
+        self.started_at = time.perf_counter()
+
+        # আগের রানে উত্তর না পাওয়া মেসেজ আগে
+        for row in self.inbox.pending():
+            await self._enqueue(row)
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if webhook_server is None:
+            poller = asyncio.create_task(self._poll())
+        else:
+            webhook_server.handle = self.accept_update
+            await webhook_server.start()
+            poller = None
+        reporter = asyncio.create_task(self._report())
+        try:
+            if stop is None:
+                await (poller or asyncio.Event().wait())
+            else:
+                await stop.wait()
+        finally:
+            if poller:
+                poller.cancel()
+            else:
+                await webhook_server.stop()  # নতুন POST বন্ধ, গ্রহণ করা আপডেট সারিতে তোলা শেষ
+            reporter.cancel()
+            await self.drain()
+            for w in workers:
+                w.cancel()
+        return self.stats()
+
+    async def drain(self):
+        while not self.queue.empty() or self.active:
+            await asyncio.sleep(0.05)
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0
+        return {
+            "processed": self.processed,
+            "elapsed": elapsed,
+            "msgs_per_sec": self.processed / elapsed if elapsed else 0.0,
+        }
+
+    async def _enqueue(self, row):
+        await self.slots.acquire()  # backpressure
+        self.queue.put_nowait(row)
+
+    async def _poll(self):
+        while True:
+            try:
+                updates = await asyncio.to_thread(self.fetch, self.offset)
+            except Exception as e:
+                logging.warning(f"getUpdates ব্যর্থ: {e}")
+                await asyncio.sleep(2)
+                continue
+
+            rows = []
+            for update in updates.get("result") or []:
+                self.offset = update["update_id"] + 1
+                message = update.get("message") or {}
+                if message.get("text"):
+                    rows.append((update["update_id"], message["chat"]["id"], message["text"]))
+            if updates.get("result"):
+                rows = await asyncio.to_thread(self.inbox.accept, rows, self.offset)
+            for row in rows:
+                logging.debug(f"💬 আপডেট {row[0]} ({row[1]}), {len(row[2])} অক্ষর")  # মেসেজের লেখা লগে নয়
+                await self._enqueue(row)
+
+    async def accept_update(self, update):
+        # webhook: polling-এর মতোই আগে inbox-এ (durable), তারপর সারিতে
+        message = update.get("message") or {}
+        if not message.get("text"):
+            return
+        row = (update["update_id"], message["chat"]["id"], message["text"])
+        # webhook-এ getUpdates offset-এর কোনো মানে নেই, তাই লেখা হয় না
+        for row in await asyncio.to_thread(self.inbox.accept, [row]):
+            await self._enqueue(row)
+
+    async def _worker(self):
+        while True:
+            update_id, chat_id, text = await self.queue.get()
+            if chat_id in self.active:
+                # এই চ্যাটের আগের মেসেজ এখনো চলছে — ক্রম রাখতে পেছনে জমা
+                self.active[chat_id].append((update_id, text))
+                continue
+            backlog = self.active[chat_id] = deque([(update_id, text)])
+            try:
+                while backlog:
+                    uid, msg = backlog[0]
+                    try:
+                        await self._handle(uid, chat_id, msg)
+                    except Exception as e:
+                        # inbox.done বা stream তৈরি ব্যর্থ হলেও worker আর চ্যাটের সারি বাঁচে;
+                        # done না হওয়া আপডেট inbox-এ থেকে যায়, রিস্টার্টে আবার আসবে
+                        logging.error(f"Listener মেসেজ {uid} ব্যর্থ ({chat_id}): {e}")
+                    finally:
+                        backlog.popleft()
+                        self.slots.release()
+            finally:
+                del self.active[chat_id]
+
+    async def _handle(self, update_id, chat_id, msg):
+        verify = self.verify
+        stream = None
+        if self.edit is not None and telegram_stream.ENABLED and not msg.startswith("/"):
+            # প্রথম টুকরোতেই মেসেজ, তারপর সেটাই edit (থ্রটল করা)
+            stream = telegram_stream.MessageStream(
+                send=lambda text: self.send(chat_id, text),
+                edit=lambda message_id, text: self.edit(chat_id, message_id, text),
+                interval=telegram_stream.edit_interval(chat_id),
+            )
+            verify = lambda text: self.verify(text, lambda partial: stream.update(verify_service.partial_reply(partial)))
+        try:
+            if self.admission is not None and not msg.startswith("/"):
+                answer = await asyncio.to_thread(self.admission.answer, chat_id, msg, verify)
+            else:
+                answer = await asyncio.to_thread(verify, msg)
+        except Exception as e:
+            answer = f"ত্রুটি: {e}"
+        try:
+            final = "🧠 যাচাই ফলাফল:\n" + answer
+            if stream is not None:
+                await asyncio.to_thread(stream.flush, final)
+            else:
+                await asyncio.to_thread(self.send, chat_id, final)
+        except Exception as e:
+            logging.error(f"sendMessage ব্যর্থ ({chat_id}): {e}")
+        await asyncio.to_thread(self.inbox.done, update_id)
+        self.processed += 1
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(REPORT_EVERY)
+            s = self.stats()
+            logging.info(f"📈 {s['processed']} মেসেজ, {s['msgs_per_sec']:.2f} msg/s, queue {self.queue.qsize()}, active chats {len(self.active)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.info("🤖 YachaiBot listener running...")
+    model_router.configure(GEMINI_API_KEY)
+    if METRICS_PORT:
+        metrics.start_server(METRICS_PORT)
+    bot = Listener(admission=admission.Admission("listener"), edit=edit_message)
+    try:
+        if LISTENER_MODE == "webhook":
+            if not WEBHOOK_URL:
+                raise SystemExit("❌ LISTENER_MODE=webhook-এর জন্য LISTENER_WEBHOOK_URL দরকার।")
+            server = webhook.WebhookServer(None, name="listener")
+            logging.info(f"🪝 setWebhook: {set_webhook(WEBHOOK_URL, webhook.WEBHOOK_SECRET)}")
+
+            async def main():
+                stop = asyncio.Event()
+                loop = asyncio.get_running_loop()
+                for sig in (signal.SIGTERM, signal.SIGINT):
+                    loop.add_signal_handler(sig, stop.set)
+                return await bot.run(stop, webhook_server=server)
+
+            logging.info(f"👋 বন্ধ: {asyncio.run(main())}")
+        else:
+            delete_webhook()
+            asyncio.run(bot.run())
+    except KeyboardInterrupt:
+        pass
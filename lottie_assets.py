@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================
+# 🎨 LOTTIE ASSETS (লোকাল ফাইল, ঐচ্ছিক রিফ্রেশ)
+# =====================================================
+# আগে প্রতি cold start-এ তিনটা Lottie JSON নেটওয়ার্ক থেকে আনা হত (প্রতিটায় ১০ সেকেন্ড
+# পর্যন্ত অপেক্ষা) — সাইডবার আঁকার আগেই। এখন assets/lottie/ থেকে পড়া হয়; ফাইল না
+# থাকলে None (অ্যানিমেশন ছাড়াই অ্যাপ চলে)। নতুন করে নামাতে:
+#   python lottie_assets.py
+# অথবা LOTTIE_REFRESH=1 দিলে অ্যাপ চালুর সময় ব্যাকগ্রাউন্ডে (UI আটকায় না)।
+
+ASSET_DIR = os.getenv("YACHAI_LOTTIE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "lottie"))
+LOTTIE_URLS = {
+    "loading": "https://assets9.lottiefiles.com/packages/lf20_qp1q7mct.json",
+    "success": "https://assets2.lottiefiles.com/packages/lf20_mq9m0vpg.json",
+    "alert": "https://assets1.lottiefiles.com/packages/lf20_jtbfg2nb.json",
+}
+
+_cache = {}
+_refresh_started = False
+_refresh_lock = threading.Lock()
+
+
+def _path(name):
+    return os.path.join(ASSET_DIR, f"{name}.json")
+
+
+def load_lottie(name):
+    if name not in _cache:
+        try:
+            with open(_path(name), encoding="utf-8") as f:
+                _cache[name] = json.load(f)
+        except (OSError, ValueError):
+            return None  # ফাইল না থাকলে পরে রিফ্রেশ হলে আবার চেষ্টা
+    return _cache[name]
+
+
+def _download(name, url, timeout):
+    import requests  # শুধু রিফ্রেশে লাগে
+    r = requests.get(url, timeout=timeout)
+    r.raise_for_status()
+    data = r.json()
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    tmp = _path(name) + ".part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, _path(name))
+    _cache[name] = data
+    return name
+
+
+def refresh(timeout=10):
+    # তিনটাই একসাথে; একটা ব্যর্থ হলে বাকিগুলো থামে না
+    done = []
+    with ThreadPoolExecutor(max_workers=len(LOTTIE_URLS)) as pool:
+        futures = {pool.submit(_download, n, u, timeout): n for n, u in LOTTIE_URLS.items()}
+        for future, name in futures.items():
+            try:
+                done.append(future.result())
+            except Exception as e:
+                logging.warning(f"Lottie '{name}' রিফ্রেশ ব্যর্থ: {e}")
+    return done
+
+
+def refresh_in_background(missing_only=True):
+    # প্রতি প্রসেসে একবারই
+    global _refresh_started
+    with _refresh_lock:
+        if _refresh_started:
+            return
+        _refresh_started = True
+    if missing_only and all(os.path.exists(_path(n)) for n in LOTTIE_URLS):
+        return
+    threading.Thread(target=refresh, name="lottie-refresh", daemon=True).start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    names = refresh()
+    print(f"🎨 {len(names)}/{len(LOTTIE_URLS)} Lottie ফাইল {ASSET_DIR}-এ আপডেট হয়েছে")
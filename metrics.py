@@ -0,0 +1,246 @@
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =====================================================
+# 📊 METRICS (latency histogram + counter + queue gauge)
+# =====================================================
+# কোন ধাপে সময় যাচ্ছে — মডেল কল, JSON পার্স, SQLite, Telegram send, PDF রেন্ডার —
+# প্রসেসের ভেতরে জমা হয়, আর Prometheus text format-এ /metrics থেকে পড়া যায়
+# (বট প্রসেসগুলো নিজের পোর্টে, verify_service তার নিজের সার্ভারে, অ্যাপ Performance পেজে)।
+# প্রতি observe মানে একটা bisect আর একটা lock — কয়েক মাইক্রোসেকেন্ড, তাই সবসময় চালু রাখা যায়।
+# বাইরের কোনো লাইব্রেরি লাগে না।
+
+# সেকেন্ড — SQLite-এর sub-ms থেকে Gemini-র কয়েক সেকেন্ড পর্যন্ত
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_registry = {}  # name → metric (তৈরির ক্রমে)
+_registry_lock = threading.Lock()
+
+
+def _label_text(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def lines(self):
+        with self._lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_label_text(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels → [bucket counts..., +Inf], sum
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, *labels):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            s = self.series.get(labels)
+            if s is None:
+                s = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            s[0][i] += 1
+            s[1] += seconds
+
+    def time(self, *labels):
+        # with DB_QUERY.time("insert", "reports"): ...  — ব্যতিক্রম হলেও সময় গোনা হয়
+        return _Timer(self, labels)
+
+    def summary(self):
+        # অ্যাডমিন পেজের জন্য: bucket থেকে আনুমানিক p50/p95 (উপরের সীমা)
+        with self._lock:
+            items = [(k, list(s[0]), s[1]) for k, s in sorted(self.series.items())]
+        rows = []
+        for labels, counts, total in items:
+            n = sum(counts)
+            row = dict(zip(self.labelnames, labels))
+            row.update({"count": n, "mean_ms": total / n * 1000 if n else None,
+                        "p50_ms": self._quantile(counts, n, 0.5), "p95_ms": self._quantile(counts, n, 0.95)})
+            rows.append(row)
+        return rows
+
+    def _quantile(self, counts, n, q):
+        if not n:
+            return None
+        seen = 0
+        for bound, c in zip(self.buckets, counts):
+            seen += c
+            if seen >= q * n:
+                return bound * 1000
+        return float("inf")
+
+    def lines(self):
+        with self._lock:
+            items = [(k, list(s[0]), s[1]) for k, s in sorted(self.series.items())]
+        out = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                out.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, ('le', repr(float(bound))))} {cumulative}")
+            cumulative += counts[-1]
+            out.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, ('le', '+Inf'))} {cumulative}")
+            out.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {total}")
+            out.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {cumulative}")
+        return out
+
+
+class _Timer:
+    # @contextmanager-এর generator-এর চেয়ে কয়েকগুণ সস্তা (hot path-এ প্রতি SQLite কলে)
+    __slots__ = ("hist", "labels", "started")
+
+    def __init__(self, hist, labels):
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class Gauge:
+    # মান পড়ার সময় callback ডাকা হয় (যেমন queue.qsize) — hot path-এ কোনো খরচ নেই
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callbacks = {}
+        self._lock = threading.Lock()
+
+    def track(self, fn, *labels):
+        with self._lock:
+            self.callbacks[labels] = fn
+
+    def values(self):
+        with self._lock:
+            items = sorted(self.callbacks.items())
+        out = []
+        for labels, fn in items:
+            try:
+                out.append((labels, float(fn())))
+            except Exception as e:
+                logging.warning(f"Gauge {self.name}{labels} পড়া ব্যর্থ: {e}")
+        return out
+
+    def lines(self):
+        return [f"{self.name}{_label_text(self.labelnames, k)} {v:g}" for k, v in self.values()]
+
+
+def _get_or_create(cls, name, help, labelnames, **kwargs):
+    # Streamlit rerun বা একাধিক import-এ একই নামের মেট্রিক আবার তৈরি হয় না
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, labelnames, **kwargs)
+        return metric
+
+
+def counter(name, help, labelnames=()):
+    return _get_or_create(Counter, name, help, labelnames)
+
+
+def histogram(name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def gauge(name, help, labelnames=()):
+    return _get_or_create(Gauge, name, help, labelnames)
+
+
+# =====================================================
+# 🧭 সব ধাপের মেট্রিক (এক জায়গায়, যাতে নাম/লেবেল মেলে)
+# =====================================================
+MODEL_CALL = histogram("yachai_model_call_seconds", "Gemini/fallback model call latency", ("model", "result"))
+MODEL_TTFT = histogram("yachai_model_ttft_seconds", "Time to first streamed token", ("model",))
+JSON_PARSE = histogram("yachai_json_parse_seconds", "Model JSON parse + validate latency by outcome", ("kind", "result"))
+DB_QUERY = histogram("yachai_db_seconds", "SQLite statement latency", ("op", "table"))
+TELEGRAM_SEND = histogram("yachai_telegram_send_seconds", "Telegram sendMessage latency", ("sender", "result"))
+RENDER = histogram("yachai_render_seconds", "Chart/PDF render latency (submit to done)", ("kind", "result"))
+QUEUE_DEPTH = gauge("yachai_queue_depth", "Items waiting in each queue", ("queue",))
+VERIFICATIONS = counter("yachai_verifications_total", "Verification requests by source and origin", ("source", "origin"))
+MODEL_OUTPUT = counter("yachai_model_output_total", "Model JSON outputs: ok / repaired (retry avoided) / invalid (retried)", ("kind", "outcome"))
+ADMISSIONS = counter("yachai_admission_total", "Bot admission decisions (run/fallback/queued/rejected)", ("bot", "decision"))
+
+
+def histograms():
+    with _registry_lock:
+        return [m for m in _registry.values() if m.kind == "histogram"]
+
+
+def render():
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for m in metrics:
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.lines())
+    return "\n".join(lines) + "\n"
+
+
+# =====================================================
+# 🌐 /metrics সার্ভার (বট প্রসেসগুলোর জন্য)
+# =====================================================
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def start_server(port, host="0.0.0.0"):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        logging.error(f"Metrics সার্ভার চালু ব্যর্থ (port {port}): {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logging.info(f"📊 Metrics: http://{host}:{server.server_address[1]}/metrics")
+    return server
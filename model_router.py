@@ -0,0 +1,276 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import metrics
+
+# =====================================================
+# 🚦 MODEL ROUTER (latency-aware fallback + circuit breaker + hedging)
+# =====================================================
+# আগে gemini-2.5-flash ধীর/ব্যর্থ হলে প্রতিটা রিকোয়েস্ট পুরো timeout অপেক্ষা করে তারপর
+# fallback-এ যেত। এখন প্রতিটা মডেলের rolling latency/error হিসাব রাখা হয়:
+# - পরপর কয়েকবার বা বেশি হারে ব্যর্থ হলে মডেলটা COOLDOWN সেকেন্ড বাদ (circuit open)
+# - hedging চালু থাকলে primary-র p95 পেরোলেই fallback-ও শুরু, যেটা আগে আসে সেটাই উত্তর
+# পোর্টাল (gemini_analysis), telegram_bot.py আর listener.py একই router ব্যবহার করে।
+# generate_stream — একই fallback ক্রম, কিন্তু উত্তর টুকরো টুকরো আসার সাথে সাথে on_text-এ;
+# প্রথম টুকরো (TTFT) আর পুরো উত্তর (MODEL_CALL) আলাদা মাপা হয়।
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")  # যেমন fake_servers.FakeGemini-এর url (বেঞ্চমার্ক)
+MODELS = [m.strip() for m in os.getenv("GEMINI_MODELS", "gemini-2.5-flash,gemini-1.5-flash-latest").split(",") if m.strip()]
+HEDGE = os.getenv("ROUTER_HEDGE", "0") == "1"
+WINDOW = int(os.getenv("ROUTER_WINDOW", 50))            # rolling stats-এ কয়টা কল
+MIN_SAMPLES = 5                                         # p95/error rate ধরার আগে অন্তত এতগুলো কল
+FAILURE_THRESHOLD = int(os.getenv("ROUTER_FAILURES", 3))  # পরপর এতবার ব্যর্থ → circuit open
+ERROR_RATE_THRESHOLD = 0.5
+COOLDOWN = float(os.getenv("ROUTER_COOLDOWN", 30))
+
+
+def configure(api_key):
+    global GEMINI_API_KEY
+    GEMINI_API_KEY = api_key
+
+
+def gemini_factory(name):
+    import google.generativeai as genai  # শুধু আসল মডেল লাগলে লোড
+    if GEMINI_API_ENDPOINT:
+        genai.configure(api_key=GEMINI_API_KEY or "local", transport="rest",
+                        client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(name)
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class ModelHealth:
+    def __init__(self, name, window=WINDOW, cooldown=COOLDOWN):
+        self.name = name
+        self.cooldown = cooldown
+        self.samples = deque(maxlen=window)  # (latency, ok)
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # 0 = closed
+        self.probing = False   # half-open trial কল চলছে
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok):
+        with self._lock:
+            self.samples.append((latency, ok))
+            probing, self.probing = self.probing, False
+            if ok:
+                self.consecutive_failures = 0
+                self.open_until = 0.0
+                return
+            self.consecutive_failures += 1
+            if probing or self.consecutive_failures >= FAILURE_THRESHOLD or self._error_rate() >= ERROR_RATE_THRESHOLD:
+                self.open_until = time.monotonic() + self.cooldown
+                self.trips += 1
+                logging.warning(f"🚦 {self.name} circuit open — {self.cooldown:.0f}s বাদ থাকবে")
+
+    def _error_rate(self):
+        if len(self.samples) < MIN_SAMPLES:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def available(self):
+        # cooldown শেষ হলে half-open: ঠিক একজন caller trial পায় (open_until আরেক cooldown
+        # সামনে সরে, তাই বাকিদের কাছে circuit open-ই থাকে); trial-এর ফল record()-এ —
+        # সফল হলে closed, ব্যর্থ হলে আবার open। trial কখনো কল না হলে পরের cooldown-এ নতুন trial
+        with self._lock:
+            if not self.open_until:
+                return True
+            now = time.monotonic()
+            if now < self.open_until:
+                return False
+            self.open_until = now + self.cooldown
+            self.probing = True
+            return True
+
+    def state(self):
+        with self._lock:
+            if not self.open_until:
+                return "closed"
+            return "half-open" if self.probing or time.monotonic() >= self.open_until else "open"
+
+    def p95(self):
+        with self._lock:
+            latencies = [lat for lat, ok in self.samples if ok]
+        return _percentile(latencies, 95) if len(latencies) >= MIN_SAMPLES else None
+
+    def snapshot(self):
+        with self._lock:
+            latencies = [lat for lat, ok in self.samples if ok]
+            error_rate = self._error_rate()
+            calls = len(self.samples)
+        return {
+            "model": self.name,
+            "state": self.state(),
+            "calls": calls,
+            "error_rate": error_rate,
+            "p50_ms": _percentile(latencies, 50) * 1000 if latencies else None,
+            "p95_ms": _percentile(latencies, 95) * 1000 if latencies else None,
+            "trips": self.trips,
+        }
+
+
+class ModelRouter:
+    def __init__(self, models=None, factory=gemini_factory, hedge=HEDGE, cooldown=COOLDOWN, max_workers=16):
+        self.models = list(models or MODELS)
+        self.factory = factory
+        self.hedge = hedge
+        self.health = {m: ModelHealth(m, cooldown=cooldown) for m in self.models}
+        self.hedges_started = 0
+        self.hedge_wins = 0
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-router")
+
+    def _client(self, name):
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = self.factory(name)
+            return self._clients[name]
+
+    def _call(self, name, prompt, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self._client(name).generate_content(prompt, **kwargs)
+        except Exception:
+            elapsed = time.perf_counter() - started
+            self.health[name].record(elapsed, False)
+            metrics.MODEL_CALL.observe(elapsed, name, "error")
+            raise
+        elapsed = time.perf_counter() - started
+        self.health[name].record(elapsed, True)
+        metrics.MODEL_CALL.observe(elapsed, name, "ok")
+        return response
+
+    def _call_stream(self, name, prompt, on_text, **kwargs):
+        # ফেরত দেয় (পুরো টেক্সট, response); on_text(এ পর্যন্ত জমা টেক্সট) প্রতি টুকরোয়
+        started = time.perf_counter()
+        text = ""
+        try:
+            response = self._client(name).generate_content(prompt, stream=True, **kwargs)
+            for chunk in response:
+                try:
+                    piece = chunk.text
+                except ValueError:
+                    continue  # শুধু finish_reason / safety টুকরো, টেক্সট নেই
+                if not text and piece:
+                    metrics.MODEL_TTFT.observe(time.perf_counter() - started, name)
+                text += piece
+                on_text(text)
+        except Exception:
+            elapsed = time.perf_counter() - started
+            self.health[name].record(elapsed, False)
+            metrics.MODEL_CALL.observe(elapsed, name, "error")
+            raise
+        elapsed = time.perf_counter() - started
+        self.health[name].record(elapsed, True)
+        metrics.MODEL_CALL.observe(elapsed, name, "ok")
+        return text, response
+
+    def _order(self):
+        order = [m for m in self.models if self.health[m].available()]
+        return order or list(self.models)  # সব open হলে তবুও চেষ্টা করা
+
+    def generate(self, prompt, accept=None, **kwargs):
+        # accept(response) False হলে (যেমন JSON পার্স হয়নি) পরের মডেলে যাওয়া হয়
+        # ফেরত দেয় (model_name, response); সব ব্যর্থ হলে RuntimeError
+        order = self._order()
+        if self.hedge and len(order) > 1:
+            return self._generate_hedged(order, prompt, accept, **kwargs)
+
+        last_error = None
+        for name in order:
+            try:
+                response = self._call(name, prompt, **kwargs)
+            except Exception as e:
+                logging.warning(f"{name} ব্যর্থ: {e}")
+                last_error = e
+                continue
+            if accept is None or accept(response):
+                return name, response
+            last_error = ValueError(f"{name}: অগ্রহণযোগ্য উত্তর")
+        raise RuntimeError(f"সব মডেল ব্যর্থ: {last_error}")
+
+    def generate_stream(self, prompt, on_text, accept=None, **kwargs):
+        # stream-এ hedging নেই (দুটো stream একসাথে দেখানো যায় না); ব্যর্থ হলে পরের মডেল
+        # শুরু থেকে, on_text আবার খালি থেকে জমা টেক্সট পায়
+        # ফেরত দেয় (model_name, text, response); accept(text) False হলে পরের মডেল
+        last_error = None
+        for name in self._order():
+            try:
+                text, response = self._call_stream(name, prompt, on_text, **kwargs)
+            except Exception as e:
+                logging.warning(f"{name} stream ব্যর্থ: {e}")
+                last_error = e
+                continue
+            if accept is None or accept(text):
+                return name, text, response
+            last_error = ValueError(f"{name}: অগ্রহণযোগ্য উত্তর")
+        raise RuntimeError(f"সব মডেল ব্যর্থ: {last_error}")
+
+    def _generate_hedged(self, order, prompt, accept, **kwargs):
+        remaining = list(order)
+        running = {}
+        last_error = None
+
+        def launch():
+            name = remaining.pop(0)
+            running[self._pool.submit(self._call, name, prompt, **kwargs)] = name
+            return name
+
+        primary = launch()
+        hedge_after = self.health[primary].p95()
+        while running:
+            timeout = hedge_after if remaining else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # primary p95 পেরিয়ে গেছে — পরের মডেলও শুরু
+                self.hedges_started += 1
+                launch()
+                continue
+            for future in done:
+                name = running.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logging.warning(f"{name} ব্যর্থ: {e}")
+                    last_error = e
+                    continue
+                if accept is None or accept(response):
+                    if name != primary:
+                        self.hedge_wins += 1
+                    return name, response
+                last_error = ValueError(f"{name}: অগ্রহণযোগ্য উত্তর")
+            if not running and remaining:
+                launch()  # যা চলছিল সব ব্যর্থ — সাথে সাথে পরেরটা
+        raise RuntimeError(f"সব মডেল ব্যর্থ: {last_error}")
+
+    def stats(self):
+        return {
+            "models": [self.health[m].snapshot() for m in self.models],
+            "hedge": self.hedge,
+            "hedges_started": self.hedges_started,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter()
+        return _router
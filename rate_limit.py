@@ -0,0 +1,31 @@
+import time
+
+# =====================================================
+# 🪣 TOKEN BUCKET (alert outbox আর বটের admission দুজনেরই)
+# =====================================================
+# rate: প্রতি সেকেন্ডে কয়টা token জমে, capacity: একসাথে সর্বোচ্চ কয়টা (burst)।
+# thread-safe নয় — যে ব্যবহার করে সে নিজের lock ধরে ডাকে।
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # 429-এর retry_after
+
+    def wait_time(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def block(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
@@ -0,0 +1,323 @@
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import report_search
+import storage
+
+# =====================================================
+# 🗄️ HOT/COLD ARCHIVE (পুরোনো যাচাইকৃত রিপোর্ট → Parquet)
+# =====================================================
+# reports টেবিল শুধু বাড়ে — data.db বড় হয়, ব্যাকআপ ধীর হয়, পুরো টেবিল পড়া ভারী হয়।
+# অ্যাডমিন-যাচাইকৃত (final_verdict আছে) আর ARCHIVE_DAYS-এর চেয়ে পুরোনো রিপোর্টগুলো:
+# - মাস ধরে ভাগ করা zstd Parquet ফাইলে:  archive/reports/month=2025-01/part-<প্রথম id>-<শেষ id>.parquet
+# - একই ট্রানজ্যাকশনে লাইভ টেবিল থেকে মুছে, archive_files (manifest)-এ ফাইলের নাম আর
+#   archive_rollup-এ ওদের গোনা (report_rollup-এর একই key) — Analytics তাই দুই স্তর মিলিয়েই দেখায়
+# - ফাইল আগে লেখা হয়, manifest পরে; মাঝপথে থামলে/batch ব্যর্থ হলে manifest-এ না থাকা ফাইলগুলো পরের রানে মুছে যায়,
+#   আর পড়ার দিক শুধু manifest-এর ফাইল পড়ে — তাই কোনো রিপোর্ট দুবার বা হারিয়ে যায় না
+# - পড়ার সময় কেউ রিপোর্টটা আবার ট্যাগ করলে মোছা সংখ্যা মেলে না → batch বাতিল, পরের রানে আবার
+# সার্চ আর near-duplicate lookup লাইভে না পেলে DuckDB দিয়ে Parquet থেকে (শুধু দরকারি ফাইল)।
+# Parquet ফাইল আর বদলায় না — ব্যাকআপ মানে শুধু নতুন ফাইল কপি (rsync)। PostgreSQL-এ একাধিক নোড
+# থাকলে ARCHIVE_DIR সবার শেয়ার্ড হতে হবে, আর জবটা একটা নোডেই চালান।
+#
+# python report_archive.py --older-than 180          (cron-এ দিনে একবার)
+# python report_archive.py --stats | --search "ভোটার" | --vacuum
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+ARCHIVE_DIR = os.getenv("YACHAI_ARCHIVE_DIR", "archive")
+ARCHIVE_DAYS = int(os.getenv("YACHAI_ARCHIVE_DAYS", 180))
+BATCH_SIZE = 20000
+ROW_GROUP_SIZE = 10000
+COMPRESSION = "zstd"
+
+_local = threading.local()  # প্রতি থ্রেডে একটা DuckDB কানেকশন
+
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("id", pa.int64()), ("timestamp", pa.timestamp("s")), ("text", pa.string()), ("score", pa.int32()),
+        ("verdict", pa.string()), ("justification", pa.string()), ("final_verdict", pa.string()),
+        ("updated_at", pa.timestamp("s")), ("source", pa.string()),
+    ])
+
+
+def _as_datetime(value):
+    # SQLite-এ 'YYYY-MM-DD HH:MM:SS' টেক্সট, PostgreSQL-এ datetime
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _rollup_key(row):
+    # report_rollup._key-এর Python রূপ: (day, verdict, final_verdict, source, score_bucket)
+    _, timestamp, _, score, verdict, _, final_verdict, _, source = row
+    day = _as_datetime(timestamp).strftime("%Y-%m-%d") if timestamp is not None else ""
+    bucket = -1 if score is None else min(max(int(score), 0) // 10, 9)
+    return (day, verdict or "", final_verdict or "", source or "", bucket)
+
+
+def _write_file(rows, relpath):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    columns = list(zip(*rows))
+    converted = [
+        [_as_datetime(v) for v in col] if name in ("timestamp", "updated_at") else list(col)
+        for name, col in zip(storage.REPORT_COLUMNS, columns)
+    ]
+    table = pa.Table.from_arrays(converted, schema=_schema())
+    path = os.path.join(ARCHIVE_DIR, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pq.write_table(table, tmp, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE)
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if pq.read_metadata(path).num_rows != len(rows):
+        raise RuntimeError(f"{relpath}: লেখা সারির সংখ্যা মেলেনি")
+    return os.path.getsize(path)
+
+
+def _remove_orphans(store):
+    # manifest-এ নেই এমন ফাইল = আগের কোনো রান মাঝপথে থেমেছিল
+    with store.reader() as conn:
+        known = {r[0] for r in conn.execute("SELECT path FROM archive_files").fetchall()}
+    removed = 0
+    for root, _, names in os.walk(ARCHIVE_DIR):
+        for name in names:
+            relpath = os.path.relpath(os.path.join(root, name), ARCHIVE_DIR)
+            if relpath not in known and (name.endswith(".parquet") or name.endswith(".tmp")):
+                os.remove(os.path.join(root, name))
+                removed += 1
+    if removed:
+        logging.warning(f"🗄️ আগের অসম্পূর্ণ রানের {removed}টি ফাইল মুছে ফেলা হলো")
+    return removed
+
+
+def _move(conn, first_id, last_id, cutoff, read_at, expected, files, rollup):
+    # একই শর্তে মোছা — পড়ার পরে কেউ আবার ট্যাগ করলে (updated_at নতুন) সংখ্যা মিলবে না
+    deleted = conn.execute("""
+        DELETE FROM reports WHERE id BETWEEN ? AND ? AND final_verdict IS NOT NULL AND timestamp < ?
+        AND (updated_at IS NULL OR updated_at < ?)
+    """, (first_id, last_id, cutoff, read_at)).rowcount
+    if deleted != expected:
+        raise RuntimeError(f"id {first_id}–{last_id}: {expected}টি পড়া হয়েছিল, মুছতে গিয়ে {deleted}টি — পরে আবার")
+    for key, (count, score_sum) in rollup.items():
+        conn.execute("""
+            INSERT INTO archive_rollup (day, verdict, final_verdict, source, score_bucket, reports, score_sum)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(day, verdict, final_verdict, source, score_bucket) DO UPDATE SET
+                reports = archive_rollup.reports + excluded.reports, score_sum = archive_rollup.score_sum + excluded.score_sum
+        """, key + (count, score_sum))
+    for relpath, month, f_first, f_last, rows, size in files:
+        conn.execute("""
+            INSERT INTO archive_files (path, month, first_id, last_id, rows, bytes) VALUES (?, ?, ?, ?, ?, ?)
+        """, (relpath, month, f_first, f_last, rows, size))
+    return deleted
+
+
+def archive(store, older_than_days=ARCHIVE_DAYS, batch_size=BATCH_SIZE, dry_run=False):
+    # ফেরত: (কয়টা রিপোর্ট সরানো হলো, কয়টা ফাইল, মোট byte)
+    cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+    if not dry_run:
+        _remove_orphans(store)
+    moved, written, total_bytes, after_id = 0, 0, 0, 0
+    started = time.perf_counter()
+    while True:
+        read_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        with store.reader() as conn:
+            rows = conn.execute(f"""
+                SELECT {', '.join(storage.REPORT_COLUMNS)} FROM reports
+                WHERE id > ? AND final_verdict IS NOT NULL AND timestamp < ? AND (updated_at IS NULL OR updated_at < ?)
+                ORDER BY id LIMIT ?
+            """, (after_id, cutoff, read_at, batch_size)).fetchall()
+        if not rows:
+            break
+        first_id, last_id = rows[0][0], rows[-1][0]
+        after_id = last_id
+        if dry_run:
+            moved += len(rows)
+            continue
+
+        by_month, rollup = {}, {}
+        for row in rows:
+            by_month.setdefault(_as_datetime(row[1]).strftime("%Y-%m"), []).append(row)
+            key = _rollup_key(row)
+            count, score_sum = rollup.get(key, (0, 0))
+            rollup[key] = (count + 1, score_sum + (row[3] or 0))
+        files = []
+        try:
+            for month, month_rows in sorted(by_month.items()):
+                relpath = os.path.join("reports", f"month={month}", f"part-{month_rows[0][0]:010d}-{month_rows[-1][0]:010d}.parquet")
+                size = _write_file(month_rows, relpath)
+                files.append((relpath, month, month_rows[0][0], month_rows[-1][0], len(month_rows), size))
+            store.write(lambda conn: _move(conn, first_id, last_id, cutoff, read_at, len(rows), files, rollup))
+        except Exception as e:
+            # লাইভ টেবিল বদলায়নি (বা timeout-এ অনিশ্চিত) — ফাইলগুলো manifest-এ না উঠলে পরের রানে মুছে যাবে
+            logging.error(f"আর্কাইভ batch ব্যর্থ (id {first_id}–{last_id}): {e}")
+            continue
+        moved += len(rows)
+        written += len(files)
+        total_bytes += sum(f[5] for f in files)
+        elapsed = time.perf_counter() - started
+        print(f"🗄️ id {last_id} পর্যন্ত | {moved} রিপোর্ট → {written} ফাইল ({total_bytes / 1e6:.1f} MB) | "
+              f"{moved / elapsed if elapsed else 0:.0f} সারি/s", flush=True)
+    return moved, written, total_bytes
+
+
+def vacuum(db_path):
+    # মোছার পরে data.db ফাইল নিজে থেকে ছোট হয় না — VACUUM চলাকালীন লেখকেরা অপেক্ষা করে
+    before = os.path.getsize(db_path)
+    conn = sqlite3.connect(db_path, timeout=60)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return before, os.path.getsize(db_path)
+
+
+# =====================================================
+# 🔎 পড়ার দিক (DuckDB, শুধু manifest-এর ফাইল)
+# =====================================================
+def _duck():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        import duckdb
+        conn = _local.conn = duckdb.connect()
+    return conn
+
+
+def files(store, first_id=None, last_id=None):
+    # id পরিসর দিলে শুধু যেসব ফাইলে সেই পরিসরের রিপোর্ট থাকতে পারে
+    with store.reader() as conn:
+        if first_id is None:
+            rows = conn.execute("SELECT path FROM archive_files ORDER BY first_id").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT path FROM archive_files WHERE last_id >= ? AND first_id <= ? ORDER BY first_id", (first_id, last_id)
+            ).fetchall()
+    return [os.path.join(ARCHIVE_DIR, r[0]) for r in rows]
+
+
+def stats(store):
+    with store.reader() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(rows), 0), COALESCE(SUM(bytes), 0), MIN(month), MAX(month) FROM archive_files"
+        ).fetchone()
+    return {"files": row[0], "reports": row[1], "bytes": row[2], "oldest_month": row[3], "newest_month": row[4]}
+
+
+def search(store, query, verdict=None, date_from=None, date_to=None, limit=20):
+    # লাইভ সার্চের (storage.search) একই ফলাফলের আকার, সাথে "archived": True
+    terms = report_search.search_terms(query)
+    paths = files(store) if terms else []
+    if not paths:
+        return []
+    where, params = [], [paths]
+    for forms in terms:
+        likes = []
+        for form in sorted(forms):
+            # বাংলায় ছোট/বড় হাতের অক্ষর নেই — ILIKE-এর unicode case-folding বাদ দিয়ে সরাসরি contains (৪ গুণ দ্রুত);
+            # ইংরেজি অক্ষর থাকলে শুধু তখন lower()
+            if form.lower() != form.upper():
+                likes.append("contains(lower(text), ?) OR contains(lower(justification), ?)")
+                form = form.lower()
+            else:
+                likes.append("contains(text, ?) OR contains(justification, ?)")
+            params += [form, form]
+        where.append("(" + " OR ".join(likes) + ")")
+    if verdict:
+        where.append("COALESCE(final_verdict, verdict) = ?")
+        params.append(verdict)
+    if date_from:
+        where.append("timestamp >= CAST(? AS DATE)")
+        params.append(str(date_from))
+    if date_to:
+        where.append("timestamp < CAST(? AS DATE) + INTERVAL 1 DAY")
+        params.append(str(date_to))
+    rows = _duck().execute(f"""
+        SELECT id, timestamp, score, verdict, final_verdict, text, justification FROM read_parquet(?)
+        WHERE {' AND '.join(where)} ORDER BY id DESC LIMIT ?
+    """, params + [limit]).fetchall()
+    return [{
+        "id": r[0], "timestamp": str(r[1]), "score": r[2], "verdict": r[3], "final_verdict": r[4],
+        "text_snippet": report_search.snippet(r[5], terms), "justification_snippet": report_search.snippet(r[6], terms),
+        "archived": True,
+    } for r in rows]
+
+
+def lookup(store, report_ids):
+    # claim_index.find_reviewed-এর জন্য: (id, text, score, verdict, justification, final_verdict)
+    ids = sorted(int(i) for i in report_ids)
+    paths = files(store, ids[0], ids[-1]) if ids else []
+    if not paths:
+        return []
+    return _duck().execute(f"""
+        SELECT id, text, score, verdict, justification, final_verdict FROM read_parquet(?)
+        WHERE id IN ({', '.join('?' * len(ids))})
+    """, [paths] + ids).fetchall()
+
+
+def archived_ids(store, since=None):
+    # claim_index-এর reviewed_buckets-এর জন্য: since-এর পরে manifest-এ ওঠা ফাইলগুলোর id (শুধু id কলাম পড়া),
+    # সাথে তাদের সবচেয়ে নতুন created_at
+    with store.reader() as conn:
+        if since is None:
+            rows = conn.execute("SELECT path, created_at FROM archive_files").fetchall()
+        else:
+            rows = conn.execute("SELECT path, created_at FROM archive_files WHERE created_at >= ?", (since,)).fetchall()
+    if not rows:
+        return [], None
+    import pyarrow.parquet as pq
+    ids = []
+    for path, _ in rows:
+        ids += pq.read_table(os.path.join(ARCHIVE_DIR, path), columns=["id"]).column("id").to_pylist()
+    return ids, max(str(r[1]) for r in rows)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="পুরোনো যাচাইকৃত রিপোর্ট Parquet আর্কাইভে সরানো / আর্কাইভে খোঁজা")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--older-than", type=int, default=ARCHIVE_DAYS, help="কত দিনের পুরোনো (ডিফল্ট: YACHAI_ARCHIVE_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="শুধু গোনা, কিছু সরানো নয়")
+    parser.add_argument("--vacuum", action="store_true", help="শেষে data.db ছোট করা (শুধু SQLite)")
+    parser.add_argument("--stats", action="store_true", help="আর্কাইভের সারাংশ")
+    parser.add_argument("--search", help="শুধু আর্কাইভে খোঁজা")
+    args = parser.parse_args()
+
+    store = storage.get_storage(args.db)
+    if args.stats or args.search:
+        if args.search:
+            started = time.perf_counter()
+            results = search(store, args.search)
+            for r in results:
+                print(f"#{r['id']} {r['final_verdict'] or r['verdict']} ({r['score']}%) {r['timestamp']} — {r['text_snippet']}")
+            print(f"🔎 {len(results)}টি ফলাফল, {(time.perf_counter() - started) * 1000:.0f}ms")
+        print(stats(store))
+        return
+
+    started = time.perf_counter()
+    moved, written, total_bytes = archive(store, args.older_than, args.batch_size, args.dry_run)
+    elapsed = time.perf_counter() - started
+    if args.dry_run:
+        print(f"🔍 {moved}টি রিপোর্ট আর্কাইভযোগ্য ({args.older_than} দিনের পুরোনো, যাচাইকৃত)")
+        return
+    print(f"✅ {moved} রিপোর্ট → {written} ফাইল ({total_bytes / 1e6:.1f} MB), {elapsed:.1f}s "
+          f"({moved / elapsed if elapsed else 0:.0f} সারি/s)")
+    if args.vacuum:
+        if store.name != "sqlite":
+            print("ℹ️ PostgreSQL-এ VACUUM সার্ভারের autovacuum-ই করে")
+        else:
+            store.close()  # writer থ্রেড বন্ধ, তারপর VACUUM
+            before, after = vacuum(args.db)
+            print(f"🧹 data.db: {before / 1e6:.1f} MB → {after / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
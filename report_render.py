@@ -0,0 +1,272 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import metrics
+
+# =====================================================
+# 🖨️ REPORT RENDERING (চার্ট + PDF, আলাদা প্রসেসে, মেমোরিতে)
+# =====================================================
+# আগে পোর্টাল রিকোয়েস্ট থ্রেডেই 200 dpi চার্ট আঁকত আর chart.png /
+# Yachai_Report_Visual.pdf-এ লিখত — একসাথে দুজন ব্যবহারকারী হলে একে অন্যের ফাইল
+# ওভাররাইট হত, আর প্রতি ক্লিকে নতুন করে রেন্ডার। এখন:
+# - ProcessPoolExecutor-এ রেন্ডার (matplotlib GIL/মেমোরি Streamlit প্রসেসের বাইরে)
+# - চার্ট আর PDF দুটোই bytes (BytesIO) — কোনো শেয়ার্ড ফাইল নেই
+# - matplotlib, লোগো আর ফন্টের পাথ প্রতি worker-এ একবারই লোড
+# - ফলাফল (report id, version) ধরে LRU ক্যাশে; একই রিপোর্টে একসাথে দুটো ক্লিক
+#   হলেও রেন্ডার একবার
+# - অ্যাডমিনের জন্য অনেক রিপোর্ট এক PDF-এ (bulk export)
+
+FONT_PATH = os.getenv("YACHAI_PDF_FONT", "SolaimanLipi.ttf")
+LOGO_PATH = os.getenv("YACHAI_LOGO", "yachai_logo.png")
+WORKERS = int(os.getenv("RENDER_WORKERS", 2))
+CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", 256))
+CHART_DPI = 200
+MODEL_LABEL = "Model: Gemini-2.5 Flash (Pro API)"
+
+
+class FontMissingError(RuntimeError):
+    pass
+
+
+# --- worker প্রসেসের ভেতরের অবস্থা (initializer একবার সেট করে) ---
+_plt = None
+_logo = None
+_font_path = None
+_chart = None
+
+
+def _init_worker(font_path, logo_path):
+    global _plt, _logo, _font_path
+    import matplotlib
+    matplotlib.use("Agg")  # GUI ছাড়া
+    import matplotlib.pyplot as plt
+    _plt = plt
+    _font_path = font_path if font_path and os.path.exists(font_path) else None
+    try:
+        with open(logo_path, "rb") as f:
+            _logo = f.read()
+    except OSError:
+        _logo = None  # লোগো না থাকলে সমস্যা নেই
+
+
+def _chart_figure():
+    # প্রতি worker-এ একটাই figure; প্রতি রিপোর্টে শুধু বারের উচ্চতা বদলায়
+    global _chart
+    if _chart is None:
+        fig, ax = _plt.subplots(figsize=(5, 3))
+        bars = ax.bar(['Truth Probability', 'Misinformation Probability'], [0, 0], color=['#00bfff', '#ff4d4d'])
+        ax.set_ylim(0, 100)
+        ax.set_ylabel('Confidence %')
+        ax.set_title('AI Confidence Meter', color='#1d3557')
+        ax.tick_params(colors='#111')
+        fig.patch.set_alpha(0)
+        ax.set_facecolor('none')
+        fig.tight_layout()  # একবার — প্রতি savefig-এ bbox_inches='tight'-এর দ্বিগুণ draw লাগে না
+        _chart = (fig, bars)
+    return _chart
+
+
+def render_chart(score, dpi=CHART_DPI):
+    if _plt is None:
+        _init_worker(FONT_PATH, LOGO_PATH)
+    fig, (truth_bar, misinfo_bar) = _chart_figure()
+    truth_bar.set_height(100 - score)
+    misinfo_bar.set_height(score)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", transparent=True, dpi=dpi)
+    return buf.getvalue()
+
+
+def _new_pdf():
+    from fpdf import FPDF
+    if _font_path is None:
+        raise FontMissingError(f"{FONT_PATH} ফন্ট ফাইলটি পাওয়া যায়নি")
+    pdf = FPDF()
+    pdf.add_font('Bangla', '', _font_path)
+    pdf.add_font('Bangla', 'B', _font_path)
+    return pdf
+
+
+def _add_report_page(pdf, report, chart_png=None):
+    score = int(report["score"] or 0)
+    pdf.add_page()
+    pdf.set_font('Bangla', 'B', 16)
+    pdf.cell(0, 10, text="YachaiFactBot - AI Verification Report", new_x="LMARGIN", new_y="NEXT", align='C')
+
+    pdf.set_font('Bangla', '', 12)
+    pdf.multi_cell(0, 10, text=f"\nUser Query:\n{report['text']}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 10, text=f"Suspicion Score: {score}%", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 10, text=f"Truth Probability: {100 - score}%", new_x="LMARGIN", new_y="NEXT")
+    if report.get("final_verdict"):
+        pdf.cell(0, 10, text=f"Final Verdict: {report['final_verdict']}", new_x="LMARGIN", new_y="NEXT")
+    pdf.multi_cell(0, 10, text=f"\nAI Explanation:\n{report.get('justification') or ''}", new_x="LMARGIN", new_y="NEXT")
+
+    pdf.cell(0, 10, text=MODEL_LABEL, new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(5)
+
+    if _logo:
+        pdf.image(io.BytesIO(_logo), x=160, y=10, w=30)
+
+    if chart_png:
+        pdf.image(io.BytesIO(chart_png), x=40, y=pdf.get_y() + 5, w=130)
+    else:
+        _draw_vector_chart(pdf, score, x=40, y=pdf.get_y() + 5, w=130, h=70)
+    pdf.set_y(pdf.get_y() + 80)
+
+    pdf.set_font('Bangla', 'B', 12)
+    pdf.cell(0, 10, text="Developed by Team Believer 💡", new_x="LMARGIN", new_y="NEXT", align='C')
+
+
+def _draw_vector_chart(pdf, score, x, y, w, h):
+    # bulk export-এর জন্য একই চার্ট সরাসরি PDF-এ আঁকা — matplotlib-এর PNG-র চেয়ে
+    # অনেক দ্রুত আর ছোট (প্রতি পেজে ~০.১ সেকেন্ড বাঁচে)
+    pdf.set_font('Bangla', '', 10)
+    pdf.set_xy(x, y)
+    pdf.cell(w, 6, text='AI Confidence Meter', align='C')
+    top, bottom = y + 8, y + h - 8
+    pdf.set_draw_color(17, 17, 17)
+    pdf.line(x + 10, top, x + 10, bottom)
+    pdf.line(x + 10, bottom, x + w, bottom)
+    bar_w = (w - 10) / 4
+    for i, (label, value, color) in enumerate((
+        ('Truth Probability', 100 - score, (0, 191, 255)),
+        ('Misinformation Probability', score, (255, 77, 77)),
+    )):
+        bar_x = x + 10 + bar_w * (0.5 + 2 * i)
+        bar_h = (bottom - top) * value / 100
+        pdf.set_fill_color(*color)
+        pdf.rect(bar_x, bottom - bar_h, bar_w, bar_h, style='F')
+        pdf.set_xy(bar_x - bar_w / 2, bottom + 1)
+        pdf.cell(bar_w * 2, 5, text=label, align='C')
+        pdf.set_xy(bar_x, bottom - bar_h - 5)
+        pdf.cell(bar_w, 5, text=f"{value}%", align='C')
+
+
+def render_pdf(report, chart_png=None):
+    if _plt is None:
+        _init_worker(FONT_PATH, LOGO_PATH)
+    pdf = _new_pdf()
+    _add_report_page(pdf, report, chart_png or render_chart(int(report["score"] or 0)))
+    return bytes(pdf.output())
+
+
+def render_bulk_pdf(reports):
+    # এক ডকুমেন্ট, প্রতি রিপোর্টে এক পেজ — ফন্ট একবারই embed হয়, চার্ট vector
+    if _plt is None:
+        _init_worker(FONT_PATH, LOGO_PATH)
+    pdf = _new_pdf()
+    for report in reports:
+        _add_report_page(pdf, report)
+    return bytes(pdf.output())
+
+
+# =====================================================
+# 🧰 RENDERER (Streamlit প্রসেসের দিক)
+# =====================================================
+def report_version(report):
+    # রিপোর্ট বদলালে (যেমন final_verdict) নতুন key — পুরোনো ক্যাশ আর মেলে না
+    raw = "\x1f".join(str(report.get(k)) for k in ("text", "score", "verdict", "justification", "final_verdict"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _warmup():
+    return os.getpid()
+
+
+@contextmanager
+def _plain_main():
+    # Streamlit app.py-কে __main__ হিসেবে চালায় — spawn করা worker তখন পুরো অ্যাপটাই
+    # (secrets, init_db, dispatcher…) আবার চালাত। worker চালুর মুহূর্তে __main__ হিসেবে
+    # এই মডিউলটা দেখানো হয়, worker শুধু report_render import করে।
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = sys.modules[__name__]
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class ReportRenderer:
+    def __init__(self, workers=WORKERS, font_path=FONT_PATH, logo_path=LOGO_PATH, cache_size=CACHE_SIZE):
+        self.workers = workers
+        self.initargs = (font_path, logo_path)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # key → Future
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.pool = self._start_pool()
+        metrics.QUEUE_DEPTH.track(self.pending, "render")
+
+    def _start_pool(self):
+        # spawn — Streamlit-এর থ্রেডওয়ালা প্রসেস fork করা নিরাপদ নয়।
+        # সব worker এখনই চালু করা হয়, পরে submit-এ আর নতুন প্রসেস তৈরি হয় না।
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self.initargs,
+        )
+        with _plain_main():
+            wait([pool.submit(_warmup) for _ in range(self.workers)])
+        return pool
+
+    def _submit(self, fn, *args):
+        try:
+            return self.pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # কোনো worker মারা গেলে (যেমন মেমোরি শেষ) পুরো pool নতুন করে
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._start_pool()
+            return self.pool.submit(fn, *args)
+
+    def _cached(self, key, fn, *args):
+        with self._lock:
+            future = self.cache.get(key)
+            if future is not None and not (future.done() and future.exception()):
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._submit(fn, *args)
+            started = time.perf_counter()
+            future.add_done_callback(lambda f: metrics.RENDER.observe(
+                time.perf_counter() - started, key[0], "error" if f.cancelled() or f.exception() else "ok"))
+            self.cache[key] = future
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return future
+
+    def chart(self, report):
+        score = int(report["score"] or 0)
+        return self._cached(("chart", score), render_chart, score)
+
+    def pdf(self, report, chart_png=None):
+        # পোর্টালে আগেই আঁকা চার্ট থাকলে সেটাই PDF-এ, আবার আঁকা হয় না
+        key = ("pdf", report["id"], report_version(report))
+        return self._cached(key, render_pdf, dict(report), chart_png)
+
+    def bulk_pdf(self, reports):
+        reports = [dict(r) for r in reports]
+        key = ("bulk", tuple((r["id"], report_version(r)) for r in reports))
+        return self._cached(key, render_bulk_pdf, reports)
+
+    def pending(self):
+        with self._lock:
+            return sum(1 for f in self.cache.values() if not f.done())
+
+    def stats(self):
+        with self._lock:
+            return {"cached": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
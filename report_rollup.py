@@ -0,0 +1,249 @@
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+
+# =====================================================
+# 📈 ANALYTICS ROLLUP (দিন × ভার্ডিক্ট × স্কোর-বাকেট)
+# =====================================================
+# দৈনিক সংখ্যা, ভার্ডিক্ট বণ্টন, স্কোর histogram, রিভিউ ব্যাকলগের বয়স — এগুলো পুরো
+# reports টেবিল pandas-এ না তুলে report_rollup টেবিল থেকে পড়া হয়। টেবিলটা
+# reports-এর trigger দিয়ে (FTS-এর মতোই) সবসময় sync থাকে — পোর্টাল, দুটো বট,
+# import_claims, rescore_reports, অ্যাডমিনের ট্যাগ — যে পথেই লেখা হোক।
+# প্রতি সারি: একটা (দিন, AI ভার্ডিক্ট, অ্যাডমিন ট্যাগ, source, স্কোর-বাকেট) → কয়টা রিপোর্ট, স্কোরের যোগফল।
+# আকার রিপোর্টের সংখ্যার উপর নয়, দিনের সংখ্যার উপর নির্ভর করে।
+#
+# backfill / সন্দেহ হলে:  python report_rollup.py --rebuild   (--check: reports-এর সাথে মিলিয়ে দেখা)
+# আর্কাইভে সরানো রিপোর্টগুলো (report_archive) archive_rollup-এ — একই key, সরানোর ট্রানজ্যাকশনেই যোগ হয়।
+# নিচের Analytics query দুটো টেবিল মিলিয়ে পড়ে; rebuild/check শুধু লাইভ report_rollup-এর।
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+
+KEY_COLUMNS = ("day", "verdict", "final_verdict", "source", "score_bucket")
+ALL_TIERS = f"""(
+    SELECT {', '.join(KEY_COLUMNS)}, reports, score_sum FROM report_rollup
+    UNION ALL SELECT {', '.join(KEY_COLUMNS)}, reports, score_sum FROM archive_rollup
+) AS rollup"""
+BACKLOG_AGES = [("< ১ দিন", 0, 0), ("১–৩ দিন", 1, 3), ("৪–৭ দিন", 4, 7), ("> ৭ দিন", 8, None)]
+
+
+def _key(row):
+    # row = "new" / "old" (trigger) বা "" (rebuild-এর GROUP BY) — NULL কে '' ধরা, যাতে PRIMARY KEY-তে মেলে
+    p = f"{row}." if row else ""
+    return (
+        f"COALESCE(date({p}timestamp), '')",
+        f"COALESCE({p}verdict, '')",
+        f"COALESCE({p}final_verdict, '')",  # '' = পেন্ডিং
+        f"COALESCE({p}source, '')",
+        f"CASE WHEN {p}score IS NULL THEN -1 ELSE MIN(MAX(CAST({p}score AS INTEGER), 0) / 10, 9) END",  # 100 → 9
+    )
+
+
+def _add_sql(row):
+    return f"""
+        INSERT INTO report_rollup ({', '.join(KEY_COLUMNS)}, reports, score_sum)
+        VALUES ({', '.join(_key(row))}, 1, COALESCE({row}.score, 0))
+        ON CONFLICT({', '.join(KEY_COLUMNS)}) DO UPDATE SET
+            reports = reports + 1, score_sum = score_sum + excluded.score_sum;
+    """
+
+
+def _remove_sql(row):
+    match = " AND ".join(f"{c} = {e}" for c, e in zip(KEY_COLUMNS, _key(row)))
+    return f"""
+        UPDATE report_rollup SET reports = reports - 1, score_sum = score_sum - COALESCE({row}.score, 0) WHERE {match};
+        DELETE FROM report_rollup WHERE {match} AND reports <= 0;
+    """
+
+
+def ensure_rollup(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='report_rollup'"
+    ).fetchone()
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS report_rollup (
+            day TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            final_verdict TEXT NOT NULL,
+            source TEXT NOT NULL,
+            score_bucket INTEGER NOT NULL,
+            reports INTEGER NOT NULL,
+            score_sum INTEGER NOT NULL,
+            PRIMARY KEY ({', '.join(KEY_COLUMNS)})
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS archive_rollup (
+            day TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            final_verdict TEXT NOT NULL,
+            source TEXT NOT NULL,
+            score_bucket INTEGER NOT NULL,
+            reports INTEGER NOT NULL,
+            score_sum INTEGER NOT NULL,
+            PRIMARY KEY ({', '.join(KEY_COLUMNS)})
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS report_rollup_ai AFTER INSERT ON reports BEGIN
+            {_add_sql("new")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS report_rollup_ad AFTER DELETE ON reports BEGIN
+            {_remove_sql("old")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS report_rollup_au
+        AFTER UPDATE OF timestamp, score, verdict, final_verdict, source ON reports BEGIN
+            {_remove_sql("old")}
+            {_add_sql("new")}
+        END;
+    """)
+    if not exists:
+        # আগের রিপোর্টগুলো একবার গোনা
+        rebuild(conn)
+        logging.info("📈 Rollup টেবিল (report_rollup) তৈরি হয়েছে।")
+    conn.commit()
+
+
+def rebuild(conn):
+    # পুরো টেবিল নতুন করে — একটা write transaction-এ, যাতে মাঝে আসা insert-এর trigger হারিয়ে না যায়
+    started = time.perf_counter()
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM report_rollup")
+        conn.execute(f"""
+            INSERT INTO report_rollup ({', '.join(KEY_COLUMNS)}, reports, score_sum)
+            SELECT {', '.join(_key(''))}, COUNT(*), COALESCE(SUM(score), 0)
+            FROM reports GROUP BY 1, 2, 3, 4, 5
+        """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    rows = conn.execute("SELECT COUNT(*), COALESCE(SUM(reports), 0) FROM report_rollup").fetchone()
+    logging.info(f"📈 Rollup rebuild: {rows[1]} রিপোর্ট → {rows[0]} সারি, {time.perf_counter() - started:.2f}s")
+    return rows[1]
+
+
+def check(conn, key=None):
+    # rollup বনাম reports-এর সরাসরি GROUP BY — অমিলগুলো ফেরত (পুরো টেবিল পড়ে, শুধু CLI/রক্ষণাবেক্ষণে)
+    # key: অন্য ব্যাকএন্ডের key expression (storage._pg_key)
+    live = {tuple(r[:5]): tuple(r[5:]) for r in conn.execute(f"""
+        SELECT {', '.join(key or _key(''))}, COUNT(*), COALESCE(SUM(score), 0) FROM reports GROUP BY 1, 2, 3, 4, 5
+    """)}
+    rolled = {tuple(r[:5]): tuple(r[5:]) for r in conn.execute(
+        f"SELECT {', '.join(KEY_COLUMNS)}, reports, score_sum FROM report_rollup"
+    )}
+    return [(k, live.get(k), rolled.get(k)) for k in sorted(set(live) | set(rolled), key=str) if live.get(k) != rolled.get(k)]
+
+
+# ---------- অ্যাডমিন Analytics পেজের query (শুধু report_rollup) ----------
+def _since(days):
+    return "" if days is None else (date.today() - timedelta(days=days - 1)).isoformat()
+
+
+def totals(conn):
+    # reports = লাইভ টেবিলে কয়টা (pagination/মাইগ্রেশন এটাই মেলায়), archived = আর্কাইভে সরানো
+    row = conn.execute("""
+        SELECT COALESCE(SUM(reports), 0),
+               COALESCE(SUM(CASE WHEN final_verdict = '' THEN reports END), 0),
+               MIN(CASE WHEN final_verdict = '' THEN day END),
+               (SELECT COALESCE(SUM(reports), 0) FROM archive_rollup)
+        FROM report_rollup
+    """).fetchone()
+    return {"reports": row[0], "pending": row[1], "oldest_pending_day": row[2], "archived": row[3]}
+
+
+def daily(conn, days=30):
+    rows = conn.execute(f"""
+        SELECT day, SUM(reports), SUM(CASE WHEN final_verdict = '' THEN reports ELSE 0 END),
+               SUM(CASE WHEN score_bucket >= 0 THEN score_sum END) * 1.0 / NULLIF(SUM(CASE WHEN score_bucket >= 0 THEN reports END), 0)
+        FROM {ALL_TIERS} WHERE day >= ? GROUP BY day ORDER BY day
+    """, (_since(days),)).fetchall()
+    return [{"day": d, "reports": n, "pending": p, "avg_score": None if s is None else round(float(s), 1)} for d, n, p, s in rows]
+
+
+def verdicts(conn, days=None):
+    rows = conn.execute(f"""
+        SELECT verdict, final_verdict, SUM(reports) FROM {ALL_TIERS}
+        WHERE day >= ? GROUP BY verdict, final_verdict ORDER BY 3 DESC
+    """, (_since(days),)).fetchall()
+    return [{"verdict": v or None, "final_verdict": f or None, "reports": n} for v, f, n in rows]
+
+
+def score_histogram(conn, days=None):
+    rows = conn.execute(f"""
+        SELECT score_bucket, SUM(reports) FROM {ALL_TIERS}
+        WHERE day >= ? AND score_bucket >= 0 GROUP BY score_bucket
+    """, (_since(days),)).fetchall()
+    counts = dict(rows)
+    return [{"bucket": f"{b * 10}–{b * 10 + (10 if b == 9 else 9)}", "reports": counts.get(b, 0)} for b in range(10)]
+
+
+def sources(conn, days=None):
+    rows = conn.execute(f"""
+        SELECT source, SUM(reports) FROM {ALL_TIERS} WHERE day >= ? GROUP BY source ORDER BY 2 DESC
+    """, (_since(days),)).fetchall()
+    return [{"source": s or "—", "reports": n} for s, n in rows]
+
+
+def backlog_ages(conn, today=None):
+    # পেন্ডিং রিপোর্ট কত দিন ধরে অপেক্ষায় (দিন-ভিত্তিক, তাই আনুমানিক)
+    today = today or date.today()
+    rows = conn.execute("""
+        SELECT day, SUM(reports) FROM report_rollup WHERE final_verdict = '' AND day != '' GROUP BY day
+    """).fetchall()
+    result = {label: 0 for label, _, _ in BACKLOG_AGES}
+    for day, n in rows:
+        age = (today - date.fromisoformat(day)).days
+        for label, low, high in BACKLOG_AGES:
+            if age >= low and (high is None or age <= high):
+                result[label] += n
+                break
+        else:
+            result[BACKLOG_AGES[0][0]] += n  # ঘড়ির গোলমালে ভবিষ্যতের তারিখ
+    return [{"age": label, "reports": n} for label, n in result.items()]
+
+
+def _report_check(mismatches):
+    for key, live, rolled in mismatches[:20]:
+        print(f"❌ {key}: reports={live} rollup={rolled}")
+    print("✅ rollup reports-এর সাথে মিলেছে" if not mismatches else f"❌ {len(mismatches)}টি অমিল — --rebuild চালান")
+    raise SystemExit(1 if mismatches else 0)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="report_rollup টেবিল তৈরি / backfill / যাচাই")
+    parser.add_argument("--db", default=os.getenv("YACHAI_DATABASE_URL") or DB_PATH, help="SQLite ফাইল বা postgresql://...")
+    parser.add_argument("--rebuild", action="store_true", help="reports থেকে পুরো rollup নতুন করে গোনা")
+    parser.add_argument("--check", action="store_true", help="rollup আর reports মিলিয়ে দেখা")
+    args = parser.parse_args()
+
+    if args.db.startswith(("postgres://", "postgresql://")):
+        import storage
+        store = storage.open_storage(args.db)  # schema + trigger + প্রথমবার backfill
+        try:
+            if args.rebuild:
+                print(f"✅ {store.rebuild_rollup()} রিপোর্ট rollup-এ গোনা হয়েছে")
+            if args.check:
+                _report_check(store.check_rollup())
+            with store.reader() as conn:
+                print(totals(conn))
+        finally:
+            store.close()
+        return
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    try:
+        ensure_rollup(conn)
+        if args.rebuild:
+            print(f"✅ {rebuild(conn)} রিপোর্ট rollup-এ গোনা হয়েছে")
+        if args.check:
+            _report_check(check(conn))
+        print(totals(conn))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
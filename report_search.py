@@ -0,0 +1,124 @@
+import logging
+import os
+import re
+import unicodedata
+
+# =====================================================
+# 🔎 FULL-TEXT SEARCH (SQLite FTS5, বাংলা + ASCII)
+# =====================================================
+# reports.text আর justification-এর FTS5 mirror — trigger দিয়ে সবসময় sync থাকে।
+# ডিফল্ট unicode61 টোকেনাইজার কার-চিহ্ন/হসন্ত (Unicode M*) কে separator ধরে
+# বাংলা শব্দ ভেঙে ফেলে, তাই M* কেও token-এর অংশ ধরা হয়েছে।
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+TOKENIZER = "unicode61 remove_diacritics 0 categories 'L* N* Co M*'"
+
+_BN_DIGITS = "০১২৩৪৫৬৭৮৯"
+_TO_BN = str.maketrans("0123456789", _BN_DIGITS)
+_TO_ASCII = str.maketrans(_BN_DIGITS, "0123456789")
+
+
+def ensure_fts(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='reports_fts'"
+    ).fetchone()
+    conn.executescript(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+            text, justification,
+            content='reports', content_rowid='id',
+            tokenize="{TOKENIZER}"
+        );
+        CREATE TRIGGER IF NOT EXISTS reports_fts_ai AFTER INSERT ON reports BEGIN
+            INSERT INTO reports_fts(rowid, text, justification) VALUES (new.id, new.text, new.justification);
+        END;
+        CREATE TRIGGER IF NOT EXISTS reports_fts_ad AFTER DELETE ON reports BEGIN
+            INSERT INTO reports_fts(reports_fts, rowid, text, justification) VALUES ('delete', old.id, old.text, old.justification);
+        END;
+        CREATE TRIGGER IF NOT EXISTS reports_fts_au AFTER UPDATE OF text, justification ON reports BEGIN
+            INSERT INTO reports_fts(reports_fts, rowid, text, justification) VALUES ('delete', old.id, old.text, old.justification);
+            INSERT INTO reports_fts(rowid, text, justification) VALUES (new.id, new.text, new.justification);
+        END;
+    """)
+    if not exists:
+        # আগের রিপোর্টগুলো একবার index করা
+        conn.execute("INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')")
+        logging.info("🔎 FTS index (reports_fts) তৈরি হয়েছে।")
+    conn.commit()
+
+
+def search_terms(query):
+    # প্রতিটা শব্দের রূপগুলো — অঙ্ক থাকলে বাংলা/ইংরেজি দুই রূপেই
+    q = unicodedata.normalize("NFC", query or "")
+    return [{token, token.translate(_TO_ASCII), token.translate(_TO_BN)}
+            for token in re.findall(r"[^\s\"'()*:^.,!?।]+", q)]
+
+
+def build_match_query(query):
+    # প্রতিটা শব্দ prefix match (লিস্ট* → লিস্টে, লিস্টের)
+    terms = []
+    for forms in search_terms(query):
+        quoted = [f'"{f}"*' for f in sorted(forms)]
+        terms.append(quoted[0] if len(quoted) == 1 else "(" + " OR ".join(quoted) + ")")
+    return " AND ".join(terms)
+
+
+def search(conn, query, verdict=None, date_from=None, date_to=None, limit=20, offset=0):
+    match = build_match_query(query)
+    if not match:
+        return []
+    where, params = ["reports_fts MATCH ?"], [match]
+    if verdict:
+        # অ্যাডমিনের সিদ্ধান্ত থাকলে সেটাই, না হলে AI ভার্ডিক্ট
+        where.append("COALESCE(r.final_verdict, r.verdict) = ?")
+        params.append(verdict)
+    if date_from:
+        where.append("r.timestamp >= ?")
+        params.append(str(date_from))
+    if date_to:
+        where.append("r.timestamp < date(?, '+1 day')")
+        params.append(str(date_to))
+    rows = conn.execute(f"""
+        SELECT r.id, r.timestamp, r.score, r.verdict, r.final_verdict,
+               snippet(reports_fts, 0, '**', '**', '…', 16) AS text_snippet,
+               snippet(reports_fts, 1, '**', '**', '…', 16) AS justification_snippet
+        FROM reports_fts JOIN reports r ON r.id = reports_fts.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY bm25(reports_fts, 2.0, 1.0)
+        LIMIT ? OFFSET ?
+    """, params + [limit, offset]).fetchall()
+    keys = ["id", "timestamp", "score", "verdict", "final_verdict", "text_snippet", "justification_snippet"]
+    return [dict(zip(keys, r)) for r in rows]
+
+
+def snippet(text, terms, width=60):
+    # FTS5-এর snippet()-এর মতো (PostgreSQL ব্যাকএন্ডের জন্য): প্রথম মিলের আশেপাশে, মিলগুলো **bold**
+    text = text or ""
+    forms = sorted({f for t in terms for f in t if f}, key=len, reverse=True)
+    if not forms:
+        return text[:width * 2]
+    pattern = re.compile("|".join(re.escape(f) for f in forms), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, first.start() - width) if first else 0
+    part = text[start:start + width * 2]
+    return ("…" if start else "") + pattern.sub(lambda m: f"**{m.group(0)}**", part) + ("…" if start + width * 2 < len(text) else "")
+
+
+def search_db(query, db_path=DB_PATH, limit=5):
+    # বটের জন্য: শেয়ার্ড storage (SQLite FTS5 বা PostgreSQL) দিয়ে সার্চ
+    try:
+        import storage
+        return storage.get_storage(db_path).search(query, limit=limit)
+    except Exception as e:
+        logging.error(f"Search ব্যর্থ: {e}")
+        return []
+
+
+def format_results_text(query, results):
+    if not results:
+        return f"🔎 \"{query}\" — কোনো রিপোর্ট পাওয়া যায়নি।"
+    lines = [f"🔎 \"{query}\" — {len(results)}টি ফলাফল:"]
+    for r in results:
+        verdict = r["final_verdict"] or r["verdict"] or "N/A"
+        mark = "🧑‍💼" if r["final_verdict"] else "🤖"
+        lines.append(f"\n#{r['id']} {mark} {verdict} ({r['score']}%)\n{r['text_snippet'].replace('**', '')}")
+    return "\n".join(lines)
@@ -0,0 +1,230 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import metrics
+
+# =====================================================
+# ✍️ REPORT WRITER (এক writer থ্রেড, group commit) + read-only কানেকশন পুল
+# =====================================================
+# আগে প্রতিটা Streamlit সেশন/বট থ্রেড একটা শেয়ার্ড check_same_thread=False কানেকশনে
+# সারি লিখে সাথে সাথে commit করত — চাপের মুখে "database is locked" আর প্রতি সারিতে fsync।
+# এখন প্রতি প্রসেসে, প্রতি ডেটাবেস ফাইলে একটাই writer থ্রেড:
+# - লেখার কাজগুলো (insert_report, update_verdict, ...) একটা সারিতে আসে
+# - সারিতে যা জমেছে (সর্বোচ্চ MAX_BATCH) একটা transaction-এ — এক commit, এক WAL sync;
+#   আগের commit চলার সময় যা আসে সেটাই পরের batch, তাই কোনো কাজ একটা commit-এর বেশি অপেক্ষা করে না।
+#   ধীর ডিস্কে FLUSH_MS দিলে প্রথম কাজের পর সর্বোচ্চ ততক্ষণ আরও কাজের অপেক্ষা (বড় batch, বেশি latency)
+# - প্রতিটা কাজ নিজের SAVEPOINT-এ, একটার ভুলে বাকিরা আটকায় না
+# - WAL + synchronous=NORMAL + busy_timeout (অন্য প্রসেসের writer থাকলে অপেক্ষা, সাথে সাথে ত্রুটি নয়)
+# ডাকার থ্রেড নিজের কাজ commit হওয়া পর্যন্ত অপেক্ষা করে, তাই ফলাফল (report id) আগের মতোই পায়।
+# পড়ার জন্য আলাদা read-only কানেকশন পুল — ড্যাশবোর্ডের query writer-এর কানেকশনে লাইন দেয় না।
+
+MAX_BATCH = int(os.getenv("REPORT_WRITER_MAX_BATCH", 200))
+FLUSH_MS = float(os.getenv("REPORT_WRITER_FLUSH_MS", 0))  # 0 = শুধু যা ইতিমধ্যে সারিতে আছে
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 10000))
+WRITE_TIMEOUT = 60  # সেকেন্ড, ডাকার থ্রেড কতক্ষণ অপেক্ষা করবে
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", 8))
+
+DB_WRITE_BATCH = metrics.histogram("yachai_db_write_batch_size", "Write operations per group commit", ("db",),
+                                   buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500))
+
+
+def apply_pragmas(conn):
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL-এ নিরাপদ: commit-এ fsync নয়, checkpoint-এ
+
+
+class ReportWriter:
+    def __init__(self, db_path, setup=None, max_batch=MAX_BATCH, flush_ms=FLUSH_MS):
+        # setup(conn) — writer কানেকশনে একবার (টেবিল/trigger তৈরি)
+        self.db_path = db_path
+        self.setup = setup
+        self.max_batch = max_batch
+        self.flush_seconds = flush_ms / 1000
+        self.queue = queue.Queue()
+        self.commits = 0
+        self.writes = 0
+        self.failed = 0
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        metrics.QUEUE_DEPTH.track(self.queue.qsize, "report_writer")
+
+    # ---------- ডাকার দিক ----------
+    def submit(self, fn):
+        # fn(conn) → ফলাফল; writer থ্রেডে, একটা batch transaction-এর ভেতরে চলে
+        future = Future()
+        self.queue.put((fn, future))
+        return future
+
+    def execute(self, fn, timeout=WRITE_TIMEOUT):
+        return self.submit(fn).result(timeout)
+
+    def insert_report(self, text, result, source=None):
+        def insert(conn):
+            return conn.execute("""
+                INSERT INTO reports (text, score, verdict, justification, final_verdict, source)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (text, int(result.get("score", 0)), result.get("verdict", "N/A"),
+                  result.get("justification", "N/A"), result.get("final_verdict"), source)).lastrowid
+        return self.execute(insert)
+
+    def update_verdict(self, report_id, verdict):
+        # অ্যাডমিনের ট্যাগ; রিপোর্টের (text, score, verdict, justification) ফেরত — ক্যাশে বসানোর জন্য
+        def update(conn):
+            conn.execute("UPDATE reports SET final_verdict=?, updated_at=CURRENT_TIMESTAMP WHERE id=?", (verdict, report_id))
+            return conn.execute("SELECT text, score, verdict, justification FROM reports WHERE id=?", (report_id,)).fetchone()
+        return self.execute(update)
+
+    def close(self, timeout=10):
+        # বাকি কাজ commit করে থ্রেড বন্ধ (atexit); রেজিস্ট্রি থেকেও বাদ, যাতে পরের get_writer নতুন writer পায়
+        with _lock:
+            if _writers.get(os.path.abspath(self.db_path)) is self:
+                del _writers[os.path.abspath(self.db_path)]
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "commits": self.commits, "writes": self.writes, "failed": self.failed,
+                "avg_batch": round(self.writes / self.commits, 2) if self.commits else None}
+
+    # ---------- writer থ্রেড ----------
+    def _connect(self):
+        # isolation_level=None — BEGIN/COMMIT/SAVEPOINT আমরা নিজেরা দিই
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        apply_pragmas(conn)
+        if self.setup is not None:
+            self.setup(conn)
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        return conn
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logging.error(f"Report writer কানেকশন ব্যর্থ: {e}")
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.max_batch:
+                # যা জমে আছে সাথে সাথে; খালি হলে deadline পর্যন্ত অপেক্ষা
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(conn, batch)
+        conn.close()
+
+    def _flush(self, conn, batch):
+        results = []
+        try:
+            with metrics.DB_QUERY.time("group_commit", "reports"):
+                conn.execute("BEGIN IMMEDIATE")
+                for fn, future in batch:
+                    conn.execute("SAVEPOINT op")
+                    try:
+                        results.append((future, fn(conn), None))
+                        conn.execute("RELEASE op")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO op")
+                        conn.execute("RELEASE op")
+                        results.append((future, None, e))
+                conn.execute("COMMIT")
+        except Exception as e:
+            # commit নিজেই ব্যর্থ (disk/lock) — পুরো batch বাতিল, সবাইকে জানানো
+            logging.error(f"Group commit ব্যর্থ ({len(batch)}টি কাজ): {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.failed += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.commits += 1
+        self.writes += len(batch)
+        DB_WRITE_BATCH.observe(len(batch), os.path.basename(self.db_path))
+        for future, value, error in results:
+            if error is not None:
+                self.failed += 1
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+
+class ReadPool:
+    def __init__(self, db_path, size=READ_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+
+_writers = {}
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_writer(db_path, setup=None):
+    # প্রতি ডেটাবেস ফাইলে একটাই (পোর্টাল আর verify_service একই প্রসেসে একই writer পায়)
+    key = os.path.abspath(db_path)
+    with _lock:
+        writer = _writers.get(key)
+        if writer is None or not writer._thread.is_alive():  # মরা থ্রেডের writer-এ execute পুরো WRITE_TIMEOUT আটকে থাকত
+            writer = _writers[key] = ReportWriter(db_path, setup)
+            atexit.register(writer.close)
+        return writer
+
+
+def get_read_pool(db_path):
+    key = os.path.abspath(db_path)
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ReadPool(db_path)
+        return pool
@@ -0,0 +1,63 @@
+import argparse
+import logging
+import os
+import time
+
+import gemini_analysis
+import storage
+import verdict_cache
+
+# =====================================================
+# 🔁 BULK RE-SCORING (batch Gemini mode)
+# =====================================================
+# python rescore_reports.py --batch-size 10 --pending-only
+# reports টেবিল id ক্রমে পড়ে, প্রতি batch এক প্রম্পটে যাচাই করে score/verdict/justification আপডেট করে।
+# ক্যাশে থাকা একই দাবির পুরোনো উত্তরও বদলানো হয়, যাতে পরের অনুরোধে নতুন স্কোর আসে।
+
+
+def rescore(db_path, batch_size, pending_only=False, limit=None):
+    store = storage.get_storage(db_path)  # YACHAI_DATABASE_URL থাকলে শেয়ার্ড PostgreSQL
+    where = "AND final_verdict IS NULL" if pending_only else ""
+    last_id, done = 0, 0
+    while limit is None or done < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done)
+        with store.reader() as conn:
+            rows = conn.execute(
+                f"SELECT id, text FROM reports WHERE id > ? {where} ORDER BY id LIMIT ?", (last_id, size)
+            ).fetchall()
+        if not rows:
+            break
+        results = gemini_analysis.get_gemini_batch_analysis(rows, batch_size=batch_size)
+        texts = dict(rows)
+        rescored = {rid: a for rid, a in results.items() if a}
+        updates = [(a["score"], a["verdict"], a.get("justification", ""), rid) for rid, a in rescored.items()]
+        if updates:
+            store.write(lambda conn: conn.executemany("UPDATE reports SET score=?, verdict=?, justification=? WHERE id=?", updates))
+            verdict_cache.refresh_many([(texts[rid], a) for rid, a in rescored.items()])
+        done += len(rows)
+        last_id = rows[-1][0]
+        logging.info(f"🔁 {done} রিপোর্ট রি-স্কোর হয়েছে (শেষ ID {last_id}, এই batch-এ {len(updates)}/{len(rows)} সফল)")
+    return done
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="reports টেবিল batch Gemini দিয়ে রি-স্কোর করা")
+    parser.add_argument("--db", default=os.getenv("YACHAI_DB_PATH", "data.db"))
+    parser.add_argument("--batch-size", type=int, default=gemini_analysis.BATCH_SIZE)
+    parser.add_argument("--pending-only", action="store_true", help="শুধু অ্যাডমিন-অযাচাইকৃত রিপোর্ট")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    gemini_analysis.configure(os.getenv("GEMINI_API_KEY"))
+    started = time.perf_counter()
+    done = rescore(args.db, args.batch_size, args.pending_only, args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {done} রিপোর্ট, {elapsed:.1f}s ({done / elapsed if elapsed else 0:.2f} claims/s)")
+    for mode, u in gemini_analysis.usage_per_claim().items():
+        if u["claims"]:
+            print(f"  {mode:>6}: {u['calls']} calls, {u['seconds_per_claim']:.2f}s/claim, {u['tokens_per_claim']:.0f} tokens/claim")
+
+
+if __name__ == "__main__":
+    main()
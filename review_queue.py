@@ -0,0 +1,322 @@
+import argparse
+import logging
+import os
+import time
+
+import claim_index
+import storage
+
+# =====================================================
+# 🗂️ REVIEW QUEUE (priority + লিজ + ক্লাস্টার ট্যাগ)
+# =====================================================
+# আগে অ্যাডমিন পেজ প্রতি rerun-এ ৫০০টা পেন্ডিং রিপোর্ট pandas-এ তুলে selectbox-এ পুরো টেক্সট
+# দেখাত, আর টেক্সট মিলিয়ে সারি খুঁজত — একই টেক্সটের দুটো রিপোর্টে ভুল সারি ট্যাগ হতো। এখন:
+# - কিউ ডেটাবেসেই, জমা priority-র index ক্রমে (review_clusters.priority, পেন্ডিং না থাকলে NULL):
+#   priority = AI স্কোর + ক্লাস্টারের পেন্ডিং রিপোর্টের সংখ্যা + কত দিন ধরে অপেক্ষায়।
+#   ক্লাস্টারের পেন্ডিং সংখ্যা (review_cluster_sizes) আর সদস্যদের priority বদলায় শুধু
+#   ট্যাগ/ক্লাস্টারে যোগের সময়, সেই ক্লাস্টারেরই; বয়সের অংশ REFRESH_SECONDS-এ একবার সবার।
+#   তাই কিউ দেখা/লিজ নেওয়া পেন্ডিং রিপোর্টের সংখ্যার ওপর নির্ভর করে না
+# - রিভিউয়ার একসাথে কয়েকটা রিপোর্ট লিজ নেন (মেয়াদসহ) — অন্যরা সেগুলো পান না, মেয়াদ
+#   পেরোলে আবার কিউতে; তাই একাধিক ফ্যাক্ট-চেকার একসাথে কাজ করলেও সংঘর্ষ নেই
+# - একই ক্লাস্টারের সব পেন্ডিং রিপোর্টে একটাই ভার্ডিক্ট — এক ট্রানজ্যাকশনে
+# ক্লাস্টার (review_clusters) claim_index-এর LSH থেকে, নতুন পেন্ডিং রিপোর্টগুলো sync_clusters-এ।
+#
+# python review_queue.py --reviewer rahim --claim 5   (কিউর উপরের দিক দেখা / লিজ নেওয়া)
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+LEASE_SECONDS = int(os.getenv("REVIEW_LEASE_SECONDS", 600))
+BATCH = int(os.getenv("REVIEW_BATCH", 10))  # একবারে কয়টা লিজ
+DUP_WEIGHT = float(os.getenv("REVIEW_DUP_WEIGHT", 5))  # প্রতিটা অতিরিক্ত অনুরূপ রিপোর্টে
+DUP_CAP = 10
+AGE_WEIGHT = float(os.getenv("REVIEW_AGE_WEIGHT", 3))  # অপেক্ষার প্রতি দিনে
+AGE_CAP = 14  # দিন
+SYNC_BATCH = 500
+REFRESH_SECONDS = int(os.getenv("REVIEW_REFRESH_SECONDS", 3600))  # priority-র বয়সের অংশ এতক্ষণ পরপর নতুন করে
+
+ITEM_COLUMNS = ("id", "timestamp", "text", "score", "verdict", "justification", "cluster_id", "duplicates", "priority")
+
+# ব্যাকএন্ড অনুযায়ী যে দুটো জিনিস আলাদা
+_LEAST = {"sqlite": "MIN", "postgresql": "LEAST"}
+_AGE_DAYS = {
+    "sqlite": "julianday('now') - julianday(r.timestamp)",
+    "postgresql": "EXTRACT(EPOCH FROM LOCALTIMESTAMP - r.timestamp) / 86400",  # সেশন UTC, timestamp-ও UTC
+}
+
+_refreshed = {}  # store → শেষ পুরো refresh (time.monotonic)
+
+
+def _priority_sql(backend):
+    # review_clusters-এর একটা সারির priority; রিপোর্ট আর পেন্ডিং না থাকলে NULL (কিউ থেকে বাদ)
+    least = _LEAST[backend]
+    return f"""(
+        SELECT COALESCE(r.score, 0) + {DUP_WEIGHT} * {least}(COALESCE(s.pending, 1) - 1, {DUP_CAP})
+               + {AGE_WEIGHT} * {least}(COALESCE({_AGE_DAYS[backend]}, 0), {AGE_CAP})
+        FROM reports r
+        LEFT JOIN review_cluster_sizes s ON s.cluster_id = review_clusters.cluster_id
+        WHERE r.id = review_clusters.report_id AND r.final_verdict IS NULL
+    )"""
+
+
+def _recount(conn, backend, cluster_ids):
+    # এই ক্লাস্টারগুলোর পেন্ডিং সংখ্যা (শুধু final_verdict IS NULL) আর সদস্যদের priority নতুন করে —
+    # খরচ ক্লাস্টারের আকার অনুযায়ী, পুরো কিউ নয়
+    cluster_ids = sorted(set(cluster_ids))
+    for i in range(0, len(cluster_ids), 500):
+        chunk = cluster_ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM review_cluster_sizes WHERE cluster_id IN ({marks})", chunk)
+        conn.execute(f"""
+            INSERT INTO review_cluster_sizes (cluster_id, pending)
+            SELECT c.cluster_id, COUNT(*) FROM review_clusters c JOIN reports r ON r.id = c.report_id
+            WHERE c.cluster_id IN ({marks}) AND r.final_verdict IS NULL
+            GROUP BY c.cluster_id
+        """, chunk)
+        conn.execute(f"UPDATE review_clusters SET priority = {_priority_sql(backend)} WHERE cluster_id IN ({marks})", chunk)
+
+
+def _refresh(conn, backend):
+    # সব পেন্ডিং রিপোর্টের গোনা আর priority নতুন করে — বয়সের অংশ বাড়ে, আর অন্য পথে
+    # (storage.update_verdict, পুরোনো ডেটাবেস) বদলানো সারিও ঠিক হয়। REFRESH_SECONDS-এ একবার
+    conn.execute("DELETE FROM review_cluster_sizes")
+    conn.execute("""
+        INSERT INTO review_cluster_sizes (cluster_id, pending)
+        SELECT c.cluster_id, COUNT(*) FROM reports r JOIN review_clusters c ON c.report_id = r.id
+        WHERE r.final_verdict IS NULL
+        GROUP BY c.cluster_id
+    """)
+    conn.execute(f"""
+        UPDATE review_clusters SET priority = {_priority_sql(backend)}
+        WHERE priority IS NOT NULL OR report_id IN (SELECT id FROM reports WHERE final_verdict IS NULL)
+    """)
+
+
+def _maybe_refresh(store, conn):
+    if time.monotonic() - _refreshed.get(store, float("-inf")) >= REFRESH_SECONDS:
+        _refresh(conn, store.name)
+        _refreshed[store] = time.monotonic()
+
+
+def _items_sql(where, lease_join="LEFT JOIN"):
+    # জমা priority-র partial index (idx_review_clusters_priority) ক্রমে — LIMIT পেলেই থামে
+    return f"""
+        SELECT r.id, r.timestamp, r.text, r.score, r.verdict, r.justification, c.cluster_id,
+               COALESCE(s.pending, 1), c.priority
+        FROM review_clusters c
+        JOIN reports r ON r.id = c.report_id
+        LEFT JOIN review_cluster_sizes s ON s.cluster_id = c.cluster_id
+        {lease_join} review_leases l ON l.report_id = c.report_id
+        WHERE c.priority IS NOT NULL AND r.final_verdict IS NULL AND {where}
+        ORDER BY c.priority DESC, c.report_id
+        LIMIT ?
+    """
+
+
+def _items(rows):
+    items = []
+    for row in rows:
+        item = dict(zip(ITEM_COLUMNS, row))
+        item["timestamp"] = str(item["timestamp"])
+        item["priority"] = round(float(item["priority"]), 1)  # PostgreSQL-এ Decimal
+        items.append(item)
+    return items
+
+
+def available(store, reviewer=None, limit=20, now=None):
+    # লিজ নেই / মেয়াদ শেষ / নিজের লিজ — কিউর উপরের দিক (শুধু দেখা, লিজ নয়)
+    now = time.time() if now is None else now
+    with store.reader() as conn:
+        rows = conn.execute(
+            _items_sql("(l.report_id IS NULL OR l.expires_at < ? OR l.reviewer = ?)"),
+            (now, reviewer or "", limit),
+        ).fetchall()
+    return _items(rows)
+
+
+def leased(store, reviewer, now=None):
+    # এই রিভিউয়ারের চলমান লিজ (এখনো পেন্ডিং), priority ক্রমে
+    now = time.time() if now is None else now
+    with store.reader() as conn:
+        rows = conn.execute(
+            _items_sql("l.reviewer = ? AND l.expires_at >= ?", "JOIN"), (reviewer, now, BATCH * 10)
+        ).fetchall()
+    return _items(rows)
+
+
+def claim(store, reviewer, limit=BATCH, ttl=LEASE_SECONDS):
+    # কিউর উপর থেকে limit টা লিজ — প্রতি ক্লাস্টার থেকে একটাই (বাকিগুলো ক্লাস্টার ট্যাগে যায়)
+    now = time.time()
+
+    def take(conn):
+        conn.execute("DELETE FROM review_leases WHERE expires_at < ?", (now,))
+        _maybe_refresh(store, conn)
+        rows = conn.execute(
+            _items_sql("(l.report_id IS NULL OR l.reviewer = ?)"), (reviewer, limit * 4)
+        ).fetchall()
+        # অন্য রিভিউয়ারের হাতে থাকা ক্লাস্টার বাদ — একটা ক্লাস্টার একজনই দেখেন
+        clusters = {r[0] for r in conn.execute("""
+            SELECT DISTINCT c.cluster_id FROM review_leases l JOIN review_clusters c ON c.report_id = l.report_id
+            WHERE l.reviewer <> ?
+        """, (reviewer,)).fetchall()}
+        picked = []
+        for item in _items(rows):
+            if item["cluster_id"] is not None and item["cluster_id"] in clusters:
+                continue
+            clusters.add(item["cluster_id"])
+            picked.append(item)
+            if len(picked) >= limit:
+                break
+        for item in picked:
+            # অন্য কেউ এইমাত্র নিয়ে থাকলে (PostgreSQL-এ একসাথে দুই নোড) WHERE-এ আটকে যায়
+            conn.execute("""
+                INSERT INTO review_leases (report_id, reviewer, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(report_id) DO UPDATE SET reviewer=excluded.reviewer, expires_at=excluded.expires_at
+                WHERE review_leases.expires_at < ? OR review_leases.reviewer = excluded.reviewer
+            """, (item["id"], reviewer, now + ttl, now))
+        mine = {r[0] for r in conn.execute(
+            "SELECT report_id FROM review_leases WHERE reviewer=? AND expires_at >= ?", (reviewer, now)
+        ).fetchall()}
+        return [item for item in picked if item["id"] in mine]
+    return store.write(take)
+
+
+def release(store, reviewer):
+    # রিভিউয়ারের সব লিজ ছেড়ে দেওয়া (লগআউট / নাম বদল)
+    return store.write(lambda conn: conn.execute("DELETE FROM review_leases WHERE reviewer=?", (reviewer,)).rowcount)
+
+
+def cluster_members(store, report_id):
+    # রিপোর্টটার ক্লাস্টারের সব পেন্ডিং রিপোর্ট (নিজেসহ) — (id, text, score, লিজ কার)
+    with store.reader() as conn:
+        rows = conn.execute("""
+            SELECT r.id, r.text, r.score, l.reviewer, l.expires_at
+            FROM review_clusters c
+            JOIN review_clusters m ON m.cluster_id = c.cluster_id
+            JOIN reports r ON r.id = m.report_id
+            LEFT JOIN review_leases l ON l.report_id = r.id
+            WHERE c.report_id = ? AND r.final_verdict IS NULL
+            ORDER BY r.id
+        """, (report_id,)).fetchall()
+    now = time.time()
+    return [{"id": r[0], "text": r[1], "score": r[2], "leased_by": r[3] if r[4] is not None and r[4] >= now else None}
+            for r in rows]
+
+
+def tag(store, report_ids, verdict, reviewer):
+    # এক ট্রানজ্যাকশনে; অন্য কারো চলমান লিজে থাকা বা আগেই ট্যাগ হওয়া রিপোর্ট বাদ
+    # ফেরত: [(id, text, score, verdict, justification)] — যেগুলো সত্যিই ট্যাগ হলো (ক্যাশে বসানোর জন্য)
+    now = time.time()
+
+    def apply(conn):
+        tagged = []
+        clusters = set()
+        for report_id in report_ids:
+            cur = conn.execute("""
+                UPDATE reports SET final_verdict=?, updated_at=CURRENT_TIMESTAMP
+                WHERE id=? AND final_verdict IS NULL AND NOT EXISTS (
+                    SELECT 1 FROM review_leases WHERE report_id=? AND reviewer<>? AND expires_at>=?
+                )
+            """, (verdict, report_id, report_id, reviewer, now))
+            if cur.rowcount:
+                row = conn.execute("SELECT text, score, verdict, justification FROM reports WHERE id=?", (report_id,)).fetchone()
+                tagged.append((report_id,) + tuple(row))
+                cluster = conn.execute("SELECT cluster_id FROM review_clusters WHERE report_id=?", (report_id,)).fetchone()
+                if cluster:
+                    clusters.add(cluster[0])
+            conn.execute("DELETE FROM review_leases WHERE report_id=? AND reviewer=?", (report_id, reviewer))
+        _recount(conn, store.name, clusters)  # ট্যাগ হওয়াগুলো কিউ থেকে বাদ, ক্লাস্টারের বাকিদের priority কমে
+        return tagged
+    return store.write(apply)
+
+
+def top_clusters(store, limit=20):
+    # সবচেয়ে বড় পেন্ডিং ক্লাস্টারগুলো — (cluster_id, পেন্ডিং সংখ্যা, প্রথম পেন্ডিং রিপোর্টের টেক্সট)
+    with store.reader() as conn:
+        rows = conn.execute("""
+            SELECT cluster_id, pending FROM review_cluster_sizes WHERE pending > 1
+            ORDER BY pending DESC, cluster_id LIMIT ?
+        """, (limit,)).fetchall()
+        result = []
+        for cluster_id, pending in rows:
+            first = conn.execute("""
+                SELECT r.text FROM review_clusters c JOIN reports r ON r.id = c.report_id
+                WHERE c.cluster_id = ? AND r.final_verdict IS NULL ORDER BY r.id LIMIT 1
+            """, (cluster_id,)).fetchone()
+            if first:
+                result.append({"cluster_id": cluster_id, "pending": pending, "text": first[0]})
+    return result
+
+
+def stats(store, now=None):
+    now = time.time() if now is None else now
+    with store.reader() as conn:
+        leases, reviewers = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT reviewer) FROM review_leases WHERE expires_at >= ?", (now,)
+        ).fetchone()
+    return {"leased": leases, "reviewers": reviewers}
+
+
+def sync_clusters(store, batch_size=SYNC_BATCH):
+    # নতুন পেন্ডিং রিপোর্টগুলোকে ক্লাস্টারে বসানো (শেষবারের পর থেকে, partial index দিয়ে)
+    # অনুরূপ আগের রিপোর্টের ক্লাস্টারে যোগ, না পেলে নিজেই নতুন ক্লাস্টার
+    added = 0
+    with store.reader() as conn:
+        claim_index.ensure_built(conn)  # অন্য প্রসেসের নতুন রিপোর্টও LSH-এ
+        last_id = conn.execute("SELECT COALESCE(MAX(report_id), 0) FROM review_clusters").fetchone()[0]
+    while True:
+        with store.reader() as conn:
+            rows = conn.execute(
+                "SELECT id, text FROM reports WHERE id > ? AND final_verdict IS NULL ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            assigned = {}
+            for report_id, text in rows:
+                cluster_id = report_id
+                for other, _ in claim_index.similar(text, limit=20):  # সবচেয়ে অনুরূপ আগে
+                    if other == report_id:
+                        continue
+                    found = assigned.get(other)
+                    if found is None:
+                        row = conn.execute("SELECT cluster_id FROM review_clusters WHERE report_id=?", (other,)).fetchone()
+                        found = row[0] if row else None
+                    if found is not None:
+                        cluster_id = found
+                        break
+                assigned[report_id] = cluster_id
+
+        def save(conn, assigned=assigned):
+            conn.executemany("""
+                INSERT INTO review_clusters (report_id, cluster_id) VALUES (?, ?) ON CONFLICT(report_id) DO NOTHING
+            """, list(assigned.items()))
+            _recount(conn, store.name, assigned.values())
+        store.write(save)
+        added += len(rows)
+        last_id = rows[-1][0]
+    store.write(lambda conn: _maybe_refresh(store, conn))  # প্রথমবার (পুরোনো ডেটাবেসে backfill) আর পরে ঘণ্টায় একবার
+    if added:
+        logging.info(f"🗂️ Review cluster sync: {added}টি নতুন পেন্ডিং রিপোর্ট")
+    return added
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="রিভিউ কিউ দেখা / লিজ নেওয়া")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--reviewer", default="cli")
+    parser.add_argument("--claim", type=int, default=0, help="কয়টা লিজ নেওয়া (0 = শুধু দেখা)")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = storage.get_storage(args.db)
+    started = time.perf_counter()
+    synced = sync_clusters(store)
+    items = claim(store, args.reviewer, args.claim) if args.claim else available(store, args.reviewer, args.limit)
+    elapsed = time.perf_counter() - started
+    for item in items:
+        print(f"#{item['id']:<7} {item['priority']:>6} | {item['score']}% ×{item['duplicates']} {item['timestamp'][:10]} | {item['text'][:70]}")
+    print(f"✅ {len(items)}টি ({'লিজ' if args.claim else 'কিউ'}), {synced}টি নতুন ক্লাস্টারে, {elapsed * 1000:.0f}ms — {stats(store)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+import logging
+import os
+import time
+
+# =====================================================
+# ⏱️ STARTUP TIMING (cold start-এর কোন ধাপে কত সময়)
+# =====================================================
+# app.py প্রতি rerun-এ পুরো স্ক্রিপ্ট চালায়, কিন্তু মডিউল একবারই import হয় — তাই
+# এখানের হিসাব শুধু প্রসেসের প্রথম রানের (cold start)। ধাপগুলো:
+#   imports → db_init → first_render (স্ক্রিপ্টের শেষ, মানে প্রথম পেজ পাঠানো শেষ)
+# YACHAI_STARTUP_LOG দিলে ফলাফল JSON লাইন হিসেবে সেখানে যোগ হয় (বেঞ্চমার্কের জন্য)।
+
+STARTUP_LOG = os.getenv("YACHAI_STARTUP_LOG")
+
+started_at = time.perf_counter()  # এই মডিউল import হওয়ার মুহূর্ত = app.py-র শুরু
+phases = {}
+_finished = False
+
+
+def mark(phase):
+    if _finished or phase in phases:
+        return
+    phases[phase] = time.perf_counter() - started_at
+
+
+def finish(phase="first_render"):
+    global _finished
+    if _finished:
+        return
+    mark(phase)
+    _finished = True
+    summary = ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in phases.items())
+    logging.info(f"⏱️ Cold start: {summary}")
+    if STARTUP_LOG:
+        try:
+            with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"pid": os.getpid(), **phases}) + "\n")
+        except OSError as e:
+            logging.warning(f"Startup log লেখা ব্যর্থ: {e}")
+
+
+def summary():
+    return dict(phases)
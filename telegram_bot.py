@@ -1,59 +1,126 @@
 import os
+import time
+import asyncio
 import telebot
-import google.generativeai as genai
+import metrics
+import admission
+import webhook
+import telegram_stream
+import gemini_analysis
+import verify_service
+import report_search
 
 # 🔐 Environment variables
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
+METRICS_PORT = int(os.environ.get("BOT_METRICS_PORT", 9102))  # Prometheus /metrics; 0 = বন্ধ
+BOT_MODE = os.environ.get("BOT_MODE", "polling")  # polling | webhook
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL")  # Telegram যেখানে POST করবে (https://<host>/telegram/webhook)
 
 # ❗ Safety check
 if not GEMINI_API_KEY or not TELEGRAM_BOT_TOKEN:
     raise Exception("❌ Missing environment variables! Please set GEMINI_API_KEY and TELEGRAM_BOT_TOKEN.")
 
-# 🤖 Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-pro")
+# 🤖 Configure Gemini (পোর্টাল আর listener-এর সাথে একই model router)
+gemini_analysis.configure(GEMINI_API_KEY)
 
 # 💬 Initialize Telegram Bot
 bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
 
+# 📊 handler thread pool-এ কতগুলো আপডেট অপেক্ষায়
+if getattr(bot, "worker_pool", None) is not None:
+    metrics.QUEUE_DEPTH.track(bot.worker_pool.tasks.qsize, "telegram_bot_updates")
+
+# 🚦 প্রতি চ্যাট + global rate limit, ভিড়ে ক্যাশ থেকে উত্তর বা সারিতে অপেক্ষা
+admission_control = admission.Admission("telegram_bot")
+
+# 📤 উত্তর পাঠানো (sendMessage latency মাপা হয়)
+def reply(message, text):
+    started = time.perf_counter()
+    result = "error"
+    try:
+        sent = bot.reply_to(message, text)
+        result = "ok"
+        return sent
+    finally:
+        metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "telegram_bot", result)
+
+# ✏️ stream চলাকালীন আগের উত্তরটাই edit
+def edit_reply(message, message_id, text):
+    started = time.perf_counter()
+    result = "error"
+    try:
+        bot.edit_message_text(text, message.chat.id, message_id)
+        result = "ok"
+    finally:
+        metrics.TELEGRAM_SEND.observe(time.perf_counter() - started, "telegram_bot_edit", result)
+
 # 🧠 /start command
 @bot.message_handler(commands=["start"])
 def start(message):
-    bot.reply_to(
+    reply(
         message,
         "👋 স্বাগতম যাচাই (Yachai) — তোমার AI Fact-Checking সহকারী!\n\n"
         "🔎 যেকোনো খবর / পোস্ট / দাবি পাঠাও — আমি সত্যতা বিশ্লেষণ করে দিবো।"
     )
 
+# 🔎 /search command — আগের যাচাই করা রিপোর্ট খোঁজা
+@bot.message_handler(commands=["search"])
+def search(message):
+    query = message.text.partition(" ")[2].strip()
+    if not query:
+        reply(message, "🔎 ব্যবহার: /search <শব্দ বা বাক্যাংশ>")
+        return
+    results = report_search.search_db(query)
+    reply(message, report_search.format_results_text(query, results))
+
 # 📌 Handle user message
 @bot.message_handler(func=lambda msg: True)
 def check_fact(message):
     text = message.text.strip()
     bot.send_chat_action(message.chat.id, "typing")
 
-    try:
-        prompt = f"""
-তুমি একজন বাংলা fact-checking সহকারী।
-নিচের বক্তব্য সত্য নাকি মিথ্যা তা বিশ্লেষণ করো।
-
-বক্তব্য:
-{text}
+    # একটাই উত্তর-মেসেজ: সারির নোটিশ → stream-এর আংশিক উত্তর → শেষ ফলাফল, সব edit করে
+    stream = telegram_stream.MessageStream(
+        send=lambda answer: reply(message, answer).message_id,
+        edit=lambda message_id, answer: edit_reply(message, message_id, answer),
+        interval=telegram_stream.edit_interval(message.chat.id, message.chat.type),
+    )
 
-ফরম্যাট:
-- Verdict: (সত্য / মিথ্যা / বিভ্রান্তিকর)
-- বিশ্লেষণ:
-"""
+    def run(claim):
+        # ক্যাশ / অনুরূপ অ্যাডমিন-যাচাই / Gemini — পোর্টালের সাথে একই সার্ভিস, একই দাবি
+        # একসাথে এলে একটাই মডেল কল, আর ফলাফল reports টেবিলে থাকে (পুরো উত্তর আসার পরে)
+        on_partial = (lambda partial: stream.update(verify_service.partial_reply(partial))) if telegram_stream.ENABLED else None
+        result = verify_service.verify(claim, source="telegram_bot", on_partial=on_partial)
+        return f"🧾 Fact-Check Result:\n\n{verify_service.chat_reply(result)}"
 
-        response = model.generate_content(prompt)
-        result = response.text if response else "দুঃখিত, আমি যাচাই করতে পারছি না।"
+    try:
+        admission_control.submit(message.chat.id, text, run, stream.flush)
+    except Exception as e:
+        stream.flush(f"⚠️ ত্রুটি ঘটেছে: {str(e)}")
 
-        bot.reply_to(message, f"🧾 Fact-Check Result:\n\n{result}")
+# 🪝 Webhook mode — Telegram নিজেই POST করে, 200 সাথে সাথে, যাচাই ব্যাকগ্রাউন্ডে
+def handle_update(update):
+    bot.process_new_updates([telebot.types.Update.de_json(update)])
 
-    except Exception as e:
-        bot.reply_to(message, f"⚠️ ত্রুটি ঘটেছে: {str(e)}")
+def run_webhook():
+    if not WEBHOOK_URL:
+        raise Exception("❌ BOT_MODE=webhook-এর জন্য WEBHOOK_URL দরকার।")
+    bot.threaded = False  # handler webhook worker থ্রেডেই চলে, তাই shutdown-এ drain করা যায়
+    server = webhook.WebhookServer(handle_update, name="telegram_bot")
+    bot.set_webhook(url=WEBHOOK_URL, secret_token=webhook.WEBHOOK_SECRET,
+                    max_connections=webhook.WEBHOOK_WORKERS * 5, allowed_updates=["message"])
+    asyncio.run(webhook.serve(server))
+    admission_control.drain(webhook.DRAIN_TIMEOUT)  # সারিতে থাকা যাচাইও শেষ করে তারপর বন্ধ
+    print("👋 Webhook বন্ধ হয়েছে।")
 
 # 🚀 Run bot (Always active)
 if __name__ == "__main__":
     print("🤖 Yachai Telegram Bot is running on Railway...")
-    bot.polling(non_stop=True, timeout=90)
+    if METRICS_PORT:
+        metrics.start_server(METRICS_PORT)
+    if BOT_MODE == "webhook":
+        run_webhook()
+    else:
+        bot.remove_webhook()  # আগে webhook সেট থাকলে getUpdates কাজ করে না
+        bot.polling(non_stop=True, timeout=90)
@@ -0,0 +1,71 @@
+import logging
+import os
+import threading
+import time
+
+# =====================================================
+# ✏️ TELEGRAM STREAMING REPLY (একটা মেসেজ, ধাপে ধাপে edit)
+# =====================================================
+# Gemini-র উত্তর stream হলে পুরোটা শেষ হওয়া পর্যন্ত "typing…" না দেখিয়ে প্রথম টুকরোতেই
+# একটা মেসেজ পাঠানো হয়, তারপর সেটাকেই edit করে বাড়ানো হয়। Telegram-এর সীমা
+# (একই চ্যাটে ~১ মেসেজ/সেকেন্ড, গ্রুপে ২০/মিনিট) মানতে edit থ্রটল করা হয় — মাঝের
+# টুকরোগুলো বাদ পড়ে, শেষ উত্তর (flush) সবসময় যায়।
+
+ENABLED = os.getenv("STREAM_REPLIES", "1") == "1"
+PRIVATE_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", 1.0))  # সেকেন্ড
+GROUP_EDIT_INTERVAL = float(os.getenv("STREAM_GROUP_EDIT_INTERVAL", 3.0))
+
+
+def edit_interval(chat_id=None, chat_type=None):
+    # গ্রুপ/চ্যানেল: chat type বা negative chat_id
+    if chat_type in ("group", "supergroup", "channel") or str(chat_id).startswith("-"):
+        return GROUP_EDIT_INTERVAL
+    return PRIVATE_EDIT_INTERVAL
+
+
+class MessageStream:
+    def __init__(self, send, edit, interval=PRIVATE_EDIT_INTERVAL):
+        # send(text) → message_id (বা None), edit(message_id, text)
+        self.send = send
+        self.edit = edit
+        self.interval = interval
+        self.message_id = None
+        self.shown = None
+        self.last_at = 0.0
+        self.edits = 0
+        self._lock = threading.Lock()
+
+    def update(self, text):
+        # stream-এর মাঝখানে — থ্রটল; সীমার ভেতরে না পড়লে এই টুকরো বাদ
+        with self._lock:
+            if time.monotonic() - self.last_at < self.interval:
+                return
+            if self.shown is not None and self.message_id is None:
+                return  # message_id পাওয়া যায়নি — edit করা যাবে না, শেষ উত্তরের অপেক্ষা
+            try:
+                self._show(text)
+            except Exception as e:
+                logging.warning(f"Stream মেসেজ edit ব্যর্থ: {e}")
+
+    def flush(self, text):
+        # শেষ উত্তর (বা সারিতে থাকার নোটিশ) — থ্রটল ছাড়া; edit না হলে নতুন মেসেজ
+        with self._lock:
+            try:
+                self._show(text)
+            except Exception as e:
+                if self.message_id is None:
+                    raise
+                logging.warning(f"Stream মেসেজ edit ব্যর্থ, নতুন মেসেজ পাঠানো হচ্ছে: {e}")
+                self.message_id = None
+                self._show(text)
+
+    def _show(self, text):
+        if text == self.shown:
+            return  # একই টেক্সটে edit করলে Telegram 400 দেয়
+        self.last_at = time.monotonic()
+        if self.message_id is None:
+            self.message_id = self.send(text)
+        else:
+            self.edit(self.message_id, text)
+            self.edits += 1
+        self.shown = text
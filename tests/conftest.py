@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import alert_outbox
+import claim_index
+import storage
+import verdict_cache
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    # প্রতি টেস্টে আলাদা data.db — LSH index, verdict cache আর alert outbox-ও সেই ফোল্ডারে
+    path = str(tmp_path / "data.db")
+    monkeypatch.setattr(claim_index, "INDEX_PATH", str(tmp_path / "data.lsh.db"))
+    monkeypatch.setattr(claim_index, "_conn", None)
+    monkeypatch.setattr(verdict_cache, "CACHE_DB_PATH", path)
+    monkeypatch.setattr(verdict_cache, "_conn", None)
+    monkeypatch.setattr(verdict_cache, "_pending", {"hits": 0, "misses": 0})  # আগের টেস্টের না-লেখা গণনা নয়
+    monkeypatch.setattr(verdict_cache, "_touched", {})
+    monkeypatch.setattr(alert_outbox, "DB_PATH", path)
+    monkeypatch.setattr(alert_outbox, "_conn", None)
+    yield path
+    store = storage._storages.pop(os.path.abspath(path), None)
+    if store is not None:
+        store.close()
+    for module in (claim_index, verdict_cache, alert_outbox):
+        if module._conn is not None:
+            module._conn.close()
+
+
+@pytest.fixture
+def store(db_path):
+    return storage.get_storage(db_path)
+
+
+def add_report(store, text, score=50, final_verdict=None, timestamp=None):
+    def insert(conn):
+        cur = conn.execute("""
+            INSERT INTO reports (text, score, verdict, justification, final_verdict, source, timestamp)
+            VALUES (?, ?, 'মিথ্যা', 'পরীক্ষা', ?, 'test', COALESCE(?, CURRENT_TIMESTAMP))
+        """, (text, score, final_verdict, timestamp))
+        return cur.lastrowid
+    report_id = store.write(insert)
+    claim_index.add(report_id, text)
+    return report_id
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import admission
+import verdict_cache
+
+LIMITS = {"chat_rate": 0.001, "chat_burst": 2, "global_rate": 0.001, "global_burst": 3, "queue_size": 2}
+
+
+def _gate(db_path, **limits):
+    admission.save_limits({**LIMITS, **limits}, db_path)
+    gate = admission.Admission("test", db_path, workers=1)
+    gate._refresh()
+    return gate
+
+
+def test_flooding_chat_is_slowed_down_or_served_from_cache(db_path):
+    gate = _gate(db_path)
+    run = lambda text: f"মডেল: {text}"
+    assert [gate.answer(1, f"দাবি {i}", run) for i in range(2)] == ["মডেল: দাবি 0", "মডেল: দাবি 1"]
+    assert gate.answer(1, "নতুন দাবি", run) == admission.SLOW_DOWN_TEXT
+    verdict_cache.store("পুরোনো দাবি", {"score": 90, "verdict": "মিথ্যা", "justification": "আগে যাচাই"})
+    assert gate.answer(1, "পুরোনো দাবি", run).startswith(admission.FALLBACK_PREFIX)
+    assert gate.answer(2, "অন্য চ্যাট", run) == "মডেল: অন্য চ্যাট"  # অন্য চ্যাট আটকায় না
+    assert gate.stats()["rejected_chat"] == 1 and gate.stats()["fallback"] == 1
+
+
+def test_global_limit_queues_then_turns_away_when_full(db_path):
+    gate = _gate(db_path, chat_burst=10, global_burst=1)
+    replies = []
+    respond = replies.append
+    assert gate.submit(1, "প্রথম", lambda text: "চলল", respond) == "run"
+    assert [gate.submit(chat, "অপেক্ষা", lambda text: "সারি থেকে", respond) for chat in (2, 3, 4)] == [
+        "queued", "queued", "rejected_full"]
+    assert replies[1].startswith("⏳") and "অবস্থান 1" in replies[1] and "অবস্থান 2" in replies[2]
+    assert replies[3] == admission.BUSY_TEXT
+    gate.global_bucket.rate = 1000.0  # সীমা বাড়লে সারি খালি হয়
+    with gate._cond:
+        gate._cond.notify_all()
+    assert gate.drain(timeout=5)
+    assert replies[-2:] == ["সারি থেকে", "সারি থেকে"]
+
+
+def test_bots_do_not_load_the_alert_outbox():
+    # admission আর listener import করলে alert_outbox (আর তার data.db gauge) আসে না
+    code = "import sys, admission, listener, metrics; print('alert_outbox' in sys.modules, len(metrics.QUEUE_DEPTH.values()))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(admission.__file__),
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "0"]
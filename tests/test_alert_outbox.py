@@ -0,0 +1,74 @@
+import alert_outbox
+import metrics
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json"} if body else {}
+        self._body = body or {}
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses=None):
+        self.responses = responses or {}  # chat_id → status_code/body-র তালিকা
+        self.sent = []
+
+    def post(self, url, data, timeout):
+        self.sent.append((data["chat_id"], data["text"]))
+        queue = self.responses.get(data["chat_id"])
+        return queue.pop(0) if queue else FakeResponse(200)
+
+
+def _rows():
+    with alert_outbox._lock:
+        return alert_outbox._get_conn().execute(
+            "SELECT chat_id, text, status, attempts FROM alerts_outbox ORDER BY id").fetchall()
+
+
+def test_one_row_per_chat_and_in_order_delivery_per_chat(db_path):
+    assert alert_outbox.enqueue("প্রথম", chat_ids=["11", "-100"]) == 2
+    assert alert_outbox.enqueue("দ্বিতীয়", chat_ids=["11"]) == 1
+    session = FakeSession()
+    dispatcher = alert_outbox.Dispatcher(session=session)
+    dispatcher.run_once()
+    # একই চ্যাটের পরেরটা আগেরটা শেষ হওয়ার পরের পাসে
+    assert session.sent == [("11", "প্রথম"), ("-100", "প্রথম")]
+    assert alert_outbox.stats()["pending"] == 1
+    dispatcher.chat_buckets["11"].tokens = 1.0  # প্রতি চ্যাটে ১/সেকেন্ড — টেস্টে অপেক্ষা নয়
+    dispatcher.run_once()
+    assert session.sent[-1] == ("11", "দ্বিতীয়")
+    assert [r[2] for r in _rows()] == ["sent", "sent", "sent"]
+
+
+def test_rate_limit_keeps_the_alert_pending_without_counting_a_failure(db_path):
+    alert_outbox.enqueue("অ্যালার্ট", chat_ids=["11"])
+    session = FakeSession({"11": [FakeResponse(429, {"description": "Too Many Requests", "parameters": {"retry_after": 30}})]})
+    dispatcher = alert_outbox.Dispatcher(session=session)
+    dispatcher.run_once()
+    assert _rows() == [("11", "অ্যালার্ট", "pending", 0)]
+    assert dispatcher.chat_buckets["11"].wait_time() > 25
+    assert dispatcher.run_once() > 0 and len(session.sent) == 1  # retry_after পেরোনোর আগে আর নয়
+
+
+def test_bad_chat_fails_permanently_and_does_not_block_others(db_path):
+    alert_outbox.enqueue("অ্যালার্ট", chat_ids=["11", "22"])
+    session = FakeSession({"11": [FakeResponse(400, {"description": "chat not found"})]})
+    alert_outbox.Dispatcher(session=session).run_once()
+    assert [(r[0], r[2], r[3]) for r in _rows()] == [("11", "failed", 1), ("22", "sent", 1)]
+    assert alert_outbox.stats()["failed"] == 1
+
+
+def test_queue_gauge_is_registered_when_the_dispatcher_starts(db_path, monkeypatch):
+    monkeypatch.setattr(metrics.QUEUE_DEPTH, "callbacks", {})
+    dispatcher = alert_outbox.Dispatcher(session=FakeSession())
+    assert metrics.QUEUE_DEPTH.values() == []
+    dispatcher.start()
+    try:
+        assert metrics.QUEUE_DEPTH.values() == [(("alert_outbox",), 0.0)]
+    finally:
+        dispatcher.stop()
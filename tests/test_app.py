@@ -0,0 +1,47 @@
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import alert_outbox
+from conftest import add_report
+
+APP = __file__.rsplit("/tests/", 1)[0] + "/app.py"
+
+
+@pytest.fixture
+def admin(store, tmp_path, monkeypatch):
+    # app.py-র DB_PATH = "data.db" — টেস্টের ফোল্ডারে চালালে db_path-এর store-টাই
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(alert_outbox, "_dispatcher", None)
+    st.cache_data.clear()  # watermark একই হলে আগের টেস্টের পৃষ্ঠা ফেরত না আসে
+
+    def open_panel():
+        at = AppTest.from_file(APP, default_timeout=60)
+        at.secrets["ADMIN_PASS"] = "demo123"
+        at.run()
+        at.sidebar.radio[0].set_value("🧑‍💼 অ্যাডমিন প্যানেল").run()
+        at.sidebar.text_input[0].set_value("demo123").run()
+        assert not at.exception, at.exception
+        return at
+    yield open_panel
+    if alert_outbox._dispatcher is not None:
+        alert_outbox._dispatcher.stop()  # নইলে টেস্টের পরে রিপোর ফোল্ডারে data.db খুলে বসে
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def _page_ids(at):
+    return [int(i) for i in next(df.value for df in at.dataframe if "final_verdict" in df.value.columns)["id"]]
+
+
+def test_dashboard_pages_newest_first_with_keyset_cursor(store, admin):
+    ids = [add_report(store, f"দাবি নম্বর {i}", timestamp=f"2026-01-01 00:{i:02d}:00") for i in range(60)]
+    at = admin()
+    assert _page_ids(at) == ids[::-1][:50]
+    assert _button(at, "⬅️ নতুনতর").disabled
+    _button(at, "পুরোনোতর ➡️").click().run()
+    assert _page_ids(at) == ids[::-1][50:]
+    assert "পৃষ্ঠা 2 / 2" in [c.value for c in at.caption]
+    assert _button(at, "পুরোনোতর ➡️").disabled
@@ -0,0 +1,68 @@
+import threading
+
+import claim_extraction
+import verdict_cache
+from conftest import add_report
+
+POST = (
+    "ভোটার তালিকা থেকে এক কোটি নাম মুছে ফেলা হয়েছে বলে নির্বাচন কমিশনের নতুন তথ্যে দেখা গেছে। "
+    "পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে বলে জানিয়েছে সেতু কর্তৃপক্ষ। "
+    "আপনি কি এটা বিশ্বাস করেন? https://t.co/x1\n"
+    "করোনার টিকা নিলে শরীরে চুম্বক লেগে থাকে বলে দাবি করা হচ্ছে। "
+    "পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে বলে জানিয়েছে সেতু কর্তৃপক্ষ।"
+)
+
+
+def test_split_drops_questions_links_and_repeats():
+    assert claim_extraction.split_claims(POST) == [
+        "ভোটার তালিকা থেকে এক কোটি নাম মুছে ফেলা হয়েছে বলে নির্বাচন কমিশনের নতুন তথ্যে দেখা গেছে।",
+        "পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে বলে জানিয়েছে সেতু কর্তৃপক্ষ।",
+        "করোনার টিকা নিলে শরীরে চুম্বক লেগে থাকে বলে দাবি করা হচ্ছে।",
+    ]
+    assert claim_extraction.is_long(POST)
+    assert not claim_extraction.is_long("পদ্মা সেতুর টোল অর্ধেক হচ্ছে।")
+
+
+def test_only_new_claims_reach_the_model(db_path, store):
+    claims = claim_extraction.split_claims(POST)
+    verdict_cache.store(claims[0], {"score": 90, "verdict": "মিথ্যা", "justification": "ক্যাশ"})
+    add_report(store, claims[1], score=20, final_verdict="সত্য")
+    calls = []
+
+    def analyze(claim):
+        calls.append(claim)
+        return {"score": 70, "verdict": "বিভ্রান্তিকর", "justification": "মডেল"}
+
+    post = claim_extraction.analyze_post(POST, analyze, db_path)
+    assert calls == [claims[2]]
+    assert [item["origin"] for item in post["claims"]] == ["cache", "reviewed", "model"]
+    assert post["score"] == 90 and post["verdict"] == "মিথ্যা"  # সবচেয়ে সন্দেহজনক দাবিটাই
+    assert "3টি দাবির মধ্যে 2টি সন্দেহজনক (1টি নতুন যাচাই, 2টি আগের রিপোর্ট থেকে)" in post["justification"]
+
+
+def test_new_claims_are_verified_concurrently(db_path):
+    started = threading.Barrier(3)  # তিনটা দাবি একসাথে না চললে BrokenBarrierError
+
+    def analyze(claim):
+        started.wait(5)
+        return {"score": 30, "verdict": "সম্ভবত সত্য", "justification": "মডেল"}
+
+    post = claim_extraction.analyze_post(POST, analyze, db_path)
+    assert [item["origin"] for item in post["claims"]] == ["model"] * 3
+
+
+def test_token_budget_skips_the_least_informative_claims(db_path):
+    calls = []
+    lock = threading.Lock()
+
+    def analyze(claim):
+        with lock:
+            calls.append(claim)
+        return {"score": 60, "verdict": "বিভ্রান্তিকর", "justification": "মডেল"}
+
+    claims = claim_extraction.split_claims(POST)
+    budget = claim_extraction.estimate_tokens(claims[0]) + 1  # একটার মতো বাজেট
+    post = claim_extraction.analyze_post(POST, analyze, db_path, budget=budget)
+    assert calls == [claims[0]]  # কোনোটায় অঙ্ক নেই, তাই সবচেয়ে লম্বা দাবিটা আগে
+    assert [item["origin"] for item in post["claims"]] == ["model", "skipped", "skipped"]
+    assert post["tokens_estimated"] == claim_extraction.estimate_tokens(claims[0])
@@ -0,0 +1,60 @@
+import claim_index
+import report_archive
+from conftest import add_report
+
+CLAIM = "ঢাকায় আজ রাতে বড় ভূমিকম্প হবে বলে আবহাওয়া অধিদপ্তর সতর্ক করেছে, সবাই রাতে বাইরে থাকুন"
+
+
+def test_reworded_claim_is_similar_and_unrelated_is_not(store):
+    original = add_report(store, CLAIM)
+    other = add_report(store, "পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে বলে জানিয়েছে সেতু কর্তৃপক্ষ")
+    matches = dict(claim_index.similar(CLAIM + " 😱 #শেয়ার_করুন"))
+    assert original in matches and matches[original] >= claim_index.SIMILARITY_THRESHOLD
+    assert other not in matches
+
+
+def test_candidates_are_ranked_by_band_collisions(store):
+    exact = add_report(store, CLAIM)
+    for i in range(30):
+        add_report(store, f"{CLAIM} — কপি নম্বর {i} আরও কিছু শব্দ যোগ করে বদলানো")
+    with claim_index._lock:
+        ids = claim_index._candidate_ids(claim_index._get_conn(), claim_index.signature(CLAIM), limit=5)
+    assert ids[0] == exact
+
+
+def test_find_reviewed_survives_a_viral_wave_beyond_the_candidate_cap(store, db_path):
+    # যাচাইকৃত রিপোর্টটা সবচেয়ে পুরোনো; তার পরে MAX_CANDIDATES-এর বেশি পেন্ডিং কপি
+    reviewed = add_report(store, CLAIM + " (আগের ভাইরাল পোস্ট)", final_verdict="মিথ্যা")
+    for i in range(claim_index.MAX_CANDIDATES + 50):
+        add_report(store, f"{CLAIM} #{i}")
+    match = claim_index.find_reviewed(CLAIM + " শেয়ার করুন", db_path)
+    assert match is not None
+    assert match["id"] == reviewed
+    assert match["final_verdict"] == "মিথ্যা"
+
+
+def test_find_reviewed_picks_up_verdicts_set_after_the_first_sync(store, db_path):
+    report_id = add_report(store, CLAIM)
+    assert claim_index.find_reviewed(CLAIM, db_path) is None
+    store.update_verdict(report_id, "মিথ্যা")
+    assert claim_index.find_reviewed(CLAIM + " 😱", db_path)["id"] == report_id
+
+
+def test_find_reviewed_sees_reports_archived_between_syncs(store, db_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    assert claim_index.find_reviewed(CLAIM, db_path) is None
+    report_id = add_report(store, CLAIM, final_verdict="মিথ্যা", timestamp="2024-01-15 10:00:00")
+    report_archive.archive(store, older_than_days=30)  # লাইভ sync দেখার আগেই আর্কাইভে
+    assert claim_index.find_reviewed(CLAIM + " 😱", db_path)["id"] == report_id
+
+
+def test_find_reviewed_ignores_pending_only_matches(store, db_path):
+    add_report(store, CLAIM)
+    assert claim_index.find_reviewed(CLAIM, db_path) is None
+
+
+def test_clusters_group_near_duplicates(store):
+    a = add_report(store, CLAIM)
+    b = add_report(store, CLAIM + " 😱")
+    c = add_report(store, "পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে বলে জানিয়েছে সেতু কর্তৃপক্ষ")
+    assert claim_index.clusters([a, b, c]) == [[a, b], [c]]
@@ -0,0 +1,17 @@
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("requests", "pandas", "matplotlib", "duckdb", "pyarrow", "google.generativeai", "fpdf")
+
+
+def test_app_module_imports_leave_heavy_libraries_unloaded():
+    # app.py-র উপরের import-গুলো (streamlit বাদে) আলাদা প্রসেসে — ভারী লাইব্রেরি শুধু যে পথে লাগে সেখানে
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        modules = [m for m in re.findall(r"^import (\w+)", f.read(), re.M) if m != "streamlit"]
+    code = "; ".join(["import sys"] + [f"import {m}" for m in modules] +
+                     [f"print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"])
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == []
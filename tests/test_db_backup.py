@@ -0,0 +1,47 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import db_backup
+from conftest import add_report
+
+
+def test_backup_includes_wal_pages_and_verifies(store, db_path, tmp_path):
+    for i in range(20):
+        add_report(store, f"দাবি {i}")  # WAL-এ, এখনো checkpoint হয়নি
+    meta = db_backup.run_backup(db_path, str(tmp_path / "backups"))
+    assert meta["verified"] and meta["integrity"] == "ok"
+    assert meta["counts"]["reports"] == 20
+    [listed] = db_backup.list_backups(str(tmp_path / "backups"))
+    assert listed["file"] == meta["file"] and listed["sha256"] == meta["sha256"]
+    assert db_backup.verify_backup(listed["path"], {**meta["counts"], "reports": 21})["ok"] is False
+
+
+def test_writes_during_the_copy_do_not_restart_or_block_it(store, db_path, tmp_path, monkeypatch):
+    for i in range(300):
+        add_report(store, f"লম্বা দাবি {i} " + "ক" * 2000)
+    monkeypatch.setattr(db_backup, "PAGES_PER_STEP", 8)
+    writer = sqlite3.connect(db_path, timeout=1)
+    steps = []
+
+    def progress(phase, done, total):
+        if phase == "copy":
+            steps.append(done)
+            writer.execute("INSERT INTO reports (text) VALUES ('ব্যাকআপের সময় নতুন')")  # আটকালে timeout
+            writer.commit()
+    meta = db_backup.run_backup(db_path, str(tmp_path / "backups"), progress=progress)
+    writer.close()
+    assert steps == sorted(steps)  # শুরু থেকে আবার কপি হয়নি
+    assert meta["verified"] and meta["counts"]["reports"] == 300  # একটাই snapshot
+
+
+def test_retention_keeps_the_newest_per_hour_day_and_week(tmp_path):
+    now = datetime(2026, 10, 18, 12, 30)
+    stamps = [now - timedelta(minutes=10 * i) for i in range(12)] + [now - timedelta(days=d) for d in range(1, 20)]
+    for t in stamps:
+        (tmp_path / t.strftime(db_backup.NAME_FORMAT)).write_bytes(b"")
+    removed = db_backup.apply_retention(str(tmp_path), hourly=2, daily=3, weekly=2)
+    kept = sorted(b["created"] for b in db_backup.list_backups(str(tmp_path)))
+    assert kept == sorted({now, datetime(2026, 10, 18, 11, 50), now - timedelta(days=1), now - timedelta(days=2),
+                           datetime(2026, 10, 11, 12, 30)})
+    assert len(removed) == len(stamps) - len(kept) == len(stamps) - len(os.listdir(tmp_path))
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+import gemini_analysis
+
+GOOD = {"score": 80, "verdict": "মিথ্যা", "justification": "সূত্রে এমন কিছু নেই"}
+
+
+def test_valid_json_parses_ok():
+    assert gemini_analysis.parse_analysis(json.dumps(GOOD, ensure_ascii=False)) == (GOOD, "ok")
+
+
+@pytest.mark.parametrize("text", [
+    "```json\n" + json.dumps(GOOD, ensure_ascii=False) + "\n```\nআশা করি কাজে লাগবে {🙂}",
+    json.dumps(GOOD, ensure_ascii=False)[:-1] + ",}",
+    json.dumps({**GOOD, "score": "৮০%"}, ensure_ascii=False),
+    json.dumps({**GOOD, "verdict": ["মিথ্যা"]}, ensure_ascii=False),
+])
+def test_near_valid_json_is_repaired(text):
+    assert gemini_analysis.parse_analysis(text) == (GOOD, "repaired")
+
+
+@pytest.mark.parametrize("score", ["Infinity", "-Infinity", "NaN", "1e400", '"' + "9" * 400 + '"', "1" + "0" * 400, "180"])
+def test_out_of_range_or_non_finite_score_is_invalid(score):
+    text = '{"score": ' + score + ', "verdict": "মিথ্যা", "justification": "x"}'
+    assert gemini_analysis.parse_analysis(text) == (None, "invalid")
+
+
+def test_unknown_verdict_is_invalid():
+    assert gemini_analysis.parse_analysis(json.dumps({**GOOD, "verdict": "জানি না"}, ensure_ascii=False)) == (None, "invalid")
+
+
+def test_array_keeps_valid_items_and_drops_broken_ones():
+    items = [{"id": "1", **GOOD}, {"id": "2", **GOOD, "score": float("inf")}, {"id": "3", **GOOD, "score": "৮০"}]
+    text = "উত্তর: " + json.dumps(items, ensure_ascii=False)  # inf → Infinity
+    parsed, outcome = gemini_analysis.parse_analysis_array(text)
+    assert outcome == "repaired"
+    assert parsed == [("1", GOOD), ("3", GOOD)]
+
+
+def test_partial_json_shows_only_what_will_validate():
+    assert gemini_analysis.parse_partial_json('{"score": 85, "verdict": "মিথ্যা", "justification": "অর্ধেক') == {
+        "score": 85, "verdict": "মিথ্যা", "justification": "অর্ধেক"}
+    assert gemini_analysis.parse_partial_json('{"score": ' + "9" * 400 + ',') == {}
+    assert "verdict" not in gemini_analysis.parse_partial_json('{"score": 85, "verdict": "মিথ্')
@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+
+import import_claims
+
+
+def test_imported_reports_are_tagged_with_import_source(tmp_path, store, db_path):
+    path = tmp_path / "claims.jsonl"
+    path.write_text("\n".join(json.dumps({"text": t}, ensure_ascii=False) for t in ("দাবি এক", "দাবি দুই")) + "\n",
+                    encoding="utf-8")
+    importer = import_claims.Importer(str(path), db_path, workers=1, batch_size=10)
+    batch = next(import_claims.read_batches(str(path), 0, 0, 10, None))
+    results = {1: {"score": 70, "verdict": "মিথ্যা", "justification": "x"}}
+    importer._commit(batch, results)
+    with store.reader() as conn:
+        assert conn.execute("SELECT text, source FROM reports").fetchall() == [("দাবি এক", "import")]
+        assert conn.execute("SELECT imported, failed FROM import_progress").fetchone() == (1, 1)
+
+
+def test_importing_the_module_leaves_logging_unconfigured():
+    # basicConfig শুধু CLI-র main()-এ — টেস্ট বা অন্য মডিউল import করলে root logger বদলায় না
+    code = "import logging, import_claims; print(len(logging.getLogger().handlers))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(import_claims.__file__),
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "0"
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import threading
+import time
+
+import listener
+
+
+class FakeWebhook:
+    # webhook_server-এর জায়গায় — আপডেট সরাসরি accept_update দিয়ে আসে
+    handle = None
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def _run(bot, updates, timeout=10):
+    # আলাদা daemon থ্রেডে — worker মরে গিয়ে drain() আটকে গেলেও টেস্ট ঝুলে না থেকে ব্যর্থ হয়
+    async def main():
+        stop = asyncio.Event()
+
+        async def feed():
+            await asyncio.sleep(0.05)
+            for update_id, chat_id, text in updates:
+                await bot.accept_update({"update_id": update_id, "message": {"chat": {"id": chat_id}, "text": text}})
+            await bot.drain()
+            stop.set()
+
+        asyncio.get_running_loop().create_task(feed())
+        return await bot.run(stop, webhook_server=FakeWebhook())
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(stats=asyncio.run(main())), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "listener শেষ হয়নি (worker বা backlog হারিয়েছে)"
+    return result["stats"]
+
+
+def _listener(tmp_path, sent, **kwargs):
+    return listener.Listener(verify=lambda text: f"উত্তর {text}", send=lambda chat_id, text: sent.append((chat_id, text)),
+                             fetch=None, db_path=str(tmp_path / "inbox.db"), **kwargs)
+
+
+def test_each_chat_gets_answers_in_order(tmp_path):
+    sent = []
+    bot = _listener(tmp_path, sent, workers=3, queue_size=4)
+    updates = [(i, i % 2, f"m{i}") for i in range(10)]
+    stats = _run(bot, updates)
+    assert stats["processed"] == 10
+    for chat_id in (0, 1):
+        answers = [text for c, text in sent if c == chat_id]
+        assert answers == [f"🧠 যাচাই ফলাফল:\nউত্তর m{i}" for i in range(chat_id, 10, 2)]
+    assert bot.inbox.pending() == []
+
+
+def test_worker_survives_failing_inbox_done(tmp_path):
+    # inbox.done ("database is locked") ব্যর্থ হলেও worker, চ্যাটের বাকি মেসেজ আর backpressure permit টিকে থাকে
+    sent = []
+    bot = _listener(tmp_path, sent, workers=1, queue_size=3)
+    done = bot.inbox.done
+    failures = []
+
+    def flaky_done(update_id):
+        if update_id in (0, 2):
+            failures.append(update_id)
+            raise RuntimeError("database is locked")
+        done(update_id)
+    bot.inbox.done = flaky_done
+
+    _run(bot, [(i, 7, f"m{i}") for i in range(8)])
+    assert failures == [0, 2]
+    assert len(sent) == 8
+    assert bot.slots._value == 3
+    # done না হওয়া আপডেটগুলো রিস্টার্টে আবার আসবে
+    assert [row[0] for row in bot.inbox.pending()] == [0, 2]
+
+
+def test_send_failure_is_logged_not_fatal(tmp_path, caplog):
+    def send(chat_id, text):
+        raise ConnectionError("telegram down")
+    bot = listener.Listener(verify=lambda text: "ok", send=send, fetch=None, workers=1, queue_size=2,
+                            db_path=str(tmp_path / "inbox.db"))
+    stats = _run(bot, [(1, 5, "a"), (2, 5, "b")])
+    assert stats["processed"] == 2
+    assert "sendMessage ব্যর্থ" in caplog.text
+
+
+def test_polled_message_text_stays_out_of_the_log(tmp_path, caplog):
+    caplog.set_level(logging.DEBUG)
+    secret = "আমার ফোন নম্বর ০১৭১১০০০০০০ দিয়ে যাচাই করুন"
+    sent, offsets = [], []
+
+    def fetch(offset):
+        offsets.append(offset)
+        if len(offsets) == 1:
+            return {"result": [{"update_id": 5, "message": {"chat": {"id": 1}, "text": secret}}]}
+        time.sleep(0.02)
+        return {"result": []}
+
+    bot = listener.Listener(verify=lambda text: "ঠিক আছে", send=lambda chat_id, text: sent.append(text), fetch=fetch,
+                            workers=1, queue_size=2, db_path=str(tmp_path / "inbox.db"))
+
+    async def main():
+        stop = asyncio.Event()
+
+        async def wait():
+            while bot.processed < 1:
+                await asyncio.sleep(0.02)
+            stop.set()
+
+        asyncio.get_running_loop().create_task(wait())
+        return await bot.run(stop)
+
+    thread = threading.Thread(target=lambda: asyncio.run(main()), daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert sent == ["🧠 যাচাই ফলাফল:\nঠিক আছে"]
+    assert "আপডেট 5" in caplog.text
+    assert secret not in caplog.text
+
+
+def test_redelivered_webhook_update_is_answered_once(tmp_path):
+    sent = []
+    bot = _listener(tmp_path, sent, workers=2, queue_size=4)
+    # Telegram 200 না পেলে একই update_id আবার পাঠায়
+    stats = _run(bot, [(1, 5, "a"), (1, 5, "a"), (2, 5, "b"), (1, 5, "a")])
+    assert stats["processed"] == 2
+    assert sent == [(5, "🧠 যাচাই ফলাফল:\nউত্তর a"), (5, "🧠 যাচাই ফলাফল:\nউত্তর b")]
+    assert bot.inbox.offset() is None  # webhook-এ getUpdates offset লেখা হয় না
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+import model_router
+
+
+def _tripped(cooldown=0.05):
+    health = model_router.ModelHealth("primary", cooldown=cooldown)
+    for _ in range(model_router.FAILURE_THRESHOLD):
+        health.record(0.1, False)
+    return health
+
+
+def test_circuit_opens_after_consecutive_failures():
+    health = _tripped()
+    assert health.state() == "open"
+    assert not health.available()
+
+
+def test_half_open_admits_exactly_one_trial():
+    health = _tripped()
+    time.sleep(0.06)
+    admitted = []
+    threads = [threading.Thread(target=lambda: admitted.append(health.available())) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert admitted.count(True) == 1
+    assert health.state() == "half-open"
+
+
+@pytest.mark.parametrize("ok, state", [(True, "closed"), (False, "open")])
+def test_trial_result_closes_or_reopens(ok, state):
+    health = _tripped()
+    time.sleep(0.06)
+    assert health.available()
+    health.record(0.1, ok)
+    assert health.state() == state
+    assert health.available() is ok
+
+
+def test_snapshot_does_not_consume_the_trial():
+    health = _tripped()
+    time.sleep(0.06)
+    assert health.snapshot()["state"] == "half-open"
+    assert health.available()
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeClient:
+    def __init__(self, fail):
+        self.fail = fail
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("down")
+        return FakeResponse("ok")
+
+
+def test_router_skips_an_open_model():
+    clients = {"primary": FakeClient(fail=True), "fallback": FakeClient(fail=False)}
+    router = model_router.ModelRouter(["primary", "fallback"], factory=clients.__getitem__, cooldown=60)
+    for _ in range(model_router.FAILURE_THRESHOLD + 2):
+        assert router.generate("দাবি")[0] == "fallback"
+    assert clients["primary"].calls == model_router.FAILURE_THRESHOLD
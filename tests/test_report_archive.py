@@ -0,0 +1,53 @@
+import os
+
+import claim_index
+import report_archive
+from conftest import add_report
+
+OLD = "2024-01-15 10:00:00"
+CLAIM = "ভোটার তালিকা থেকে এক কোটি নাম মুছে ফেলা হয়েছে বলে নির্বাচন কমিশনের নতুন তথ্যে দেখা গেছে"
+
+
+def _live_ids(store):
+    with store.reader() as conn:
+        return {r[0] for r in conn.execute("SELECT id FROM reports").fetchall()}
+
+
+def test_archive_moves_only_old_reviewed_reports(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    archived = add_report(store, CLAIM, score=80, final_verdict="মিথ্যা", timestamp=OLD)
+    pending_old = add_report(store, "পদ্মা সেতুর টোল অর্ধেক করা হচ্ছে", timestamp=OLD)
+    reviewed_new = add_report(store, "প্রবাসীদের রেমিট্যান্সে নতুন কর", final_verdict="সত্য")
+
+    moved, written, size = report_archive.archive(store, older_than_days=30)
+    assert (moved, written) == (1, 1) and size > 0
+    assert _live_ids(store) == {pending_old, reviewed_new}
+    assert report_archive.files(store) == [os.path.join(str(tmp_path / "archive"), "reports", "month=2024-01",
+                                                        f"part-{archived:010d}-{archived:010d}.parquet")]
+    assert report_archive.stats(store)["reports"] == 1
+    assert report_archive.archive(store, older_than_days=30) == (0, 0, 0)  # আবার চালালে কিছু নড়ে না
+
+
+def test_archived_reports_stay_searchable_and_findable(store, db_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    archived = add_report(store, CLAIM, score=80, final_verdict="মিথ্যা", timestamp=OLD)
+    report_archive.archive(store, older_than_days=30)
+
+    hits = report_archive.search(store, "ভোটার তালিকা")
+    assert [(h["id"], h["final_verdict"], h["archived"]) for h in hits] == [(archived, "মিথ্যা", True)]
+    assert report_archive.search(store, "ভোটার", verdict="সত্য") == []
+    assert report_archive.lookup(store, [archived])[0][0] == archived
+
+    # লাইভ টেবিলে আর নেই, তবু পুনরায় আসা দাবি আর্কাইভের যাচাইকৃত রায় পায়
+    match = claim_index.find_reviewed(CLAIM + " 😱", db_path)
+    assert match["id"] == archived and match["final_verdict"] == "মিথ্যা"
+
+
+def test_orphan_files_from_an_interrupted_run_are_removed(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    orphan = tmp_path / "archive" / "reports" / "month=2024-01" / "part-0000000001-0000000009.parquet"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"half written")
+    report_archive.archive(store, older_than_days=30)
+    assert not orphan.exists()
+    assert report_archive.search(store, "ভোটার") == []
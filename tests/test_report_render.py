@@ -0,0 +1,45 @@
+import os
+import re
+
+import pytest
+
+import report_render
+
+REPORT = {"id": 7, "text": "ভোটার তালিকা থেকে নাম মুছে গেছে", "score": 80, "verdict": "মিথ্যা",
+          "justification": "নির্বাচন কমিশনের তথ্যে এমন কিছু নেই", "final_verdict": None}
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    if not os.path.exists(report_render.FONT_PATH):
+        pytest.skip(f"PDF ফন্ট নেই ({report_render.FONT_PATH}) — YACHAI_PDF_FONT দিয়ে দিন")
+    renderer = report_render.ReportRenderer(workers=1, cache_size=4)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_chart_renders_in_memory_and_is_cached_by_score(renderer):
+    first = renderer.chart(REPORT)
+    assert first.result(timeout=60).startswith(b"\x89PNG")
+    assert renderer.chart({**REPORT, "id": 8}) is first  # একই স্কোর → একই চার্ট
+    assert renderer.stats()["hits"] >= 1
+
+
+def test_pdf_is_rerendered_when_the_report_changes(renderer):
+    pdf = renderer.pdf(REPORT)
+    assert pdf.result(timeout=60).startswith(b"%PDF")
+    assert renderer.pdf(dict(REPORT)) is pdf
+    assert renderer.pdf({**REPORT, "final_verdict": "মিথ্যা"}) is not pdf
+
+
+def test_bulk_pdf_has_one_page_per_report(renderer):
+    reports = [{**REPORT, "id": i, "score": i * 10} for i in range(3)]
+    data = renderer.bulk_pdf(reports).result(timeout=60)
+    assert len(re.findall(rb"/Type /Page\b", data)) == 3
+
+
+def test_missing_font_is_reported_not_rendered(monkeypatch):
+    monkeypatch.setattr(report_render, "_plt", object())  # worker আগেই চালু, কিন্তু ফন্ট পাওয়া যায়নি
+    monkeypatch.setattr(report_render, "_font_path", None)
+    with pytest.raises(report_render.FontMissingError):
+        report_render.render_pdf(REPORT)
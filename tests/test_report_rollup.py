@@ -0,0 +1,42 @@
+import sqlite3
+
+import report_rollup
+from conftest import add_report
+
+
+def test_rollup_follows_inserts_updates_and_deletes(store):
+    ids = [store.insert_report(f"দাবি {i}", {"score": i * 20, "verdict": "মিথ্যা", "justification": "x"}, "portal")
+           for i in range(6)]
+    add_report(store, "পুরোনো দাবি", score=100, timestamp="2024-01-02 03:04:05")
+    store.update_verdict(ids[0], "সত্য")
+    store.write(lambda conn: conn.execute("UPDATE reports SET score = 55, source = 'listener' WHERE id = ?", (ids[1],)))
+    store.write(lambda conn: conn.execute("DELETE FROM reports WHERE id = ?", (ids[2],)))
+    with store.reader() as conn:
+        assert report_rollup.check(conn) == []
+        totals = report_rollup.totals(conn)
+    assert totals["reports"] == 6
+    assert totals["pending"] == 5
+
+
+def test_check_reports_drift_and_rebuild_repairs_it(store, db_path):
+    for i in range(3):
+        add_report(store, f"দাবি {i}", score=i * 30)
+    store.write(lambda conn: conn.execute("UPDATE report_rollup SET reports = reports + 5"))
+    with store.reader() as conn:
+        drift = report_rollup.check(conn)
+    assert drift and all(live != rolled for _, live, rolled in drift)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert report_rollup.rebuild(conn) == 3
+        assert report_rollup.check(conn) == []
+    finally:
+        conn.close()
+
+
+def test_score_histogram_buckets_edges(store):
+    for score in (0, 9, 10, 99, 100):
+        add_report(store, f"স্কোর {score}", score=score)
+    with store.reader() as conn:
+        rows = conn.execute("SELECT score_bucket, SUM(reports) FROM report_rollup GROUP BY 1 ORDER BY 1").fetchall()
+    assert rows == [(0, 2), (1, 1), (9, 2)]
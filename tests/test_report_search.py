@@ -0,0 +1,31 @@
+import report_search
+from conftest import add_report
+
+
+def test_bengali_words_match_by_prefix_and_either_digit_form(store):
+    voter = add_report(store, "ভোটার তালিকা থেকে ১০ লাখ নাম মুছে গেছে")
+    add_report(store, "পদ্মা সেতুর টোল অর্ধেক হচ্ছে")
+    assert [r["id"] for r in store.search("ভোটার তালিকা")] == [voter]
+    assert [r["id"] for r in store.search("লিকা")] == []  # শব্দের মাঝখান নয়, শুরু থেকে মেলে
+    assert [r["id"] for r in store.search("তালি 10")] == [voter]
+    assert "**তালিকা**" in store.search("তালি")[0]["text_snippet"]
+
+
+def test_verdict_filter_prefers_the_admin_decision(store):
+    ai_false = add_report(store, "ভোটার তালিকা বাতিল")
+    reviewed = add_report(store, "ভোটার তালিকা নতুন করে", final_verdict="সত্য")
+    assert [r["id"] for r in store.search("ভোটার", verdict="মিথ্যা")] == [ai_false]
+    assert [r["id"] for r in store.search("ভোটার", verdict="সত্য")] == [reviewed]
+
+
+def test_index_follows_text_updates_and_deletes(store):
+    report_id = add_report(store, "পুরোনো লেখা")
+    store.write(lambda conn: conn.execute("UPDATE reports SET text = 'নতুন লেখা' WHERE id = ?", (report_id,)))
+    assert store.search("পুরোনো") == []
+    assert [r["id"] for r in store.search("নতুন")] == [report_id]
+    store.write(lambda conn: conn.execute("DELETE FROM reports WHERE id = ?", (report_id,)))
+    assert store.search("নতুন") == []
+
+
+def test_build_match_query_quotes_operators():
+    assert report_search.build_match_query('OR "NEAR" ১০') == '"OR"* AND "NEAR"* AND ("10"* OR "১০"*)'
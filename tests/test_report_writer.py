@@ -0,0 +1,22 @@
+import time
+
+import report_writer
+import storage
+
+
+def test_closed_writer_is_replaced_not_reused(tmp_path):
+    path = str(tmp_path / "w.db")
+    setup = lambda conn: conn.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+    first = report_writer.get_writer(path, setup)
+    first.close()
+    second = report_writer.get_writer(path, setup)
+    assert second is not first
+    started = time.monotonic()
+    assert second.execute(lambda conn: conn.execute("INSERT INTO t VALUES (1)").rowcount, timeout=5) == 1
+    assert time.monotonic() - started < 1
+    second.close()
+
+
+def test_store_keeps_writing_after_its_writer_is_closed(store):
+    store.writer.close()
+    assert store.insert_report("বন্ধের পরে লেখা", {"score": 10, "verdict": "সত্য", "justification": "x"}) > 0
@@ -0,0 +1,19 @@
+import rescore_reports
+import verdict_cache
+from conftest import add_report
+
+
+def test_rescore_updates_reports_and_cached_answers(store, db_path, monkeypatch):
+    cached = add_report(store, "পদ্মা সেতুর টোল অর্ধেক হচ্ছে", score=20)
+    uncached = add_report(store, "করোনার টিকায় চুম্বক", score=20)
+    verdict_cache.store("পদ্মা সেতুর টোল অর্ধেক হচ্ছে", {"score": 20, "verdict": "সত্য", "justification": "পুরোনো"})
+    verdict_cache.record_final_verdict("পদ্মা সেতুর টোল অর্ধেক হচ্ছে", "মিথ্যা")
+    monkeypatch.setattr(rescore_reports.gemini_analysis, "get_gemini_batch_analysis", lambda rows, batch_size=None: {
+        rid: {"score": 85, "verdict": "মিথ্যা", "justification": "নতুন"} for rid, _ in rows})
+
+    assert rescore_reports.rescore(db_path, batch_size=10) == 2
+    with store.reader() as conn:
+        assert conn.execute("SELECT id, score FROM reports ORDER BY id").fetchall() == [(cached, 85), (uncached, 85)]
+    hit = verdict_cache.lookup("পদ্মা সেতুর টোল অর্ধেক হচ্ছে")
+    assert (hit["score"], hit["justification"], hit["final_verdict"]) == (85, "নতুন", "মিথ্যা")
+    assert verdict_cache.lookup("করোনার টিকায় চুম্বক") is None  # রি-স্কোর ক্যাশে নতুন এন্ট্রি ঢোকায় না
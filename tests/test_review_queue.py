@@ -0,0 +1,98 @@
+import time
+
+import review_queue
+from conftest import add_report
+
+CLAIM = "ভোটার তালিকা থেকে এক কোটি নাম মুছে ফেলা হয়েছে বলে নির্বাচন কমিশনের নতুন তথ্যে দেখা গেছে"
+
+
+def _seed(store):
+    # একটা ৩-সদস্যের ক্লাস্টার (মাঝারি স্কোর) আর কয়েকটা একক রিপোর্ট
+    cluster = [add_report(store, CLAIM + suffix, score=40) for suffix in ("", " 😱", " #শেয়ার")]
+    singles = [add_report(store, text, score=score) for text, score in [
+        ("পদ্মা সেতুর টোল আগামী মাস থেকে অর্ধেক করা হচ্ছে", 90),
+        ("করোনার টিকা নিলে শরীরে চুম্বক লেগে থাকে", 10),
+        ("প্রবাসীদের রেমিট্যান্সে নতুন কর বসছে জুলাই থেকে", 60),
+    ]]
+    review_queue.sync_clusters(store)
+    return cluster, singles
+
+
+def test_queue_orders_by_priority_with_cluster_bonus(store):
+    cluster, singles = _seed(store)
+    items = review_queue.available(store, limit=10)
+    assert [item["priority"] for item in items] == sorted((item["priority"] for item in items), reverse=True)
+    by_id = {item["id"]: item for item in items}
+    assert by_id[cluster[0]]["duplicates"] == 3
+    assert by_id[cluster[0]]["priority"] == 40 + review_queue.DUP_WEIGHT * 2
+    assert by_id[singles[0]]["priority"] == 90
+
+
+def test_claim_gives_disjoint_leases_one_per_cluster(store):
+    cluster, singles = _seed(store)
+    alice = review_queue.claim(store, "alice", limit=10)
+    bob = review_queue.claim(store, "bob", limit=10)
+    alice_ids = {item["id"] for item in alice}
+    bob_ids = {item["id"] for item in bob}
+    assert not alice_ids & bob_ids
+    assert len(alice_ids & set(cluster)) == 1  # ক্লাস্টারের বাকিগুলো ক্লাস্টার ট্যাগে যায়
+    assert not bob_ids & set(cluster)  # অন্য রিভিউয়ারের হাতে থাকা ক্লাস্টার বাদ
+    assert {item["id"] for item in review_queue.leased(store, "alice")} == alice_ids
+
+
+def test_expired_lease_returns_to_the_queue(store):
+    _seed(store)
+    first = review_queue.claim(store, "alice", limit=1, ttl=0.05)
+    time.sleep(0.1)
+    again = review_queue.claim(store, "bob", limit=1)
+    assert [item["id"] for item in again] == [first[0]["id"]]
+
+
+def test_tag_respects_other_reviewers_leases(store):
+    cluster, singles = _seed(store)
+    alice = review_queue.claim(store, "alice", limit=10)
+    leased_id = alice[0]["id"]
+    assert review_queue.tag(store, [leased_id], "মিথ্যা", "bob") == []
+    tagged = review_queue.tag(store, [leased_id], "মিথ্যা", "alice")
+    assert [row[0] for row in tagged] == [leased_id]
+    assert review_queue.tag(store, [leased_id], "সত্য", "alice") == []  # আগেই ট্যাগ হওয়া
+
+
+def test_cluster_counts_only_pending_members_after_tagging(store):
+    cluster, singles = _seed(store)
+    review_queue.tag(store, cluster[:2], "মিথ্যা", "alice")
+    items = {item["id"]: item for item in review_queue.available(store, limit=10)}
+    assert cluster[0] not in items and cluster[1] not in items
+    assert items[cluster[2]]["duplicates"] == 1
+    assert items[cluster[2]]["priority"] == 40
+    assert review_queue.top_clusters(store) == []
+    assert [m["id"] for m in review_queue.cluster_members(store, cluster[2])] == [cluster[2]]
+
+
+def test_full_refresh_matches_incremental_priorities(store):
+    cluster, singles = _seed(store)
+    add_report(store, CLAIM + " আবার", score=70)
+    review_queue.sync_clusters(store)
+    review_queue.tag(store, [singles[1]], "সত্য", "alice")
+    before = {item["id"]: item["priority"] for item in review_queue.available(store, limit=20)}
+    store.write(lambda conn: review_queue._refresh(conn, store.name))
+    after = {item["id"]: item["priority"] for item in review_queue.available(store, limit=20)}
+    assert before == after
+
+
+def test_verdict_set_outside_tag_drops_out_on_refresh(store, monkeypatch):
+    cluster, singles = _seed(store)
+    store.update_verdict(singles[0], "মিথ্যা")
+    assert singles[0] not in {item["id"] for item in review_queue.available(store, limit=10)}
+    monkeypatch.setattr(review_queue, "_refreshed", {})  # এক ঘণ্টা পেরিয়েছে
+    review_queue.sync_clusters(store)
+    with store.reader() as conn:
+        assert conn.execute("SELECT priority FROM review_clusters WHERE report_id=?", (singles[0],)).fetchone()[0] is None
+
+
+def test_stats_and_release(store):
+    _seed(store)
+    review_queue.claim(store, "alice", limit=2)
+    assert review_queue.stats(store, now=time.time()) == {"leased": 2, "reviewers": 1}
+    assert review_queue.release(store, "alice") == 2
+    assert review_queue.stats(store)["leased"] == 0
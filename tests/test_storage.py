@@ -0,0 +1,43 @@
+import storage
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, sql, params=None):
+        self.log.append(sql)
+
+
+class FakeConn:
+    # psycopg2 কানেকশনের জায়গায় — সার্ভার ছাড়াই PREPARE/EXECUTE/DEALLOCATE গোনা
+    autocommit = True
+
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+
+def test_placeholders_inside_literals_are_left_alone():
+    sql = "SELECT 'কী?', \"col?\" FROM t WHERE a=? AND b='it''s ?' AND c=?"
+    assert storage._to_dollar(sql) == "SELECT 'কী?', \"col?\" FROM t WHERE a=$1 AND b='it''s ?' AND c=$2"
+    assert storage._to_pyformat("SELECT '50%?' WHERE a=?") == "SELECT '50%%?' WHERE a=%s"
+
+
+def test_prepared_statements_are_bounded_per_connection(monkeypatch):
+    monkeypatch.setattr(storage, "PG_STATEMENT_CACHE", 3)
+    conn = FakeConn()
+    pg = storage.PgConnection(conn, storage.OrderedDict())
+    hot = "SELECT id FROM reports WHERE id=?"
+    for size in range(1, 10):
+        pg.execute(hot, (1,), prepare=True)
+        # chunk-এর দৈর্ঘ্য বদলালে নতুন SQL — আগে প্রতিটা সার্ভারে চিরকাল PREPARE হয়ে থাকত
+        pg.execute(f"SELECT id FROM reports WHERE id IN ({','.join('?' * size)})", tuple(range(size)), prepare=True)
+    assert len(pg.statements) == 3
+    assert hot in pg.statements
+    prepared = sum(sql.startswith("PREPARE") for sql in conn.log)
+    deallocated = sum(sql.startswith("DEALLOCATE") for sql in conn.log)
+    assert prepared - deallocated == 3
+    assert sum(sql.startswith(f"PREPARE {pg.statements[hot]} ") for sql in conn.log) == 1
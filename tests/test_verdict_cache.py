@@ -0,0 +1,32 @@
+import sqlite3
+
+import verdict_cache
+
+
+def _changes(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COALESCE(SUM(hits), 0) FROM verdict_cache").fetchone()[0], \
+            dict(conn.execute("SELECT name, value FROM verdict_cache_stats").fetchall())
+    finally:
+        conn.close()
+
+
+def test_hits_stay_in_memory_until_flush(db_path, monkeypatch):
+    monkeypatch.setattr(verdict_cache, "FLUSH_SECONDS", 3600)
+    verdict_cache.store("ভোটার তালিকা থেকে নাম মুছে গেছে", {"score": 80, "verdict": "মিথ্যা"})
+    for _ in range(5):
+        assert verdict_cache.lookup("ভোটার তালিকা থেকে নাম মুছে গেছে")["score"] == 80
+    assert verdict_cache.lookup("অন্য দাবি") is None
+    assert _changes(db_path) == (0, {})  # hit/miss-এ কোনো write নেই
+
+    stats = verdict_cache.stats()  # stats আগে জমা গণনা লিখে নেয়
+    assert (stats["hits"], stats["misses"]) == (5, 1)
+    assert _changes(db_path) == (5, {"hits": 5, "misses": 1})
+
+
+def test_final_verdict_is_returned_and_pinned(db_path):
+    verdict_cache.store("এই দাবি", {"score": 30, "verdict": "সত্য"})
+    verdict_cache.record_final_verdict("এই দাবি", "মিথ্যা")
+    assert verdict_cache.lookup("এই দাবি")["final_verdict"] == "মিথ্যা"
+    assert verdict_cache.stats()["pinned"] == 1
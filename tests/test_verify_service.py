@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+import verify_service
+
+RESULT = {"score": 90, "verdict": "মিথ্যা", "justification": "পরীক্ষা"}
+
+
+class SlowAnalysis:
+    # leader-এর _analyze: কয়েকটা partial দিয়ে, started সংকেতের পরে release পর্যন্ত আটকে থাকে
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail = fail
+
+    def __call__(self, text, on_partial=None):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        for score in range(3):
+            if on_partial is not None:
+                on_partial({"score": score})
+            time.sleep(0.02)
+        if self.fail:
+            raise verify_service.VerificationError("AI সেবাটি এই মুহূর্তে পাওয়া যাচ্ছে না")
+        return dict(RESULT, origin="model")
+
+
+def _run_concurrently(verifier, followers, on_partial_for=lambda name: None):
+    results, errors, idents = {}, {}, {}
+
+    def run(name):
+        idents[name] = threading.get_ident()
+        try:
+            results[name] = verifier._shared("একই দাবি, একই সময়ে", on_partial_for(name))
+        except Exception as e:
+            errors[name] = e
+
+    leader = threading.Thread(target=run, args=("leader",))
+    leader.start()
+    assert verifier._analyze.started.wait(5)
+    threads = [threading.Thread(target=run, args=(f"f{i}",)) for i in range(followers)]
+    for t in threads:
+        t.start()
+    while verifier.stats()["coalesced"] < followers:
+        time.sleep(0.005)
+    verifier._analyze.release.set()
+    for t in [leader] + threads:
+        t.join(5)
+    return results, errors, idents
+
+
+def test_concurrent_requests_share_one_analysis(db_path):
+    verifier = verify_service.Verifier(db_path)
+    verifier._analyze = SlowAnalysis()
+    results, errors, _ = _run_concurrently(verifier, followers=5)
+    assert not errors
+    assert verifier._analyze.calls == 1
+    assert sorted(leader for _, leader in results.values()) == [False] * 5 + [True]
+    assert all(result["score"] == 90 for result, _ in results.values())
+
+
+def test_partials_are_delivered_on_each_waiters_own_thread(db_path):
+    verifier = verify_service.Verifier(db_path)
+    verifier._analyze = SlowAnalysis()
+    seen = {}
+
+    def on_partial_for(name):
+        return lambda partial: seen.setdefault(name, []).append((partial["score"], threading.get_ident()))
+
+    results, errors, idents = _run_concurrently(verifier, followers=2, on_partial_for=on_partial_for)
+    assert not errors
+    assert set(seen) == {"leader", "f0", "f1"}
+    for name, partials in seen.items():
+        # অপেক্ষমাণের callback তার নিজের থ্রেডে — leader-এর থ্রেডে নয় (Streamlit সেশন আলাদা থাকে)
+        assert {ident for _, ident in partials} == {idents[name]}
+    assert [score for score, _ in seen["leader"]] == [0, 1, 2]
+
+
+def test_leader_failure_reaches_every_waiter(db_path):
+    verifier = verify_service.Verifier(db_path)
+    verifier._analyze = SlowAnalysis(fail=True)
+    results, errors, _ = _run_concurrently(verifier, followers=3)
+    assert not results
+    assert set(errors) == {"leader", "f0", "f1", "f2"}
+    assert all(isinstance(e, verify_service.VerificationError) for e in errors.values())
+    assert verifier.stats()["inflight"] == 0
+
+
+def test_verify_persists_each_request_with_its_source(db_path, store):
+    verifier = verify_service.Verifier(db_path)
+    verifier._analyze = lambda text, on_partial=None: dict(RESULT, origin="model")
+    first = verifier.verify("ভোটার তালিকা থেকে নাম মুছে গেছে", source="portal")
+    second = verifier.verify("ভোটার তালিকা থেকে নাম মুছে গেছে", source="listener")
+    assert first["report_id"] != second["report_id"]
+    with store.reader() as conn:
+        assert conn.execute("SELECT source FROM reports ORDER BY id").fetchall() == [("portal",), ("listener",)]
+
+
+def test_empty_text_is_rejected(db_path):
+    with pytest.raises(verify_service.VerificationError):
+        verify_service.Verifier(db_path).verify("   ")
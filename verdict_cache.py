@@ -0,0 +1,250 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from claim_text import claim_key
+
+# =====================================================
+# 🗂️ VERDICT CACHE (SQLite, TTL + LRU)
+# =====================================================
+# পোর্টাল আর দুটো বটই একই data.db শেয়ার করে, তাই একই দাবির জন্য
+# বারবার Gemini কল না করে এখান থেকে উত্তর দেওয়া হয়।
+# kind="analysis" → get_gemini_analysis-এর JSON, kind="chat" → বটের ফ্রি-টেক্সট উত্তর।
+# অ্যাডমিনের final_verdict থাকলে সেটাই আগে, আর সেই row কখনো evict হয় না।
+
+CACHE_DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+CACHE_TTL_SECONDS = int(os.getenv("VERDICT_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", 5000))
+# hit/miss গণনা আর last_used_at মেমরিতে জমে, এতক্ষণ পরপর এক লেনদেনে লেখা হয় —
+# তাই cache hit-এ data.db-তে কোনো write/fsync নেই
+FLUSH_SECONDS = float(os.getenv("VERDICT_CACHE_FLUSH_SECONDS", 30))
+FLUSH_MAX_TOUCHES = 500
+
+_conn = None
+_lock = threading.Lock()
+_pending = {"hits": 0, "misses": 0}
+_touched = {}  # (claim_key, kind) → [last_used_at, hits]
+_last_flush = time.monotonic()
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False, timeout=10)
+        _conn.execute("PRAGMA journal_mode=WAL;")
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS verdict_cache (
+                claim_key TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT,
+                final_verdict TEXT,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (claim_key, kind)
+            );
+            CREATE INDEX IF NOT EXISTS idx_verdict_cache_lru
+                ON verdict_cache(last_used_at) WHERE final_verdict IS NULL;
+            CREATE TABLE IF NOT EXISTS verdict_cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        _conn.commit()
+    return _conn
+
+
+def _flush(conn):
+    # জমে থাকা hit/miss আর LRU timestamp লেখা (_lock ধরে ডাকতে হয়; commit করে caller)
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not _touched and not any(_pending.values()):
+        return False
+    conn.executemany("""
+        INSERT INTO verdict_cache_stats (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+    """, [(name, n) for name, n in _pending.items() if n])
+    conn.executemany(
+        "UPDATE verdict_cache SET last_used_at=MAX(last_used_at, ?), hits=hits+? WHERE claim_key=? AND kind=?",
+        [(used, hits, key, kind) for (key, kind), (used, hits) in _touched.items()],
+    )
+    _pending.update(hits=0, misses=0)
+    _touched.clear()
+    return True
+
+
+def _commit_flush(conn):
+    try:
+        if _flush(conn):
+            conn.commit()
+    except Exception:
+        conn.rollback()  # গণনা মেমরিতেই থাকে, পরের বার আবার চেষ্টা
+        raise
+
+
+def _maybe_flush(conn):
+    if len(_touched) >= FLUSH_MAX_TOUCHES or time.monotonic() - _last_flush >= FLUSH_SECONDS:
+        _commit_flush(conn)
+
+
+def flush():
+    if _conn is None:
+        return
+    try:
+        with _lock:
+            _commit_flush(_conn)
+    except Exception as e:
+        logging.error(f"Verdict cache flush ব্যর্থ: {e}")
+
+
+atexit.register(flush)
+
+
+def lookup(text, kind="analysis"):
+    key = claim_key(text)
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            row = conn.execute(
+                "SELECT payload, created_at FROM verdict_cache WHERE claim_key=? AND kind=?",
+                (key, kind),
+            ).fetchone()
+            reviewed = conn.execute(
+                "SELECT final_verdict FROM verdict_cache WHERE claim_key=? AND final_verdict IS NOT NULL LIMIT 1",
+                (key,),
+            ).fetchone()
+            final_verdict = reviewed[0] if reviewed else None
+
+            # মেয়াদোত্তীর্ণ AI উত্তর বাদ (অ্যাডমিন-যাচাইকৃত হলে নয়) — row মোছে পরের store()/_evict
+            if row and final_verdict is None and now - row[1] > CACHE_TTL_SECONDS:
+                row = None
+
+            if row is None and final_verdict is None:
+                _pending["misses"] += 1
+                _maybe_flush(conn)
+                return None
+
+            if row:
+                touch = _touched.setdefault((key, kind), [now, 0])
+                touch[0] = now
+                touch[1] += 1
+            _pending["hits"] += 1
+            _maybe_flush(conn)
+    except Exception as e:
+        logging.error(f"Verdict cache lookup ব্যর্থ: {e}")
+        return None
+
+    result = json.loads(row[0]) if row and row[0] else {}
+    if final_verdict:
+        result["final_verdict"] = final_verdict
+    return result
+
+
+def store(text, payload, kind="analysis"):
+    key = claim_key(text)
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute("""
+                INSERT INTO verdict_cache (claim_key, kind, payload, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(claim_key, kind) DO UPDATE SET
+                    payload=excluded.payload,
+                    created_at=excluded.created_at,
+                    last_used_at=excluded.last_used_at
+            """, (key, kind, json.dumps(payload, ensure_ascii=False), now, now))
+            _flush(conn)  # LRU eviction-এর আগে জমে থাকা last_used_at লেখা
+            _evict(conn, now)
+            conn.commit()
+    except Exception as e:
+        logging.error(f"Verdict cache store ব্যর্থ: {e}")
+
+
+def refresh_many(items, kind="analysis"):
+    # [(text, payload)] — শুধু আগে থেকে ক্যাশে থাকা দাবিগুলোর উত্তর বদলানো (যেমন রি-স্কোরের পরে),
+    # নতুন এন্ট্রি ঢোকে না তাই LRU-র জনপ্রিয় উত্তরগুলো সরে যায় না; অ্যাডমিনের final_verdict থাকে
+    now = time.time()
+    rows = [(json.dumps(payload, ensure_ascii=False), now, claim_key(text), kind) for text, payload in items]
+    try:
+        with _lock:
+            conn = _get_conn()
+            updated = conn.executemany(
+                "UPDATE verdict_cache SET payload=?, created_at=? WHERE claim_key=? AND kind=?", rows
+            ).rowcount
+            conn.commit()
+        return updated
+    except Exception as e:
+        logging.error(f"Verdict cache refresh ব্যর্থ: {e}")
+        return 0
+
+
+def _evict(conn, now):
+    conn.execute(
+        "DELETE FROM verdict_cache WHERE final_verdict IS NULL AND created_at < ?",
+        (now - CACHE_TTL_SECONDS,),
+    )
+    # LRU: সবচেয়ে কম ব্যবহৃত AI উত্তরগুলো আগে বাদ
+    conn.execute("""
+        DELETE FROM verdict_cache WHERE rowid IN (
+            SELECT rowid FROM verdict_cache WHERE final_verdict IS NULL
+            ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+        )
+    """, (CACHE_MAX_ENTRIES,))
+
+
+def record_final_verdict(text, final_verdict, analysis=None):
+    # অ্যাডমিন ট্যাগ দিলে এই দাবির সব cached উত্তরে সেটা বসে যায়
+    key = claim_key(text)
+    now = time.time()
+    payload = json.dumps(analysis, ensure_ascii=False) if analysis else None
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute("""
+                INSERT INTO verdict_cache (claim_key, kind, payload, final_verdict, created_at, last_used_at)
+                VALUES (?, 'analysis', ?, ?, ?, ?)
+                ON CONFLICT(claim_key, kind) DO UPDATE SET
+                    payload=COALESCE(excluded.payload, payload),
+                    final_verdict=excluded.final_verdict,
+                    last_used_at=excluded.last_used_at
+            """, (key, payload, final_verdict, now, now))
+            conn.execute("UPDATE verdict_cache SET final_verdict=? WHERE claim_key=?", (final_verdict, key))
+            conn.commit()
+    except Exception as e:
+        logging.error(f"Verdict cache final verdict ব্যর্থ: {e}")
+
+
+def chat_reply(cached):
+    # বটের জন্য ক্যাশ থেকে উত্তর সাজানো (অ্যাডমিনের সিদ্ধান্ত থাকলে সেটা আগে)
+    parts = []
+    if cached.get("final_verdict"):
+        parts.append(f"🧑‍💼 ফ্যাক্ট-চেকার যাচাইকৃত সিদ্ধান্ত: {cached['final_verdict']}")
+    if cached.get("text"):
+        parts.append(cached["text"])
+    return "\n\n".join(parts)
+
+
+def stats():
+    with _lock:
+        conn = _get_conn()
+        _commit_flush(conn)
+        counters = dict(conn.execute("SELECT name, value FROM verdict_cache_stats").fetchall())
+        entries, pinned = conn.execute(
+            "SELECT COUNT(*), COUNT(final_verdict) FROM verdict_cache"
+        ).fetchone()
+    hits = counters.get("hits", 0)
+    misses = counters.get("misses", 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / total * 100) if total else 0.0,
+        "entries": entries,
+        "pinned": pinned,
+    }
@@ -0,0 +1,326 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import claim_extraction
+import claim_index
+import gemini_analysis
+import metrics
+import report_writer
+import storage
+import verdict_cache
+from claim_text import claim_key
+
+# =====================================================
+# 🛰️ VERIFICATION SERVICE (single-flight, পোর্টাল + দুটো বট)
+# =====================================================
+# গুজব ছড়ালে একই সেকেন্ডে একই দাবি পোর্টাল, telegram_bot.py আর listener.py —
+# তিন দিক থেকেই আসে, আর আগে প্রত্যেকটা আলাদা Gemini কল করত। এখন:
+# - একই normalized দাবির (claim_key) জন্য একসাথে একটাই যাচাই চলে; বাকিরা সেই
+#   ফলাফলের জন্য অপেক্ষা করে (single-flight), মডেল কল একবারই
+# - ক্রম: ভার্ডিক্ট ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → Gemini (পোর্টালের মতোই)
+# - লম্বা পোস্ট হলে claim_extraction আলাদা দাবিতে ভাগ করে; প্রতিটা দাবিও একই
+#   single-flight দিয়ে যায়, তাই দুটো পোস্টে একই দাবি থাকলেও মডেল কল একবার
+# - on_partial দিলে Gemini-র উত্তর stream হয় — অপেক্ষমাণ সবাই একই টুকরো পায়, তবে
+#   নিজের থ্রেডে (নিজস্ব সারি থেকে); reports-এ লেখা হয় শুধু পুরো উত্তর আসার পরে
+# - প্রতিটা অনুরোধের ফলাফল reports টেবিলে (source কলামে কোথা থেকে এসেছে) —
+#   বটের ট্রাফিকও এখন অ্যাডমিন ড্যাশবোর্ডে দেখা যায়
+#
+# আলাদা প্রসেসগুলোর মধ্যে coalescing-এর জন্য daemon চালাতে হয়:
+#   python verify_service.py --port 8765
+#   VERIFY_SERVICE_URL=http://127.0.0.1:8765  (app.py আর দুটো বটের env-এ)
+# VERIFY_SERVICE_URL না থাকলে (বা daemon বন্ধ থাকলে) প্রসেসের ভেতরেই একই Verifier চলে —
+# তখন coalescing শুধু সেই প্রসেসের থ্রেডগুলোর মধ্যে।
+
+DB_PATH = os.getenv("YACHAI_DB_PATH", "data.db")
+SERVICE_URL = os.getenv("VERIFY_SERVICE_URL")
+SERVICE_HOST = os.getenv("VERIFY_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("VERIFY_SERVICE_PORT", 8765))
+REQUEST_TIMEOUT = float(os.getenv("VERIFY_SERVICE_TIMEOUT", 120))  # সেকেন্ড — Gemini ধীর হলেও
+
+
+class VerificationError(RuntimeError):
+    pass
+
+
+def _open_db(db_path):
+    # সরাসরি SQLite কানেকশন (বেঞ্চমার্ক/রক্ষণাবেক্ষণ) — টেবিল/trigger সহ
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+    report_writer.apply_pragmas(conn)
+    storage.sqlite_schema(conn)
+    return conn
+
+
+class Verifier:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._inflight = {}  # claim_key → Future
+        self.counts = Counter()  # requests, coalesced, cache, reviewed, model, failed
+        self.by_source = Counter()
+        metrics.QUEUE_DEPTH.track(lambda: len(self._inflight), "verify_inflight")
+
+    def _storage(self):
+        # প্রসেসের শেয়ার্ড storage — SQLite-এ writer থ্রেড, PostgreSQL-এ pool; প্রথমবার টেবিল/trigger তৈরি করে নেয়
+        return storage.get_storage(self.db_path)
+
+    def _analyze(self, text, on_partial=None):
+        # পোর্টালের আগের ক্রম: ক্যাশ → অনুরূপ অ্যাডমিন-যাচাই → Gemini
+        result = verdict_cache.lookup(text)
+        if result is not None and "score" in result:
+            self.counts["cache"] += 1
+            return {**result, "origin": "cache"}
+        if claim_extraction.is_long(text):
+            post = claim_extraction.analyze_post(text, self._sub_claim, self.db_path)
+            if not post:
+                raise VerificationError("AI সেবাটি এই মুহূর্তে পাওয়া যাচ্ছে না")
+            self.counts["posts"] += 1
+            verdict_cache.store(text, post)
+            return {**post, **(result or {}), "origin": "claims"}
+        match = claim_index.find_reviewed(text, self.db_path)
+        if match:
+            self.counts["reviewed"] += 1
+            return {**{k: match[k] for k in ("score", "verdict", "justification", "final_verdict", "similarity")},
+                    "origin": "reviewed"}
+        self.counts["model"] += 1
+        analysis = gemini_analysis.get_gemini_analysis(text, on_partial)
+        if not analysis:
+            raise VerificationError("AI সেবাটি এই মুহূর্তে পাওয়া যাচ্ছে না")
+        verdict_cache.store(text, analysis)
+        return {**analysis, **(result or {}), "origin": "model"}
+
+    def _persist(self, text, result, source):
+        # SQLite-এ group commit: অন্য থ্রেডের insert-এর সাথে এক transaction-এ, commit হওয়া পর্যন্ত অপেক্ষা
+        with metrics.DB_QUERY.time("insert", "reports"):
+            report_id = self._storage().insert_report(text, result, source)
+        claim_index.add(report_id, text)
+        logging.info(f"📝 Report inserted successfully ({source}): {result.get('verdict', 'N/A')}")
+        return report_id
+
+    def _sub_claim(self, claim):
+        # লম্বা পোস্টের একটা দাবি — অন্য অনুরোধে একই দাবি চললে সেটার ফলাফলই
+        try:
+            return self._shared(claim)[0]
+        except Exception as e:
+            logging.warning(f"দাবি যাচাই ব্যর্থ: {e}")
+            return None
+
+    def _shared(self, text, on_partial=None):
+        # single-flight: (result, leader কি না)
+        key = claim_key(text)
+        inbox = None
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+                flight.waiters = []  # অপেক্ষমাণদের নিজস্ব partial সারি
+            else:
+                self.counts["coalesced"] += 1
+                if on_partial is not None:
+                    inbox = queue.SimpleQueue()
+                    flight.waiters.append(inbox)
+        if not leader:
+            if inbox is not None:
+                self._follow(flight, inbox, on_partial)
+            return dict(flight.result()), leader  # leader ব্যর্থ হলে অপেক্ষমাণ সবাই একই ত্রুটি পায়
+
+        def broadcast(partial):
+            # leader-এর callback এই থ্রেডেই; অপেক্ষমাণদের টুকরো তাদের সারিতে — ওরা নিজের থ্রেডে
+            # দেখায় (Streamlit লেখা যায় শুধু সেই সেশনের নিজের script থ্রেড থেকে)
+            if on_partial is not None:
+                try:
+                    on_partial(partial)
+                except Exception as e:
+                    logging.warning(f"Partial callback ব্যর্থ: {e}")
+            with self._lock:
+                waiters = list(flight.waiters)
+            for inbox in waiters:
+                inbox.put(partial)
+
+        try:
+            # কেউ stream না চাইলে সাধারণ (non-stream) কল; পরে কেউ যোগ দিলে শুধু শেষ ফল পায়
+            streaming = on_partial is not None or bool(flight.waiters)
+            flight.set_result(self._analyze(text, broadcast if streaming else None))
+        except Exception as e:
+            self.counts["failed"] += 1
+            flight.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return dict(flight.result()), leader
+
+    def _follow(self, flight, inbox, on_partial):
+        # অপেক্ষমাণের নিজের থ্রেডে partial দেখানো, flight শেষ না হওয়া পর্যন্ত।
+        # টুকরোগুলো এ পর্যন্ত জমা উত্তরের parse, তাই জমে থাকলে শুধু সর্বশেষটাই দেখানো হয়
+        done = object()
+        flight.add_done_callback(lambda _: inbox.put(done))
+        while True:
+            partial = inbox.get()
+            while partial is not done and not inbox.empty():
+                partial = inbox.get()
+            if partial is done:
+                return
+            try:
+                on_partial(partial)
+            except Exception as e:
+                logging.warning(f"Partial callback ব্যর্থ: {e}")
+
+    def verify(self, text, source="portal", on_partial=None):
+        text = (text or "").strip()
+        if not text:
+            raise VerificationError("দাবির টেক্সট খালি")
+        with self._lock:
+            self.counts["requests"] += 1
+            self.by_source[source] += 1
+        result, leader = self._shared(text, on_partial)
+        result["coalesced"] = not leader
+        metrics.VERIFICATIONS.inc(source, "coalesced" if not leader else result.get("origin", "model"))
+        result["report_id"] = self._persist(text, result, source)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {**{k: self.counts[k] for k in ("requests", "coalesced", "cache", "reviewed", "model", "posts", "failed")},
+                    "inflight": len(self._inflight), "by_source": dict(self.by_source)}
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_verifier():
+    global _verifier
+    with _verifier_lock:
+        if _verifier is None:
+            _verifier = Verifier()
+        return _verifier
+
+
+# =====================================================
+# 📞 CLIENT (পোর্টাল আর বটগুলো এটাই ডাকে)
+# =====================================================
+_session = None
+
+
+def _remote(text, source):
+    global _session
+    import requests
+    if _session is None:
+        _session = requests.Session()  # কানেকশন রি-ইউজ; Streamlit/listener-এর অনেক থ্রেড একসাথে
+        _session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=32))
+    resp = _session.post(f"{SERVICE_URL}/verify", json={"text": text, "source": source},
+                         timeout=(2, REQUEST_TIMEOUT))
+    data = resp.json()
+    if resp.status_code != 200:
+        raise VerificationError(data.get("error") or f"HTTP {resp.status_code}")
+    return data
+
+
+def verify(text, source="portal", on_partial=None):
+    # on_partial(dict) — stream চলাকালীন আংশিক score/verdict/justification (শুধু প্রসেসের ভেতরে;
+    # daemon-এর HTTP API-তে stream নেই, তখন সরাসরি শেষ ফলাফল)
+    if SERVICE_URL:
+        import requests
+        try:
+            return _remote(text, source)
+        except requests.ConnectionError as e:
+            logging.warning(f"Verify service-এ সংযোগ ব্যর্থ, প্রসেসের ভেতরেই যাচাই: {e}")
+    return get_verifier().verify(text, source, on_partial)
+
+
+def chat_reply(result):
+    # বটের জন্য: অ্যাডমিনের সিদ্ধান্ত থাকলে সেটা আগে, তারপর AI ভার্ডিক্ট + ব্যাখ্যা
+    parts = []
+    if result.get("final_verdict"):
+        parts.append(f"🧑‍💼 ফ্যাক্ট-চেকার যাচাইকৃত সিদ্ধান্ত: {result['final_verdict']}")
+    parts.append(f"Verdict: {result.get('verdict', 'N/A')} ({int(result.get('score', 0))}% সন্দেহজনক)")
+    if result.get("justification"):
+        parts.append(f"বিশ্লেষণ: {result['justification']}")
+    return "\n\n".join(parts)
+
+
+def partial_reply(partial):
+    # stream চলাকালীন বটের মেসেজ (edit করে করে বাড়ে)
+    parts = ["⏳ যাচাই চলছে…"]
+    if partial.get("verdict"):
+        score = f" ({partial['score']}% সন্দেহজনক)" if partial.get("score") is not None else ""
+        parts.append(f"Verdict: {partial['verdict']}{score}")
+    if partial.get("justification"):
+        parts.append(f"বিশ্লেষণ: {partial['justification']}▌")
+    return "\n\n".join(parts)
+
+
+# =====================================================
+# 🌐 DAEMON (HTTP, লোকাল)
+# =====================================================
+def make_server(verifier, host=SERVICE_HOST, port=SERVICE_PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                return self._reply(200, {"ok": True})
+            if self.path == "/stats":
+                return self._reply(200, verifier.stats())
+            if self.path == "/metrics":
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", metrics.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                return self.wfile.write(body)
+            return self._reply(404, {"error": "Not Found"})
+
+        def do_POST(self):
+            if self.path != "/verify":
+                return self._reply(404, {"error": "Not Found"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length).decode("utf-8"))
+                text, source = payload["text"], str(payload.get("source") or "unknown")
+            except (ValueError, KeyError, TypeError) as e:
+                return self._reply(400, {"error": f"ভুল অনুরোধ: {e}"})
+            try:
+                return self._reply(200, verifier.verify(text, source))
+            except VerificationError as e:
+                return self._reply(503, {"error": str(e)})
+            except Exception as e:
+                logging.error(f"Verify ব্যর্থ: {e}")
+                return self._reply(500, {"error": str(e)})
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="লোকাল যাচাই সার্ভিস (single-flight)")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+    gemini_analysis.configure(os.getenv("GEMINI_API_KEY"))
+    server = make_server(Verifier(args.db), args.host, args.port)
+    print(f"🛰️ Verify service চালু: http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,150 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# =====================================================
+# 🪝 WEBHOOK SERVER (aiohttp, polling-এর বদলে)
+# =====================================================
+# long-polling-এ প্রতি বটে একটা প্রসেস getUpdates-এ আটকে থাকে, আর মেসেজ আসা থেকে
+# হাতে পাওয়া পর্যন্ত একটা round trip দেরি। webhook-এ Telegram নিজেই POST করে:
+# - X-Telegram-Bot-Api-Secret-Token হেডার মিলিয়ে দেখা হয় (না মিললে 401)
+# - আপডেট সীমিত সারিতে রেখে সাথে সাথে 200 — যাচাই ব্যাকগ্রাউন্ড worker-এ
+# - সারি ভরা থাকলে 503, Telegram পরে নিজেই আবার পাঠায় (backpressure)
+# - SIGTERM/SIGINT-এ নতুন আপডেট নেওয়া বন্ধ, সারিতে আর চলমান কাজ শেষ করে তারপর বন্ধ
+# handle(update) — sync ফাংশন হলে থ্রেডে, async হলে সরাসরি await করা হয়।
+
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 8443))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")  # setWebhook-এর secret_token (A-Z, a-z, 0-9, _ -)
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", 8))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", 1000))
+DRAIN_TIMEOUT = int(os.getenv("WEBHOOK_DRAIN_TIMEOUT", 30))  # সেকেন্ড, shutdown-এ কতক্ষণ অপেক্ষা
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+WEBHOOK_REQUESTS = metrics.counter("yachai_webhook_requests_total", "Webhook POSTs by HTTP status", ("server", "status"))
+WEBHOOK_HANDLE = metrics.histogram("yachai_webhook_handle_seconds", "Webhook update processing latency (queued to done)", ("server", "result"))
+
+
+class WebhookServer:
+    def __init__(self, handle, name="webhook", secret=WEBHOOK_SECRET, host=WEBHOOK_HOST, port=WEBHOOK_PORT,
+                 path=WEBHOOK_PATH, workers=WEBHOOK_WORKERS, queue_size=WEBHOOK_QUEUE_SIZE):
+        if not secret:
+            raise ValueError("WEBHOOK_SECRET সেট করা নেই — secret ছাড়া webhook চালু করা হবে না।")
+        self.handle = handle
+        self.name = name
+        self.secret = secret.encode("utf-8")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.queue_size = queue_size
+        self.accepted = 0
+        self.processed = 0
+        self.runner = None
+        self._executor = None
+        self._tasks = []
+
+    async def start(self):
+        from aiohttp import web
+
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        metrics.QUEUE_DEPTH.track(self.queue.qsize, f"{self.name}_webhook")
+        app = web.Application(client_max_size=1024 * 1024)
+        app.router.add_post(self.path, self._on_update)
+        app.router.add_get("/health", self._on_health)
+        if not asyncio.iscoroutinefunction(self.handle):
+            # asyncio-র default executor ছোট (CPU+4) — প্রতি worker-এ একটা থ্রেড
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.name}-webhook")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port, backlog=1024)
+        await site.start()
+        self.port = runner.addresses[0][1]  # port=0 হলে আসল পোর্ট
+        self.runner = runner  # এখন থেকে POST নেওয়া যায়
+        logging.info(f"🪝 Webhook ({self.name}): http://{self.host}:{self.port}{self.path}")
+        return self
+
+    async def stop(self, timeout=DRAIN_TIMEOUT):
+        # আগে সার্ভার বন্ধ (নতুন POST নয়), তারপর সারি খালি হওয়া পর্যন্ত অপেক্ষা
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Webhook drain সময় পেরিয়েছে — {self.queue.qsize()}টি আপডেট বাকি")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        logging.info(f"🪝 Webhook ({self.name}) বন্ধ: {self.accepted} গ্রহণ, {self.processed} সম্পন্ন")
+
+    async def _on_health(self, request):
+        from aiohttp import web
+        return web.json_response({"ok": True, "queued": self.queue.qsize(), "accepted": self.accepted,
+                                  "processed": self.processed})
+
+    async def _on_update(self, request):
+        from aiohttp import web
+        token = request.headers.get(SECRET_HEADER, "").encode("utf-8")
+        if not hmac.compare_digest(token, self.secret):
+            return self._respond(web, 401)
+        try:
+            update = await request.json(loads=json.loads)
+        except Exception:
+            return self._respond(web, 400)
+        if not isinstance(update, dict) or "update_id" not in update:
+            return self._respond(web, 400)
+        try:
+            self.queue.put_nowait((update, time.perf_counter()))
+        except asyncio.QueueFull:
+            return self._respond(web, 503)  # Telegram পরে আবার পাঠাবে
+        self.accepted += 1
+        return self._respond(web, 200)
+
+    def _respond(self, web, status):
+        WEBHOOK_REQUESTS.inc(self.name, str(status))
+        return web.Response(status=status)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            update, queued_at = await self.queue.get()
+            result = "error"
+            try:
+                if self._executor is None:
+                    await self.handle(update)
+                else:
+                    await loop.run_in_executor(self._executor, self.handle, update)
+                result = "ok"
+            except Exception as e:
+                logging.error(f"Webhook আপডেট {update.get('update_id')} প্রসেস ব্যর্থ: {e}")
+            finally:
+                WEBHOOK_HANDLE.observe(time.perf_counter() - queued_at, self.name, result)
+                self.processed += 1
+                self.queue.task_done()
+
+
+async def serve(server, stop=None):
+    # SIGTERM/SIGINT (বা stop ইভেন্ট) পর্যন্ত চালু, তারপর graceful shutdown
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows / মূল থ্রেড নয়
+    await server.start()
+    await stop.wait()
+    await server.stop()